@@ -0,0 +1,127 @@
+"""Tests for enforced per-agent timeouts with partial results."""
+
+import asyncio
+from typing import Any
+
+import pytest
+from verifflowcc.agents.base import BaseAgent
+from verifflowcc.core.orchestrator import Orchestrator
+from verifflowcc.core.path_config import PathConfig
+from verifflowcc.core.sdk_config import SDKConfig
+from verifflowcc.core.vmodel import VModelStage
+
+
+class HangingAgent(BaseAgent):
+    """Agent that streams some output and then hangs."""
+
+    def __init__(self, partial: str = '{"components": [', delay: float = 3600):
+        super().__init__(
+            name="hanging_architect",
+            agent_type="architect",
+            sdk_config=SDKConfig(api_key="test-key"),
+        )
+        self.partial = partial
+        self.delay = delay
+        self.cancelled = False
+
+    async def process(self, input_data: dict[str, Any]) -> dict[str, Any]:
+        """Emit partial output, then wait until cancelled."""
+        self.partial_response += self.partial
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return {"status": "success", "artifacts": {}, "metrics": {}}
+
+
+class TestProcessWithTimeout:
+    """Test BaseAgent.process_with_timeout."""
+
+    @pytest.mark.asyncio
+    async def test_timeout_cancels_and_returns_partial_output(self) -> None:
+        """Test that a hung agent is cancelled and its partial output returned."""
+        agent = HangingAgent()
+
+        result = await agent.process_with_timeout({}, timeout=0.05)
+
+        assert agent.cancelled is True
+        assert result["status"] == "timeout"
+        assert result["partial_response"] == '{"components": ['
+        assert result["partial_data"] is None
+        assert result["metrics"]["timed_out"] is True
+        assert result["metrics"]["timeout_seconds"] == 0.05
+        assert result["sdk_outcome"] == "timeout"
+
+    @pytest.mark.asyncio
+    async def test_complete_partial_json_is_parsed(self) -> None:
+        """Test that partial output forming complete JSON is handed over parsed."""
+        agent = HangingAgent(partial='{"components": ["api"]}')
+
+        result = await agent.process_with_timeout({}, timeout=0.01)
+
+        assert result["partial_data"] == {"components": ["api"]}
+
+    @pytest.mark.asyncio
+    async def test_fast_agent_is_unaffected(self) -> None:
+        """Test that agents finishing within the deadline return their output."""
+        agent = HangingAgent(delay=0)
+
+        result = await agent.process_with_timeout({}, timeout=1)
+
+        assert result["status"] == "success"
+
+    def test_default_timeout_from_sdk_config(self) -> None:
+        """Test that the deadline defaults to the SDK agent timeout."""
+        assert HangingAgent().get_timeout() == 90
+
+
+class TestOrchestratorTimeouts:
+    """Test timeout enforcement in stage execution."""
+
+    @pytest.fixture
+    def orchestrator(self, isolated_agilevv_dir: PathConfig) -> Orchestrator:
+        """Provide an orchestrator with a short architect timeout."""
+        isolated_agilevv_dir.config_path.write_text(
+            "v_model:\n"
+            "  stages:\n"
+            "    design: {enabled: true, gating: soft}\n"
+            "agents:\n"
+            "  architect: {timeout: 0.05}\n"
+            "cache: {enabled: false}\n"
+        )
+        orchestrator = Orchestrator(path_config=isolated_agilevv_dir)
+        orchestrator.agents["architect"] = HangingAgent()
+        return orchestrator
+
+    @pytest.mark.asyncio
+    async def test_timeout_recorded_and_gated(self, orchestrator: Orchestrator) -> None:
+        """Test that a timed-out stage is recorded in metrics and fails its gate."""
+        result = await orchestrator.execute_stage(VModelStage.DESIGN, {"story": {"id": "S-1"}})
+
+        assert result["status"] == "timeout"
+        assert orchestrator.state["agent_metrics"]["design"]["timed_out"] is True
+        gate = orchestrator.state["quality_gates"]["design"]
+        assert gate["passed"] is False
+        assert gate["partial_output"] == '{"components": ['
+        assert "timed out" in gate["issues"][0]
+
+    @pytest.mark.asyncio
+    async def test_timeout_under_hard_gating_keeps_partial_output(
+        self, orchestrator: Orchestrator
+    ) -> None:
+        """Test that a hard-gated timeout stops with the partial output attached."""
+        orchestrator.config["v_model"]["stages"]["design"]["gating"] = "hard"
+
+        result = await orchestrator.execute_stage(VModelStage.DESIGN, {"story": {"id": "S-1"}})
+
+        assert result["status"] == "error"
+        assert result["timed_out"] is True
+        assert result["partial_response"] == '{"components": ['
+        assert orchestrator._is_hard_gate_failure(VModelStage.DESIGN, result)
+
+    def test_timeout_read_from_config(self, orchestrator: Orchestrator) -> None:
+        """Test that agents.<name>.timeout overrides the SDK default."""
+        agent = orchestrator.agents["architect"]
+        assert orchestrator._get_agent_timeout("architect", agent) == 0.05
+        assert orchestrator._get_agent_timeout("developer", agent) == 90
@@ -84,7 +84,7 @@ class TestQATesterAgentProcessing:
         assert "quality_assessment" in result
 
         # Validate that artifacts were saved
-        test_artifact_path = isolated_agilevv_dir.base_dir / "testing" / "US-001.json"
+        test_artifact_path = isolated_agilevv_dir.base_dir / "testing" / "unit" / "US-001.json"
         assert test_artifact_path.exists()
 
     async def test_process_with_api_failure(self, isolated_agilevv_dir: PathConfig) -> None:
@@ -110,6 +110,29 @@ class TestQATesterAgentProcessing:
         assert result["next_stage_ready"] is False
         assert "error" in result
 
+    async def test_testing_phases_have_separate_artifacts(
+        self, isolated_agilevv_dir: PathConfig
+    ) -> None:
+        """Test that concurrent testing phases of a story never share artifact files."""
+
+        async def respond(prompt: str, input_data: dict[str, Any]) -> str:
+            return f"{input_data['testing_phase']} test plan"
+
+        results = []
+        for phase in ("unit", "integration", "system"):
+            agent = QATesterAgent(path_config=isolated_agilevv_dir)
+            agent._call_claude_sdk = respond  # type: ignore[method-assign]
+            results.append(await agent.process({"story_id": "US-001", "testing_phase": phase}))
+
+        reports = [result["artifacts"]["test_report"] for result in results]
+        assert reports == [
+            "testing/unit/US-001.json",
+            "testing/integration/US-001.json",
+            "testing/system/US-001.json",
+        ]
+        for report in reports:
+            assert (isolated_agilevv_dir.base_dir / report).exists()
+
 
 class TestQATesterAgentIntegration:
     """Integration tests for QATesterAgent with V-Model workflow."""
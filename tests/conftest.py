@@ -1,13 +1,17 @@
 """Pytest configuration and fixtures for test isolation."""
 
+import asyncio
+import copy
 import os
 import shutil
-from collections.abc import Generator
+from collections.abc import Callable, Generator
 from pathlib import Path
 from typing import Any
 
 import pytest
+from verifflowcc.core.orchestrator import Orchestrator
 from verifflowcc.core.path_config import PathConfig
+from verifflowcc.core.vmodel import VModelStage
 
 
 def pytest_addoption(parser: pytest.Parser) -> None:
@@ -388,7 +392,83 @@ def agilevv_factory(tmp_path: Path) -> Generator[AgileVVDirFactory, None, None]:
         factory.cleanup_all()
 
 
+class ScriptedOrchestrator(Orchestrator):
+    """Orchestrator whose stages return scripted results instead of calling agents.
+
+    Every stage succeeds with a summary artifact unless it is listed in
+    ``failing``, ``stage_result`` replaces the result of every stage, and the
+    stage named by ``hang_at`` hangs once ``hanging`` is set.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.calls: list[str] = []
+        self.failing: set[str] = set()
+        self.stage_result: dict[str, Any] | None = None
+        self.hang_at: str | None = None
+        self.hanging = asyncio.Event()
+
+    async def _execute_stage_logic(
+        self, stage: VModelStage, context: dict[str, Any]
+    ) -> dict[str, Any]:
+        self.calls.append(stage.value)
+        if stage.value == self.hang_at:
+            self.hanging.set()
+            await asyncio.sleep(3600)
+        if stage.value in self.failing:
+            return {"status": "error", "error": "boom", "artifacts": {}}
+        if self.stage_result is not None:
+            return copy.deepcopy(self.stage_result)
+        return {"status": "success", "artifacts": {"summary": f"{stage.value} done"}}
+
+
+@pytest.fixture
+def make_orchestrator(isolated_agilevv_dir: PathConfig) -> Callable[..., ScriptedOrchestrator]:
+    """Provide a factory for scripted orchestrators sharing one project directory.
+
+    Args:
+        isolated_agilevv_dir: Project directory of the test
+
+    Returns:
+        Factory taking the arguments of build_orchestrator_config()
+    """
+
+    def factory(gating: dict[str, str] | None = None, **sections: Any) -> ScriptedOrchestrator:
+        return ScriptedOrchestrator(
+            path_config=isolated_agilevv_dir,
+            config=build_orchestrator_config(gating, **sections),
+            show_progress=False,
+        )
+
+    return factory
+
+
 # Test data builders
+def build_orchestrator_config(
+    gating: dict[str, str] | None = None, **sections: Any
+) -> dict[str, Any]:
+    """Build an orchestrator config with every stage enabled and the stage cache off.
+
+    Args:
+        gating: Gating mode per stage name, "off" for the stages left out
+        **sections: Further config sections, e.g. state={"backend": "sqlite"}
+
+    Returns:
+        Orchestrator configuration
+    """
+    gating = gating or {}
+    return {
+        "v_model": {
+            "stages": {
+                stage.value: {"enabled": True, "gating": gating.get(stage.value, "off")}
+                for stage in VModelStage
+            },
+        },
+        "cache": {"enabled": False},
+        **sections,
+    }
+
+
 def build_sample_user_story(story_id: str, title: str, description: str) -> dict[str, Any]:
     """Build a sample user story for testing.
 
@@ -0,0 +1,137 @@
+"""Tests for stage outputs stored by handle outside the project state."""
+
+import json
+from typing import Any
+
+import pytest
+from verifflowcc.core.artifact_handles import SCHEMA_VERSION, ArtifactHandle, HandleStore
+from verifflowcc.core.path_config import PathConfig
+from verifflowcc.core.state_store import load_project_state
+from verifflowcc.core.vmodel import VModelStage
+
+STORY = {"id": "STORY-001", "title": "Login", "description": "Login"}
+
+
+def handle_store(path_config: PathConfig) -> HandleStore:
+    """Create a store writing to the project's outputs directory."""
+    return HandleStore(path_config.base_dir, path_config.outputs_dir)
+
+
+class TestHandleStore:
+    """Test writing and loading bodies through handles."""
+
+    def test_round_trip(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that a handle describes its body and loads it back."""
+        body = {"design_document": "design/S-1.json", "components": ["api", "db"]}
+
+        handle = handle_store(isolated_agilevv_dir).put(body)
+
+        assert ArtifactHandle.is_handle(handle)
+        assert handle["schema_version"] == SCHEMA_VERSION
+        body_path = isolated_agilevv_dir.base_dir / handle["path"]
+        assert body_path.stat().st_size == handle["size"]
+        # A new store has nothing in memory and reads the file
+        assert handle_store(isolated_agilevv_dir).load(handle) == body
+
+    def test_identical_bodies_are_stored_once(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that equal bodies share one file whatever their key order."""
+        store = handle_store(isolated_agilevv_dir)
+
+        first = store.put({"a": 1, "b": 2})
+        second = store.put({"b": 2, "a": 1})
+
+        assert first == second
+        assert len(list(isolated_agilevv_dir.outputs_dir.rglob("*.json"))) == 1
+
+    def test_loads_return_copies(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that modifying a loaded body does not affect later loads."""
+        store = handle_store(isolated_agilevv_dir)
+        handle = store.put({"files": ["a.py"]})
+
+        store.load(handle)["files"].append("b.py")
+
+        assert store.load(handle) == {"files": ["a.py"]}
+
+    def test_inline_values_pass_through(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that outputs stored inline by older versions are returned as they are."""
+        store = handle_store(isolated_agilevv_dir)
+
+        assert store.load({"summary": "design done"}) == {"summary": "design done"}
+        assert store.load(None) is None
+
+    def test_tampered_body_is_rejected(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that a body not matching its hash is not returned."""
+        handle = handle_store(isolated_agilevv_dir).put({"summary": "design done"})
+        (isolated_agilevv_dir.base_dir / handle["path"]).write_text('{"summary": "edited"}')
+
+        with pytest.raises(ValueError, match="does not match"):
+            handle_store(isolated_agilevv_dir).load(handle)
+
+    def test_newer_schema_is_rejected(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that bodies written by a newer version are not misread."""
+        handle = handle_store(isolated_agilevv_dir).put({})
+
+        with pytest.raises(ValueError, match="schema version"):
+            handle_store(isolated_agilevv_dir).load(
+                {**handle, "schema_version": SCHEMA_VERSION + 1}
+            )
+
+
+class TestOrchestratorHandles:
+    """Test that the orchestrator keeps stage outputs out of its state."""
+
+    @pytest.mark.asyncio
+    async def test_state_size_does_not_grow_with_outputs(
+        self, make_orchestrator: Any, isolated_agilevv_dir: PathConfig
+    ) -> None:
+        """Test that large outputs over several sprints leave state.json small."""
+        orchestrator = make_orchestrator()
+        sizes = []
+        for sprint in range(3):
+            orchestrator.stage_result = {
+                "status": "success",
+                "artifacts": {"report": f"sprint {sprint} " + "x" * 50_000},
+                "session_state": {"history": ["turn"] * 1_000},
+            }
+            await orchestrator.run_sprint(STORY)
+            sizes.append(isolated_agilevv_dir.state_path.stat().st_size)
+
+        state = load_project_state(isolated_agilevv_dir)
+        assert all(ArtifactHandle.is_handle(h) for h in state["stage_artifacts"].values())
+        assert all(ArtifactHandle.is_handle(h) for h in state["session_state"].values())
+        assert len(state["completed_stages"]) == len(set(state["completed_stages"]))
+        assert sizes[-1] < 20_000
+        assert abs(sizes[-1] - sizes[0]) < 1_000
+
+    @pytest.mark.asyncio
+    async def test_downstream_stages_receive_bodies(self, make_orchestrator: Any) -> None:
+        """Test that agent input is built from the loaded bodies, not the handles."""
+        orchestrator = make_orchestrator()
+        orchestrator.stage_result = {
+            "status": "success",
+            "artifacts": {"design_data": {"components": ["api"]}},
+            "session_state": {"session_id": "abc"},
+        }
+        await orchestrator.execute_stage(VModelStage.DESIGN, {})
+
+        input_data = orchestrator._prepare_comprehensive_agent_input(VModelStage.CODING, {})
+
+        assert input_data["design_spec"] == {"components": ["api"]}
+        assert input_data["session_state"] == {"design": {"session_id": "abc"}}
+
+    @pytest.mark.asyncio
+    async def test_checkpoint_keeps_outputs_of_its_time(
+        self, make_orchestrator: Any, isolated_agilevv_dir: PathConfig
+    ) -> None:
+        """Test that a restored checkpoint loads the outputs it was taken with."""
+        orchestrator = make_orchestrator()
+        orchestrator.stage_result = {"status": "success", "artifacts": {"version": 1}}
+        await orchestrator.execute_stage(VModelStage.DESIGN, {})
+        checkpoint = await orchestrator.checkpoint("before-redesign")
+
+        orchestrator.stage_result = {"status": "success", "artifacts": {"version": 2}}
+        await orchestrator.execute_stage(VModelStage.DESIGN, {})
+        assert await orchestrator.restore_checkpoint("before-redesign")
+
+        assert len(json.dumps(checkpoint["state"])) < 5_000
+        assert make_orchestrator().get_stage_artifacts("design") == {"version": 1}
@@ -0,0 +1,220 @@
+"""Tests for the index of artifacts by story, stage, type and sprint."""
+
+import json
+import sqlite3
+from typing import Any
+
+import pytest
+from tests.conftest import build_orchestrator_config
+from typer.testing import CliRunner
+from verifflowcc.agents.base import BaseAgent
+from verifflowcc.cli import app
+from verifflowcc.core.artifact_index import ArtifactIndex, artifact_type
+from verifflowcc.core.artifact_store import ArtifactStore
+from verifflowcc.core.orchestrator import Orchestrator
+from verifflowcc.core.path_config import PathConfig
+from verifflowcc.core.sdk_config import SDKConfig
+from verifflowcc.core.vmodel import VModelStage
+
+STORY = {"id": "S-1", "title": "Login", "description": "Login"}
+
+
+class DesigningArchitect(BaseAgent):
+    """Architect stand-in saving a design and a diagram."""
+
+    def __init__(self, path_config: PathConfig):
+        super().__init__(
+            name="designing_architect",
+            agent_type="architect",
+            path_config=path_config,
+            sdk_config=SDKConfig(api_key="test-key"),
+        )
+
+    async def process(self, input_data: dict[str, Any]) -> dict[str, Any]:
+        """Save the artifacts of the design stage."""
+        story_id = input_data["story_id"]
+        self.save_artifact(f"design/{story_id}.json", {"story_id": story_id})
+        self.save_artifact(
+            f"design/diagrams/{story_id}_api.puml", "@startuml", artifact_type="diagram"
+        )
+        return {"status": "success", "artifacts": {"design": f"design/{story_id}.json"}}
+
+
+def paths(entries: list[Any]) -> list[str]:
+    """Get the paths of index entries."""
+    return [entry.path for entry in entries]
+
+
+class TestArtifactType:
+    """Test deriving artifact types from names."""
+
+    @pytest.mark.parametrize(
+        ("name", "expected"),
+        [
+            ("design/US-001.json", "design"),
+            ("testing/unit/US-001_traceability.json", "traceability"),
+            ("design/diagrams/US-001_api.puml", "api"),
+            ("architecture.md", "architecture"),
+        ],
+    )
+    def test_type_from_name(self, name: str, expected: str) -> None:
+        """Test the types of the names the agents use."""
+        assert artifact_type(name, "US-001") == expected
+
+    def test_unknown_story(self) -> None:
+        """Test that names are not split without a story."""
+        assert artifact_type("design/US-001.json") == "US-001"
+
+
+class TestArtifactIndex:
+    """Test recording and querying published artifacts."""
+
+    def test_saves_are_indexed(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that artifacts saved outside a transaction are indexed by their labels."""
+        store = ArtifactStore.for_project(isolated_agilevv_dir)
+        store.save("design/S-1.json", b"{}", labels={"story_id": "S-1"})
+        store.save("testing/S-1_traceability.json", b"[]", labels={"story_id": "S-1"})
+        store.save("testing/S-2_traceability.json", b"[1]", labels={"story_id": "S-2"})
+        index = ArtifactIndex.for_project(isolated_agilevv_dir)
+
+        assert paths(index.query(story_id="S-1")) == [
+            "design/S-1.json",
+            "testing/S-1_traceability.json",
+        ]
+        entry = index.get("testing/S-2_traceability.json")
+        assert entry is not None
+        assert (entry.type, entry.size, entry.sha256) == (
+            "traceability",
+            3,
+            store.digest("testing/S-2_traceability.json"),
+        )
+        assert paths(index.query(type="traceability", story_id="S-2")) == [
+            "testing/S-2_traceability.json"
+        ]
+
+    def test_commit_records_transaction_labels(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that committed artifacts are indexed with the story, stage and sprint."""
+        store = ArtifactStore.for_project(isolated_agilevv_dir)
+        index = store.index
+        assert index is not None
+
+        store.begin(story_id="S-1", stage="design", sprint_number=2)
+        store.save("design/S-1.json", b"{}")
+        store.save("design/diagrams/S-1_api.puml", b"@startuml", labels={"type": "diagram"})
+        assert index.query() == []
+        store.commit()
+
+        assert paths(index.query(stage="design", sprint_number=2)) == [
+            "design/S-1.json",
+            "design/diagrams/S-1_api.puml",
+        ]
+        assert paths(index.query(type="diagram")) == ["design/diagrams/S-1_api.puml"]
+
+        store.begin(story_id="S-1", stage="design", sprint_number=3)
+        store.save("design/S-1.json", b"{}")
+        store.discard()
+        store.begin(story_id="S-1", stage="design", sprint_number=4)
+        store.save("design/S-1.json", b"{}")
+        store.commit()
+
+        # An unchanged artifact saved again is indexed under the latest sprint
+        assert paths(index.query(sprint_number=4)) == ["design/S-1.json"]
+        assert index.query(sprint_number=3) == []
+
+    def test_story_workspaces_share_the_index(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that artifacts of story workspaces are indexed relative to the project."""
+        ArtifactStore.for_project(isolated_agilevv_dir.for_story("S-2")).save(
+            "design/S-2.json", b"{}", labels={"story_id": "S-2"}
+        )
+
+        assert paths(ArtifactIndex.for_project(isolated_agilevv_dir).query(type="design")) == [
+            "stories/S-2/design/S-2.json"
+        ]
+
+    def test_rebuild_from_recorded_hashes(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that the index is recreated from the artifact_refs.json files."""
+        store = ArtifactStore.for_project(isolated_agilevv_dir)
+        store.begin(story_id="S-1", stage="design", sprint_number=1)
+        store.save("design/S-1.json", b"{}")
+        store.commit()
+        ArtifactStore.for_project(isolated_agilevv_dir.for_story("S-2")).save(
+            "design/S-2.json", b"[]", labels={"story_id": "S-2"}
+        )
+        expected = ArtifactIndex.for_project(isolated_agilevv_dir).query()
+        isolated_agilevv_dir.artifact_index_path.unlink()
+
+        index = ArtifactIndex.for_project(isolated_agilevv_dir)
+        assert index.rebuild() == 2
+
+        assert [entry.to_dict() | {"updated_at": None} for entry in index.query()] == [
+            entry.to_dict() | {"updated_at": None} for entry in expected
+        ]
+
+    def test_queries_use_indexes(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that each filter is answered from an index rather than a table scan."""
+        ArtifactStore.for_project(isolated_agilevv_dir).save("design/S-1.json", b"{}")
+        connection = sqlite3.connect(isolated_agilevv_dir.artifact_index_path)
+        try:
+            for column in ("story_id", "stage", "type", "sprint_number"):
+                query = f"EXPLAIN QUERY PLAN SELECT * FROM artifacts WHERE {column} = ?"  # noqa: S608
+                plan = connection.execute(query, ("x",)).fetchall()
+                assert "USING INDEX" in str(plan), column
+        finally:
+            connection.close()
+
+
+class TestIndexedStages:
+    """Test the index as used by the orchestrator, the agents and the CLI."""
+
+    @pytest.mark.asyncio
+    async def test_stage_artifacts_are_queryable(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test finding a stage's artifacts after the orchestrator runs it."""
+        orchestrator = Orchestrator(
+            path_config=isolated_agilevv_dir,
+            config=build_orchestrator_config(),
+            show_progress=False,
+        )
+        agent = DesigningArchitect(isolated_agilevv_dir)
+        orchestrator.agents["architect"] = agent
+
+        result = await orchestrator.execute_stage(VModelStage.DESIGN, {"story": STORY})
+
+        assert result["status"] == "success"
+        sprint = orchestrator.state["sprint_number"]
+        assert paths(orchestrator.find_artifacts(story_id="S-1", sprint_number=sprint)) == [
+            "design/S-1.json",
+            "design/diagrams/S-1_api.puml",
+        ]
+        assert paths(agent.find_artifacts(stage="design", type="diagram")) == [
+            "design/diagrams/S-1_api.puml"
+        ]
+
+    def test_cli_query(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test vv artifacts query with JSON output and a rebuilt index."""
+        ArtifactStore.for_project(isolated_agilevv_dir).save(
+            "testing/S-1_traceability.json", b"{}", labels={"story_id": "S-1"}
+        )
+        isolated_agilevv_dir.artifact_index_path.unlink()
+        base_dir = str(isolated_agilevv_dir.base_dir)
+
+        result = CliRunner().invoke(
+            app,
+            [
+                "artifacts",
+                "query",
+                "--type",
+                "traceability",
+                "--rebuild-index",
+                "--json",
+                "--dir",
+                base_dir,
+            ],
+        )
+        table = CliRunner().invoke(app, ["artifacts", "query", "--story", "S-1", "--dir", base_dir])
+
+        assert result.exit_code == 0, result.output
+        assert [entry["path"] for entry in json.loads(result.output)] == [
+            "testing/S-1_traceability.json"
+        ]
+        assert table.exit_code == 0, table.output
+        assert "traceability" in table.output
@@ -0,0 +1,336 @@
+"""Tests for named artifacts stored once per content in a blob store."""
+
+import hashlib
+import json
+import stat
+import threading
+from pathlib import Path
+from typing import Any
+
+import pytest
+from tests.conftest import build_orchestrator_config
+from verifflowcc.agents.base import BaseAgent
+from verifflowcc.core.artifact_store import ArtifactStore, BlobStore
+from verifflowcc.core.orchestrator import Orchestrator
+from verifflowcc.core.path_config import PathConfig
+from verifflowcc.core.sdk_config import SDKConfig
+from verifflowcc.core.stage_cache import hash_artifacts
+from verifflowcc.core.vmodel import VModelStage
+
+STORY = {"id": "S-1", "title": "Login", "description": "Login"}
+DESIGN = {"components": ["api", "db"], "interface_specifications": ["rest"]}
+
+
+class SavingDeveloper(BaseAgent):
+    """Developer stand-in saving artifacts directly."""
+
+    def __init__(self, path_config: PathConfig):
+        super().__init__(
+            name="saving_developer",
+            agent_type="developer",
+            path_config=path_config,
+            sdk_config=SDKConfig(api_key="test-key"),
+        )
+
+    async def process(self, input_data: dict[str, Any]) -> dict[str, Any]:
+        """Not used by these tests."""
+        return {}
+
+
+def blob_files(path_config: PathConfig) -> list[Path]:
+    """Get the blob files of a project."""
+    return [path for path in path_config.blobs_dir.rglob("*") if path.is_file()]
+
+
+class TestArtifactStore:
+    """Test saving named artifacts through the blob store."""
+
+    def test_named_file_holds_content(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that a saved artifact reads as a regular file."""
+        store = ArtifactStore.for_project(isolated_agilevv_dir)
+
+        digest = store.save("design/S-1.json", b'{"a": 1}')
+
+        assert (isolated_agilevv_dir.base_dir / "design/S-1.json").read_bytes() == b'{"a": 1}'
+        assert store.blobs.get(digest) == b'{"a": 1}'
+        assert store.digest("design/S-1.json") == digest
+
+    def test_identical_contents_share_a_blob(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that equal artifacts are stored once and compare by hash."""
+        store = ArtifactStore.for_project(isolated_agilevv_dir)
+
+        store.save("testing/S-1_strategy.json", b"{}")
+        store.save("testing/S-2_strategy.json", b"{}")
+        store.save("testing/S-3_strategy.json", b"[]")
+
+        assert len(blob_files(isolated_agilevv_dir)) == 2
+        assert store.same("testing/S-1_strategy.json", "testing/S-2_strategy.json")
+        assert not store.same("testing/S-1_strategy.json", "testing/S-3_strategy.json")
+        assert not store.same("testing/S-1_strategy.json", "testing/missing.json")
+
+    def test_unchanged_save_leaves_file_alone(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that saving the same content again does not rewrite the file."""
+        store = ArtifactStore.for_project(isolated_agilevv_dir)
+        store.save("design/S-1.json", b"{}")
+        before = (isolated_agilevv_dir.base_dir / "design/S-1.json").stat()
+
+        store.save("design/S-1.json", b"{}")
+
+        after = (isolated_agilevv_dir.base_dir / "design/S-1.json").stat()
+        assert (after.st_ino, after.st_mtime_ns) == (before.st_ino, before.st_mtime_ns)
+
+    def test_changed_save_keeps_other_names(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that replacing an artifact leaves the artifacts sharing its blob alone."""
+        store = ArtifactStore.for_project(isolated_agilevv_dir)
+        store.save("a.json", b"{}")
+        store.save("b.json", b"{}")
+
+        store.save("a.json", b"[]")
+
+        assert (isolated_agilevv_dir.base_dir / "b.json").read_bytes() == b"{}"
+        assert not store.same("a.json", "b.json")
+
+    def test_files_written_elsewhere_are_hashed(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that recorded hashes are not trusted once a file is replaced."""
+        store = ArtifactStore.for_project(isolated_agilevv_dir)
+        store.save("a.json", b"{}")
+        (isolated_agilevv_dir.base_dir / "a.json").unlink()
+        (isolated_agilevv_dir.base_dir / "a.json").write_bytes(b"[1]")
+
+        assert store.digest("a.json") == hashlib.sha256(b"[1]").hexdigest()
+        assert store.digest("missing.json") is None
+
+    def test_corrupt_blob_is_reported(self, tmp_path: Path) -> None:
+        """Test that a blob not matching its hash is not returned."""
+        blobs = BlobStore(tmp_path)
+        digest = blobs.put(b"{}")
+        blobs.path_of(digest).chmod(0o644)
+        blobs.path_of(digest).write_bytes(b"[]")
+
+        with pytest.raises(ValueError, match=digest):
+            blobs.get(digest)
+
+    def test_corrupt_blob_is_rewritten(self, tmp_path: Path) -> None:
+        """Test that storing a content again repairs its blob."""
+        blobs = BlobStore(tmp_path)
+        digest = blobs.put(b"{}")
+        blobs.path_of(digest).chmod(0o644)
+        blobs.path_of(digest).write_bytes(b"[]")
+
+        assert blobs.put(b"{}") == digest
+        assert blobs.get(digest) == b"{}"
+
+    def test_blobs_are_read_only(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that blobs cannot be written while named files can."""
+        store = ArtifactStore.for_project(isolated_agilevv_dir)
+        digest = store.save("a.json", b"{}")
+
+        assert stat.S_IMODE(store.blobs.path_of(digest).stat().st_mode) == 0o444
+        assert stat.S_IMODE((isolated_agilevv_dir.base_dir / "a.json").stat().st_mode) == 0o644
+
+    def test_edit_in_place_leaves_blob_alone(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that editing a named file changes neither its blob nor other names."""
+        store = ArtifactStore.for_project(isolated_agilevv_dir)
+        digest = store.save("a.json", b"{}")
+        store.save("b.json", b"{}")
+
+        (isolated_agilevv_dir.base_dir / "a.json").write_bytes(b"[1]")
+
+        assert store.blobs.get(digest) == b"{}"
+        assert (isolated_agilevv_dir.base_dir / "b.json").read_bytes() == b"{}"
+        assert store.digest("a.json") == hashlib.sha256(b"[1]").hexdigest()
+        assert store.digest("b.json") == digest
+
+
+class TestTransactions:
+    """Test publishing the artifacts of a stage together."""
+
+    def test_commit_publishes_saves(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that saves in a transaction appear only once committed."""
+        store = ArtifactStore.for_project(isolated_agilevv_dir)
+        written: list[str] = []
+
+        store.begin()
+        store.save("design/S-1.json", b"{}")
+        store.on_commit(lambda: written.append("architecture.md"))
+
+        assert not (isolated_agilevv_dir.base_dir / "design/S-1.json").exists()
+        assert store.read("design/S-1.json") == b"{}"
+        assert store.digest("design/S-1.json") is None
+        assert written == []
+
+        assert store.commit() == ["design/S-1.json"]
+        assert (isolated_agilevv_dir.base_dir / "design/S-1.json").read_bytes() == b"{}"
+        assert store.digest("design/S-1.json") == hashlib.sha256(b"{}").hexdigest()
+        assert written == ["architecture.md"]
+
+    def test_discard_keeps_previous_set(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that a failed stage leaves the previous artifacts in place."""
+        store = ArtifactStore.for_project(isolated_agilevv_dir)
+        store.save("design/S-1.json", b"[1]")
+        written: list[str] = []
+
+        store.begin()
+        store.save("design/S-1.json", b"[2]")
+        store.save("design/diagrams/S-1_api.puml", b"@startuml")
+        store.on_commit(lambda: written.append("architecture.md"))
+        store.discard()
+        store.commit()
+
+        assert (isolated_agilevv_dir.base_dir / "design/S-1.json").read_bytes() == b"[1]"
+        assert not (isolated_agilevv_dir.base_dir / "design/diagrams").exists()
+        assert written == []
+
+    def test_readers_never_see_part_of_a_commit(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that a reader racing commits sees all of a set or none of it."""
+        names = [f"design/S-{i}.json" for i in range(5)]
+        store = ArtifactStore.for_project(isolated_agilevv_dir)
+        store.begin()
+        for name in names:
+            store.save(name, b"0")
+        store.commit()
+        reader = ArtifactStore(store.base_dir, store.blobs, store.lock)
+        done = threading.Event()
+        seen: list[set[str | None]] = []
+
+        def read() -> None:
+            while not done.is_set():
+                seen.append(set(reader.digests(names).values()))
+
+        thread = threading.Thread(target=read)
+        thread.start()
+        try:
+            for generation in range(1, 50):
+                store.begin()
+                for name in names:
+                    store.save(name, str(generation).encode())
+                store.commit()
+        finally:
+            done.set()
+            thread.join()
+
+        assert seen
+        assert all(len(digests) == 1 for digests in seen)
+        assert reader.read(names[0]) == b"49"
+
+    def test_commit_point_is_the_recorded_hashes(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that artifacts recorded before their files are replaced read from blobs."""
+        store = ArtifactStore.for_project(isolated_agilevv_dir)
+        store.save("a.json", b"[1]")
+        digest = store.blobs.put(b"[2]")
+        # A commit interrupted after recording the new hashes
+        refs = store.read_refs()
+        refs["a.json"] = {"sha256": digest, "type": "document"}
+        store.refs_path.write_text(json.dumps(refs))
+
+        assert store.read("a.json") == b"[2]"
+        assert store.digest("a.json") == digest
+        assert store.file_of("a.json") == store.blobs.path_of(digest)
+
+        store.save("a.json", b"[2]")
+        assert (isolated_agilevv_dir.base_dir / "a.json").read_bytes() == b"[2]"
+        assert "stamp" in store.read_refs()["a.json"]
+
+
+class TestAgentArtifacts:
+    """Test BaseAgent artifacts stored through the blob store."""
+
+    def test_stories_share_blobs(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that story workspaces store identical artifacts once."""
+        for story_id in ("S-1", "S-2"):
+            agent = SavingDeveloper(isolated_agilevv_dir.for_story(story_id))
+            agent.save_artifact(f"design/{story_id}.json", DESIGN)
+
+        story_file = isolated_agilevv_dir.for_story("S-2").base_dir / "design/S-2.json"
+        assert json.loads(story_file.read_text()) == DESIGN
+        assert len(blob_files(isolated_agilevv_dir)) == 1
+
+    def test_embedded_references_round_trip(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that embedded copies are stored once and restored on load."""
+        agent = SavingDeveloper(isolated_agilevv_dir)
+
+        for story_id in ("S-1", "S-2"):
+            agent.save_artifact(
+                f"implementation/{story_id}.json",
+                {"story_id": story_id, "design_reference": DESIGN},
+            )
+
+        saved = json.loads((isolated_agilevv_dir.base_dir / "implementation/S-1.json").read_text())
+        assert set(saved["design_reference"]) == {"$blob"}
+        assert agent.load_artifact("implementation/S-2.json") == {
+            "story_id": "S-2",
+            "design_reference": DESIGN,
+        }
+        # One blob per implementation artifact and one for the shared design
+        assert len(blob_files(isolated_agilevv_dir)) == 3
+
+    def test_text_and_legacy_artifacts(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that text artifacts and files written before the store still load."""
+        agent = SavingDeveloper(isolated_agilevv_dir)
+        (isolated_agilevv_dir.base_dir / "legacy.json").write_text(json.dumps(DESIGN))
+
+        agent.save_artifact("notes.md", "# Notes")
+
+        assert agent.load_artifact("notes.md") == "# Notes"
+        assert agent.load_artifact("legacy.json") == DESIGN
+        assert agent.load_artifact("missing.json") is None
+
+    def test_stage_cache_uses_recorded_hashes(
+        self, isolated_agilevv_dir: PathConfig, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that hashing saved artifacts for the stage cache reads no artifact."""
+        agent = SavingDeveloper(isolated_agilevv_dir)
+        agent.save_artifact("design/S-1.json", DESIGN)
+        expected = agent.artifact_store.digest("design/S-1.json")
+        refs = agent.artifact_store.read_refs()
+
+        def fail_read(path: Path) -> bytes:
+            raise AssertionError(f"{path} was read")
+
+        # Only the recorded hashes are read
+        monkeypatch.setattr(ArtifactStore, "read_refs", lambda store: refs)
+        monkeypatch.setattr(Path, "read_bytes", fail_read)
+
+        assert hash_artifacts(isolated_agilevv_dir.base_dir, {"design": "design/S-1.json"}) == {
+            "design": expected
+        }
+
+
+class FailingArchitect(SavingDeveloper):
+    """Agent saving part of its artifacts before failing on its second run."""
+
+    version = 1
+
+    async def process(self, input_data: dict[str, Any]) -> dict[str, Any]:
+        """Save a design, write a document outside the store and fail."""
+        self.save_artifact("design/S-1.json", {"version": self.version})
+        self._write_file(self.path_config.architecture_path, f"v{self.version}")
+        if self.version == 2:
+            raise RuntimeError("stream interrupted")
+        return {"status": "success", "artifacts": {"design": "design/S-1.json"}}
+
+
+class TestStageCommits:
+    """Test that the orchestrator publishes the artifacts of successful stages only."""
+
+    @pytest.mark.asyncio
+    async def test_failed_stage_publishes_nothing(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that a stage failing halfway leaves the previous artifacts."""
+        orchestrator = Orchestrator(
+            path_config=isolated_agilevv_dir,
+            config=build_orchestrator_config(),
+            show_progress=False,
+        )
+        agent = FailingArchitect(isolated_agilevv_dir)
+        orchestrator.agents["architect"] = agent
+        design_path = isolated_agilevv_dir.base_dir / "design/S-1.json"
+
+        first = await orchestrator.execute_stage(VModelStage.DESIGN, {"story": STORY})
+        agent.version = 2
+        second = await orchestrator.execute_stage(VModelStage.DESIGN, {"story": STORY})
+
+        assert first["status"] == "success"
+        assert second["status"] == "error"
+        assert json.loads(design_path.read_text()) == {"version": 1}
+        assert isolated_agilevv_dir.architecture_path.read_text() == "v1"
+        assert agent.load_artifact("design/S-1.json") == {"version": 1}
@@ -0,0 +1,226 @@
+"""Tests for multi-story batch sprint execution."""
+
+import asyncio
+import json
+import sqlite3
+from typing import Any, cast
+
+import pytest
+from tests.conftest import build_orchestrator_config
+from verifflowcc.core.batch import BatchSprintRunner, normalize_stories, story_id_for
+from verifflowcc.core.orchestrator import Orchestrator
+from verifflowcc.core.path_config import PathConfig
+
+
+class RecordingOrchestrator(Orchestrator):
+    """Orchestrator whose sprint only records concurrency and writes story state."""
+
+    in_flight = 0
+    peak = 0
+
+    async def run_sprint(self, story: dict[str, Any]) -> dict[str, Any]:
+        """Simulate a sprint without invoking any agent."""
+        if story.get("fail"):
+            raise RuntimeError("story exploded")
+
+        cls = type(self)
+        cls.in_flight += 1
+        cls.peak = max(cls.peak, cls.in_flight)
+        try:
+            self.state["active_story"] = story
+            self.state["quality_gates"]["requirements"] = {"passed": True}
+            self._save_state()
+            await asyncio.sleep(0.01)
+        finally:
+            cls.in_flight -= 1
+
+        return {
+            "sprint_number": 1,
+            "stages": {"requirements": {"status": "success"}, "design": {"status": "error"}},
+            "final_decision": "GO" if story.get("go") else "NO-GO",
+            "readiness_score": 80,
+            "success_rate": 0.5,
+            "completed_stages": ["requirements"],
+            "quality_summary": {"requirements": {"passed": True}},
+        }
+
+
+@pytest.fixture
+def recording_factory() -> Any:
+    """Provide a factory creating RecordingOrchestrators with fresh counters."""
+
+    class Recorder(RecordingOrchestrator):
+        in_flight = 0
+        peak = 0
+
+    def factory(story_path_config: PathConfig) -> Orchestrator:
+        return Recorder(path_config=story_path_config, show_progress=False)
+
+    factory.recorder = Recorder  # type: ignore[attr-defined]
+    return factory
+
+
+class TestNormalizeStories:
+    """Test story normalization."""
+
+    def test_strings_get_positional_ids(self) -> None:
+        """Test that plain story titles get identifiers derived from the title."""
+        stories = normalize_stories(["Login", "Logout"])
+        assert [s["id"] for s in stories] == [story_id_for("Login"), story_id_for("Logout")]
+        assert stories[0]["id"].startswith("STORY-")
+        assert stories[0]["title"] == "Login"
+
+    def test_ids_do_not_depend_on_position(self) -> None:
+        """Test that a story keeps its ID in another batch at another position."""
+        first = normalize_stories(["Login"])
+        second = normalize_stories(["Signup", "Login"])
+        assert second[1]["id"] == first[0]["id"]
+        assert second[0]["id"] != first[0]["id"]
+        assert story_id_for("  login ") == story_id_for("Login")
+
+    def test_existing_ids_are_kept(self) -> None:
+        """Test that story dictionaries keep their identifiers."""
+        stories = normalize_stories([{"id": "AUTH-1", "title": "Login"}, "Logout"])
+        assert [s["id"] for s in stories] == ["AUTH-1", story_id_for("Logout")]
+
+    def test_duplicate_ids_rejected(self) -> None:
+        """Test that duplicate story identifiers are rejected."""
+        with pytest.raises(ValueError, match="Duplicate"):
+            normalize_stories([{"id": "A", "title": "x"}, {"id": "A", "title": "y"}])
+
+
+class TestBatchSprintRunner:
+    """Test concurrent execution of several stories."""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(
+        self, isolated_agilevv_dir: PathConfig, recording_factory: Any
+    ) -> None:
+        """Test that no more than max_concurrency stories run at once."""
+        runner = BatchSprintRunner(
+            path_config=isolated_agilevv_dir,
+            max_concurrency=2,
+            orchestrator_factory=recording_factory,
+        )
+
+        summary = await runner.run(["A", "B", "C", "D"])
+
+        assert recording_factory.recorder.peak == 2
+        assert summary["totals"]["stories"] == 4
+
+    @pytest.mark.asyncio
+    async def test_stories_have_isolated_state(
+        self, isolated_agilevv_dir: PathConfig, recording_factory: Any
+    ) -> None:
+        """Test that every story writes its own state file."""
+        runner = BatchSprintRunner(
+            path_config=isolated_agilevv_dir, orchestrator_factory=recording_factory
+        )
+
+        await runner.run(["Login", "Logout"])
+
+        for title in ("Login", "Logout"):
+            state_path = isolated_agilevv_dir.for_story(story_id_for(title)).state_path
+            state = json.loads(state_path.read_text())
+            assert state["active_story"]["title"] == title
+            assert state["quality_gates"] == {"requirements": {"passed": True}}
+
+    @pytest.mark.asyncio
+    async def test_story_state_stores_are_closed(
+        self, isolated_agilevv_dir: PathConfig, recording_factory: Any
+    ) -> None:
+        """Test that every story releases its state store, failed stories included."""
+        orchestrators: list[Orchestrator] = []
+
+        def factory(story_path_config: PathConfig) -> Orchestrator:
+            orchestrator = recording_factory.recorder(
+                path_config=story_path_config,
+                config=build_orchestrator_config(state={"backend": "sqlite"}),
+                show_progress=False,
+            )
+            orchestrators.append(orchestrator)
+            return cast("Orchestrator", orchestrator)
+
+        runner = BatchSprintRunner(path_config=isolated_agilevv_dir, orchestrator_factory=factory)
+        await runner.run(
+            [{"id": "OK-1", "title": "works"}, {"id": "BAD-1", "title": "breaks", "fail": True}]
+        )
+
+        assert len(orchestrators) == 2
+        for orchestrator in orchestrators:
+            with pytest.raises(sqlite3.ProgrammingError):
+                orchestrator.state_store.load()
+
+    @pytest.mark.asyncio
+    async def test_failing_story_does_not_stop_batch(
+        self, isolated_agilevv_dir: PathConfig, recording_factory: Any
+    ) -> None:
+        """Test that an exception in one story is isolated and merged into the summary."""
+        runner = BatchSprintRunner(
+            path_config=isolated_agilevv_dir, orchestrator_factory=recording_factory
+        )
+
+        summary = await runner.run(
+            [
+                {"id": "OK-1", "title": "works", "go": True},
+                {"id": "BAD-1", "title": "breaks", "fail": True},
+                {"id": "OK-2", "title": "works too"},
+            ]
+        )
+
+        stories = summary["stories"]
+        assert stories["BAD-1"]["status"] == "error"
+        assert stories["BAD-1"]["error"] == "story exploded"
+        assert stories["OK-1"]["final_decision"] == "GO"
+        assert stories["OK-2"]["failed_stages"] == ["design"]
+        assert summary["totals"] == {
+            "stories": 3,
+            "go": 1,
+            "no_go": 2,
+            "errors": 1,
+            "average_success_rate": pytest.approx(1 / 3),
+        }
+
+    @pytest.mark.asyncio
+    async def test_summary_is_persisted(
+        self, isolated_agilevv_dir: PathConfig, recording_factory: Any
+    ) -> None:
+        """Test that the merged summary is written under batches/."""
+        runner = BatchSprintRunner(
+            path_config=isolated_agilevv_dir, orchestrator_factory=recording_factory
+        )
+
+        summary = await runner.run(["A"])
+
+        saved = json.loads(
+            (isolated_agilevv_dir.batches_dir / f"{summary['batch_id']}.json").read_text()
+        )
+        assert saved["stories"][story_id_for("A")]["title"] == "A"
+
+    def test_concurrency_read_from_config(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that batch.max_concurrency is read from config.yaml."""
+        isolated_agilevv_dir.config_path.write_text("batch:\n  max_concurrency: 5\n")
+        runner = BatchSprintRunner(path_config=isolated_agilevv_dir)
+        assert runner.max_concurrency == 5
+
+    def test_invalid_concurrency(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that a non-positive concurrency limit is rejected."""
+        with pytest.raises(ValueError):
+            BatchSprintRunner(path_config=isolated_agilevv_dir, max_concurrency=0)
+
+
+class TestStoryPathConfig:
+    """Test per-story workspaces."""
+
+    def test_story_workspace_location(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that story workspaces live under stories/."""
+        story_config = isolated_agilevv_dir.for_story("STORY-001")
+        assert story_config.base_dir == isolated_agilevv_dir.stories_dir / "STORY-001"
+
+    @pytest.mark.parametrize(
+        "story_id", ["", "..", "a/b", "/abs"], ids=["empty", "parent", "nested", "absolute"]
+    )
+    def test_invalid_story_ids(self, isolated_agilevv_dir: PathConfig, story_id: str) -> None:
+        """Test that story identifiers cannot escape the stories directory."""
+        with pytest.raises(ValueError):
+            isolated_agilevv_dir.for_story(story_id)
@@ -0,0 +1,407 @@
+"""Tests for checkpoints stored as compressed deltas and their retention."""
+
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+import yaml
+from typer.testing import CliRunner
+from verifflowcc.cli import app
+from verifflowcc.core.checkpoint_store import (
+    COMPRESSIONS,
+    CheckpointStore,
+    RetentionPolicy,
+)
+from verifflowcc.core.path_config import PathConfig
+from verifflowcc.core.state_store import load_project_state, save_project_state
+from verifflowcc.core.vmodel import VModelStage
+
+
+def sprint_states(count: int) -> list[dict[str, Any]]:
+    """Build the states of a project at successive checkpoints."""
+    states = []
+    for i in range(count):
+        states.append(
+            {
+                "current_stage": f"stage-{i % 8}",
+                "sprint_number": i // 8,
+                "completed_stages": [f"stage-{j}" for j in range(i)],
+                "quality_gates": {f"stage-{j}": {"passed": True} for j in range(i)},
+            }
+        )
+    return states
+
+
+def checkpoint_store(
+    path_config: PathConfig, snapshot_every: int = 3, compression: str = "gzip"
+) -> CheckpointStore:
+    """Create a store writing to the project's checkpoints directory."""
+    return CheckpointStore(path_config.checkpoints_dir, snapshot_every, compression=compression)
+
+
+def save_series(store: CheckpointStore, sprints: list[int]) -> None:
+    """Save one checkpoint per entry, taken in the given sprint."""
+    for i, sprint in enumerate(sprints):
+        state = {**sprint_states(i + 1)[i], "sprint_number": sprint}
+        store.save({"name": f"cp-{i}", "timestamp": f"2025-01-01T00:00:{i:02d}", "state": state})
+
+
+class TestCheckpointStore:
+    """Test writing deltas and rebuilding checkpoints from them."""
+
+    def test_deltas_between_snapshots(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that every snapshot_every-th checkpoint is a full snapshot."""
+        store = checkpoint_store(isolated_agilevv_dir)
+        for i, state in enumerate(sprint_states(7)):
+            store.save({"name": f"cp-{i}", "state": state})
+
+        records = [store.read_record(f"cp-{i}") for i in range(7)]
+
+        assert ["state" in record for record in records] == [
+            True,
+            False,
+            False,
+            True,
+            False,
+            False,
+            True,
+        ]
+        assert records[2]["base"] == "cp-1"
+        assert records[2]["depth"] == 2
+
+    def test_restore_rebuilds_every_state(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that each checkpoint loads the state it was taken with."""
+        states = sprint_states(7)
+        store = checkpoint_store(isolated_agilevv_dir)
+        for i, state in enumerate(states):
+            store.save({"name": f"cp-{i}", "state": state, "message": f"step {i}"})
+
+        # A new store has nothing in memory and reads the chains
+        reader = checkpoint_store(isolated_agilevv_dir)
+        for i, state in enumerate(states):
+            checkpoint = reader.load(f"cp-{i}")
+            assert checkpoint["state"] == state
+            assert checkpoint["message"] == f"step {i}"
+            assert "delta" not in checkpoint
+
+    def test_chain_continues_across_stores(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that a new store bases its first checkpoint on the latest one."""
+        states = sprint_states(2)
+        checkpoint_store(isolated_agilevv_dir).save({"name": "first", "state": states[0]})
+
+        checkpoint_store(isolated_agilevv_dir).save({"name": "second", "state": states[1]})
+
+        store = checkpoint_store(isolated_agilevv_dir)
+        assert store.read_record("second")["base"] == "first"
+        assert store.read_manifest()["latest"] == "second"
+        assert store.load("second")["state"] == states[1]
+
+    def test_replacing_a_base_keeps_dependants(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that checkpoints based on a replaced checkpoint keep their state."""
+        states = sprint_states(3)
+        store = checkpoint_store(isolated_agilevv_dir, snapshot_every=10)
+        store.save({"name": "a", "state": states[0]})
+        store.save({"name": "b", "state": states[1]})
+
+        store.save({"name": "a", "state": states[2]})
+
+        assert store.load("a")["state"] == states[2]
+        assert store.load("b")["state"] == states[1]
+
+    def test_checkpoint_without_delta_is_a_snapshot(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that files written before deltas existed are still restored."""
+        path = isolated_agilevv_dir.checkpoints_dir / "old.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text('{"name": "old", "state": {"sprint_number": 4}}')
+
+        assert checkpoint_store(isolated_agilevv_dir).load("old")["state"] == {"sprint_number": 4}
+
+    def test_missing_base(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that a checkpoint whose base was deleted is reported."""
+        store = checkpoint_store(isolated_agilevv_dir)
+        for i, state in enumerate(sprint_states(2)):
+            store.save({"name": f"cp-{i}", "state": state})
+        store.path_of("cp-0").unlink()
+
+        with pytest.raises(FileNotFoundError):
+            store.load("cp-1")
+
+    def test_snapshot_every_must_be_positive(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that a snapshot interval below one is rejected."""
+        with pytest.raises(ValueError, match="snapshot_every"):
+            checkpoint_store(isolated_agilevv_dir, snapshot_every=0)
+
+
+class TestManifest:
+    """Test the manifest indexing the checkpoints."""
+
+    def test_entries_describe_checkpoints(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that the manifest lists checkpoints in creation order with their metadata."""
+        store = checkpoint_store(isolated_agilevv_dir)
+        save_series(store, [1, 2])
+        store.update_metadata("cp-1", message="after design", git_tag="checkpoint/cp-1")
+
+        entries = checkpoint_store(isolated_agilevv_dir).entries()
+
+        assert [entry["name"] for entry in entries] == ["cp-0", "cp-1"]
+        assert entries[1]["message"] == "after design"
+        assert entries[1]["git_tag"] == "checkpoint/cp-1"
+        assert entries[1]["parent"] == "cp-0"
+        assert entries[1]["sprint_number"] == 2
+        assert entries[1]["size"] == store.path_of("cp-1").stat().st_size
+
+    def test_listing_does_not_open_checkpoints(
+        self, isolated_agilevv_dir: PathConfig, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that listing and naming read only the manifest."""
+        save_series(checkpoint_store(isolated_agilevv_dir), [1] * 5)
+
+        def fail(*args: Any) -> None:
+            raise AssertionError("checkpoint file opened")
+
+        monkeypatch.setattr(CheckpointStore, "read_record", fail)
+        store = checkpoint_store(isolated_agilevv_dir)
+
+        assert len(store.entries()) == 5
+        assert store.next_name() == "checkpoint_6"
+        assert store.exists("cp-4")
+
+    def test_next_name_skips_taken_names(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that allocated names do not collide after removals."""
+        store = checkpoint_store(isolated_agilevv_dir)
+        for name in ["checkpoint_1", "checkpoint_2", "checkpoint_3"]:
+            store.save({"name": name, "state": {}})
+        store.gc(RetentionPolicy(keep_last=2))
+
+        assert store.next_name() == "checkpoint_4"
+
+    def test_rebuilt_when_missing(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that checkpoints written before the manifest existed are indexed."""
+        store = checkpoint_store(isolated_agilevv_dir)
+        save_series(store, [1, 1, 1])
+        store.manifest_path.unlink()
+
+        manifest = checkpoint_store(isolated_agilevv_dir).rebuild_manifest()
+
+        assert list(manifest["checkpoints"]) == ["cp-0", "cp-1", "cp-2"]
+        assert manifest["latest"] == "cp-2"
+        assert manifest["checkpoints"]["cp-2"]["parent"] == "cp-1"
+
+    def test_gc_and_restore_update_manifest(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that removed checkpoints leave the manifest and restores are recorded."""
+        store = checkpoint_store(isolated_agilevv_dir)
+        save_series(store, [1, 1, 1])
+
+        store.gc(RetentionPolicy(keep_last=2))
+        store.mark_restored("cp-1")
+
+        manifest = checkpoint_store(isolated_agilevv_dir).read_manifest()
+        assert list(manifest["checkpoints"]) == ["cp-1", "cp-2"]
+        # cp-1 was a delta based on the removed cp-0
+        assert manifest["checkpoints"]["cp-1"]["parent"] is None
+        assert "restored_at" in manifest["checkpoints"]["cp-1"]
+
+
+class TestCompression:
+    """Test compressed checkpoint files."""
+
+    @pytest.mark.parametrize("compression", list(COMPRESSIONS))
+    def test_round_trip(self, isolated_agilevv_dir: PathConfig, compression: str) -> None:
+        """Test that checkpoints are written in the configured format and read back."""
+        states = sprint_states(2)
+        store = checkpoint_store(isolated_agilevv_dir, compression=compression)
+        for i, state in enumerate(states):
+            store.save({"name": f"cp-{i}", "state": state})
+
+        assert store.path_of("cp-1").name == f"cp-1{COMPRESSIONS[compression]}"
+        assert checkpoint_store(isolated_agilevv_dir).load("cp-1")["state"] == states[1]
+
+    def test_changing_compression(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that files of another format stay readable and are replaced when rewritten."""
+        states = sprint_states(3)
+        checkpoint_store(isolated_agilevv_dir, compression="none").save(
+            {"name": "a", "state": states[0]}
+        )
+
+        store = checkpoint_store(isolated_agilevv_dir, compression="lzma")
+        store.save({"name": "b", "state": states[1]})
+        store.update_metadata("a", message="first")
+
+        assert sorted(store.names()) == ["a", "b"]
+        assert store.path_of("a").name == "a.json.xz"
+        assert not (isolated_agilevv_dir.checkpoints_dir / "a.json").exists()
+        assert store.load("b")["state"] == states[1]
+
+    def test_unknown_compression(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that an unknown compression is reported."""
+        with pytest.raises(ValueError, match="zstd"):
+            checkpoint_store(isolated_agilevv_dir, compression="zstd")
+
+
+class TestRetention:
+    """Test removing checkpoints by retention policy."""
+
+    def test_keep_last(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that only the latest checkpoints are kept and still restore."""
+        store = checkpoint_store(isolated_agilevv_dir)
+        save_series(store, [1, 1, 1, 1, 1])
+        expected = store.load("cp-4")["state"]
+
+        removed = store.gc(RetentionPolicy(keep_last=2))
+
+        assert [record["name"] for record in removed] == ["cp-0", "cp-1", "cp-2"]
+        assert sorted(store.names()) == ["cp-3", "cp-4"]
+        # cp-4 was based on cp-3, itself a delta based on a removed checkpoint
+        assert checkpoint_store(isolated_agilevv_dir).load("cp-4")["state"] == expected
+
+    def test_keep_per_sprint(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that the latest checkpoint of each sprint is kept."""
+        store = checkpoint_store(isolated_agilevv_dir)
+        save_series(store, [1, 1, 2, 2, 3])
+
+        store.gc(RetentionPolicy(keep_last=1, keep_per_sprint=True))
+
+        assert sorted(store.names()) == ["cp-1", "cp-3", "cp-4"]
+
+    def test_max_bytes(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that the oldest checkpoints are removed until the rest fits."""
+        store = checkpoint_store(isolated_agilevv_dir, compression="none")
+        save_series(store, [1] * 6)
+        latest_size = store.path_of("cp-5").stat().st_size
+
+        store.gc(RetentionPolicy(max_bytes=1))
+
+        assert store.names() == ["cp-5"]
+        assert store.path_of("cp-5").stat().st_size >= latest_size
+
+    def test_dry_run(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that a dry run reports without removing anything."""
+        store = checkpoint_store(isolated_agilevv_dir)
+        save_series(store, [1, 1, 1])
+
+        removed = store.gc(RetentionPolicy(keep_last=1), dry_run=True)
+
+        assert [record["name"] for record in removed] == ["cp-0", "cp-1"]
+        assert len(store.names()) == 3
+
+    def test_git_tags_of_removed_checkpoints(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that the tags of removed checkpoints are deleted, and only those."""
+        store = checkpoint_store(isolated_agilevv_dir)
+        save_series(store, [1, 1, 1])
+        store.update_metadata("cp-0", git_tag="checkpoint/cp-0")
+        store.update_metadata("cp-2", git_tag="checkpoint/cp-2")
+        git = MagicMock()
+        git.delete_checkpoint_tag.return_value = (True, "checkpoint/cp-0")
+
+        store.gc(RetentionPolicy(keep_last=1), git=git)
+
+        git.delete_checkpoint_tag.assert_called_once_with("cp-0")
+
+    def test_invalid_policy(self) -> None:
+        """Test that a policy removing every checkpoint is rejected."""
+        with pytest.raises(ValueError, match="keep_last"):
+            RetentionPolicy.from_settings({"keep_last": 0})
+
+
+class TestCheckpointDeltas:
+    """Test the orchestrator and CLI writing delta checkpoints."""
+
+    @pytest.mark.asyncio
+    async def test_orchestrator_restores_delta_checkpoint(self, make_orchestrator: Any) -> None:
+        """Test that a checkpoint stored as a delta restores its state."""
+        orchestrator = make_orchestrator()
+        await orchestrator.checkpoint("start")
+        await orchestrator.execute_stage(VModelStage.REQUIREMENTS, {})
+        await orchestrator.checkpoint("after-requirements")
+        expected = orchestrator.checkpoints.load("after-requirements")["state"]
+        await orchestrator.execute_stage(VModelStage.DESIGN, {})
+
+        assert "delta" in orchestrator.checkpoints.read_record("after-requirements")
+        assert await orchestrator.restore_checkpoint("after-requirements")
+        assert orchestrator.state["completed_stages"] == expected["completed_stages"]
+
+    def test_cli_checkpoint_and_restore(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that vv checkpoint writes deltas and vv checkpoint restore rebuilds them."""
+        isolated_agilevv_dir.config_path.write_text(
+            yaml.dump({"checkpoints": {"snapshot_every": 5}})
+        )
+        base_dir = str(isolated_agilevv_dir.base_dir)
+        runner = CliRunner()
+        states = sprint_states(3)
+        with patch(
+            "verifflowcc.core.git_integration.GitIntegration.is_git_repo", return_value=False
+        ):
+            for i, state in enumerate(states):
+                save_project_state(isolated_agilevv_dir, state)
+                result = runner.invoke(app, ["checkpoint", "--name", f"cp-{i}", "--dir", base_dir])
+                assert result.exit_code == 0, result.output
+
+            with patch("verifflowcc.cli.Confirm.ask", return_value=True):
+                result = runner.invoke(app, ["checkpoint", "restore", "cp-1", "--dir", base_dir])
+
+        assert result.exit_code == 0, result.output
+        store = CheckpointStore.for_project(isolated_agilevv_dir)
+        assert "delta" in store.read_record("cp-2")
+        restored = load_project_state(isolated_agilevv_dir)
+        assert restored["completed_stages"] == states[1]["completed_stages"]
+
+    @pytest.mark.asyncio
+    async def test_auto_gc_after_checkpoint(self, make_orchestrator: Any) -> None:
+        """Test that auto_gc applies the retention after every new checkpoint."""
+        orchestrator = make_orchestrator(
+            checkpoints={"retention": {"keep_last": 2, "auto_gc": True}}
+        )
+        for i in range(4):
+            await orchestrator.checkpoint(f"cp-{i}")
+
+        assert sorted(orchestrator.checkpoints.names()) == ["cp-2", "cp-3"]
+        assert await orchestrator.restore_checkpoint("cp-3")
+
+    def test_cli_gc(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that vv checkpoint gc applies the configured policy and its overrides."""
+        isolated_agilevv_dir.config_path.write_text(
+            yaml.dump({"checkpoints": {"retention": {"keep_last": 3}}})
+        )
+        save_series(CheckpointStore.for_project(isolated_agilevv_dir), [1, 1, 1, 1])
+        base_dir = str(isolated_agilevv_dir.base_dir)
+        runner = CliRunner()
+
+        with patch(
+            "verifflowcc.core.git_integration.GitIntegration.is_git_repo", return_value=False
+        ):
+            dry_run = runner.invoke(
+                app, ["checkpoint", "gc", "--keep-last", "1", "--dry-run", "--dir", base_dir]
+            )
+            result = runner.invoke(app, ["checkpoint", "gc", "--dir", base_dir])
+
+        assert dry_run.exit_code == 0, dry_run.output
+        assert "Would remove 3 checkpoint(s)" in dry_run.output
+        assert result.exit_code == 0, result.output
+        assert sorted(CheckpointStore.for_project(isolated_agilevv_dir).names()) == [
+            "cp-1",
+            "cp-2",
+            "cp-3",
+        ]
+
+    def test_cli_list_reads_manifest(
+        self, isolated_agilevv_dir: PathConfig, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that vv checkpoint list shows checkpoints without opening their files."""
+        save_series(CheckpointStore.for_project(isolated_agilevv_dir), [1, 1])
+
+        def fail(*args: Any) -> None:
+            raise AssertionError("checkpoint file opened")
+
+        monkeypatch.setattr(CheckpointStore, "read_record", fail)
+        with patch(
+            "verifflowcc.core.git_integration.GitIntegration.is_git_repo", return_value=False
+        ):
+            result = CliRunner().invoke(
+                app,
+                ["checkpoint", "list", "--dir", str(isolated_agilevv_dir.base_dir)],
+                terminal_width=200,
+            )
+
+        assert result.exit_code == 0, result.output
+        assert "cp-0" in result.output
+        assert "cp-1" in result.output
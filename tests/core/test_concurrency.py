@@ -0,0 +1,312 @@
+"""Tests for the adaptive (AIMD) concurrency controller."""
+
+import asyncio
+import json
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+from tests.conftest import build_orchestrator_config
+from typer.testing import CliRunner
+from verifflowcc.agents.base import BaseAgent
+from verifflowcc.cli import app
+from verifflowcc.core.concurrency import (
+    ERROR,
+    SUCCESS,
+    THROTTLED,
+    TIMEOUT,
+    AdaptiveConcurrencyController,
+    Permit,
+    configure_concurrency_controller,
+    outcome_from_result,
+    set_concurrency_controller,
+)
+from verifflowcc.core.orchestrator import Orchestrator
+from verifflowcc.core.path_config import PathConfig
+from verifflowcc.core.retry import RetryPolicy
+from verifflowcc.core.scheduler import StageGraph, StageScheduler
+from verifflowcc.core.sdk_config import SDKConfig
+from verifflowcc.core.vmodel import VModelStage
+
+CONFIG = build_orchestrator_config(concurrency={"initial_limit": 2, "max_limit": 4})
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def fresh_global_controller() -> Iterator[None]:
+    """Isolate the process-wide controller between tests."""
+    set_concurrency_controller(None)
+    yield
+    set_concurrency_controller(None)
+
+
+class TestOutcomeFromResult:
+    """Test reading congestion signals from stage results."""
+
+    @pytest.mark.parametrize(
+        ("result", "outcome"),
+        [
+            ({"status": "success", "sdk_outcome": SUCCESS}, SUCCESS),
+            ({"status": "timeout", "sdk_outcome": TIMEOUT}, TIMEOUT),
+            ({"status": "error", "sdk_outcome": ERROR}, ERROR),
+            ({"status": "success", "sdk_outcome": THROTTLED}, THROTTLED),
+            ({"status": "error", "sdk_outcome": SUCCESS}, SUCCESS),
+            ({"status": "error", "error": "Agent creation failed"}, None),
+            ({"status": "success", "metrics": {}}, None),
+            ({"status": "success", "sdk_outcome": SUCCESS, "cached": True}, None),
+            ({"status": "skipped"}, None),
+        ],
+        ids=[
+            "success",
+            "timeout",
+            "error",
+            "throttled",
+            "gate-failure",
+            "agent-creation",
+            "no-sdk-call",
+            "cached",
+            "skipped",
+        ],
+    )
+    def test_outcomes(self, result: dict[str, Any], outcome: str | None) -> None:
+        """Test that only the outcome reported by the agent is a signal."""
+        assert outcome_from_result(result) == outcome
+
+
+class FlakyAgent(BaseAgent):
+    """Agent whose SDK queries fail a given number of times."""
+
+    def __init__(self, failures: int, error: Exception) -> None:
+        super().__init__(
+            name="flaky", agent_type="developer", sdk_config=SDKConfig(api_key="test-key")
+        )
+        self.retry_policy = RetryPolicy(max_retries=1, base_delay=0)
+        self.failures = failures
+        self.error = error
+
+    async def _query_claude_sdk(self, prompt: str) -> str:
+        if self.failures:
+            self.failures -= 1
+            raise self.error
+        return "done"
+
+    async def process(self, input_data: dict[str, Any]) -> dict[str, Any]:
+        try:
+            await self._call_claude_sdk("prompt")
+        except Exception as e:
+            return {"status": "error", "error": str(e)}
+        return {"status": "success", "metrics": {}}
+
+
+class TestAgentOutcome:
+    """Test the SDK outcome agents report."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("failures", "outcome"),
+        [(0, SUCCESS), (1, THROTTLED), (2, ERROR)],
+        ids=["success", "retried", "failed"],
+    )
+    async def test_outcome_of_sdk_calls(self, failures: int, outcome: str) -> None:
+        """Test that retries and failed SDK calls are reported as such."""
+        agent = FlakyAgent(failures, ConnectionError("connection reset"))
+
+        result = await agent.process_with_timeout({}, timeout=5)
+
+        assert result["sdk_outcome"] == outcome
+
+    @pytest.mark.asyncio
+    async def test_gate_failure_keeps_sdk_outcome(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that a hard gate failure of a healthy call does not count as congestion."""
+
+        class HardGatedOrchestrator(Orchestrator):
+            async def _execute_stage_logic(
+                self, stage: VModelStage, context: dict[str, Any]
+            ) -> dict[str, Any]:
+                return {"status": "success", "metrics": {}, "sdk_outcome": SUCCESS}
+
+            async def _apply_advanced_gating(
+                self, stage: VModelStage, result: dict[str, Any]
+            ) -> dict[str, Any]:
+                return {"passed": False, "issues": ["low quality"]}
+
+        config = build_orchestrator_config({"design": "hard"})
+        orchestrator = HardGatedOrchestrator(path_config=isolated_agilevv_dir, config=config)
+
+        result = await orchestrator.execute_stage(VModelStage.DESIGN, {})
+
+        assert result["status"] == "error"
+        assert outcome_from_result(result) == SUCCESS
+
+
+class TestAIMD:
+    """Test limit adjustments."""
+
+    def test_additive_increase(self) -> None:
+        """Test that the limit grows by one per window of healthy calls."""
+        controller = AdaptiveConcurrencyController(initial_limit=2)
+
+        for _ in range(3):
+            controller.record(SUCCESS, 1.0)
+
+        assert controller.limit == 3
+        assert controller.adjustments[-1]["from"] == 2
+        assert controller.adjustments[-1]["reason"] == "healthy"
+
+    def test_multiplicative_decrease_within_bounds(self) -> None:
+        """Test that congestion halves the limit without going below min_limit."""
+        controller = AdaptiveConcurrencyController(initial_limit=4, min_limit=1)
+
+        controller.record(TIMEOUT, 1.0)
+        assert controller.limit == 2
+        assert controller.adjustments[-1]["reason"] == "timeout"
+
+        controller.record(THROTTLED, 1.0)
+        controller.record(ERROR, 1.0)
+        assert controller.limit == 1
+
+    def test_increase_capped_at_max_limit(self) -> None:
+        """Test that the limit never exceeds max_limit."""
+        controller = AdaptiveConcurrencyController(initial_limit=2, max_limit=2)
+        for _ in range(10):
+            controller.record(SUCCESS, 1.0)
+        assert controller.limit == 2
+        assert not controller.adjustments
+
+    def test_burst_of_failures_decreases_once(self) -> None:
+        """Test that calls started before a decrease do not decrease again."""
+        clock = FakeClock()
+        controller = AdaptiveConcurrencyController(initial_limit=8, max_limit=8, clock=clock)
+        permits = [Permit("qa", started_at=0.0) for _ in range(3)]
+
+        clock.now = 5.0
+        for permit in permits:
+            controller.record(ERROR, 5.0, permit)
+
+        assert controller.limit == 4
+        assert controller.congested_calls == 3
+
+    def test_slow_call_relative_to_average(self) -> None:
+        """Test that a call much slower than its key's average is congestion."""
+        controller = AdaptiveConcurrencyController(initial_limit=4)
+
+        controller.record(SUCCESS, 10.0, Permit("developer", 0.0))
+        controller.record(SUCCESS, 3.0, Permit("requirements", 0.0))
+        assert controller.limit == 4  # different keys are not compared
+
+        controller.record(SUCCESS, 30.0, Permit("developer", 0.0))
+        assert controller.limit == 2
+        assert controller.adjustments[-1]["reason"] == "slow (30.0s)"
+
+    def test_latency_target(self) -> None:
+        """Test that an absolute latency target replaces the relative check."""
+        controller = AdaptiveConcurrencyController(initial_limit=4, latency_target=2.0)
+        controller.record(SUCCESS, 2.5)
+        assert controller.limit == 2
+
+    def test_invalid_bounds(self) -> None:
+        """Test that inconsistent limits are rejected."""
+        with pytest.raises(ValueError):
+            AdaptiveConcurrencyController(initial_limit=9, max_limit=8)
+
+
+class TestSlots:
+    """Test admission of calls."""
+
+    @pytest.mark.asyncio
+    async def test_in_flight_bounded_by_limit(self) -> None:
+        """Test that no more calls than the limit hold a slot at once."""
+        controller = AdaptiveConcurrencyController(initial_limit=2, max_limit=2)
+        in_flight = peak = 0
+
+        async def call() -> None:
+            nonlocal in_flight, peak
+            async with controller.slot():
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.01)
+                in_flight -= 1
+
+        await asyncio.gather(*(call() for _ in range(5)))
+
+        assert peak == 2
+        assert controller.in_flight == 0
+        assert controller.total_calls == 5
+
+    @pytest.mark.asyncio
+    async def test_exception_counts_as_error(self) -> None:
+        """Test that a call raising an exception decreases the limit."""
+        controller = AdaptiveConcurrencyController(initial_limit=4)
+
+        with pytest.raises(RuntimeError):
+            async with controller.slot():
+                raise RuntimeError("boom")
+
+        assert controller.limit == 2
+
+    @pytest.mark.asyncio
+    async def test_scheduler_consults_controller(self) -> None:
+        """Test that the scheduler only dispatches stages the controller admits."""
+        controller = AdaptiveConcurrencyController(initial_limit=1, max_limit=1)
+        in_flight = peak = 0
+
+        async def execute(stage: VModelStage) -> dict[str, Any]:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+            return {"status": "success", "sdk_outcome": SUCCESS}
+
+        await StageScheduler(StageGraph.default(), execute, concurrency=controller).run()
+
+        assert peak == 1
+        assert controller.total_calls == len(list(VModelStage))
+
+
+class TestOrchestratorConcurrency:
+    """Test the controller as used by the orchestrator."""
+
+    def test_controller_shared_between_orchestrators(
+        self, isolated_agilevv_dir: PathConfig
+    ) -> None:
+        """Test that orchestrators with the same settings keep the learned limit."""
+        first = Orchestrator(path_config=isolated_agilevv_dir, config=CONFIG)
+        assert first.concurrency is not None
+        first.concurrency.record(TIMEOUT, 1.0)
+
+        second = Orchestrator(path_config=isolated_agilevv_dir, config=CONFIG)
+
+        assert second.concurrency is first.concurrency
+        assert second.get_status()["concurrency"]["limit"] == 1
+
+    def test_adaptive_can_be_disabled(self) -> None:
+        """Test that concurrency.adaptive: false turns the controller off."""
+        assert configure_concurrency_controller({"adaptive": False}) is None
+
+    def test_limit_and_adjustments_in_status(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that the limit and its adjustments reach state.json and vv status."""
+        orchestrator = Orchestrator(path_config=isolated_agilevv_dir, config=CONFIG)
+        assert orchestrator.concurrency is not None
+        orchestrator.concurrency.record(TIMEOUT, 1.0)
+        orchestrator._save_state()
+
+        state = json.loads(isolated_agilevv_dir.state_path.read_text())
+        assert state["concurrency"]["limit"] == 1
+        assert state["concurrency"]["adjustments"][0]["reason"] == "timeout"
+
+        result = CliRunner().invoke(
+            app, ["status", "--dir", str(isolated_agilevv_dir.base_dir)], terminal_width=200
+        )
+        assert result.exit_code == 0
+        assert "Concurrency Limit" in result.output
+        assert "2 -> 1 (timeout)" in result.output
@@ -0,0 +1,269 @@
+"""Tests for the stage event bus."""
+
+import asyncio
+import threading
+from typing import Any
+
+import pytest
+from tests.conftest import build_orchestrator_config
+from verifflowcc.agents.base import BaseAgent
+from verifflowcc.core.events import (
+    STAGE_COMPLETED,
+    STAGE_FAILED,
+    STAGE_GATED,
+    STAGE_STARTED,
+    STAGE_STREAMED,
+    EventBus,
+    StageEvent,
+)
+from verifflowcc.core.orchestrator import Orchestrator
+from verifflowcc.core.path_config import PathConfig
+from verifflowcc.core.vmodel import VModelStage
+
+
+class StreamingArchitect(BaseAgent):
+    """Architect streaming a canned response without contacting Claude."""
+
+    async def process(self, input_data: dict[str, Any]) -> dict[str, Any]:
+        for chunk in ("Design ", "done"):
+            if self.stream_listener is not None:
+                await self.stream_listener(chunk)
+        return {"status": "success", "artifacts": {}}
+
+
+def event(event_type: str = STAGE_COMPLETED, stage: VModelStage = VModelStage.DESIGN) -> StageEvent:
+    """Build an event for a stage."""
+    return StageEvent(event_type, stage)
+
+
+class TestEventBus:
+    """Test delivery of events to subscribers."""
+
+    @pytest.mark.asyncio
+    async def test_slow_subscriber_does_not_delay_publish(self) -> None:
+        """Test that non-blocking subscribers run after publish() returns."""
+        bus = EventBus()
+        release = asyncio.Event()
+        received: list[str] = []
+
+        async def slow(event: StageEvent) -> None:
+            await release.wait()
+            received.append(event.type)
+
+        bus.subscribe(slow)
+        await bus.publish(event(STAGE_STARTED))
+        await bus.publish(event(STAGE_COMPLETED))
+        assert received == []
+
+        release.set()
+        await bus.drain()
+        assert received == [STAGE_STARTED, STAGE_COMPLETED]
+
+    @pytest.mark.asyncio
+    async def test_blocking_subscribers_run_concurrently(self) -> None:
+        """Test that publish() awaits blocking subscribers side by side."""
+        bus = EventBus(timeout=1.0)
+        first_started = asyncio.Event()
+        second_started = asyncio.Event()
+
+        async def first(event: StageEvent) -> None:
+            first_started.set()
+            await second_started.wait()
+
+        async def second(event: StageEvent) -> None:
+            second_started.set()
+            await first_started.wait()
+
+        first_subscription = bus.subscribe(first, blocking=True)
+        second_subscription = bus.subscribe(second, blocking=True)
+        await bus.publish(event())
+
+        assert first_subscription.delivered == 1
+        assert second_subscription.delivered == 1
+
+    @pytest.mark.asyncio
+    async def test_failures_are_isolated(self) -> None:
+        """Test that failing and hanging subscribers do not affect the others."""
+        bus = EventBus(timeout=0.01)
+        received: list[StageEvent] = []
+
+        def failing(event: StageEvent) -> None:
+            raise RuntimeError("notifier down")
+
+        async def hanging(event: StageEvent) -> None:
+            await asyncio.sleep(3600)
+
+        failing_subscription = bus.subscribe(failing, blocking=True)
+        hanging_subscription = bus.subscribe(hanging, blocking=True)
+        bus.subscribe(received.append)
+
+        await bus.publish(event())
+        await bus.drain()
+
+        assert len(received) == 1
+        assert failing_subscription.errors == 1
+        assert hanging_subscription.timeouts == 1
+
+    @pytest.mark.asyncio
+    async def test_sync_subscriber_runs_off_the_event_loop(self) -> None:
+        """Test that a blocking sync callback neither stalls the loop nor outlives its timeout."""
+        bus = EventBus(timeout=0.05)
+        release = threading.Event()
+        threads: list[threading.Thread] = []
+
+        def stuck(event: StageEvent) -> None:
+            threads.append(threading.current_thread())
+            release.wait(5)
+
+        subscription = bus.subscribe(stuck, blocking=True)
+        ticks = 0
+
+        async def tick() -> None:
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        ticker = asyncio.ensure_future(tick())
+        await bus.publish(event())
+        ticker.cancel()
+        release.set()
+
+        assert subscription.timeouts == 1
+        assert threads != [threading.main_thread()]
+        assert ticks > 1
+
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_oldest_event(self) -> None:
+        """Test that a subscriber that cannot keep up only misses old events."""
+        bus = EventBus(queue_size=2)
+        release = asyncio.Event()
+        received: list[VModelStage] = []
+
+        async def slow(event: StageEvent) -> None:
+            await release.wait()
+            received.append(event.stage)
+
+        subscription = bus.subscribe(slow)
+        await bus.publish(event(stage=VModelStage.REQUIREMENTS))
+        await asyncio.sleep(0)  # the worker takes the first event
+        for stage in (VModelStage.DESIGN, VModelStage.CODING, VModelStage.UNIT_TESTING):
+            await bus.publish(event(stage=stage))
+
+        release.set()
+        await bus.drain()
+
+        assert received == [VModelStage.REQUIREMENTS, VModelStage.CODING, VModelStage.UNIT_TESTING]
+        assert subscription.dropped == 1
+
+    @pytest.mark.asyncio
+    async def test_filters_by_event_and_stage(self) -> None:
+        """Test that subscribers only receive the events they asked for."""
+        bus = EventBus()
+        received: list[StageEvent] = []
+        bus.subscribe(
+            received.append, events=[STAGE_FAILED], stages=[VModelStage.CODING], blocking=True
+        )
+
+        await bus.publish(event(STAGE_FAILED, VModelStage.DESIGN))
+        await bus.publish(event(STAGE_COMPLETED, VModelStage.CODING))
+        await bus.publish(event(STAGE_FAILED, VModelStage.CODING))
+
+        assert [(e.type, e.stage) for e in received] == [(STAGE_FAILED, VModelStage.CODING)]
+        assert bus.has_subscribers(STAGE_FAILED, VModelStage.CODING)
+        assert not bus.has_subscribers(STAGE_STREAMED, VModelStage.CODING)
+
+    def test_unknown_event_type(self) -> None:
+        """Test that subscribing to an unknown event type is rejected."""
+        with pytest.raises(ValueError, match="stage_finished"):
+            EventBus().subscribe(print, events=["stage_finished"])
+
+
+class TestOrchestratorEvents:
+    """Test the events published while executing stages."""
+
+    @pytest.mark.asyncio
+    async def test_stage_lifecycle_events(self, make_orchestrator: Any) -> None:
+        """Test that a stage publishes started, gated and completed in order."""
+        orchestrator = make_orchestrator()
+        received: list[StageEvent] = []
+        orchestrator.events.subscribe(received.append, blocking=True)
+
+        await orchestrator.execute_stage(VModelStage.DESIGN, {})
+
+        assert [e.type for e in received] == [STAGE_STARTED, STAGE_GATED, STAGE_COMPLETED]
+        assert "passed" in received[1].data["gate"]
+        assert received[2].data["result"]["status"] == "success"
+
+    @pytest.mark.asyncio
+    async def test_hard_gate_failure_publishes_failed(self, make_orchestrator: Any) -> None:
+        """Test that a stage failing hard gating publishes stage_failed."""
+        orchestrator = make_orchestrator({"design": "hard"})
+        orchestrator.stage_result = {"status": "error", "artifacts": {}}
+        received: list[StageEvent] = []
+        orchestrator.events.subscribe(received.append, events=[STAGE_FAILED], blocking=True)
+
+        result = await orchestrator.execute_stage(VModelStage.DESIGN, {})
+
+        assert result["status"] == "error"
+        assert len(received) == 1
+        assert received[0].data["result"]["status"] == "error"
+
+    @pytest.mark.asyncio
+    async def test_registered_callback_runs_off_the_critical_path(
+        self, make_orchestrator: Any
+    ) -> None:
+        """Test that a slow callback does not hold up the stage."""
+        orchestrator = make_orchestrator()
+        release = asyncio.Event()
+        results: list[dict[str, Any]] = []
+
+        async def notify(result: dict[str, Any]) -> None:
+            await release.wait()
+            results.append(result)
+
+        orchestrator.register_callback(VModelStage.DESIGN, notify)
+
+        result = await orchestrator.execute_stage(VModelStage.DESIGN, {})
+        assert result["status"] == "success"
+        assert results == []
+
+        release.set()
+        await orchestrator.flush()
+        assert results == [result]
+
+    @pytest.mark.asyncio
+    async def test_blocking_callback_completes_with_the_stage(self, make_orchestrator: Any) -> None:
+        """Test that a blocking callback has run when the stage returns."""
+        orchestrator = make_orchestrator()
+        results: list[dict[str, Any]] = []
+
+        async def write_report(result: dict[str, Any]) -> None:
+            await asyncio.sleep(0.01)
+            results.append(result)
+
+        orchestrator.register_callback(VModelStage.DESIGN, write_report, blocking=True)
+        orchestrator.register_callback(VModelStage.CODING, write_report, blocking=True)
+
+        await orchestrator.execute_stage(VModelStage.DESIGN, {})
+
+        assert len(results) == 1
+
+    @pytest.mark.asyncio
+    async def test_streamed_output_is_published(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that output streamed by the stage agent reaches subscribers."""
+        orchestrator = Orchestrator(
+            path_config=isolated_agilevv_dir, config=build_orchestrator_config()
+        )
+        orchestrator.agents["architect"] = StreamingArchitect(
+            "architect", "architect", path_config=isolated_agilevv_dir
+        )
+        chunks: list[str] = []
+        orchestrator.events.subscribe(
+            lambda event: chunks.append(event.data["content"]), events=[STAGE_STREAMED]
+        )
+
+        await orchestrator.execute_stage(VModelStage.DESIGN, {"story": {"id": "S-1"}})
+        await orchestrator.flush()
+
+        assert chunks == ["Design ", "done"]
@@ -0,0 +1,76 @@
+"""Tests for the codec of persisted JSON."""
+
+import json
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import pytest
+from verifflowcc.core import json_codec
+from verifflowcc.core.json_codec import OrjsonCodec, StdlibCodec
+
+CODECS = [StdlibCodec]
+if json_codec.orjson is not None:
+    CODECS.append(OrjsonCodec)
+
+
+@dataclass
+class Point:
+    """A value JSON cannot represent."""
+
+    x: int
+
+
+@pytest.fixture(params=CODECS, ids=lambda codec: codec.name)
+def codec(request: pytest.FixtureRequest) -> Iterator[Any]:
+    """Provide each available codec as the current one."""
+    previous = json_codec.set_codec(request.param())
+    yield json_codec.get_codec()
+    json_codec.set_codec(previous)
+
+
+class TestJsonCodec:
+    """Test that every codec encodes like the standard library."""
+
+    def test_compact_and_pretty(self, codec: Any) -> None:
+        """Test that machine files are compact and human files indented."""
+        value = {"stage": "design", "issues": ["none"]}
+
+        assert json_codec.dumps(value) == '{"stage":"design","issues":["none"]}'
+        assert json_codec.dumps(value, pretty=True) == json.dumps(value, indent=2)
+
+    def test_round_trip(self, codec: Any) -> None:
+        """Test that decoding an encoded value gives it back."""
+        value = {"b": [1, 2.5, None, True], "a": {"nested": "ünïcode"}}
+
+        assert json_codec.loads(json_codec.dumps(value)) == value
+        assert json_codec.loads(json_codec.dumps(value).encode()) == value
+        assert json_codec.dumps(value, sort_keys=True).startswith('{"a"')
+
+    def test_unsupported_values_become_strings(self, codec: Any) -> None:
+        """Test that values JSON cannot represent are encoded with str()."""
+        moment = datetime(2025, 1, 2, 3, 4, 5)
+        value = {1: moment, "path": Path("design/S-1.json"), "point": Point(1), "big": 2**70}
+
+        assert json_codec.loads(json_codec.dumps(value)) == {
+            "1": str(moment),
+            "path": "design/S-1.json",
+            "point": "Point(x=1)",
+            "big": 2**70,
+        }
+
+    def test_invalid_documents(self, codec: Any) -> None:
+        """Test that invalid JSON raises the standard library's error."""
+        with pytest.raises(json.JSONDecodeError):
+            json_codec.loads('{"truncated": ')
+
+    def test_stdlib_forced_by_environment(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that AGILEVV_JSON_CODEC=stdlib disables the fast codec."""
+        monkeypatch.setenv("AGILEVV_JSON_CODEC", "stdlib")
+        previous = json_codec.set_codec(None)
+        try:
+            assert json_codec.get_codec().name == "stdlib"
+        finally:
+            json_codec.set_codec(previous)
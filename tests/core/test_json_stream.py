@@ -0,0 +1,159 @@
+"""Tests for partial loading of large JSON files."""
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+from verifflowcc.agents.base import BaseAgent
+from verifflowcc.core import json_stream
+from verifflowcc.core.path_config import PathConfig
+from verifflowcc.core.sdk_config import SDKConfig
+
+RESULTS = {
+    "story_id": "S-1",
+    "test_cases": [
+        {"id": "TC-1", "name": 'quotes " and brackets ]}', "steps": [{"n": 1}, {"n": 2}]},
+        {"id": "TC-2", "name": "escaped \\", "steps": []},
+        {"id": "TC-3", "unicode": "é中", "expected": None},
+    ],
+    "execution_summary": {"passed": 2, "failed": 1, "pass_rate": "66.7%"},
+    "score": -1.5e3,
+    "final": True,
+}
+
+
+class ReadingTester(BaseAgent):
+    """QA stand-in saving and reading artifacts directly."""
+
+    def __init__(self, path_config: PathConfig):
+        super().__init__(
+            name="reading_tester",
+            agent_type="qa_tester",
+            path_config=path_config,
+            sdk_config=SDKConfig(api_key="test-key"),
+        )
+
+    async def process(self, input_data: dict[str, Any]) -> dict[str, Any]:
+        """Not used by these tests."""
+        return {}
+
+
+@pytest.fixture(params=["small", "mapped"])
+def results_path(
+    request: pytest.FixtureRequest, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> Path:
+    """Write the results, read whole or memory-mapped."""
+    if request.param == "mapped":
+        monkeypatch.setattr(json_stream, "MMAP_THRESHOLD", 1)
+    path = tmp_path / "S-1_results.json"
+    path.write_text(json.dumps(RESULTS, indent=2))
+    return path
+
+
+class TestLoadKeys:
+    """Test decoding selected top-level keys."""
+
+    def test_selected_keys(self, results_path: Path) -> None:
+        """Test that only the keys asked for are returned, with their values."""
+        assert json_stream.load_keys(
+            results_path, ["execution_summary", "score", "final", "missing"]
+        ) == {
+            "execution_summary": RESULTS["execution_summary"],
+            "score": RESULTS["score"],
+            "final": True,
+        }
+
+    def test_compact_document(self, tmp_path: Path) -> None:
+        """Test a document written without whitespace."""
+        path = tmp_path / "compact.json"
+        path.write_text(json.dumps(RESULTS, separators=(",", ":")))
+
+        assert json_stream.load_keys(path, ["test_cases"]) == {"test_cases": RESULTS["test_cases"]}
+
+    def test_values_beyond_a_match(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test values nested deeper and running longer than a single match reaches."""
+        monkeypatch.setattr(json_stream, "SKIP_WINDOW", 16)
+        deep: Any = ["x]"]
+        for _ in range(json_stream.NESTING_MATCHED + 2):
+            deep = [{"a": deep, "b": "a string longer than the window, with } and ]"}]
+        path = tmp_path / "deep.json"
+        path.write_text(json.dumps({"deep": deep, "after": [deep, 1]}))
+
+        assert json_stream.load_keys(path, ["after"]) == {"after": [deep, 1]}
+        assert list(json_stream.iter_array(path, "after")) == [deep, 1]
+
+    @pytest.mark.parametrize("content", ["[1, 2]", '{"a": [1, 2', '{"a": [[[[[[1]]', '{"a" 1}', ""])
+    def test_invalid_documents(self, tmp_path: Path, content: str) -> None:
+        """Test that files not holding a JSON object are reported."""
+        path = tmp_path / "invalid.json"
+        path.write_text(content)
+
+        with pytest.raises(ValueError):
+            json_stream.load_keys(path, ["a"])
+
+
+class TestIterArray:
+    """Test decoding array elements one at a time."""
+
+    def test_array_under_key(self, results_path: Path) -> None:
+        """Test iterating over the array of a top-level key."""
+        assert list(json_stream.iter_array(results_path, "test_cases")) == RESULTS["test_cases"]
+        assert list(json_stream.iter_array(results_path, "missing")) == []
+
+    def test_top_level_array(self, tmp_path: Path) -> None:
+        """Test iterating over a document that is an array."""
+        path = tmp_path / "array.json"
+        path.write_text(' [ "a" , 1 , {"b": [2]} , null ] ')
+
+        assert list(json_stream.iter_array(path)) == ["a", 1, {"b": [2]}, None]
+        path.write_text("[]")
+        assert list(json_stream.iter_array(path)) == []
+
+    def test_not_an_array(self, results_path: Path) -> None:
+        """Test that a key holding another value is reported."""
+        with pytest.raises(ValueError):
+            list(json_stream.iter_array(results_path, "execution_summary"))
+
+    def test_elements_decoded_lazily(
+        self, results_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that stopping early leaves the remaining elements undecoded."""
+        decoded: list[Any] = []
+        loads = json_stream.json_codec.loads
+        monkeypatch.setattr(
+            json_stream.json_codec, "loads", lambda data: decoded.append(data) or loads(data)
+        )
+        elements = json_stream.iter_array(results_path, "test_cases")
+
+        assert next(elements)["id"] == "TC-1"
+        elements.close()
+
+        # The keys scanned before the array, and its first element
+        assert len(decoded) == 3
+
+
+class TestAgentPartialLoads:
+    """Test partial loads of agent artifacts."""
+
+    def test_load_keys_of_artifact(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test loading selected keys, embedded references resolved."""
+        agent = ReadingTester(isolated_agilevv_dir)
+        design = {"components": ["api"]}
+        agent.save_artifact("implementation/S-1.json", {**RESULTS, "design_reference": design})
+
+        assert agent.load_artifact(
+            "implementation/S-1.json", keys=["execution_summary", "design_reference"]
+        ) == {"execution_summary": RESULTS["execution_summary"], "design_reference": design}
+        assert agent.load_artifact("implementation/missing.json", keys=["a"]) is None
+
+    def test_iter_staged_artifact(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test iterating over an artifact saved in the open transaction."""
+        agent = ReadingTester(isolated_agilevv_dir)
+        agent.artifact_store.begin()
+        agent.save_artifact("testing/S-1_results.json", RESULTS)
+
+        cases = agent.iter_artifact("testing/S-1_results.json", "test_cases")
+
+        assert [case["id"] for case in cases] == ["TC-1", "TC-2", "TC-3"]
+        assert list(agent.iter_artifact("testing/missing.json")) == []
@@ -0,0 +1,276 @@
+"""Tests for pipelined stage execution."""
+
+import asyncio
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+import pytest
+from tests.conftest import ScriptedOrchestrator, build_orchestrator_config
+from verifflowcc.agents import base
+from verifflowcc.agents.base import BaseAgent, warm_prompt_templates
+from verifflowcc.core.orchestrator import Orchestrator
+from verifflowcc.core.path_config import PathConfig
+from verifflowcc.core.pipeline import BackgroundWriter
+from verifflowcc.core.vmodel import VModelStage
+
+STORY = {"id": "STORY-001", "title": "Login", "description": "Login"}
+
+
+class PipelinedOrchestrator(ScriptedOrchestrator):
+    """Scripted orchestrator recording which stages were prepared during coding."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.prepared_during_coding: set[VModelStage] = set()
+        self.preparation_threads: set[int] = set()
+
+    def _prepare_downstream_stages(self, stage: VModelStage) -> None:
+        self.preparation_threads.add(threading.get_ident())
+        super()._prepare_downstream_stages(stage)
+
+    async def _execute_stage_logic(
+        self, stage: VModelStage, context: dict[str, Any]
+    ) -> dict[str, Any]:
+        if stage == VModelStage.CODING:
+            # Stand-in for the SDK call: the testing agents appear while it is in flight
+            for _ in range(200):
+                self.prepared_during_coding = set(self.stage_agents)
+                if len(self.prepared_during_coding) == 3:
+                    break
+                await asyncio.sleep(0.01)
+        await asyncio.sleep(0)
+        return await super()._execute_stage_logic(stage, context)
+
+
+class TestBackgroundWriter:
+    """Test ordered background writes."""
+
+    @pytest.mark.asyncio
+    async def test_jobs_run_in_order_off_the_event_loop(self) -> None:
+        """Test that jobs are written in submission order by a worker thread."""
+        writer = BackgroundWriter()
+        written: list[tuple[str, bool]] = []
+        main = threading.current_thread()
+
+        for key in ("a", "b", "c"):
+            writer.submit(
+                key, lambda k=key: written.append((k, threading.current_thread() is main))
+            )
+        await writer.flush()
+
+        assert written == [("a", False), ("b", False), ("c", False)]
+
+    @pytest.mark.asyncio
+    async def test_pending_job_for_same_key_is_replaced(self) -> None:
+        """Test that only the latest content of a busy file is written."""
+        writer = BackgroundWriter()
+        release = threading.Event()
+        written: list[str] = []
+
+        writer.submit("slow", release.wait)
+        writer.submit("state", lambda: written.append("v1"))
+        writer.submit("state", lambda: written.append("v2"))
+        release.set()
+        await writer.flush()
+
+        assert written == ["v2"]
+        assert writer.jobs_coalesced == 1
+
+    @pytest.mark.asyncio
+    async def test_errors_surface_on_flush(self) -> None:
+        """Test that a failing job is reported by the next flush."""
+        writer = BackgroundWriter()
+
+        def fail() -> None:
+            raise OSError("disk full")
+
+        writer.submit("x", fail)
+        with pytest.raises(OSError, match="disk full"):
+            await writer.flush()
+
+    @pytest.mark.asyncio
+    async def test_full_queue_writes_oldest_inline(self) -> None:
+        """Test that a bounded writer writes the oldest jobs in the caller when full."""
+        writer = BackgroundWriter(max_pending=2)
+        main = threading.current_thread()
+        written: list[tuple[str, bool]] = []
+
+        for key in ("a", "b", "c"):
+            writer.submit(
+                key, lambda k=key: written.append((k, threading.current_thread() is main))
+            )
+        assert written == [("a", True)]
+        await writer.flush()
+
+        assert [key for key, _ in written] == ["a", "b", "c"]
+        assert writer.jobs_written_inline == 1
+
+    @pytest.mark.asyncio
+    async def test_wait_for_writes_pending_job(self) -> None:
+        """Test that a reader of a target gets the content queued for it."""
+        writer = BackgroundWriter()
+        written: list[str] = []
+
+        writer.submit("a", lambda: written.append("a"))
+        writer.submit("b", lambda: written.append("b"))
+        writer.wait_for("b")
+
+        assert written == ["a", "b"]
+        assert writer.pending == 0
+
+    def test_without_event_loop_writes_immediately(self) -> None:
+        """Test that jobs submitted outside an event loop are written synchronously."""
+        writer = BackgroundWriter()
+        written: list[str] = []
+        writer.submit("x", lambda: written.append("x"))
+        assert written == ["x"]
+
+
+class TestPipelinedSprint:
+    """Test sprints run in pipelined mode."""
+
+    @pytest.mark.asyncio
+    async def test_outputs_are_on_disk_when_sprint_returns(
+        self, isolated_agilevv_dir: PathConfig
+    ) -> None:
+        """Test that background persistence is flushed before the sprint returns."""
+        orchestrator = PipelinedOrchestrator(
+            path_config=isolated_agilevv_dir,
+            config=build_orchestrator_config(pipeline={"enabled": True}),
+            show_progress=False,
+        )
+        assert orchestrator.pipelined
+
+        await orchestrator.run_sprint(STORY)
+
+        sprint_dir = isolated_agilevv_dir.sprints_dir / "sprint-1"
+        assert json.loads((sprint_dir / "sprint.json").read_text())["status"] == "completed"
+        assert all((sprint_dir / f"{stage.value}.json").exists() for stage in VModelStage)
+        state = json.loads(isolated_agilevv_dir.state_path.read_text())
+        assert state["sprint_number"] == 1
+        assert state["active_story"] is None
+        assert orchestrator.persistence.pending == 0
+        assert orchestrator.persistence.jobs_written > 0
+
+    @pytest.mark.asyncio
+    async def test_downstream_agents_prepared_ahead(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that the testing stage agents are created off the loop during the coding call."""
+        orchestrator = PipelinedOrchestrator(
+            path_config=isolated_agilevv_dir,
+            config=build_orchestrator_config(pipeline={"enabled": True}),
+            show_progress=False,
+        )
+
+        await orchestrator.run_sprint(STORY)
+
+        assert {
+            VModelStage.UNIT_TESTING,
+            VModelStage.INTEGRATION_TESTING,
+            VModelStage.SYSTEM_TESTING,
+        } <= orchestrator.prepared_during_coding
+        assert threading.get_ident() not in orchestrator.preparation_threads
+
+    @pytest.mark.asyncio
+    async def test_interruption_flushes_pending_writes(
+        self, isolated_agilevv_dir: PathConfig
+    ) -> None:
+        """Test that a cancelled pipelined sprint leaves a resumable manifest."""
+        orchestrator = PipelinedOrchestrator(
+            path_config=isolated_agilevv_dir,
+            config=build_orchestrator_config(pipeline={"enabled": True}),
+            show_progress=False,
+        )
+        orchestrator.hang_at = "coding"
+
+        sprint = asyncio.ensure_future(orchestrator.run_sprint(STORY))
+        await orchestrator.hanging.wait()
+        sprint.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await sprint
+
+        sprint_dir = isolated_agilevv_dir.sprints_dir / "sprint-1"
+        assert json.loads((sprint_dir / "sprint.json").read_text())["status"] == "interrupted"
+        assert (sprint_dir / "design.json").exists()
+
+
+class WritingArchitect(BaseAgent):
+    """Architect stand-in saving artifacts, recording the thread of each write."""
+
+    def __init__(self, path_config: PathConfig):
+        super().__init__("writing_architect", "architect", path_config=path_config)
+        self.write_threads: list[threading.Thread] = []
+
+    async def process(self, input_data: dict[str, Any]) -> dict[str, Any]:
+        """Save a design and a diagram per component."""
+        for i in range(5):
+            self._write(None, lambda: self.write_threads.append(threading.current_thread()))
+            self.save_artifact(f"design/diagrams/S-1_component_{i}.puml", f"@startuml {i}")
+        self.save_artifact("design/S-1.json", {"components": 5})
+        return {"status": "success", "artifacts": {"design": "design/S-1.json"}}
+
+
+class TestArtifactWriter:
+    """Test agents writing artifacts off the event loop."""
+
+    @pytest.mark.asyncio
+    async def test_artifacts_written_before_stage_returns(
+        self, isolated_agilevv_dir: PathConfig
+    ) -> None:
+        """Test that artifact writes leave the event loop and are flushed before gating."""
+        orchestrator = Orchestrator(
+            path_config=isolated_agilevv_dir,
+            config=build_orchestrator_config(),
+            show_progress=False,
+        )
+        agent = WritingArchitect(isolated_agilevv_dir)
+        orchestrator.agents["architect"] = agent
+
+        await orchestrator.execute_stage(VModelStage.DESIGN, {"story": STORY})
+
+        assert agent.write_threads
+        assert threading.current_thread() not in agent.write_threads
+        assert agent.artifact_writer is not None and agent.artifact_writer.pending == 0
+        assert json.loads((isolated_agilevv_dir.base_dir / "design/S-1.json").read_text()) == {
+            "components": 5
+        }
+        assert len(list((isolated_agilevv_dir.base_dir / "design/diagrams").glob("*.puml"))) == 5
+
+    @pytest.mark.asyncio
+    async def test_load_sees_queued_save(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that an agent reading an artifact it queued gets the new content."""
+        agent = WritingArchitect(isolated_agilevv_dir)
+        agent.artifact_writer = BackgroundWriter()
+
+        agent.save_artifact("design/S-1.json", {"version": 1})
+        agent.save_artifact("design/S-1.json", {"version": 2})
+
+        assert agent.load_artifact("design/S-1.json") == {"version": 2}
+
+
+class TestPromptTemplateCache:
+    """Test compiled prompt template reuse."""
+
+    def test_templates_compiled_once_until_changed(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, isolated_agilevv_dir: PathConfig
+    ) -> None:
+        """Test that warmed templates are reused and edits are picked up."""
+        monkeypatch.setattr(base, "PROMPTS_DIR", tmp_path)
+        template_path = tmp_path / "architect.j2"
+        template_path.write_text("Design {{ story_id }}")
+
+        class Architect(BaseAgent):
+            async def process(self, input_data: dict[str, Any]) -> dict[str, Any]:
+                return {}
+
+        agent = Architect("architect", "architect", path_config=isolated_agilevv_dir)
+
+        assert warm_prompt_templates() == 1
+        assert agent.load_prompt_template("architect", story_id="S-1") == "Design S-1"
+
+        template_path.write_text("Architecture {{ story_id }}")
+        stat = template_path.stat()
+        os.utime(template_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert agent.load_prompt_template("architect", story_id="S-1") == "Architecture S-1"
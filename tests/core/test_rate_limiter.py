@@ -0,0 +1,174 @@
+"""Tests for the shared request and token rate limiter."""
+
+import asyncio
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+from verifflowcc.agents.base import BaseAgent
+from verifflowcc.agents.factory import AgentFactory
+from verifflowcc.core.orchestrator import Orchestrator
+from verifflowcc.core.path_config import PathConfig
+from verifflowcc.core.rate_limiter import (
+    RateLimiter,
+    TokenBucket,
+    configure_rate_limiter,
+    get_rate_limiter,
+    set_rate_limiter,
+)
+from verifflowcc.core.sdk_config import SDKConfig
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class EchoAgent(BaseAgent):
+    """Agent whose SDK query echoes the prompt without contacting Claude."""
+
+    async def _query_claude_sdk(self, prompt: str) -> str:
+        return prompt
+
+    async def process(self, input_data: dict[str, Any]) -> dict[str, Any]:
+        """Send one prompt through the rate-limited SDK call."""
+        response = await self._call_claude_sdk(input_data["prompt"])
+        return {"status": "success", "response": response, "artifacts": {}}
+
+
+@pytest.fixture(autouse=True)
+def fresh_global_limiter() -> Iterator[None]:
+    """Isolate the process-wide limiter between tests."""
+    set_rate_limiter(None)
+    yield
+    set_rate_limiter(None)
+
+
+class TestTokenBucket:
+    """Test token bucket accounting."""
+
+    def test_refill_is_capped(self) -> None:
+        """Test that the bucket refills at its rate up to its capacity."""
+        clock = FakeClock()
+        bucket = TokenBucket(capacity=10, refill_per_second=2, clock=clock)
+
+        bucket.consume(10)
+        clock.now = 2.0
+        assert bucket.level == pytest.approx(4)
+        clock.now = 100.0
+        assert bucket.level == 10
+
+    def test_time_until_accounts_for_debt(self) -> None:
+        """Test that consumption beyond the level must be paid back first."""
+        clock = FakeClock()
+        bucket = TokenBucket(capacity=10, refill_per_second=2, clock=clock)
+
+        bucket.consume(14)  # 4 tokens of debt
+        assert bucket.time_until(2) == pytest.approx(3.0)
+        assert bucket.time_until(1000) == pytest.approx(7.0)  # capped at capacity
+
+
+class TestRateLimiter:
+    """Test waiting for request and token capacity."""
+
+    @pytest.mark.asyncio
+    async def test_unlimited_does_not_wait(self) -> None:
+        """Test that a limiter without limits never throttles."""
+        limiter = RateLimiter()
+        assert await limiter.acquire(10_000) == 0.0
+        assert not limiter.enabled
+
+    @pytest.mark.asyncio
+    async def test_request_limit_throttles(self) -> None:
+        """Test that an exhausted request bucket delays the next call."""
+        limiter = RateLimiter(requests_per_minute=6000)  # 100 per second
+        assert limiter.requests is not None
+        limiter.requests.consume(6000)
+
+        waited = await limiter.acquire()
+
+        assert waited > 0
+        assert limiter.get_stats()["throttled_requests"] == 1
+        assert limiter.get_stats()["total_wait_seconds"] == pytest.approx(waited, abs=1e-3)
+
+    @pytest.mark.asyncio
+    async def test_waiters_are_served_in_arrival_order(self) -> None:
+        """Test that a large call is not overtaken by smaller calls behind it."""
+        limiter = RateLimiter(tokens_per_minute=60_000)  # 1000 tokens per second
+        assert limiter.tokens is not None
+        limiter.tokens.consume(60_000)
+        served: list[str] = []
+
+        async def call(name: str, tokens: int) -> None:
+            await limiter.acquire(tokens)
+            served.append(name)
+
+        await asyncio.gather(call("large", 50), call("small-1", 1), call("small-2", 1))
+
+        assert served == ["large", "small-1", "small-2"]
+        assert limiter.get_stats()["throttled_requests"] == 3
+
+    @pytest.mark.asyncio
+    async def test_response_tokens_delay_later_calls(self) -> None:
+        """Test that tokens charged after a call are waited out by the next one."""
+        limiter = RateLimiter(tokens_per_minute=60_000)
+        assert await limiter.acquire(1) == 0.0
+
+        limiter.consume(60_020)  # a response larger than the remaining budget
+
+        assert await limiter.acquire(1) >= 0.015
+
+    def test_configure_keeps_unchanged_buckets(self) -> None:
+        """Test that re-applying the same limits does not refill the buckets."""
+        limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=1000)
+        bucket = limiter.requests
+
+        limiter.configure(60, None)
+
+        assert limiter.requests is bucket
+        assert limiter.tokens is None
+        with pytest.raises(ValueError):
+            limiter.configure(0, None)
+
+
+class TestSharedLimiter:
+    """Test sharing one limiter between agents."""
+
+    def test_configured_from_sdk_section(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that sdk.requests_per_minute and tokens_per_minute apply process-wide."""
+        config = {"v_model": {"stages": {}}, "sdk": {"requests_per_minute": 30}}
+        orchestrator = Orchestrator(path_config=isolated_agilevv_dir, config=config)
+
+        assert orchestrator.rate_limiter is get_rate_limiter()
+        assert orchestrator.rate_limiter.requests_per_minute == 30
+        assert orchestrator.rate_limiter.tokens_per_minute is None
+        assert all(a.rate_limiter is get_rate_limiter() for a in orchestrator.agents.values())
+        status = orchestrator.get_status()["sdk_config"]["rate_limiter"]
+        assert status["requests_per_minute"] == 30
+
+    @pytest.mark.asyncio
+    async def test_agents_share_limits_and_report_wait(
+        self, isolated_agilevv_dir: PathConfig
+    ) -> None:
+        """Test that calls of different agents draw from the same buckets."""
+        limiter = configure_rate_limiter({"requests_per_minute": 6000})
+        factory = AgentFactory(SDKConfig(api_key="test-key"), isolated_agilevv_dir)
+        factory.register_agent("echo", EchoAgent)
+        first = factory.create_agent("echo", name="first")
+        second = factory.create_agent("echo", name="second")
+        assert limiter.requests is not None
+        limiter.requests.consume(6000)
+
+        results = await asyncio.gather(
+            first.process_with_timeout({"prompt": "a"}),
+            second.process_with_timeout({"prompt": "b"}),
+        )
+
+        assert first.rate_limiter is second.rate_limiter is limiter
+        assert limiter.total_requests == 2
+        assert all(r["metrics"]["rate_limit_wait_seconds"] > 0 for r in results)
@@ -0,0 +1,193 @@
+"""Tests for retrying transient Claude Code SDK failures."""
+
+import asyncio
+import random
+from typing import Any
+
+import pytest
+from claude_code_sdk import CLIConnectionError, CLINotFoundError, ProcessError
+from verifflowcc.agents.base import BaseAgent
+from verifflowcc.core.orchestrator import Orchestrator
+from verifflowcc.core.path_config import PathConfig
+from verifflowcc.core.retry import (
+    PERMANENT,
+    TRANSIENT,
+    RetryPolicy,
+    RetryStats,
+    classify_error,
+    retry_async,
+)
+from verifflowcc.core.sdk_config import AuthenticationError, SDKConfig
+from verifflowcc.core.vmodel import VModelStage
+
+
+class FlakyArchitect(BaseAgent):
+    """Architect whose SDK query fails a scripted number of times."""
+
+    def __init__(self, path_config: PathConfig, failures: list[Exception]):
+        super().__init__(
+            name="flaky_architect",
+            agent_type="architect",
+            path_config=path_config,
+            sdk_config=SDKConfig(api_key="test-key", max_retries=2, retry_delay=0.001),
+        )
+        self.failures = failures
+        self.queries = 0
+
+    async def _query_claude_sdk(self, prompt: str) -> str:
+        self.queries += 1
+        if self.failures:
+            raise self.failures.pop(0)
+        return '{"components": ["api"], "interface_specifications": ["rest"]}'
+
+    async def process(self, input_data: dict[str, Any]) -> dict[str, Any]:
+        """Query the SDK once and return the design."""
+        try:
+            design = await self._parse_response(await self._call_claude_sdk("design"), input_data)
+        except Exception as e:
+            return {"status": "error", "error": str(e), "artifacts": {}}
+        return {"status": "success", "design_data": design, "artifacts": {}}
+
+
+class TestClassifyError:
+    """Test transient/permanent error classification."""
+
+    @pytest.mark.parametrize(
+        "error",
+        [
+            CLIConnectionError("connection lost"),
+            ProcessError("Command failed", exit_code=1, stderr="429 rate_limit_error"),
+            ProcessError("Command failed", exit_code=1, stderr="Overloaded"),
+            ProcessError("Command failed", exit_code=1),
+            asyncio.TimeoutError(),
+            RuntimeError("503 Service Unavailable"),
+        ],
+        ids=["connection", "rate-limit", "overloaded", "bare-exit", "timeout", "http-503"],
+    )
+    def test_transient(self, error: Exception) -> None:
+        """Test errors that are worth retrying."""
+        assert classify_error(error) == TRANSIENT
+
+    @pytest.mark.parametrize(
+        "error",
+        [
+            CLINotFoundError("Claude Code not found"),
+            AuthenticationError("no credentials"),
+            ProcessError("Command failed", exit_code=1, stderr="Invalid API key"),
+            ValueError("bad input"),
+        ],
+        ids=["cli-missing", "auth", "invalid-key", "value-error"],
+    )
+    def test_permanent(self, error: Exception) -> None:
+        """Test errors that fail fast."""
+        assert classify_error(error) == PERMANENT
+
+
+class TestRetryPolicy:
+    """Test backoff computation."""
+
+    def test_backoff_is_exponential_and_capped(self) -> None:
+        """Test that delays double per retry up to max_delay."""
+        policy = RetryPolicy(base_delay=1.0, max_delay=5.0, jitter=False)
+        assert [policy.backoff(n) for n in range(4)] == [1.0, 2.0, 4.0, 5.0]
+
+    def test_jitter_stays_within_cap(self) -> None:
+        """Test that jittered delays are spread over [0, cap]."""
+        policy = RetryPolicy(base_delay=1.0, max_delay=5.0)
+        rng = random.Random(7)  # noqa: S311
+        delays = [policy.backoff(3, rng) for _ in range(50)]
+        assert all(0 <= d <= 5.0 for d in delays)
+        assert len(set(delays)) > 1
+
+    def test_from_sdk_config(self) -> None:
+        """Test that SDKConfig retry settings drive the policy."""
+        policy = RetryPolicy.from_sdk_config(SDKConfig(max_retries=5, retry_delay=0.5))
+        assert (policy.max_retries, policy.base_delay) == (5, 0.5)
+
+
+class TestRetryAsync:
+    """Test the retry loop."""
+
+    @staticmethod
+    def _failing(errors: list[Exception]) -> Any:
+        async def attempt() -> str:
+            if errors:
+                raise errors.pop(0)
+            return "ok"
+
+        return attempt
+
+    @pytest.mark.asyncio
+    async def test_transient_errors_are_retried(self) -> None:
+        """Test that a call succeeding after transient errors returns its result."""
+        stats = RetryStats()
+        delays: list[float] = []
+
+        async def sleep(delay: float) -> None:
+            delays.append(delay)
+
+        result = await retry_async(
+            self._failing([CLIConnectionError("a"), CLIConnectionError("b")]),
+            RetryPolicy(max_retries=3, base_delay=0.5, jitter=False),
+            stats,
+            sleep=sleep,
+        )
+
+        assert result == "ok"
+        assert delays == [0.5, 1.0]
+        assert (stats.attempts, stats.retries, stats.backoff_seconds) == (3, 2, 1.5)
+
+    @pytest.mark.asyncio
+    async def test_permanent_error_is_not_retried(self) -> None:
+        """Test that permanent errors are raised on the first attempt."""
+        stats = RetryStats()
+        with pytest.raises(CLINotFoundError):
+            await retry_async(self._failing([CLINotFoundError("missing")]), RetryPolicy(), stats)
+        assert (stats.attempts, stats.retries) == (1, 0)
+
+    @pytest.mark.asyncio
+    async def test_retries_are_bounded(self) -> None:
+        """Test that the last transient error is raised once retries are exhausted."""
+        stats = RetryStats()
+        errors: list[Exception] = [CLIConnectionError(str(n)) for n in range(5)]
+        with pytest.raises(CLIConnectionError, match="2"):
+            await retry_async(
+                self._failing(errors), RetryPolicy(max_retries=2, base_delay=0), stats
+            )
+        assert stats.attempts == 3
+        assert [e["kind"] for e in stats.errors] == [TRANSIENT] * 3
+
+
+class TestAgentRetries:
+    """Test retries of agent SDK calls and their stage metrics."""
+
+    @pytest.mark.asyncio
+    async def test_transient_failure_recovers_within_stage(
+        self, isolated_agilevv_dir: PathConfig
+    ) -> None:
+        """Test that a stage survives a dropped connection and records the retry."""
+        orchestrator = Orchestrator(path_config=isolated_agilevv_dir, show_progress=False)
+        agent = FlakyArchitect(isolated_agilevv_dir, [CLIConnectionError("dropped")])
+        orchestrator.agents["architect"] = agent
+
+        result = await orchestrator.execute_stage(
+            VModelStage.DESIGN, {"story": {"id": "S-1", "title": "Login"}}
+        )
+
+        metrics = orchestrator.state["agent_metrics"]["design"]
+        assert result["status"] == "success"
+        assert agent.queries == 2
+        assert metrics["retries"] == 1
+        assert metrics["backoff_seconds"] <= 0.001
+
+    @pytest.mark.asyncio
+    async def test_permanent_failure_fails_fast(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that a permanent failure is reported without retrying."""
+        agent = FlakyArchitect(isolated_agilevv_dir, [CLINotFoundError("missing")])
+
+        result = await agent.process_with_timeout({"story_id": "S-1"})
+
+        assert result["status"] == "error"
+        assert agent.queries == 1
+        assert result["metrics"]["retries"] == 0
+        assert result["metrics"]["retry_errors"][0]["kind"] == PERMANENT
@@ -162,6 +162,12 @@ class TestSDKConfigAgentSpecific:
         timeout = config.get_agent_timeout("developer")
         assert timeout == 120
 
+    def test_get_agent_timeout_agent_type_aliases(self) -> None:
+        """Test that agent types and config names resolve to the same timeout."""
+        config = SDKConfig(api_key="test-key")
+        assert config.get_agent_timeout("requirements") == 60
+        assert config.get_agent_timeout("qa_tester") == config.get_agent_timeout("qa")
+
     def test_get_agent_timeout_default(self) -> None:
         """Test default agent timeout for unknown agent."""
         config = SDKConfig(api_key="test-key")
@@ -0,0 +1,126 @@
+"""Tests for resuming failed or interrupted sprints."""
+
+import asyncio
+import json
+import shutil
+from typing import Any
+
+import pytest
+from typer.testing import CliRunner
+from verifflowcc.cli import app
+from verifflowcc.core.path_config import PathConfig
+from verifflowcc.core.vmodel import VModelStage
+
+STORY = {"id": "STORY-001", "title": "Login", "description": "Login"}
+
+
+class TestResumeSprint:
+    """Test Orchestrator.resume_sprint."""
+
+    @pytest.mark.asyncio
+    async def test_stage_outputs_are_persisted(
+        self, make_orchestrator: Any, isolated_agilevv_dir: PathConfig
+    ) -> None:
+        """Test that each finished stage is written to the sprint directory."""
+        orchestrator = make_orchestrator()
+        await orchestrator.run_sprint(STORY)
+
+        sprint_dir = isolated_agilevv_dir.sprints_dir / "sprint-1"
+        manifest = json.loads((sprint_dir / "sprint.json").read_text())
+        record = json.loads((sprint_dir / "design.json").read_text())
+
+        assert manifest["status"] == "completed"
+        assert manifest["story"] == STORY
+        assert record["status"] == "success"
+        assert record["gate"]["passed"] is True
+
+    @pytest.mark.asyncio
+    async def test_resume_after_hard_gate_failure(self, make_orchestrator: Any) -> None:
+        """Test that resuming only re-runs the failed stage and what depends on it."""
+        gating = {"system_testing": "hard"}
+        first = make_orchestrator(gating)
+        first.failing = {"system_testing"}
+
+        result = await first.run_sprint(STORY)
+        assert "validation" not in result["stages"]
+
+        # The failing stage is fixed and its gate relaxed before resuming
+        second = make_orchestrator()
+        resumed = await second.resume_sprint()
+
+        assert second.calls == ["system_testing", "validation"]
+        assert resumed["sprint_number"] == 1
+        assert set(resumed["stages"]) == {stage.value for stage in VModelStage}
+        assert "coding" in resumed["resumed_stages"]
+
+    @pytest.mark.asyncio
+    async def test_resume_reads_sqlite_tables(
+        self, make_orchestrator: Any, isolated_agilevv_dir: PathConfig
+    ) -> None:
+        """Test that the sqlite backend resumes from its tables, not the JSON files."""
+        first = make_orchestrator({"system_testing": "hard"}, state={"backend": "sqlite"})
+        first.failing = {"system_testing"}
+        await first.run_sprint(STORY)
+        first.close()
+        shutil.rmtree(isolated_agilevv_dir.sprints_dir)
+
+        second = make_orchestrator(state={"backend": "sqlite"})
+        resumed = await second.resume_sprint()
+        second.close()
+
+        assert second.calls == ["system_testing", "validation"]
+        assert "coding" in resumed["resumed_stages"]
+
+    @pytest.mark.asyncio
+    async def test_resume_after_interruption(
+        self, make_orchestrator: Any, isolated_agilevv_dir: PathConfig
+    ) -> None:
+        """Test resuming a sprint that was cancelled while a stage was running."""
+        first = make_orchestrator()
+        first.hang_at = "coding"
+
+        sprint = asyncio.ensure_future(first.run_sprint(STORY))
+        await first.hanging.wait()
+        sprint.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await sprint
+
+        manifest_path = isolated_agilevv_dir.sprints_dir / "sprint-1" / "sprint.json"
+        assert json.loads(manifest_path.read_text())["status"] == "interrupted"
+
+        second = make_orchestrator()
+        await second.resume_sprint()
+
+        assert second.calls[0] == "coding"
+        assert "requirements" not in second.calls
+        assert json.loads(manifest_path.read_text())["status"] == "completed"
+
+    @pytest.mark.asyncio
+    async def test_failed_gate_reruns_downstream(self, make_orchestrator: Any) -> None:
+        """Test that stages depending on a stage that failed its gate are re-run."""
+        first = make_orchestrator({"design": "soft"})
+        await first.run_sprint(STORY)  # design fails its soft gate (no components)
+
+        second = make_orchestrator()
+        await second.resume_sprint()
+
+        assert second.calls[:2] == ["design", "coding"]
+        assert "requirements" not in second.calls
+
+    @pytest.mark.asyncio
+    async def test_resume_without_outputs(self, make_orchestrator: Any) -> None:
+        """Test that resuming a sprint without persisted outputs fails clearly."""
+        with pytest.raises(ValueError, match="No persisted outputs"):
+            await make_orchestrator().resume_sprint()
+
+
+class TestResumeCLI:
+    """Test vv sprint --resume."""
+
+    def test_resume_without_sprint(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that --resume reports when there is nothing to resume."""
+        result = CliRunner().invoke(
+            app, ["sprint", "--resume", "--dir", str(isolated_agilevv_dir.base_dir)]
+        )
+        assert result.exit_code == 1
+        assert "Cannot resume sprint" in result.output
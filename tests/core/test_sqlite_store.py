@@ -0,0 +1,174 @@
+"""Tests for the SQLite state backend."""
+
+import json
+import shutil
+from typing import Any
+
+import pytest
+import yaml
+from tests.conftest import build_orchestrator_config
+from typer.testing import CliRunner
+from verifflowcc.cli import app
+from verifflowcc.core.orchestrator import Orchestrator
+from verifflowcc.core.path_config import PathConfig
+from verifflowcc.core.sqlite_store import SQLiteStateStore
+from verifflowcc.core.state_journal import StateJournal
+from verifflowcc.core.state_store import load_project_state, open_state_store
+from verifflowcc.core.vmodel import VModelStage
+
+
+def use_sqlite_backend(path_config: PathConfig) -> None:
+    """Select the sqlite backend in a project's config.yaml."""
+    path_config.config_path.write_text(yaml.dump({"state": {"backend": "sqlite"}}))
+
+
+class TestSQLiteStateStore:
+    """Test storing state in SQLite."""
+
+    def test_roundtrip(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that saved state is loaded back, including deleted keys."""
+        store = SQLiteStateStore(isolated_agilevv_dir)
+        store.load()
+        state: dict[str, Any] = {"sprint_number": 1, "active_story": {"id": "S-1"}}
+        store.save(state)
+        del state["active_story"]
+        state["sprint_number"] = 2
+        store.save(state)
+        store.close()
+
+        assert SQLiteStateStore(isolated_agilevv_dir).load() == {"sprint_number": 2}
+
+    def test_gate_history_not_duplicated(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that a gate result is recorded once however often the state is saved."""
+        store = SQLiteStateStore(isolated_agilevv_dir)
+        store.load()
+        state: dict[str, Any] = {"sprint_number": 1, "quality_gates": {}}
+        state["quality_gates"]["design"] = {"passed": False}
+        store.save(state)
+        store.save(state, compact=True)
+        state["quality_gates"]["design"] = {"passed": True}
+        store.save(state)
+
+        history = store.gate_history("design")
+        assert [gate["passed"] for gate in history] == [False, True]
+        assert history[0]["sprint_number"] == 1
+
+    def test_readers_not_blocked_by_writer(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that WAL mode lets readers load while a write is in progress."""
+        writer = SQLiteStateStore(isolated_agilevv_dir)
+        writer.load()
+        writer.save({"current_stage": "design"})
+
+        writer._connection.execute("BEGIN IMMEDIATE")
+        writer._connection.execute(
+            "UPDATE state SET value = ? WHERE key = 'current_stage'", (json.dumps("coding"),)
+        )
+        reader = SQLiteStateStore(isolated_agilevv_dir)
+        assert reader.load() == {"current_stage": "design"}
+        writer._connection.commit()
+
+        assert reader.load() == {"current_stage": "coding"}
+
+    def test_writers_keep_each_others_changes(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that a compacting save applies its changes to the rows as stored."""
+        first = SQLiteStateStore(isolated_agilevv_dir)
+        first.load()
+        state: dict[str, Any] = {"checkpoint_history": [], "stage": "requirements"}
+        first.save(state)
+
+        second = SQLiteStateStore(isolated_agilevv_dir)
+        other = second.load()
+        assert other is not None
+        other["checkpoint_history"].append("cp-other")
+        second.save(other, compact=True)
+
+        state["stage"] = "design"
+        state["checkpoint_history"].append("cp-first")
+        first.save(state, compact=True)
+
+        assert SQLiteStateStore(isolated_agilevv_dir).load() == {
+            "checkpoint_history": ["cp-other", "cp-first"],
+            "stage": "design",
+        }
+
+    def test_unknown_backend(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that an unknown backend is reported."""
+        with pytest.raises(ValueError, match="postgres"):
+            open_state_store(isolated_agilevv_dir, {"backend": "postgres"})
+
+
+class TestOrchestratorSQLite:
+    """Test the orchestrator and CLI on the sqlite backend."""
+
+    @pytest.mark.asyncio
+    async def test_sprint_history_is_queryable(
+        self, make_orchestrator: Any, isolated_agilevv_dir: PathConfig
+    ) -> None:
+        """Test that sprints, stage runs, gates and metrics land in their tables."""
+        orchestrator = make_orchestrator(state={"backend": "sqlite"})
+        orchestrator.stage_result = {
+            "status": "success",
+            "artifacts": {},
+            "metrics": {"execution_time": 1.5},
+        }
+
+        await orchestrator.run_sprint({"id": "S-1", "title": "Login"})
+
+        store = SQLiteStateStore(isolated_agilevv_dir)
+        assert [(s["sprint_number"], s["status"]) for s in store.sprints()] == [(1, "completed")]
+        assert len(store.stage_runs(sprint_number=1)) == len(list(VModelStage))
+        assert store.stage_runs(stage="coding")[0]["status"] == "success"
+        assert len(store.gate_history("design")) == 1
+        assert store.agent_metrics()["design"]["execution_time"] == 1.5
+
+        reloaded = Orchestrator(
+            path_config=isolated_agilevv_dir,
+            config=build_orchestrator_config(state={"backend": "sqlite"}),
+        )
+        assert reloaded.state["sprint_number"] == 1
+        assert len(reloaded.state["completed_stages"]) == len(list(VModelStage))
+
+    @pytest.mark.asyncio
+    async def test_import_and_export(
+        self, make_orchestrator: Any, isolated_agilevv_dir: PathConfig
+    ) -> None:
+        """Test that a JSON project moves to SQLite and back unchanged."""
+        orchestrator = make_orchestrator(state={"backend": "json"})
+        await orchestrator.run_sprint({"id": "S-1", "title": "Login"})
+        state = StateJournal.for_project(isolated_agilevv_dir).load()
+        design = json.loads(
+            (isolated_agilevv_dir.sprints_dir / "sprint-1" / "design.json").read_text()
+        )
+
+        store = SQLiteStateStore(isolated_agilevv_dir)
+        assert store.import_json() == state
+        assert len(store.gate_history("design")) == 1
+
+        isolated_agilevv_dir.state_path.unlink()
+        shutil.rmtree(isolated_agilevv_dir.sprints_dir)
+        assert store.export_json() == state
+
+        assert StateJournal.for_project(isolated_agilevv_dir).load() == state
+        exported = isolated_agilevv_dir.sprints_dir / "sprint-1" / "design.json"
+        assert json.loads(exported.read_text()) == design
+
+    def test_cli_reads_configured_backend(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that vv state import and vv status work on the sqlite backend."""
+        StateJournal.for_project(isolated_agilevv_dir).save({"current_sprint": "Sprint 3"})
+        runner = CliRunner()
+
+        result = runner.invoke(
+            app, ["state", "import", "--dir", str(isolated_agilevv_dir.base_dir)]
+        )
+        assert result.exit_code == 0
+        assert isolated_agilevv_dir.state_db_path.exists()
+
+        use_sqlite_backend(isolated_agilevv_dir)
+        isolated_agilevv_dir.state_path.unlink()
+        assert load_project_state(isolated_agilevv_dir) == {"current_sprint": "Sprint 3"}
+
+        result = runner.invoke(
+            app, ["status", "--dir", str(isolated_agilevv_dir.base_dir), "--json"]
+        )
+        assert result.exit_code == 0
+        assert "Sprint 3" in result.output
@@ -0,0 +1,201 @@
+"""Tests for content-hash memoization of stage results."""
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+from verifflowcc.agents.base import BaseAgent
+from verifflowcc.core.orchestrator import Orchestrator
+from verifflowcc.core.path_config import PathConfig
+from verifflowcc.core.sdk_config import SDKConfig
+from verifflowcc.core.stage_cache import (
+    StageCache,
+    hash_artifacts,
+    hash_content,
+    normalize_agent_input,
+)
+from verifflowcc.core.vmodel import VModelStage
+
+
+class CountingArchitect(BaseAgent):
+    """Architect stand-in that counts how often it is executed."""
+
+    def __init__(self, path_config: PathConfig):
+        super().__init__(
+            name="counting_architect",
+            agent_type="architect",
+            path_config=path_config,
+            sdk_config=SDKConfig(api_key="test-key"),
+        )
+        self.calls = 0
+
+    async def process(self, input_data: dict[str, Any]) -> dict[str, Any]:
+        """Produce a deterministic design artifact."""
+        self.calls += 1
+        design = {"components": ["api"], "interface_specifications": ["rest"]}
+        self.save_artifact(f"design/{input_data['story_id']}.json", design)
+        return {
+            "status": "success",
+            "design_data": design,
+            "artifacts": {"design": f"design/{input_data['story_id']}.json"},
+            "metrics": {},
+        }
+
+
+class TestHashing:
+    """Test hashing helpers."""
+
+    def test_hash_content_is_order_independent(self) -> None:
+        """Test that dictionaries hash identically regardless of key order."""
+        assert hash_content({"a": 1, "b": 2}) == hash_content({"b": 2, "a": 1})
+        assert hash_content({"a": 1}) != hash_content({"a": 2})
+
+    def test_hash_artifacts_uses_file_content(self, tmp_path: Path) -> None:
+        """Test that artifact paths are hashed by the content they point to."""
+        (tmp_path / "req.json").write_text("{}")
+        first = hash_artifacts(tmp_path, {"requirements": "req.json", "missing": "gone.json"})
+
+        (tmp_path / "req.json").write_text('{"changed": true}')
+        second = hash_artifacts(tmp_path, {"requirements": "req.json", "missing": "gone.json"})
+
+        assert first["requirements"] != second["requirements"]
+        assert first["missing"] is None
+
+    def test_normalize_agent_input_drops_volatile_keys(self) -> None:
+        """Test that run-specific values are excluded from fingerprints."""
+        normalized = normalize_agent_input(
+            {
+                "story_id": "S-1",
+                "session_state": {"x": 1},
+                "context": {"stage": "design", "sprint_number": 4, "sprint_results": {}},
+            }
+        )
+        assert normalized == {"story_id": "S-1", "context": {"stage": "design"}}
+
+
+class TestStageCache:
+    """Test the stage result store."""
+
+    @pytest.fixture
+    def cache(self, tmp_path: Path) -> StageCache:
+        """Provide a stage cache rooted in a temporary directory."""
+        return StageCache(tmp_path / "cache", tmp_path, max_entries_per_stage=2)
+
+    def test_put_and_get(self, cache: StageCache) -> None:
+        """Test that stored results are returned for the same fingerprint."""
+        fingerprint = cache.fingerprint("design", {"input": 1})
+        cache.put("design", fingerprint, {"status": "success", "artifacts": {}})
+
+        assert cache.get("design", fingerprint) == {"status": "success", "artifacts": {}}
+        assert cache.get("design", cache.fingerprint("design", {"input": 2})) is None
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_entry_invalid_when_artifact_changes(self, cache: StageCache, tmp_path: Path) -> None:
+        """Test that a result is not reused once its artifacts changed on disk."""
+        (tmp_path / "design.json").write_text("{}")
+        result = {"status": "success", "artifacts": {"design": "design.json"}}
+        cache.put("design", "fp", result)
+
+        (tmp_path / "design.json").write_text('{"edited": true}')
+
+        assert cache.get("design", "fp") is None
+
+    def test_prune_keeps_recent_entries(self, cache: StageCache) -> None:
+        """Test that only max_entries_per_stage entries are kept."""
+        for i in range(4):
+            cache.put("design", f"fp{i}", {"artifacts": {}})
+        assert len(list((cache.cache_dir / "design").glob("*.json"))) == 2
+
+    def test_invalidate(self, cache: StageCache) -> None:
+        """Test removing entries for one or all stages."""
+        cache.put("design", "a", {"artifacts": {}})
+        cache.put("coding", "b", {"artifacts": {}})
+
+        assert cache.invalidate("design") == 1
+        assert cache.invalidate() == 1
+
+
+class TestOrchestratorStageCache:
+    """Test memoization inside the orchestrator."""
+
+    @pytest.fixture
+    def orchestrator(self, isolated_agilevv_dir: PathConfig) -> Orchestrator:
+        """Provide an orchestrator whose design stage uses a counting agent."""
+        orchestrator = Orchestrator(path_config=isolated_agilevv_dir)
+        orchestrator.agents["architect"] = CountingArchitect(isolated_agilevv_dir)
+        return orchestrator
+
+    @staticmethod
+    def _context(title: str = "Login") -> dict[str, Any]:
+        return {
+            "story": {"id": "S-1", "title": title, "description": title},
+            "sprint_results": {"started_at": "now"},
+        }
+
+    def _set_requirements(self, orchestrator: Orchestrator, content: dict[str, Any]) -> None:
+        path = orchestrator.path_config.base_dir / "requirements" / "S-1.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(content))
+        orchestrator.state["stage_artifacts"]["requirements"] = {
+            "requirements": "requirements/S-1.json"
+        }
+
+    @pytest.mark.asyncio
+    async def test_unchanged_inputs_reuse_result(self, orchestrator: Orchestrator) -> None:
+        """Test that re-running a stage with identical inputs skips the agent."""
+        agent = orchestrator.agents["architect"]
+        self._set_requirements(orchestrator, {"criteria": ["a"]})
+
+        first = await orchestrator.execute_stage(VModelStage.DESIGN, self._context())
+        orchestrator.state["sprint_number"] += 1
+        second = await orchestrator.execute_stage(VModelStage.DESIGN, self._context())
+
+        assert agent.calls == 1
+        assert "cached" not in first
+        assert second["cached"] is True
+        assert second["design_data"] == first["design_data"]
+        assert orchestrator.state["agent_metrics"]["design"]["cache_hit"] is True
+
+    @pytest.mark.asyncio
+    async def test_changed_story_reruns_stage(self, orchestrator: Orchestrator) -> None:
+        """Test that a change in the agent input invalidates the stored result."""
+        agent = orchestrator.agents["architect"]
+
+        await orchestrator.execute_stage(VModelStage.DESIGN, self._context("Login"))
+        await orchestrator.execute_stage(VModelStage.DESIGN, self._context("Logout"))
+
+        assert agent.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_upstream_change_cascades(self, orchestrator: Orchestrator) -> None:
+        """Test that only a change in upstream artifact content invalidates a stage."""
+        agent = orchestrator.agents["architect"]
+
+        self._set_requirements(orchestrator, {"criteria": ["a"]})
+        await orchestrator.execute_stage(VModelStage.DESIGN, self._context())
+
+        # Rewriting identical upstream content keeps the cached result valid
+        self._set_requirements(orchestrator, {"criteria": ["a"]})
+        await orchestrator.execute_stage(VModelStage.DESIGN, self._context())
+        assert agent.calls == 1
+
+        self._set_requirements(orchestrator, {"criteria": ["a", "b"]})
+        await orchestrator.execute_stage(VModelStage.DESIGN, self._context())
+        assert agent.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_cache_can_be_disabled(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that cache.enabled: false always executes the agent."""
+        isolated_agilevv_dir.config_path.write_text(
+            "v_model:\n  stages: {}\ncache:\n  enabled: false\n"
+        )
+        orchestrator = Orchestrator(path_config=isolated_agilevv_dir)
+        agent = CountingArchitect(isolated_agilevv_dir)
+        orchestrator.agents["architect"] = agent
+
+        await orchestrator.execute_stage(VModelStage.DESIGN, self._context())
+        await orchestrator.execute_stage(VModelStage.DESIGN, self._context())
+
+        assert orchestrator.stage_cache is None
+        assert agent.calls == 2
@@ -0,0 +1,216 @@
+"""Tests for the dependency-aware V-Model stage scheduler."""
+
+import asyncio
+from typing import Any
+
+import pytest
+from verifflowcc.core.orchestrator import Orchestrator
+from verifflowcc.core.path_config import PathConfig
+from verifflowcc.core.scheduler import (
+    DEFAULT_STAGE_DEPENDENCIES,
+    StageGraph,
+    StageScheduler,
+)
+from verifflowcc.core.vmodel import VModelStage
+
+TESTING_STAGES = [
+    VModelStage.UNIT_TESTING,
+    VModelStage.INTEGRATION_TESTING,
+    VModelStage.SYSTEM_TESTING,
+]
+
+
+class TestStageGraph:
+    """Test stage dependency graph construction and queries."""
+
+    def test_default_graph_orders_all_stages(self) -> None:
+        """Test that the default graph contains every stage in V-Model order."""
+        graph = StageGraph.default()
+        assert graph.stages == list(VModelStage)
+
+    def test_testing_stages_only_depend_on_coding(self) -> None:
+        """Test that the testing stages are independent of each other."""
+        graph = StageGraph.default()
+        for stage in TESTING_STAGES:
+            assert graph.dependencies(stage) == (VModelStage.CODING,)
+
+        ready = graph.ready(
+            completed=[
+                VModelStage.PLANNING,
+                VModelStage.REQUIREMENTS,
+                VModelStage.DESIGN,
+                VModelStage.CODING,
+            ],
+            started=[
+                VModelStage.PLANNING,
+                VModelStage.REQUIREMENTS,
+                VModelStage.DESIGN,
+                VModelStage.CODING,
+            ],
+        )
+        assert ready == TESTING_STAGES
+
+    def test_downstream_stages(self) -> None:
+        """Test transitive dependents of a stage."""
+        graph = StageGraph.default()
+        assert graph.downstream(VModelStage.UNIT_TESTING) == [VModelStage.VALIDATION]
+        assert graph.downstream(VModelStage.CODING) == [*TESTING_STAGES, VModelStage.VALIDATION]
+
+    def test_config_override(self) -> None:
+        """Test that config.yaml overrides replace a stage's dependencies."""
+        graph = StageGraph.from_config(
+            {"stage_dependencies": {"system_testing": ["integration_testing"]}}
+        )
+        assert graph.dependencies(VModelStage.SYSTEM_TESTING) == (VModelStage.INTEGRATION_TESTING,)
+        assert graph.stages.index(VModelStage.SYSTEM_TESTING) > graph.stages.index(
+            VModelStage.INTEGRATION_TESTING
+        )
+
+    def test_invalid_stage_in_override(self) -> None:
+        """Test that unknown stage names are rejected."""
+        with pytest.raises(ValueError, match="Invalid stage dependency override"):
+            StageGraph.from_config({"stage_dependencies": {"deployment": ["coding"]}})
+
+    def test_cycle_detection(self) -> None:
+        """Test that cyclic dependency graphs are rejected."""
+        with pytest.raises(ValueError, match="cycle"):
+            StageGraph.from_config({"stage_dependencies": {"planning": ["validation"]}})
+
+    def test_self_dependency_rejected(self) -> None:
+        """Test that a stage cannot depend on itself."""
+        dependencies = dict(DEFAULT_STAGE_DEPENDENCIES)
+        dependencies[VModelStage.CODING] = (VModelStage.CODING,)
+        with pytest.raises(ValueError, match="itself"):
+            StageGraph(dependencies)
+
+
+class TestStageScheduler:
+    """Test concurrent stage dispatch and gating semantics."""
+
+    @pytest.mark.asyncio
+    async def test_independent_stages_run_concurrently(self) -> None:
+        """Test that the testing stages overlap in time."""
+        in_flight: set[VModelStage] = set()
+        max_testing_overlap = 0
+
+        async def execute(stage: VModelStage) -> dict[str, Any]:
+            nonlocal max_testing_overlap
+            in_flight.add(stage)
+            max_testing_overlap = max(max_testing_overlap, len(in_flight & set(TESTING_STAGES)))
+            await asyncio.sleep(0.01)
+            in_flight.discard(stage)
+            return {"status": "success", "stage": stage.value}
+
+        results = await StageScheduler(StageGraph.default(), execute).run()
+
+        assert set(results) == set(VModelStage)
+        assert max_testing_overlap == 3
+        assert list(results)[-1] == VModelStage.VALIDATION
+
+    @pytest.mark.asyncio
+    async def test_dependencies_are_respected(self) -> None:
+        """Test that no stage starts before its dependencies finish."""
+        graph = StageGraph.default()
+        finished: list[VModelStage] = []
+
+        async def execute(stage: VModelStage) -> dict[str, Any]:
+            assert all(dep in finished for dep in graph.dependencies(stage))
+            await asyncio.sleep(0)
+            finished.append(stage)
+            return {"status": "success"}
+
+        await StageScheduler(graph, execute).run()
+        assert len(finished) == len(VModelStage)
+
+    @pytest.mark.asyncio
+    async def test_blocking_stage_stops_dispatch(self) -> None:
+        """Test that a hard gate failure stops new stages but lets siblings finish."""
+
+        async def execute(stage: VModelStage) -> dict[str, Any]:
+            if stage == VModelStage.UNIT_TESTING:
+                return {"status": "error"}
+            await asyncio.sleep(0.01)
+            return {"status": "success"}
+
+        scheduler = StageScheduler(
+            StageGraph.default(),
+            execute,
+            is_blocking=lambda _stage, result: result["status"] == "error",
+        )
+        results = await scheduler.run()
+
+        assert scheduler.blocked_by == VModelStage.UNIT_TESTING
+        assert VModelStage.INTEGRATION_TESTING in results
+        assert VModelStage.SYSTEM_TESTING in results
+        assert VModelStage.VALIDATION not in results
+
+    @pytest.mark.asyncio
+    async def test_completed_stages_are_skipped(self) -> None:
+        """Test that already completed stages are not executed again."""
+        executed: list[VModelStage] = []
+
+        async def execute(stage: VModelStage) -> dict[str, Any]:
+            executed.append(stage)
+            return {"status": "success"}
+
+        await StageScheduler(StageGraph.default(), execute).run(
+            completed=[VModelStage.PLANNING, VModelStage.REQUIREMENTS]
+        )
+        assert VModelStage.PLANNING not in executed
+        assert VModelStage.REQUIREMENTS not in executed
+        assert VModelStage.DESIGN in executed
+
+    @pytest.mark.asyncio
+    async def test_max_parallel_limits_in_flight_stages(self) -> None:
+        """Test that max_parallel bounds the number of concurrent stages."""
+        in_flight = 0
+        peak = 0
+
+        async def execute(stage: VModelStage) -> dict[str, Any]:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {"status": "success"}
+
+        await StageScheduler(StageGraph.default(), execute, max_parallel=2).run()
+        assert peak == 2
+
+    def test_invalid_max_parallel(self) -> None:
+        """Test that max_parallel must be positive."""
+
+        async def execute(stage: VModelStage) -> dict[str, Any]:
+            return {}
+
+        with pytest.raises(ValueError):
+            StageScheduler(StageGraph.default(), execute, max_parallel=0)
+
+
+class TestOrchestratorStageAgents:
+    """Test per-stage agent instances used for concurrent stages."""
+
+    def test_testing_stages_get_dedicated_agents(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that each testing stage gets its own QA tester instance."""
+        orchestrator = Orchestrator(path_config=isolated_agilevv_dir)
+
+        agents = [orchestrator._get_stage_agent(stage) for stage in TESTING_STAGES]
+
+        assert len({id(agent) for agent in agents}) == 3
+        assert all(type(agent).__name__ == "QATesterAgent" for agent in agents)
+        assert orchestrator._get_stage_agent(VModelStage.UNIT_TESTING) is agents[0]
+
+    def test_single_stage_agents_are_shared(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that stages with a dedicated agent type reuse the initialized agent."""
+        orchestrator = Orchestrator(path_config=isolated_agilevv_dir)
+        assert orchestrator._get_stage_agent(VModelStage.DESIGN) is orchestrator.agents["architect"]
+
+    def test_stage_graph_loaded_from_config(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that the orchestrator reads dependency overrides from config.yaml."""
+        isolated_agilevv_dir.config_path.write_text(
+            "v_model:\n  stage_dependencies:\n    system_testing: [integration_testing]\n"
+        )
+        orchestrator = Orchestrator(path_config=isolated_agilevv_dir)
+        assert orchestrator.stage_graph.dependencies(VModelStage.SYSTEM_TESTING) == (
+            VModelStage.INTEGRATION_TESTING,
+        )
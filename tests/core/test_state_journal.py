@@ -0,0 +1,288 @@
+"""Tests for the append-only project state journal."""
+
+import json
+from typing import Any
+
+import pytest
+from tests.conftest import build_orchestrator_config
+from typer.testing import CliRunner
+from verifflowcc.cli import app
+from verifflowcc.core.orchestrator import Orchestrator
+from verifflowcc.core.path_config import PathConfig
+from verifflowcc.core.state_journal import SEQ_KEY, StateJournal, apply_ops, diff_state
+from verifflowcc.core.state_store import (
+    load_project_state,
+    save_project_state,
+    update_project_state,
+)
+from verifflowcc.core.vmodel import VModelStage
+
+
+def journal_lines(path_config: PathConfig) -> list[dict[str, Any]]:
+    """Read the journal entries of a project."""
+    if not path_config.state_journal_path.exists():
+        return []
+    return [json.loads(line) for line in path_config.state_journal_path.read_text().splitlines()]
+
+
+class TestDiff:
+    """Test computing and applying state deltas."""
+
+    def test_roundtrip(self) -> None:
+        """Test that applying the diff of two states turns one into the other."""
+        old = {
+            "completed_stages": ["requirements"],
+            "stage_artifacts": {"requirements": {"stories": 3}},
+            "active_story": {"id": "S-1"},
+        }
+        new = {
+            "completed_stages": ["requirements", "design"],
+            "stage_artifacts": {"requirements": {"stories": 3}, "design": {"modules": 2}},
+        }
+
+        ops = diff_state(old, new)
+        apply_ops(old, ops)
+
+        assert old == new
+        assert ["extend", ["completed_stages"], ["design"]] in ops
+        assert ["set", ["stage_artifacts", "design"], {"modules": 2}] in ops
+        assert ["del", ["active_story"]] in ops
+
+    def test_unchanged_history_is_not_repeated(self) -> None:
+        """Test that the delta does not include unchanged parts of the state."""
+        history = {f"stage-{i}": {"output": "x" * 1000} for i in range(50)}
+        old = {"stage_artifacts": history, "current_stage": "design"}
+        new = {"stage_artifacts": history, "current_stage": "coding"}
+
+        assert diff_state(old, new) == [["set", ["current_stage"], "coding"]]
+
+    def test_only_changed_keys_are_compared(self) -> None:
+        """Test that keys left out of the changed ones are not compared."""
+        old = {"stage_artifacts": {"design": 1}, "current_stage": "design", "active_story": "S-1"}
+        new = {"stage_artifacts": {"design": 2}, "current_stage": "coding"}
+
+        ops = diff_state(old, new, keys=["current_stage", "active_story"])
+
+        assert ops == [["del", ["active_story"]], ["set", ["current_stage"], "coding"]]
+
+
+class TestStateJournal:
+    """Test persisting state as a snapshot plus journal."""
+
+    def test_saves_append_deltas(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that saves after the first append to the journal only."""
+        journal = StateJournal.for_project(isolated_agilevv_dir)
+        state: dict[str, Any] = {"completed_stages": [], "current_stage": "planning"}
+        journal.save(state)
+        snapshot = isolated_agilevv_dir.state_path.read_text()
+
+        state["completed_stages"].append("requirements")
+        journal.save(state)
+        state["current_stage"] = "design"
+        journal.save(state)
+        journal.save(state)  # nothing changed
+
+        assert isolated_agilevv_dir.state_path.read_text() == snapshot
+        assert [entry["seq"] for entry in journal_lines(isolated_agilevv_dir)] == [1, 2]
+        assert StateJournal.for_project(isolated_agilevv_dir).load() == state
+
+    def test_compaction(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that the journal is folded into state.json every compact_every saves."""
+        journal = StateJournal.for_project(isolated_agilevv_dir, compact_every=2)
+        state: dict[str, Any] = {"count": 0}
+        journal.save(state)
+
+        for count in range(1, 4):
+            state["count"] = count
+            journal.save(state)
+
+        snapshot = json.loads(isolated_agilevv_dir.state_path.read_text())
+        assert snapshot == {"count": 3, SEQ_KEY: 2}
+        assert journal_lines(isolated_agilevv_dir) == []
+        assert StateJournal.for_project(isolated_agilevv_dir).load() == {"count": 3}
+
+    def test_entries_in_snapshot_are_not_replayed(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that a crash between snapshot and truncation applies nothing twice."""
+        isolated_agilevv_dir.state_path.write_text(
+            json.dumps({"completed_stages": ["requirements"], SEQ_KEY: 1})
+        )
+        isolated_agilevv_dir.state_journal_path.write_text(
+            json.dumps({"seq": 1, "ops": [["extend", ["completed_stages"], ["requirements"]]]})
+            + "\n"
+        )
+
+        state = StateJournal.for_project(isolated_agilevv_dir).load()
+
+        assert state == {"completed_stages": ["requirements"]}
+
+    def test_torn_last_entry_is_ignored(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that a partially written entry does not prevent loading."""
+        journal = StateJournal.for_project(isolated_agilevv_dir)
+        journal.save({"stage": "requirements"})
+        journal.save({"stage": "design"})
+        with isolated_agilevv_dir.state_journal_path.open("a") as f:
+            f.write('{"seq": 2, "ops": [["set", ["sta')
+
+        assert StateJournal.for_project(isolated_agilevv_dir).load() == {"stage": "design"}
+
+    def test_external_snapshot_supersedes_journal(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that a state.json written without the journal wins over a stale journal."""
+        journal = StateJournal.for_project(isolated_agilevv_dir)
+        journal.save({"stage": "requirements"})
+        journal.save({"stage": "design"})
+        isolated_agilevv_dir.state_path.write_text(json.dumps({"stage": "restored"}))
+
+        reloaded = StateJournal.for_project(isolated_agilevv_dir)
+        assert reloaded.load() == {"stage": "restored"}
+
+        reloaded.save({"stage": "coding"})
+        assert journal_lines(isolated_agilevv_dir) == []
+        assert load_project_state(isolated_agilevv_dir) == {"stage": "coding"}
+
+    def test_writers_keep_each_others_changes(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that appends and compactions re-apply their changes to the state on disk."""
+        first = StateJournal.for_project(isolated_agilevv_dir)
+        first.load()
+        state: dict[str, Any] = {"checkpoint_history": [], "stage": "requirements"}
+        first.save(state)
+
+        second = StateJournal.for_project(isolated_agilevv_dir)
+        other = second.load()
+        assert other is not None
+        other["checkpoint_history"].append("cp-other")
+        second.save(other)
+
+        state["stage"] = "design"
+        first.save(state)
+        assert load_project_state(isolated_agilevv_dir) == {
+            "checkpoint_history": ["cp-other"],
+            "stage": "design",
+        }
+
+        state["checkpoint_history"].append("cp-first")
+        first.save(state, compact=True)
+        assert journal_lines(isolated_agilevv_dir) == []
+        assert load_project_state(isolated_agilevv_dir) == {
+            "checkpoint_history": ["cp-other", "cp-first"],
+            "stage": "design",
+        }
+
+    def test_missing_state(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that loading a project without state fails clearly."""
+        isolated_agilevv_dir.state_path.unlink(missing_ok=True)
+        with pytest.raises(FileNotFoundError):
+            load_project_state(isolated_agilevv_dir)
+
+
+class TestOrchestratorJournal:
+    """Test the journal as used by the orchestrator and the CLI."""
+
+    @pytest.mark.asyncio
+    async def test_stage_saves_are_journaled(
+        self, make_orchestrator: Any, isolated_agilevv_dir: PathConfig
+    ) -> None:
+        """Test that stage transitions append to the journal and replay on load."""
+        # Flush every save on its own instead of coalescing them
+        orchestrator = make_orchestrator(state={"flush_window": 0})
+        orchestrator._save_state()
+        snapshot = isolated_agilevv_dir.state_path.read_text()
+
+        await orchestrator.execute_stage(VModelStage.REQUIREMENTS, {})
+        await orchestrator.execute_stage(VModelStage.DESIGN, {})
+
+        assert isolated_agilevv_dir.state_path.read_text() == snapshot
+        entries = journal_lines(isolated_agilevv_dir)
+        assert len(entries) == 2
+        assert "requirements" not in json.dumps(entries[1])
+
+        reloaded = Orchestrator(
+            path_config=isolated_agilevv_dir, config=build_orchestrator_config()
+        )
+        assert reloaded.state["completed_stages"] == ["requirements", "design"]
+        assert reloaded.get_stage_artifacts("design") == {"summary": "design done"}
+
+    @pytest.mark.asyncio
+    async def test_stage_saves_only_diff_changed_keys(
+        self, make_orchestrator: Any, isolated_agilevv_dir: PathConfig
+    ) -> None:
+        """Test that a stage save hands the store the keys it changed, not the whole state."""
+        orchestrator = make_orchestrator(state={"flush_window": 0})
+        orchestrator._save_state()
+        save_job = orchestrator.state_store.save_job
+        changed_keys: list[Any] = []
+
+        def recording_save_job(
+            state: dict[str, Any], compact: bool = False, changed: Any = None
+        ) -> Any:
+            changed_keys.append(changed)
+            return save_job(state, compact, changed)
+
+        orchestrator.state_store.save_job = recording_save_job  # type: ignore[method-assign]
+        await orchestrator.execute_stage(VModelStage.REQUIREMENTS, {})
+
+        assert changed_keys
+        assert all(keys is not None for keys in changed_keys)
+        assert "stage_artifacts" in changed_keys[-1]
+        assert "checkpoint_history" not in changed_keys[-1]
+        reloaded = Orchestrator(
+            path_config=isolated_agilevv_dir, config=build_orchestrator_config()
+        )
+        assert reloaded.get_stage_artifacts("requirements") == {"summary": "requirements done"}
+
+    @pytest.mark.asyncio
+    async def test_sprint_end_compacts(
+        self, make_orchestrator: Any, isolated_agilevv_dir: PathConfig
+    ) -> None:
+        """Test that state.json is complete once a sprint finishes."""
+        orchestrator = make_orchestrator()
+
+        await orchestrator.run_sprint({"id": "S-1", "title": "Login"})
+
+        assert journal_lines(isolated_agilevv_dir) == []
+        state = json.loads(isolated_agilevv_dir.state_path.read_text())
+        assert len(state["completed_stages"]) == len(list(VModelStage))
+
+    @pytest.mark.asyncio
+    async def test_sprint_end_keeps_checkpoints_of_other_processes(
+        self, make_orchestrator: Any, isolated_agilevv_dir: PathConfig
+    ) -> None:
+        """Test that the sprint-end compaction keeps state written by another writer."""
+        orchestrator = make_orchestrator()
+        orchestrator._save_state()
+        await orchestrator.flush()
+        with update_project_state(isolated_agilevv_dir) as state:
+            state["checkpoint_history"].append({"name": "cp-other"})
+
+        await orchestrator.run_sprint({"id": "S-1", "title": "Login"})
+
+        assert journal_lines(isolated_agilevv_dir) == []
+        snapshot = json.loads(isolated_agilevv_dir.state_path.read_text())
+        assert {"name": "cp-other"} in snapshot["checkpoint_history"]
+        assert len(snapshot["completed_stages"]) == len(list(VModelStage))
+
+    def test_journal_can_be_disabled(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that state.journal: false rewrites state.json on every save."""
+        orchestrator = Orchestrator(
+            path_config=isolated_agilevv_dir,
+            config=build_orchestrator_config(state={"journal": False}),
+        )
+        orchestrator._save_state()
+        orchestrator.state["sprint_number"] = 7
+        orchestrator._save_state()
+
+        assert journal_lines(isolated_agilevv_dir) == []
+        assert json.loads(isolated_agilevv_dir.state_path.read_text())["sprint_number"] == 7
+
+    def test_cli_status_reads_journaled_state(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that vv status shows changes not yet compacted into state.json."""
+        save_project_state(isolated_agilevv_dir, {"current_sprint": "Sprint 1"})
+        journal = StateJournal.for_project(isolated_agilevv_dir)
+        journal.load()
+        journal.save({"current_sprint": "Sprint 2"})
+
+        result = CliRunner().invoke(
+            app, ["status", "--dir", str(isolated_agilevv_dir.base_dir), "--json"]
+        )
+
+        assert result.exit_code == 0
+        assert "Sprint 2" in result.output
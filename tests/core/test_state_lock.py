@@ -0,0 +1,167 @@
+"""Tests for cross-process locking of project state."""
+
+import os
+import subprocess
+import sys
+import textwrap
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+import pytest
+import verifflowcc
+from tests.conftest import build_orchestrator_config
+from typer.testing import CliRunner
+from verifflowcc.cli import app
+from verifflowcc.core.orchestrator import Orchestrator
+from verifflowcc.core.path_config import PathConfig
+from verifflowcc.core.state_journal import StateJournal
+from verifflowcc.core.state_lock import StateLockTimeoutError, lock_for
+from verifflowcc.core.state_store import (
+    load_project_state,
+    save_project_state,
+    update_project_state,
+)
+
+
+@contextmanager
+def lock_held_elsewhere(path_config: PathConfig, seconds: float) -> Iterator[subprocess.Popen[str]]:
+    """Hold the state lock of a project in another process for a while."""
+    ready = path_config.base_dir / "locked"
+    script = textwrap.dedent(
+        f"""
+        import time
+        from pathlib import Path
+        from verifflowcc.core.path_config import PathConfig
+        from verifflowcc.core.state_lock import lock_for
+
+        path_config = PathConfig(Path({str(path_config.base_dir)!r}))
+        with lock_for(path_config).exclusive():
+            Path({str(ready)!r}).touch()
+            time.sleep({seconds})
+        """
+    )
+    env = {**os.environ, "PYTHONPATH": str(Path(verifflowcc.__file__).parents[1])}
+    process = subprocess.Popen([sys.executable, "-c", script], env=env, text=True)
+    try:
+        deadline = time.monotonic() + 10
+        while not ready.exists():
+            assert process.poll() is None, "lock holder exited early"
+            assert time.monotonic() < deadline, "lock holder did not start"
+            time.sleep(0.01)
+        yield process
+    finally:
+        process.wait(timeout=10)
+
+
+class TestStateLock:
+    """Test the exclusive lock shared by writers."""
+
+    def test_writers_of_other_processes_wait(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that a writer waits for another process and reports the wait."""
+        lock = lock_for(isolated_agilevv_dir)
+
+        with lock_held_elsewhere(isolated_agilevv_dir, 0.3), lock.exclusive():
+            assert lock.held
+
+        stats = lock.get_stats()
+        assert stats["contended"] == 1
+        assert stats["max_wait_seconds"] >= 0.1
+
+    def test_timeout(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that a writer gives up once the timeout expires."""
+        lock = lock_for(isolated_agilevv_dir)
+
+        with lock_held_elsewhere(isolated_agilevv_dir, 5.0) as holder:
+            with pytest.raises(StateLockTimeoutError):
+                with lock.exclusive(timeout=0.05):
+                    pass
+            holder.kill()
+
+        assert not lock.held
+
+    def test_shared_and_reentrant_within_a_process(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that stores of one process share a reentrant lock."""
+        save_project_state(isolated_agilevv_dir, {"sprint_number": 0})
+        lock = lock_for(isolated_agilevv_dir)
+        assert lock_for(PathConfig(isolated_agilevv_dir.base_dir)) is lock
+
+        with lock.exclusive(), update_project_state(isolated_agilevv_dir) as state:
+            state["sprint_number"] = 3
+
+        assert not lock.held
+        assert load_project_state(isolated_agilevv_dir)["sprint_number"] == 3
+
+
+class TestLockFreeReads:
+    """Test reading state without the lock while it is written."""
+
+    def test_read_racing_a_compaction_is_retried(
+        self, isolated_agilevv_dir: PathConfig, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a stale snapshot read with a newer journal is not returned."""
+        journal = StateJournal.for_project(isolated_agilevv_dir)
+        journal.save({"step": 0})
+        stale_snapshot = journal.snapshot_path.read_text()
+        journal.save({"step": 1})
+        journal.save({"step": 2}, compact=True)
+        journal.save({"step": 3})
+
+        # The first read sees the snapshot as it was before the compaction
+        read_text = Path.read_text
+        stale_reads = [stale_snapshot]
+
+        def racing_read_text(path: Path, *args: Any, **kwargs: Any) -> str:
+            if path == journal.snapshot_path and stale_reads:
+                return stale_reads.pop()
+            return read_text(path, *args, **kwargs)
+
+        monkeypatch.setattr(Path, "read_text", racing_read_text)
+
+        assert StateJournal.for_project(isolated_agilevv_dir).load() == {"step": 3}
+        assert not stale_reads
+
+    def test_status_does_not_wait_for_writers(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that vv status reads while another process holds the lock."""
+        save_project_state(isolated_agilevv_dir, {"sprint_number": 0})
+        with lock_held_elsewhere(isolated_agilevv_dir, 5.0) as holder:
+            started = time.monotonic()
+            result = CliRunner().invoke(
+                app, ["status", "--dir", str(isolated_agilevv_dir.base_dir), "--json"]
+            )
+            elapsed = time.monotonic() - started
+            holder.kill()
+
+        assert result.exit_code == 0
+        assert elapsed < 2.0
+
+
+class TestOrchestratorLocking:
+    """Test lock statistics reported by the orchestrator."""
+
+    @pytest.mark.asyncio
+    async def test_lock_wait_reported_in_status(
+        self, make_orchestrator: Any, isolated_agilevv_dir: PathConfig
+    ) -> None:
+        """Test that lock statistics reach state.json and vv status."""
+        orchestrator = make_orchestrator()
+
+        await orchestrator.run_sprint({"id": "S-1", "title": "Login"})
+
+        assert orchestrator.get_status()["state_lock"]["acquisitions"] > 0
+        assert "state_lock" in load_project_state(isolated_agilevv_dir)
+        result = CliRunner().invoke(
+            app, ["status", "--dir", str(isolated_agilevv_dir.base_dir)], terminal_width=200
+        )
+        assert "State Lock Wait" in result.output
+
+    def test_lock_timeout_from_config(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that state.lock_timeout configures the project's lock."""
+        Orchestrator(
+            path_config=isolated_agilevv_dir,
+            config=build_orchestrator_config(state={"lock_timeout": 5}),
+        )
+
+        assert lock_for(isolated_agilevv_dir).timeout == 5
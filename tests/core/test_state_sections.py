@@ -0,0 +1,200 @@
+"""Tests for loading sections of the project state on their own."""
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+import yaml
+from typer.testing import CliRunner
+from verifflowcc.cli import app
+from verifflowcc.core.path_config import PathConfig
+from verifflowcc.core.sqlite_store import SQLiteStateStore
+from verifflowcc.core.state_journal import SECTIONS_SEQ_FILE, StateJournal
+from verifflowcc.core.state_store import load_project_sections, section_of
+
+STATE: dict[str, Any] = {
+    "current_stage": "design",
+    "sprint_number": 2,
+    "stage_artifacts": {"requirements": {"stories": 3}},
+    "session_state": {"requirements": {"session_id": "abc"}},
+    "agent_metrics": {"requirements": {"executions": 1}},
+    "quality_gates": {"requirements": {"passed": True}},
+    "checkpoint_history": [{"name": "cp-1"}],
+}
+
+
+def section_mtimes(path_config: PathConfig) -> dict[str, int]:
+    """Get the modification times of the section files of a project."""
+    return {
+        path.stem: path.stat().st_mtime_ns for path in path_config.state_sections_dir.glob("*.json")
+    }
+
+
+class TestSections:
+    """Test the assignment of state keys to sections."""
+
+    def test_section_of(self) -> None:
+        """Test that known keys have their section and others are in the summary."""
+        assert section_of("stage_artifacts") == "artifacts"
+        assert section_of("agent_metrics") == "metrics"
+        assert section_of("checkpoint_history") == "checkpoints"
+        assert section_of("sprint_number") == "summary"
+
+    def test_unknown_section(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that an unknown section is reported."""
+        StateJournal.for_project(isolated_agilevv_dir).save(STATE, compact=True)
+
+        with pytest.raises(ValueError, match="history"):
+            load_project_sections(isolated_agilevv_dir, ["history"])
+
+
+class TestJournalSections:
+    """Test the section files written by the journal."""
+
+    def test_sections_match_state(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that the sections hold the keys of the state after compactions and appends."""
+        journal = StateJournal.for_project(isolated_agilevv_dir)
+        journal.save(STATE, compact=True)
+        journal.save({**STATE, "sprint_number": 3})
+
+        summary = load_project_sections(isolated_agilevv_dir, ["summary"])
+        metrics = load_project_sections(isolated_agilevv_dir, ["metrics", "gates"])
+
+        assert summary == {"current_stage": "design", "sprint_number": 3}
+        assert metrics == {
+            "agent_metrics": STATE["agent_metrics"],
+            "quality_gates": STATE["quality_gates"],
+        }
+
+    def test_only_changed_sections_are_rewritten(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that an append leaves the files of unchanged sections alone."""
+        journal = StateJournal.for_project(isolated_agilevv_dir)
+        journal.save(STATE, compact=True)
+        before = section_mtimes(isolated_agilevv_dir)
+
+        journal.save({**STATE, "agent_metrics": {"requirements": {"executions": 2}}})
+
+        after = section_mtimes(isolated_agilevv_dir)
+        assert after["artifacts"] == before["artifacts"]
+        assert after["gates"] == before["gates"]
+        assert after["summary"] == before["summary"]
+        assert after["metrics"] != before["metrics"]
+
+    def test_checkpoints_are_not_in_summary(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that recording checkpoints leaves the summary alone."""
+        journal = StateJournal.for_project(isolated_agilevv_dir)
+        journal.save(STATE, compact=True)
+        before = section_mtimes(isolated_agilevv_dir)
+
+        history = [*STATE["checkpoint_history"], {"name": "cp-2"}]
+        journal.save({**STATE, "checkpoint_history": history})
+
+        after = section_mtimes(isolated_agilevv_dir)
+        assert after["summary"] == before["summary"]
+        assert after["checkpoints"] != before["checkpoints"]
+        assert "checkpoint_history" not in load_project_sections(isolated_agilevv_dir, ["summary"])
+        assert load_project_sections(isolated_agilevv_dir, ["checkpoints"]) == {
+            "checkpoint_history": history
+        }
+
+    def test_missing_sections_fall_back_to_full_state(
+        self, isolated_agilevv_dir: PathConfig
+    ) -> None:
+        """Test that a state.json without section files is still readable."""
+        isolated_agilevv_dir.state_path.write_text(json.dumps(STATE))
+
+        assert load_project_sections(isolated_agilevv_dir, ["summary"]) == {
+            "current_stage": "design",
+            "sprint_number": 2,
+        }
+
+    def test_replaced_snapshot_is_not_shadowed(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that sections of a snapshot replaced from outside are ignored."""
+        StateJournal.for_project(isolated_agilevv_dir).save(STATE, compact=True)
+
+        isolated_agilevv_dir.state_path.write_text(json.dumps({"sprint_number": 9}))
+
+        assert load_project_sections(isolated_agilevv_dir, ["summary"]) == {"sprint_number": 9}
+
+    def test_stale_sections_are_repaired(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that sections behind the journal are rewritten by the next writer."""
+        journal = StateJournal.for_project(isolated_agilevv_dir)
+        journal.save(STATE, compact=True)
+        sections_dir = isolated_agilevv_dir.state_sections_dir
+        written = {
+            path: path.read_text()
+            for path in (sections_dir / "gates.json", sections_dir / SECTIONS_SEQ_FILE)
+        }
+        journal.save({**STATE, "quality_gates": {}})
+        # A crash after the journal append left the gates section behind
+        for path, text in written.items():
+            path.write_text(text)
+
+        writer = StateJournal.for_project(isolated_agilevv_dir)
+        state = writer.load()
+        assert state is not None
+        writer.save({**state, "sprint_number": 4})
+
+        assert load_project_sections(isolated_agilevv_dir, ["gates", "summary"]) == {
+            "quality_gates": {},
+            "current_stage": "design",
+            "sprint_number": 4,
+        }
+
+
+class TestSQLiteSections:
+    """Test loading sections from the sqlite backend."""
+
+    def test_only_section_rows_are_read(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that the rows of other sections are not returned."""
+        store = SQLiteStateStore(isolated_agilevv_dir)
+        store.load()
+        store.save(STATE, compact=True)
+
+        assert store.load_sections(["artifacts"]) == {"stage_artifacts": STATE["stage_artifacts"]}
+        store.close()
+
+
+class TestStatusSections:
+    """Test that vv status reads only the sections it shows."""
+
+    def test_status_skips_stage_outputs(
+        self, isolated_agilevv_dir: PathConfig, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that the artifacts section and the full state are not read."""
+        journal = StateJournal.for_project(isolated_agilevv_dir)
+        journal.save(STATE, compact=True)
+        journal.save({**STATE, "sprint_number": 3})
+        read_text = Path.read_text
+        read: list[str] = []
+
+        def recording_read_text(path: Path, *args: Any, **kwargs: Any) -> str:
+            read.append(path.name)
+            return read_text(path, *args, **kwargs)
+
+        monkeypatch.setattr(Path, "read_text", recording_read_text)
+        result = CliRunner().invoke(
+            app, ["status", "--dir", str(isolated_agilevv_dir.base_dir), "--json"]
+        )
+
+        assert result.exit_code == 0
+        assert json.loads(result.output)["sprint_number"] == 3
+        assert "artifacts.json" not in read
+        assert isolated_agilevv_dir.state_path.name not in read
+
+    def test_status_on_sqlite_backend(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that vv status reads sections from the sqlite backend."""
+        isolated_agilevv_dir.config_path.write_text(yaml.dump({"state": {"backend": "sqlite"}}))
+        store = SQLiteStateStore(isolated_agilevv_dir)
+        store.load()
+        store.save(STATE, compact=True)
+        store.close()
+
+        result = CliRunner().invoke(
+            app, ["status", "--dir", str(isolated_agilevv_dir.base_dir), "--json"]
+        )
+
+        assert result.exit_code == 0
+        assert json.loads(result.output)["agent_metrics"] == STATE["agent_metrics"]
+        assert "stage_artifacts" not in json.loads(result.output)
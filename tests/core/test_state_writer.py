@@ -0,0 +1,146 @@
+"""Tests for atomic and debounced state writing."""
+
+import asyncio
+import signal
+from pathlib import Path
+
+import pytest
+from tests.conftest import build_orchestrator_config
+from verifflowcc import cli
+from verifflowcc.core.orchestrator import Orchestrator
+from verifflowcc.core.path_config import PathConfig
+from verifflowcc.core.state_writer import DebouncedFlush, flush_all_pending, write_atomic
+
+CONFIG = build_orchestrator_config(state={"flush_window": 60})
+
+
+def journal_lines(path_config: PathConfig) -> list[str]:
+    """Read the raw journal entries of a project."""
+    if not path_config.state_journal_path.exists():
+        return []
+    return path_config.state_journal_path.read_text().splitlines()
+
+
+class TestWriteAtomic:
+    """Test replacing files atomically."""
+
+    def test_replaces_content(self, tmp_path: Path) -> None:
+        """Test that the file holds the new content and no temporary file is left."""
+        path = tmp_path / "state" / "state.json"
+        write_atomic(path, "old")
+        write_atomic(path, "new")
+
+        assert path.read_text() == "new"
+        assert [p.name for p in path.parent.iterdir()] == ["state.json"]
+
+    def test_failed_write_keeps_previous_content(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a write interrupted before the rename leaves the file untouched."""
+        path = tmp_path / "state.json"
+        write_atomic(path, "old")
+
+        def crash(fd: int) -> None:
+            raise OSError("disk full")
+
+        monkeypatch.setattr("os.fsync", crash)
+        with pytest.raises(OSError, match="disk full"):
+            write_atomic(path, "new")
+
+        assert path.read_text() == "old"
+        assert [p.name for p in tmp_path.iterdir()] == ["state.json"]
+
+
+class TestDebouncedFlush:
+    """Test coalescing save requests."""
+
+    @pytest.mark.asyncio
+    async def test_requests_in_window_coalesce(self) -> None:
+        """Test that a burst of requests is flushed once, at the end of the window."""
+        flushed: list[int] = []
+        flusher = DebouncedFlush(lambda: flushed.append(1), window=0.05)
+
+        for _ in range(5):
+            flusher.request()
+        assert flushed == []
+        assert flusher.pending
+
+        await asyncio.sleep(0.1)
+        assert flushed == [1]
+        assert flusher.requests == 5
+        assert not flusher.pending
+
+    @pytest.mark.asyncio
+    async def test_flush_is_a_barrier(self) -> None:
+        """Test that flush() writes a pending request right away, once."""
+        flushed: list[int] = []
+        flusher = DebouncedFlush(lambda: flushed.append(1), window=60)
+
+        flusher.request()
+        flusher.flush()
+        flusher.flush_pending()
+
+        assert flushed == [1]
+
+    def test_without_event_loop_flushes_immediately(self) -> None:
+        """Test that requests outside an event loop are not deferred."""
+        flushed: list[int] = []
+        flusher = DebouncedFlush(lambda: flushed.append(1), window=60)
+
+        flusher.request()
+        flusher.request()
+
+        assert flushed == [1, 1]
+
+    @pytest.mark.asyncio
+    async def test_flush_all_pending_drains(self) -> None:
+        """Test that flush_all_pending() writes pending saves and drains queued writes."""
+        calls: list[str] = []
+        flusher = DebouncedFlush(
+            lambda: calls.append("flush"), window=60, drain=lambda: calls.append("drain")
+        )
+        flusher.request()
+
+        flush_all_pending()
+
+        assert calls == ["flush", "drain"]
+        assert not flusher.pending
+
+
+class TestOrchestratorFlushing:
+    """Test debounced state saves in the orchestrator."""
+
+    @pytest.mark.asyncio
+    async def test_stage_saves_coalesce(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that saves within the window reach the journal as one entry."""
+        orchestrator = Orchestrator(path_config=isolated_agilevv_dir, config=CONFIG)
+        orchestrator._save_state(compact=True)
+
+        orchestrator.state["sprint_number"] = 1
+        orchestrator._save_state()
+        orchestrator.state["active_story"] = {"id": "S-1"}
+        orchestrator._save_state()
+        assert journal_lines(isolated_agilevv_dir) == []
+
+        await orchestrator.flush()
+
+        assert len(journal_lines(isolated_agilevv_dir)) == 1
+        reloaded = Orchestrator(path_config=isolated_agilevv_dir, config=CONFIG)
+        assert reloaded.state["active_story"] == {"id": "S-1"}
+
+    @pytest.mark.asyncio
+    async def test_signal_flushes_pipelined_writes(self, isolated_agilevv_dir: PathConfig) -> None:
+        """Test that SIGTERM writes pending state even when writes go to the background."""
+        config = build_orchestrator_config(state={"flush_window": 60}, pipeline={"enabled": True})
+        orchestrator = Orchestrator(path_config=isolated_agilevv_dir, config=config)
+        orchestrator._save_state(compact=True)
+        await orchestrator.flush()
+
+        orchestrator.state["sprint_number"] = 4
+        orchestrator._save_state()
+        with pytest.raises(SystemExit) as exc_info:
+            cli.handle_termination(signal.SIGTERM, None)
+
+        assert exc_info.value.code == 128 + signal.SIGTERM
+        reloaded = Orchestrator(path_config=isolated_agilevv_dir, config=CONFIG)
+        assert reloaded.state["sprint_number"] == 4
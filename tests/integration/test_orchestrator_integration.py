@@ -122,7 +122,8 @@ class TestOrchestratorErrorRecovery:
         await orchestrator.checkpoint(checkpoint_name)
 
         # Verify checkpoint was created
-        checkpoint_path = isolated_agilevv_dir.base_dir / "checkpoints" / f"{checkpoint_name}.json"
+        checkpoint_path = orchestrator.checkpoints.path_of(checkpoint_name)
+        assert checkpoint_path.parent == isolated_agilevv_dir.base_dir / "checkpoints"
         assert checkpoint_path.exists()
 
     @pytest.mark.asyncio
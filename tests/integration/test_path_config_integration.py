@@ -50,7 +50,8 @@ class TestOrchestratorPathConfigIntegration:
         checkpoint_name = "test-checkpoint"
         await orchestrator.checkpoint(checkpoint_name, "Test checkpoint")
 
-        checkpoint_file = isolated_agilevv_dir.checkpoints_dir / f"{checkpoint_name}.json"
+        checkpoint_file = orchestrator.checkpoints.path_of(checkpoint_name)
+        assert checkpoint_file.parent == isolated_agilevv_dir.checkpoints_dir
         assert checkpoint_file.exists()
 
     def test_orchestrator_load_state_with_path_config(
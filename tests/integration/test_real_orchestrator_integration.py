@@ -677,7 +677,8 @@ class TestRealOrchestratorErrorHandling:
         await orchestrator.checkpoint(checkpoint_name)
 
         # Verify checkpoint was created
-        checkpoint_path = isolated_agilevv_dir.base_dir / "checkpoints" / f"{checkpoint_name}.json"
+        checkpoint_path = orchestrator.checkpoints.path_of(checkpoint_name)
+        assert checkpoint_path.parent == isolated_agilevv_dir.base_dir / "checkpoints"
         assert checkpoint_path.exists()
 
         # Modify state to simulate progression
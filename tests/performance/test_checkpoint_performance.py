@@ -0,0 +1,141 @@
+"""Performance benchmarks for delta and compressed checkpoints.
+
+Compares the storage taken by a series of checkpoints and the time to restore
+them for several snapshot intervals, from full copies only (snapshot_every=1)
+to long delta chains, and for each compression, and the time to list many
+checkpoints. Run with ``-s`` to see the figures.
+"""
+
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+from verifflowcc.core.checkpoint_store import COMPRESSIONS, CheckpointStore
+
+CHECKPOINTS = 60
+INTERVALS = [1, 5, 10, 25]
+
+
+def project_state(step: int) -> dict[str, Any]:
+    """Build the project state at a checkpoint taken after each stage."""
+    return {
+        "current_stage": f"stage-{step % 8}",
+        "sprint_number": step // 8,
+        "completed_stages": [f"stage-{i % 8}" for i in range(step)],
+        "stage_artifacts": {
+            f"stage-{i}": {"path": f"outputs/{i:02x}/{i:064x}.json", "size": 412 + i}
+            for i in range(8)
+        },
+        "quality_gates": {
+            f"stage-{i}": {
+                "passed": True,
+                "quality_score": 0.9,
+                "issues": [f"issue {j} of sprint {step // 8}" for j in range(3)],
+            }
+            for i in range(8)
+        },
+        "agent_metrics": {
+            f"agent-{i}": {"executions": step, "successes": step, "avg_duration": 12.5}
+            for i in range(5)
+        },
+        "checkpoint_history": [
+            {"name": f"cp-{i:03d}", "timestamp": "2025-01-02T03:04:05"} for i in range(step)
+        ],
+    }
+
+
+def write_checkpoints(
+    checkpoints_dir: Path, snapshot_every: int, compression: str = "none"
+) -> CheckpointStore:
+    """Write a series of checkpoints."""
+    store = CheckpointStore(checkpoints_dir, snapshot_every, compression=compression)
+    for step in range(CHECKPOINTS):
+        store.save({"name": f"cp-{step:03d}", "state": project_state(step)})
+    return store
+
+
+def storage_size(store: CheckpointStore) -> int:
+    """Get the total size of the checkpoint files of a store."""
+    return sum(store.path_of(name).stat().st_size for name in store.names())
+
+
+def slowest_restore(store: CheckpointStore) -> float:
+    """Restore every checkpoint and get the longest time taken, in seconds."""
+    slowest = 0.0
+    for step in range(CHECKPOINTS):
+        started = time.perf_counter()
+        state = store.load(f"cp-{step:03d}")["state"]
+        slowest = max(slowest, time.perf_counter() - started)
+        assert state == project_state(step)
+    return slowest
+
+
+@pytest.mark.performance
+class TestDeltaCheckpoints:
+    """Storage and restore time of checkpoints for several intervals and compressions."""
+
+    def test_size_and_restore_trade_off(self, tmp_path: Path) -> None:
+        """Compare total size and worst restore time of each snapshot interval."""
+        figures: dict[int, tuple[int, float]] = {}
+        for snapshot_every in INTERVALS:
+            store = write_checkpoints(tmp_path / f"every-{snapshot_every}", snapshot_every)
+            reader = CheckpointStore(store.checkpoints_dir, snapshot_every)
+            figures[snapshot_every] = (storage_size(store), slowest_restore(reader))
+
+        print(f"\n{CHECKPOINTS} checkpoints")
+        for snapshot_every, (size, slowest) in figures.items():
+            print(
+                f"  snapshot every {snapshot_every:>2}: {size / 1e3:8.1f} kB, "
+                f"slowest restore {slowest * 1e3:6.2f} ms"
+            )
+
+        full_size = figures[1][0]
+        assert figures[10][0] < 0.4 * full_size
+        assert figures[25][0] < figures[5][0]
+
+    def test_compression_trade_off(self, tmp_path: Path) -> None:
+        """Compare total size and worst restore time of each compression."""
+        figures: dict[str, tuple[int, float]] = {}
+        for compression in COMPRESSIONS:
+            store = write_checkpoints(tmp_path / compression, 10, compression)
+            reader = CheckpointStore(store.checkpoints_dir, 10, compression=compression)
+            figures[compression] = (storage_size(store), slowest_restore(reader))
+
+        print(f"\n{CHECKPOINTS} checkpoints, snapshot every 10")
+        for compression, (size, slowest) in figures.items():
+            print(
+                f"  {compression:>5}: {size / 1e3:8.1f} kB, slowest restore {slowest * 1e3:6.2f} ms"
+            )
+
+        assert figures["gzip"][0] < 0.5 * figures["none"][0]
+        assert figures["lzma"][0] < 0.5 * figures["none"][0]
+
+
+@pytest.mark.performance
+class TestCheckpointManifest:
+    """Listing many checkpoints from the manifest."""
+
+    def test_listing_from_manifest(self, tmp_path: Path) -> None:
+        """Compare listing from the manifest with reading every checkpoint file."""
+        store = CheckpointStore(tmp_path, snapshot_every=10)
+        for step in range(1000):
+            store.save({"name": f"cp-{step:04d}", "state": {"sprint_number": step // 8}})
+
+        started = time.perf_counter()
+        indexed = store.entries()
+        manifest_time = time.perf_counter() - started
+        started = time.perf_counter()
+        scanned = store.rebuild_manifest()["checkpoints"]
+        scan_time = time.perf_counter() - started
+        started = time.perf_counter()
+        name = store.next_name()
+        naming_time = time.perf_counter() - started
+
+        print(
+            f"\n1000 checkpoints: manifest {manifest_time * 1e3:.1f} ms, "
+            f"reading every file {scan_time * 1e3:.1f} ms, naming {naming_time * 1e3:.1f} ms"
+        )
+        assert [entry["name"] for entry in indexed] == list(scanned)
+        assert name == "checkpoint_1001"
+        assert manifest_time < scan_time / 5
@@ -0,0 +1,144 @@
+"""Performance benchmarks for the codec of persisted JSON.
+
+Compares encode and decode throughput of the available codecs on documents
+shaped like what a sprint persists: the project state, a stage output record
+and the results of a large test suite. Run with ``-s`` to see the figures.
+"""
+
+import time
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+from verifflowcc.core import json_codec
+from verifflowcc.core.json_codec import JsonCodec, OrjsonCodec, StdlibCodec
+
+ROUNDS = 20
+
+
+def sprint_state(stages: int = 7) -> dict[str, Any]:
+    """Build a project state after a sprint."""
+    return {
+        "current_stage": "validation",
+        "sprint_number": 12,
+        "completed_stages": [f"stage-{i}" for i in range(stages)],
+        "quality_gates": {
+            f"stage-{i}": {"passed": True, "quality_score": 0.92, "issues": [], "warnings": []}
+            for i in range(stages)
+        },
+        "agent_metrics": {
+            f"agent-{i}": {"executions": 40, "successes": 38, "avg_duration": 12.5}
+            for i in range(5)
+        },
+        "checkpoint_history": [
+            {"name": f"checkpoint_{i:03d}", "timestamp": "2025-01-02T03:04:05"} for i in range(50)
+        ],
+    }
+
+
+def design_record(components: int = 40) -> dict[str, Any]:
+    """Build the persisted output record of a design stage."""
+    return {
+        "stage": "design",
+        "status": "success",
+        "gate": {"passed": True, "quality_score": 0.9, "issues": []},
+        "result": {
+            "design_data": {
+                "components": [
+                    {
+                        "name": f"Component{i}",
+                        "responsibility": "Handles part of the login flow " * 4,
+                        "interfaces": [f"Interface{i}.{j}" for j in range(5)],
+                        "dependencies": [f"Component{j}" for j in range(i % 6)],
+                    }
+                    for i in range(components)
+                ],
+                "interface_specifications": [
+                    {"name": f"Interface{i}", "methods": ["get", "put", "delete"]}
+                    for i in range(components)
+                ],
+            },
+        },
+    }
+
+
+def suite_results(cases: int = 3000) -> dict[str, Any]:
+    """Build the results of a large test suite."""
+    return {
+        "execution_summary": {"total": cases, "passed": cases - 12, "failed": 12},
+        "test_cases": [
+            {
+                "id": f"TC-{i:05d}",
+                "title": f"Login rejects invalid credentials variant {i}",
+                "status": "passed" if i % 250 else "failed",
+                "duration": 0.0125 * (i % 17),
+                "steps": ["open login page", "enter credentials", "submit", "check message"],
+            }
+            for i in range(cases)
+        ],
+    }
+
+
+DOCUMENTS: dict[str, Callable[[], dict[str, Any]]] = {
+    "state": sprint_state,
+    "design_record": design_record,
+    "suite_results": suite_results,
+}
+
+CODECS: list[type[JsonCodec]] = [StdlibCodec]
+if json_codec.orjson is not None:
+    CODECS.append(OrjsonCodec)
+
+
+def throughput(operation: Callable[[], Any], size: int) -> float:
+    """Measure the throughput of an operation in MB/s, best of ROUNDS runs."""
+    best = float("inf")
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        operation()
+        best = min(best, time.perf_counter() - started)
+    return size / max(best, 1e-9) / 1e6
+
+
+@pytest.mark.performance
+class TestJsonCodecThroughput:
+    """Throughput of the codecs on sprint documents."""
+
+    @pytest.mark.parametrize("document", list(DOCUMENTS))
+    def test_codec_throughput(self, document: str) -> None:
+        """Compare encode and decode throughput of every available codec."""
+        value = DOCUMENTS[document]()
+        figures: dict[str, dict[str, float]] = {}
+
+        for codec_class in CODECS:
+            codec = codec_class()
+            compact = codec.dumps(value)
+            size = len(compact.encode())
+            figures[codec.name] = {
+                "encode": throughput(lambda codec=codec: codec.dumps(value), size),
+                "encode_pretty": throughput(
+                    lambda codec=codec: codec.dumps(value, pretty=True), size
+                ),
+                "decode": throughput(lambda codec=codec, text=compact: codec.loads(text), size),
+            }
+            assert codec.loads(compact) == StdlibCodec().loads(StdlibCodec().dumps(value))
+
+        print(f"\n{document} ({size / 1e3:.0f} kB compact)")
+        for name, figure in figures.items():
+            print(
+                f"  {name:>6}: encode {figure['encode']:8.1f} MB/s, "
+                f"pretty {figure['encode_pretty']:8.1f} MB/s, "
+                f"decode {figure['decode']:8.1f} MB/s"
+            )
+
+        # Machine files used to be written pretty by the standard library
+        assert figures[json_codec.get_codec().name]["encode"] > figures["stdlib"]["encode_pretty"]
+
+    def test_compact_output_is_smaller(self) -> None:
+        """Test that compact machine files are smaller than pretty ones."""
+        value = design_record()
+
+        compact = json_codec.dumps(value)
+        pretty = json_codec.dumps(value, pretty=True)
+
+        assert len(compact) < 0.8 * len(pretty)
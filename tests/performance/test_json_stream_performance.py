@@ -0,0 +1,79 @@
+"""Performance benchmarks for partial loading of large JSON artifacts.
+
+Compares the time and peak Python memory of loading a large test results
+artifact whole with loading its execution summary only, and with walking its
+test cases one at a time. Partial loads use a fraction of the memory but are
+not faster than a whole load. Run with ``-s`` to see the figures.
+"""
+
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+from verifflowcc.core import json_codec, json_stream
+
+TEST_CASES = 20000
+
+
+def write_results(path: Path) -> None:
+    """Write the results of a suite with many test cases, summary last."""
+    results = {
+        "story_id": "US-001",
+        "test_cases": [
+            {
+                "id": f"TC-{i:05d}",
+                "name": f"test case {i} with a fairly descriptive name",
+                "steps": [f"step {j} of test case {i}" for j in range(5)],
+                "status": "passed" if i % 10 else "failed",
+                "duration": 0.25,
+            }
+            for i in range(TEST_CASES)
+        ],
+        "execution_summary": {"total_test_cases": TEST_CASES, "pass_rate": "90.0%"},
+    }
+    path.write_text(json_codec.dumps(results, pretty=True))
+
+
+def measure(load: Callable[[], Any]) -> tuple[float, int]:
+    """Get the time a load takes, in seconds, and its peak allocation.
+
+    Allocations are traced in a second run, tracing slowing the load down.
+    """
+    started = time.perf_counter()
+    load()
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    load()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+@pytest.mark.performance
+class TestPartialLoads:
+    """Time and peak memory of whole and partial loads."""
+
+    def test_memory_bounded_by_slice(self, tmp_path: Path) -> None:
+        """Compare loading the whole artifact with loading a key or walking an array."""
+        path = tmp_path / "US-001_results.json"
+        write_results(path)
+
+        figures = {
+            "whole": measure(lambda: json_codec.loads(path.read_bytes())),
+            "summary": measure(lambda: json_stream.load_keys(path, ["execution_summary"])),
+            "walk": measure(lambda: sum(1 for _ in json_stream.iter_array(path, "test_cases"))),
+        }
+
+        print(f"\n{TEST_CASES} test cases, {path.stat().st_size / 1e6:.1f} MB")
+        for name, (elapsed, peak) in figures.items():
+            print(f"  {name:>7}: {elapsed * 1e3:8.1f} ms, peak {peak / 1e6:7.2f} MB")
+
+        whole_elapsed, whole_peak = figures["whole"]
+        assert figures["summary"][1] < whole_peak / 20
+        assert figures["walk"][1] < whole_peak / 20
+        # Partial loads bound memory at a latency cost kept within a few full loads
+        assert figures["summary"][0] < whole_elapsed * 5
+        assert figures["walk"][0] < whole_elapsed * 10
@@ -6,11 +6,14 @@ and basic functionality that doesn't require SDK integration.
 
 import os
 from pathlib import Path
+from typing import Any
 
 import pytest
 from typer.testing import CliRunner
-from verifflowcc.cli import app
+from verifflowcc.cli import app, load_backlog_stories
+from verifflowcc.core.batch import normalize_stories, story_id_for
 from verifflowcc.core.path_config import PathConfig
+from verifflowcc.core.state_store import save_project_state
 
 
 @pytest.fixture
@@ -120,3 +123,90 @@ agents:
 
 
 # NOTE: Real CLI integration tests are implemented in test_real_cli_integration.py
+
+
+class TestCLIBatchSprint:
+    """Test batch sprint option handling."""
+
+    def test_sprint_requires_a_story(self, runner: CliRunner) -> None:
+        """Test that sprint fails when no story source is given."""
+        result = runner.invoke(app, ["sprint"])
+        assert result.exit_code == 1
+        assert "story" in result.output.lower()
+
+    def test_sprint_help_lists_batch_options(self, runner: CliRunner) -> None:
+        """Test that batch options are documented."""
+        result = runner.invoke(app, ["sprint", "--help"])
+        assert result.exit_code == 0
+        assert "--stories" in result.output
+        assert "--from-backlog" in result.output
+
+    def test_load_backlog_stories(self, tmp_path: Path) -> None:
+        """Test parsing open and completed stories from the backlog."""
+        backlog = tmp_path / "backlog.md"
+        backlog.write_text("# Backlog\n- [x] Done story\n- [ ] Open story\n- [ ] # heading\n")
+
+        all_stories = load_backlog_stories(backlog)
+        open_stories = load_backlog_stories(backlog, include_completed=False)
+
+        assert [s["title"] for s in all_stories] == ["Done story", "Open story"]
+        assert [s["title"] for s in open_stories] == ["Open story"]
+        # IDs follow the title, not the position in the backlog
+        assert open_stories[0]["id"] == all_stories[1]["id"] == story_id_for("Open story")
+
+    def test_adhoc_and_backlog_stories_combine(self, tmp_path: Path) -> None:
+        """Test that --stories and --from-backlog stories never collide on IDs."""
+        backlog = tmp_path / "backlog.md"
+        backlog.write_text("- [ ] Open story\n- [ ] Other story\n")
+
+        stories = normalize_stories(["Ad hoc story", *load_backlog_stories(backlog)])
+
+        assert len({story["id"] for story in stories}) == 3
+
+
+class TestSprintCommand:
+    """Test the single-story sprint command."""
+
+    def test_story_id_is_stable_across_sprints(
+        self, runner: CliRunner, isolated_agilevv_dir: PathConfig, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that re-running a story keeps its ID, which is part of the cache fingerprint."""
+        from verifflowcc.core.orchestrator import Orchestrator
+
+        stories: list[dict[str, Any]] = []
+
+        async def run_sprint(self: Orchestrator, story: dict[str, Any]) -> dict[str, Any]:
+            stories.append(story)
+            return {"sprint_number": len(stories), "stages": {}}
+
+        monkeypatch.setattr(Orchestrator, "run_sprint", run_sprint)
+        save_project_state(isolated_agilevv_dir, {"current_sprint": "Sprint 0"})
+        args = ["sprint", "--story", "Login", "--dir", str(isolated_agilevv_dir.base_dir)]
+
+        assert runner.invoke(app, args).exit_code == 0
+        assert runner.invoke(app, args).exit_code == 0
+
+        assert [story["id"] for story in stories] == [story_id_for("Login")] * 2
+
+    def test_sprint_uses_project_dir(
+        self, runner: CliRunner, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that vv sprint --dir runs in that project, where --resume looks for it."""
+        from verifflowcc.core.orchestrator import Orchestrator
+
+        base_dirs: list[Path] = []
+
+        async def run_sprint(self: Orchestrator, story: dict[str, Any]) -> dict[str, Any]:
+            base_dirs.append(self.path_config.base_dir)
+            return {"sprint_number": 1, "stages": {}}
+
+        monkeypatch.setattr(Orchestrator, "run_sprint", run_sprint)
+        # A project other than the one AGILEVV_BASE_DIR points to
+        project = PathConfig(base_dir=tmp_path / "project")
+        project.ensure_base_exists()
+        save_project_state(project, {"current_sprint": "Sprint 0"})
+
+        result = runner.invoke(app, ["sprint", "--story", "Login", "--dir", str(project.base_dir)])
+
+        assert result.exit_code == 0
+        assert base_dirs == [project.base_dir]
@@ -205,6 +205,7 @@ class ArchitectAgent(BaseAgent):
                         self.save_artifact(
                             f"design/diagrams/{story_id}_{component_name}.puml",
                             diagram_content,
+                            artifact_type="diagram",
                         )
 
             # Save interface specifications
@@ -296,30 +297,36 @@ package "{component_name}" as {component_name.lower()} {{
             story_id: Story identifier
             design_data: Generated design data
         """
+        arch_path = self.path_config.architecture_path
         try:
-            arch_path = self.path_config.architecture_path
+            update_content = self._generate_architecture_update(story_id, design_data)
+        except Exception as e:
+            logger.error(f"Error updating architecture documentation: {e}")
+            return
 
-            # Ensure parent directory exists
-            arch_path.parent.mkdir(parents=True, exist_ok=True)
+        # Read and written by the job, after the writes queued before it
+        def update() -> None:
+            try:
+                # Ensure parent directory exists
+                arch_path.parent.mkdir(parents=True, exist_ok=True)
 
-            # Read existing content or create new
-            if arch_path.exists():
-                current_content = arch_path.read_text()
-            else:
-                current_content = "# System Architecture\n\n"
+                # Read existing content or create new
+                if arch_path.exists():
+                    current_content = arch_path.read_text()
+                else:
+                    current_content = "# System Architecture\n\n"
 
-            # Generate update content
-            update_content = self._generate_architecture_update(story_id, design_data)
+                # Check if this story already has an entry
+                if f"## Design Update - {story_id}" not in current_content:
+                    # Append new content
+                    updated_content = current_content + f"\n{update_content}\n"
+                    arch_path.write_text(updated_content)
+                    logger.info(f"Updated architecture.md for story {story_id}")
 
-            # Check if this story already has an entry
-            if f"## Design Update - {story_id}" not in current_content:
-                # Append new content
-                updated_content = current_content + f"\n{update_content}\n"
-                arch_path.write_text(updated_content)
-                logger.info(f"Updated architecture.md for story {story_id}")
+            except Exception as e:
+                logger.error(f"Error updating architecture documentation: {e}")
 
-        except Exception as e:
-            logger.error(f"Error updating architecture documentation: {e}")
+        self._write(None, update)
 
     def _generate_architecture_update(self, story_id: str, design_data: dict[str, Any]) -> str:
         """Generate architecture documentation update content.
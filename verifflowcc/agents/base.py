@@ -1,24 +1,69 @@
 """Base Agent class for VeriFlowCC subagents."""
 
+import asyncio
+import functools
 import json
 import logging
+import time
 from abc import ABC, abstractmethod
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Awaitable, Callable, Iterable, Iterator
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 # Real Claude Code SDK integration only - no mock fallbacks
 from claude_code_sdk import ClaudeCodeOptions as SDKClaudeCodeOptions
 from claude_code_sdk import ClaudeSDKClient
 from jinja2 import Template
 
+from verifflowcc.core import json_codec, json_stream
+from verifflowcc.core.artifact_index import IndexedArtifact
+from verifflowcc.core.artifact_store import ArtifactStore
+from verifflowcc.core.concurrency import ERROR, SUCCESS, THROTTLED, TIMEOUT
 from verifflowcc.core.path_config import PathConfig
+from verifflowcc.core.rate_limiter import RateLimiter, estimate_tokens
+from verifflowcc.core.retry import RetryPolicy, RetryStats, retry_async
 from verifflowcc.core.sdk_config import SDKConfig, get_sdk_config
 
+if TYPE_CHECKING:
+    from verifflowcc.core.pipeline import BackgroundWriter
+
 SDK_AVAILABLE = True
 
 logger = logging.getLogger(__name__)
 
+# Prompt templates, relative to the working directory
+PROMPTS_DIR = Path("verifflowcc/prompts")
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_template(path: str, mtime_ns: int) -> Template:
+    """Read and compile a prompt template, cached until the file changes.
+
+    Args:
+        path: Template file path
+        mtime_ns: Modification time of the file, part of the cache key
+
+    Returns:
+        Compiled template
+    """
+    template: Template = Template(Path(path).read_text())
+    return template
+
+
+def warm_prompt_templates() -> int:
+    """Compile all prompt templates ahead of their first use.
+
+    Returns:
+        Number of templates compiled
+    """
+    if not PROMPTS_DIR.is_dir():
+        return 0
+
+    templates = sorted(PROMPTS_DIR.glob("*.j2"))
+    for template_path in templates:
+        _compile_template(str(template_path), template_path.stat().st_mtime_ns)
+    return len(templates)
+
 
 class BaseAgent(ABC):
     """Base class for all VeriFlowCC subagents using Claude Code SDK."""
@@ -47,6 +92,21 @@ class BaseAgent(ABC):
             raise RuntimeError("Claude Code SDK is required for VeriFlowCC agents")
         self.context: dict[str, Any] = {}
         self.session_history: list[dict[str, str]] = []
+        # Text streamed so far by the current SDK call, kept for timeouts
+        self.partial_response = ""
+        # Set by the orchestrator to publish streamed output as stage events
+        self.stream_listener: Callable[[str], Awaitable[None]] | None = None
+        # Transient SDK failures are retried; stats cover the current processing run
+        self.retry_policy = RetryPolicy.from_sdk_config(self.sdk_config)
+        self.retry_stats = RetryStats()
+        # Set by AgentFactory to share request and token limits between agents
+        self.rate_limiter: RateLimiter | None = None
+        self.rate_limit_wait_seconds = 0.0
+        # Whether an SDK call of the current run failed after its retries
+        self.sdk_failed = False
+        self._artifact_store: ArtifactStore | None = None
+        # Set by the orchestrator to write artifacts off the event loop
+        self.artifact_writer: BackgroundWriter | None = None
 
         # Get agent-specific configuration
         self.client_options = self.sdk_config.get_client_options(agent_type)
@@ -82,56 +142,187 @@ class BaseAgent(ABC):
                 "Claude Code SDK not available. Install with: pip install claude-code-sdk"
             )
 
+        async def attempt() -> str:
+            # Every attempt is a request of its own for the shared rate limits
+            if self.rate_limiter is None:
+                return await self._query_claude_sdk(prompt)
+            self.rate_limit_wait_seconds += await self.rate_limiter.acquire(estimate_tokens(prompt))
+            response = await self._query_claude_sdk(prompt)
+            self.rate_limiter.consume(estimate_tokens(response))
+            return response
+
         try:
-            # Create SDK-compatible options by filtering unsupported parameters
-            sdk_options: Any = None
-            if SDK_AVAILABLE:
-                # TODO: Full SDK parameter integration with real Claude Code SDK
-                # Several parameters are critical for production but currently incompatible:
-                # - max_tokens: Essential for cost control and response predictability
-                # - temperature: Controls response randomness/creativity
-                # - max_turns: Conversation turn limits
-                # - model: Specific Claude model selection
-                # - stream: Streaming response control
-                # - tools_enabled: Tool usage permissions
-                # Future integration should map these to SDK equivalents
-
-                # Currently use minimal SDK options until full integration
-                # Only pass parameters that we know the real SDK accepts
-                try:
-                    # Try with minimal configuration first
-                    sdk_options = SDKClaudeCodeOptions()
-                except TypeError:
-                    # Fallback to no options if constructor doesn't accept any
-                    sdk_options = None
+            return await retry_async(attempt, self.retry_policy, self.retry_stats)
+        except Exception as e:
+            self.sdk_failed = True
+            logger.error(f"Error calling Claude SDK for agent {self.name}: {e}")
+            raise
 
-            async with ClaudeSDKClient(options=sdk_options) as client:
-                await client.query(prompt)
+    async def _query_claude_sdk(self, prompt: str) -> str:
+        """Send a prompt to Claude Code SDK once and collect the response.
 
-                response_parts: list[str] = []
-                async for message in client.receive_response():
-                    # Handle different message types properly
-                    if hasattr(message, "type") and message.type == "text":
-                        content = getattr(message, "content", "")
-                        response_parts.append(content)
-                    elif isinstance(message, dict):
-                        if message.get("type") == "text":
-                            response_parts.append(message.get("content", ""))
+        Args:
+            prompt: The prompt to send to Claude
 
-                response = "".join(response_parts)
+        Returns:
+            Response from Claude
+        """
+        # Create SDK-compatible options by filtering unsupported parameters
+        sdk_options: Any = None
+        if SDK_AVAILABLE:
+            # TODO: Full SDK parameter integration with real Claude Code SDK
+            # Several parameters are critical for production but currently incompatible:
+            # - max_tokens: Essential for cost control and response predictability
+            # - temperature: Controls response randomness/creativity
+            # - max_turns: Conversation turn limits
+            # - model: Specific Claude model selection
+            # - stream: Streaming response control
+            # - tools_enabled: Tool usage permissions
+            # Future integration should map these to SDK equivalents
+
+            # Currently use minimal SDK options until full integration
+            # Only pass parameters that we know the real SDK accepts
+            try:
+                # Try with minimal configuration first
+                sdk_options = SDKClaudeCodeOptions()
+            except TypeError:
+                # Fallback to no options if constructor doesn't accept any
+                sdk_options = None
+
+        async with ClaudeSDKClient(options=sdk_options) as client:
+            await client.query(prompt)
+
+            response_parts: list[str] = []
+            self.partial_response = ""
+            async for message in client.receive_response():
+                # Handle different message types properly
+                content = None
+                if hasattr(message, "type") and message.type == "text":
+                    content = getattr(message, "content", "")
+                elif isinstance(message, dict):
+                    if message.get("type") == "text":
+                        content = message.get("content", "")
+                if content is None:
+                    continue
+                response_parts.append(content)
+                self.partial_response += content
+                if self.stream_listener is not None:
+                    await self.stream_listener(content)
+
+            response = "".join(response_parts)
+
+            # Store in session history
+            self.session_history.append({"role": "user", "content": prompt})
+            self.session_history.append({"role": "assistant", "content": response})
+
+            return response
 
-                # Store in session history
-                self.session_history.append({"role": "user", "content": prompt})
-                self.session_history.append({"role": "assistant", "content": response})
+        # This should never be reached, but satisfies mypy
+        return ""
 
-                return response
+    def get_timeout(self) -> float:
+        """Get the deadline for one processing run of this agent in seconds."""
+        return float(self.sdk_config.get_agent_timeout(self.agent_type))
 
-        except Exception as e:
-            logger.error(f"Error calling Claude SDK for agent {self.name}: {e}")
-            raise
+    async def process_with_timeout(
+        self, input_data: dict[str, Any], timeout: float | None = None
+    ) -> dict[str, Any]:
+        """Run process() under a deadline.
 
-        # This should never be reached, but satisfies mypy
-        return ""
+        When the deadline expires the processing task is cancelled, which
+        closes the underlying Claude Code SDK client, and a timeout result
+        carrying the partial streamed output is returned instead of raising.
+
+        Args:
+            input_data: Input data for the agent
+            timeout: Deadline in seconds, defaults to get_timeout()
+
+        Returns:
+            Agent output, or a timeout result with status "timeout", with the
+            retry and rate limiting metrics of the run
+        """
+        deadline = timeout if timeout is not None else self.get_timeout()
+        self.partial_response = ""
+        self.retry_stats = RetryStats()
+        self.rate_limit_wait_seconds = 0.0
+        self.sdk_failed = False
+        start = time.monotonic()
+
+        try:
+            result = await asyncio.wait_for(self.process(input_data), timeout=deadline)
+        except asyncio.TimeoutError:
+            elapsed = time.monotonic() - start
+            logger.warning(f"Agent {self.name} timed out after {elapsed:.1f}s (limit {deadline}s)")
+            result = self._create_timeout_output(deadline, elapsed)
+
+        return self._add_call_metrics(result)
+
+    def sdk_outcome(self) -> str | None:
+        """Get how the SDK calls of the current run went, for concurrency control.
+
+        Returns:
+            ERROR when a call failed, THROTTLED when calls were retried or rate
+            limited, SUCCESS otherwise, or None when the SDK was not called
+        """
+        if not self.retry_stats.attempts:
+            return None
+        if self.sdk_failed:
+            return ERROR
+        if self.retry_stats.retries or self.rate_limit_wait_seconds > 0:
+            return THROTTLED
+        return SUCCESS
+
+    def _add_call_metrics(self, result: dict[str, Any]) -> dict[str, Any]:
+        """Record retries, rate limiting and the SDK outcome of the current run in the result.
+
+        Args:
+            result: Agent output
+
+        Returns:
+            The same output, with SDK call metrics and ``sdk_outcome`` when the
+            SDK was called
+        """
+        if self.retry_stats.attempts and isinstance(result, dict):
+            metrics = result.setdefault("metrics", {})
+            if isinstance(metrics, dict):
+                metrics.update(self.retry_stats.to_dict())
+                metrics["rate_limit_wait_seconds"] = round(self.rate_limit_wait_seconds, 3)
+            result.setdefault("sdk_outcome", self.sdk_outcome())
+        return result
+
+    def _create_timeout_output(self, timeout: float, elapsed: float) -> dict[str, Any]:
+        """Create the result of a processing run that hit its deadline.
+
+        Args:
+            timeout: Deadline that expired in seconds
+            elapsed: Time spent before cancellation in seconds
+
+        Returns:
+            Timeout result with the partial streamed output
+        """
+        partial_data: dict[str, Any] | None = None
+        if self.partial_response.strip().startswith("{"):
+            try:
+                partial_data = json.loads(self.partial_response)
+            except json.JSONDecodeError:
+                partial_data = None
+
+        return {
+            "status": "timeout",
+            "agent": self.name,
+            "agent_type": self.agent_type,
+            "error": f"Agent {self.name} timed out after {timeout}s",
+            "partial_response": self.partial_response,
+            "partial_data": partial_data,
+            "sdk_outcome": TIMEOUT,
+            "artifacts": {},
+            "metrics": {
+                "timed_out": True,
+                "timeout_seconds": timeout,
+                "execution_time": round(elapsed, 3),
+                "partial_response_chars": len(self.partial_response),
+            },
+        }
 
     def _get_mock_response(self, prompt: str, context: dict[str, Any] | None = None) -> str:
         """Get a mock response for testing purposes.
@@ -238,11 +429,10 @@ class BaseAgent(ABC):
         Returns:
             Rendered template content as string
         """
-        template_path = Path("verifflowcc/prompts") / f"{template_name}.j2"
+        template_path = PROMPTS_DIR / f"{template_name}.j2"
 
         if template_path.exists():
-            template_content = template_path.read_text()
-            template = Template(template_content)
+            template = _compile_template(str(template_path), template_path.stat().st_mtime_ns)
             return template.render(**variables, **self.context)
 
         # Fallback: return a basic template based on agent type
@@ -269,39 +459,155 @@ Please provide your response in structured JSON format appropriate for a {self.a
         template = Template(base_template)
         return template.render(**variables, **self.context)
 
-    def save_artifact(self, artifact_name: str, content: Any) -> None:
+    @property
+    def artifact_store(self) -> ArtifactStore:
+        """Store of the artifacts under the agent's project directory."""
+        if (
+            self._artifact_store is None
+            or self._artifact_store.base_dir != self.path_config.base_dir
+        ):
+            self._artifact_store = ArtifactStore.for_project(self.path_config)
+        return self._artifact_store
+
+    def save_artifact(
+        self, artifact_name: str, content: Any, artifact_type: str | None = None
+    ) -> None:
         """Save an artifact to the .agilevv directory.
 
+        The content is stored once in the project's blob store, and payloads
+        copied from earlier artifacts are stored as blobs of their own. The
+        content is serialized right away and written by the artifact writer,
+        if one is set. While the orchestrator runs a stage, the artifact is
+        published when the stage's artifacts are committed.
+
         Args:
             artifact_name: Name of the artifact
             content: Content to save
+            artifact_type: Type recorded in the artifact index, derived from
+                the name by default
         """
-        artifact_path = self.path_config.base_dir / artifact_name
-        artifact_path.parent.mkdir(parents=True, exist_ok=True)
-
+        labels: dict[str, Any] = {}
+        if artifact_type is not None:
+            labels["type"] = artifact_type
+        embedded: list[bytes] = []
         if isinstance(content, dict):
-            artifact_path.write_text(json.dumps(content, indent=2))
+            if isinstance(content.get("story_id"), str):
+                labels["story_id"] = content["story_id"]
+            content, embedded = self.artifact_store.pack_embedded(content)
+            text = json_codec.dumps(content, pretty=True)
         else:
-            artifact_path.write_text(str(content))
+            text = str(content)
 
+        store = self.artifact_store
+        self._submit(
+            self.path_config.base_dir / artifact_name,
+            functools.partial(store.save, artifact_name, text.encode(), embedded, labels),
+        )
         logger.debug(f"Saved artifact {artifact_name} for agent {self.name}")
 
-    def load_artifact(self, artifact_name: str) -> Any:
+    def load_artifact(self, artifact_name: str, keys: Iterable[str] | None = None) -> Any:
         """Load an artifact from the .agilevv directory.
 
+        Loading keys bounds memory use by the values loaded, but can take
+        longer than loading the whole artifact, which remains the default.
+
         Args:
             artifact_name: Name of the artifact
+            keys: Top-level keys to load from a JSON object, decoding only
+                their values; None to load the whole artifact
 
         Returns:
-            Artifact content
+            Artifact content, or the mapping of the keys found to their values
         """
-        artifact_path = self.path_config.base_dir / artifact_name
-        if artifact_path.exists():
-            content = artifact_path.read_text()
-            if artifact_name.endswith(".json"):
-                return json.loads(content)
-            return content
-        return None
+        if self.artifact_writer is not None:
+            self.artifact_writer.wait_for(str(self.path_config.base_dir / artifact_name))
+        if keys is not None:
+            path = self.artifact_store.file_of(artifact_name)
+            if path is None:
+                return None
+            return self.artifact_store.load_embedded(json_stream.load_keys(path, keys))
+        data = self.artifact_store.read(artifact_name)
+        if data is None:
+            return None
+        content = data.decode()
+        if artifact_name.endswith(".json"):
+            return self.artifact_store.load_embedded(json_codec.loads(content))
+        return content
+
+    def iter_artifact(self, artifact_name: str, key: str | None = None) -> Iterator[Any]:
+        """Load the elements of an array in a JSON artifact one at a time.
+
+        Only the element being yielded is decoded, so large artifacts such as
+        test results can be walked without loading them whole.
+
+        Args:
+            artifact_name: Name of the artifact
+            key: Top-level key of the array, None when the artifact is an array
+
+        Yields:
+            Elements of the array; nothing if the artifact or key is missing
+        """
+        if self.artifact_writer is not None:
+            self.artifact_writer.wait_for(str(self.path_config.base_dir / artifact_name))
+        path = self.artifact_store.file_of(artifact_name)
+        if path is not None:
+            yield from json_stream.iter_array(path, key)
+
+    def find_artifacts(self, **filters: Any) -> list[IndexedArtifact]:
+        """Find the published artifacts of the project in the artifact index.
+
+        Args:
+            **filters: story_id, stage, type and sprint_number to match
+
+        Returns:
+            Matching entries, with paths relative to the project directory
+        """
+        index = self.artifact_store.index
+        return index.query(**filters) if index is not None else []
+
+    def _submit(self, path: Path | None, job: Callable[[], Any]) -> None:
+        """Run a write job now, or hand it to the artifact writer when one is set.
+
+        Jobs are written in submission order; a pending job replacing a whole
+        file is dropped when a newer one for the same file is submitted.
+
+        Args:
+            path: File the job replaces, None for jobs that must all run, such
+                as appends
+            job: Blocking write job, using only snapshots of the agent's data
+        """
+        if self.artifact_writer is not None:
+            self.artifact_writer.submit(None if path is None else str(path), job)
+        else:
+            job()
+
+    def _write(self, path: Path | None, job: Callable[[], Any]) -> None:
+        """Write files outside the artifact store along with the stage's artifacts.
+
+        The job runs through _submit(), when the stage's artifacts are
+        committed if the orchestrator runs a stage, and not at all if the
+        stage fails.
+
+        Args:
+            path: File the job replaces, None for jobs that must all run, such
+                as appends
+            job: Blocking write job, using only snapshots of the agent's data
+        """
+        self._submit(path, functools.partial(self.artifact_store.on_commit, job))
+
+    def _write_file(self, path: Path, text: str) -> None:
+        """Write a text file, creating its directory, through _write().
+
+        Args:
+            path: File to write
+            text: Content of the file
+        """
+
+        def write() -> None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text)
+
+        self._write(path, write)
 
     def save_session_state(self) -> None:
         """Save the current session state to an artifact."""
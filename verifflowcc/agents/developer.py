@@ -209,15 +209,13 @@ class DeveloperAgent(BaseAgent):
                     purpose = file_spec.get("purpose", "Generated file")
 
                     if file_path and content:
-                        # Create directory structure if needed
                         full_path = Path.cwd() / file_path
-                        full_path.parent.mkdir(parents=True, exist_ok=True)
 
                         # Add file header comment
                         file_header = f'"""{purpose}\n\nGenerated by VeriFlowCC Developer Agent\nTimestamp: {datetime.now().isoformat()}\n"""\n\n'
 
-                        # Write file
-                        full_path.write_text(file_header + content)
+                        # Write file, creating its directory structure if needed
+                        self._write_file(full_path, file_header + content)
                         created_files.append(file_path)
                         logger.info(f"Created source file: {file_path}")
 
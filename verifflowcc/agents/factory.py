@@ -4,6 +4,7 @@ import logging
 from typing import Any
 
 from verifflowcc.core.path_config import PathConfig
+from verifflowcc.core.rate_limiter import RateLimiter, get_rate_limiter
 from verifflowcc.core.sdk_config import SDKConfig, get_sdk_config
 
 from .base import BaseAgent
@@ -18,15 +19,19 @@ class AgentFactory:
         self,
         sdk_config: SDKConfig | None = None,
         path_config: PathConfig | None = None,
+        rate_limiter: RateLimiter | None = None,
     ):
         """Initialize the agent factory.
 
         Args:
             sdk_config: SDK configuration instance
             path_config: Path configuration instance
+            rate_limiter: Rate limiter shared by created agents, defaults to
+                the process-wide limiter
         """
         self.sdk_config = sdk_config or get_sdk_config()
         self.path_config = path_config or PathConfig()
+        self.rate_limiter = rate_limiter or get_rate_limiter()
         self._agent_registry: dict[str, type[BaseAgent]] = {}
         self._register_default_agents()
 
@@ -101,24 +106,28 @@ class AgentFactory:
 
         agent_name = name or f"{agent_type}_agent"
 
+        agent: BaseAgent
         # Try to use registered agent class
         if lookup_type in self._agent_registry:
             agent_class = self._agent_registry[lookup_type]
-            return agent_class(
+            agent = agent_class(
+                name=agent_name,
+                agent_type=agent_type,
+                path_config=self.path_config,
+                sdk_config=self.sdk_config,
+            )
+        else:
+            # Fallback: create a generic agent with the base class
+            logger.warning(f"No specific agent class for {agent_type}, creating task agent")
+            agent = TaskAgent(
                 name=agent_name,
                 agent_type=agent_type,
                 path_config=self.path_config,
                 sdk_config=self.sdk_config,
             )
 
-        # Fallback: create a generic agent with the base class
-        logger.warning(f"No specific agent class for {agent_type}, creating task agent")
-        return TaskAgent(
-            name=agent_name,
-            agent_type=agent_type,
-            path_config=self.path_config,
-            sdk_config=self.sdk_config,
-        )
+        agent.rate_limiter = self.rate_limiter
+        return agent
 
     def create_all_agents(self) -> dict[str, BaseAgent]:
         """Create all V-Model agents.
@@ -107,14 +107,19 @@ class QATesterAgent(BaseAgent):
             quality_assessment = await self._assess_quality(testing_data, implementation_data)
             testing_data["quality_assessment"] = quality_assessment
 
+            # Testing phases run concurrently, each writes under its own directory
+            artifact_prefix = self._artifact_prefix(story_id, testing_phase)
+
             # Save testing artifacts
-            await self._save_testing_artifacts(story_id, testing_data)
+            await self._save_testing_artifacts(artifact_prefix, testing_data)
 
             # Generate traceability reports
-            await self._generate_traceability_reports(story_id, testing_data, implementation_data)
+            await self._generate_traceability_reports(
+                artifact_prefix, story_id, testing_data, implementation_data
+            )
 
-            logger.info(f"Successfully processed testing for {story_id}")
-            return self._create_success_output(testing_data, story_id)
+            logger.info(f"Successfully processed {testing_phase} testing for {story_id}")
+            return self._create_success_output(testing_data, story_id, artifact_prefix)
 
         except Exception as e:
             logger.error(f"Error processing testing: {e}")
@@ -441,45 +446,61 @@ class QATesterAgent(BaseAgent):
                 "confidence_level": "low",
             }
 
-    async def _save_testing_artifacts(self, story_id: str, testing_data: dict[str, Any]) -> None:
-        """Save testing artifacts.
+    @staticmethod
+    def _artifact_prefix(story_id: str, testing_phase: str) -> str:
+        """Get the path prefix of the artifacts of a testing phase.
 
         Args:
             story_id: Story identifier
+            testing_phase: Testing phase (unit, integration, system)
+
+        Returns:
+            Artifact path prefix, e.g. testing/unit/US-001
+        """
+        return f"testing/{testing_phase}/{story_id}"
+
+    async def _save_testing_artifacts(
+        self, artifact_prefix: str, testing_data: dict[str, Any]
+    ) -> None:
+        """Save testing artifacts.
+
+        Args:
+            artifact_prefix: Path prefix of the testing phase's artifacts
             testing_data: Testing data to save
         """
         try:
             # Save main testing document
             artifact_data = {**testing_data, "artifact_type": "testing"}
-            self.save_artifact(f"testing/{story_id}.json", artifact_data)
+            self.save_artifact(f"{artifact_prefix}.json", artifact_data)
 
             # Save test strategy
             test_strategy = testing_data.get("test_strategy", {})
             if test_strategy:
-                self.save_artifact(f"testing/{story_id}_strategy.json", test_strategy)
+                self.save_artifact(f"{artifact_prefix}_strategy.json", test_strategy)
 
             # Save test cases
             test_cases = testing_data.get("test_cases", [])
             if test_cases:
-                self.save_artifact(f"testing/{story_id}_testcases.json", test_cases)
+                self.save_artifact(f"{artifact_prefix}_testcases.json", test_cases)
 
             # Save test results
             test_execution = testing_data.get("test_execution", {})
             if test_execution:
-                self.save_artifact(f"testing/{story_id}_results.json", test_execution)
+                self.save_artifact(f"{artifact_prefix}_results.json", test_execution)
 
             # Save defect report if any defects found
             defects = test_execution.get("defects_found", [])
             if defects:
-                self.save_artifact(f"testing/{story_id}_defects.json", defects)
+                self.save_artifact(f"{artifact_prefix}_defects.json", defects)
 
-            logger.info(f"Saved testing artifacts for {story_id}")
+            logger.info(f"Saved testing artifacts to {artifact_prefix}")
 
         except Exception as e:
             logger.error(f"Error saving testing artifacts: {e}")
 
     async def _generate_traceability_reports(
         self,
+        artifact_prefix: str,
         story_id: str,
         testing_data: dict[str, Any],
         implementation_data: dict[str, Any],
@@ -487,6 +508,7 @@ class QATesterAgent(BaseAgent):
         """Generate traceability reports linking tests to requirements.
 
         Args:
+            artifact_prefix: Path prefix of the testing phase's artifacts
             story_id: Story identifier
             testing_data: Testing data
             implementation_data: Implementation data for traceability
@@ -530,7 +552,7 @@ class QATesterAgent(BaseAgent):
 
             # Save traceability matrix
             self.save_artifact(
-                f"testing/{story_id}_traceability.json",
+                f"{artifact_prefix}_traceability.json",
                 {
                     "story_id": story_id,
                     "generated_at": datetime.now().isoformat(),
@@ -554,12 +576,15 @@ class QATesterAgent(BaseAgent):
         except Exception as e:
             logger.error(f"Error generating traceability reports: {e}")
 
-    def _create_success_output(self, testing_data: dict[str, Any], story_id: str) -> dict[str, Any]:
+    def _create_success_output(
+        self, testing_data: dict[str, Any], story_id: str, artifact_prefix: str
+    ) -> dict[str, Any]:
         """Create successful output.
 
         Args:
             testing_data: Generated testing data
             story_id: Story identifier
+            artifact_prefix: Path prefix of the testing phase's artifacts
 
         Returns:
             Success output dictionary
@@ -573,11 +598,11 @@ class QATesterAgent(BaseAgent):
             "agent": self.name,
             "agent_type": self.agent_type,
             "artifacts": {
-                "test_report": f"testing/{story_id}.json",
-                "test_strategy": f"testing/{story_id}_strategy.json",
-                "test_cases": f"testing/{story_id}_testcases.json",
-                "test_results": f"testing/{story_id}_results.json",
-                "traceability_matrix": f"testing/{story_id}_traceability.json",
+                "test_report": f"{artifact_prefix}.json",
+                "test_strategy": f"{artifact_prefix}_strategy.json",
+                "test_cases": f"{artifact_prefix}_testcases.json",
+                "test_results": f"{artifact_prefix}_results.json",
+                "traceability_matrix": f"{artifact_prefix}_traceability.json",
             },
             "testing_data": testing_data,
             "metrics": {
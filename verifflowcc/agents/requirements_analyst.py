@@ -160,81 +160,87 @@ class RequirementsAnalystAgent(BaseAgent):
         Args:
             requirements: Elaborated requirements
         """
+        backlog_path = self.path_config.backlog_path
         try:
-            backlog_path = self.path_config.backlog_path
-
-            if not backlog_path.exists():
-                backlog_path.parent.mkdir(parents=True, exist_ok=True)
-                backlog_path.write_text("# Product Backlog\n\n")
-
-            # Read current content
-            content = backlog_path.read_text()
-
             # Build new section
             req_id = requirements.get("id", "UNKNOWN")
             story = requirements.get("original_story", {})
 
             story_section = f"\n## {req_id}: {story.get('title', 'Untitled')}\n\n"
 
-            # Only add if not already present
-            if req_id not in content:
-                story_section += f"**Priority:** {story.get('priority', 'Medium')}\n"
-                story_section += f"**Elaborated:** {requirements.get('elaborated_at', 'Unknown')}\n"
-                story_section += (
-                    f"**Description:** {story.get('description', 'No description')}\n\n"
-                )
+            story_section += f"**Priority:** {story.get('priority', 'Medium')}\n"
+            story_section += f"**Elaborated:** {requirements.get('elaborated_at', 'Unknown')}\n"
+            story_section += f"**Description:** {story.get('description', 'No description')}\n\n"
 
-                # Add functional requirements
-                functional_reqs = requirements.get("functional_requirements", [])
-                if functional_reqs:
-                    story_section += "### Functional Requirements\n"
-                    for req in functional_reqs:
-                        if isinstance(req, dict):
-                            story_section += f"- **{req.get('id', 'REQ-XXX')}**: {req.get('description', 'No description')}\n"
-                        else:
-                            story_section += f"- {req}\n"
-                    story_section += "\n"
-
-                # Add non-functional requirements
-                nf_reqs = requirements.get("non_functional_requirements", [])
-                if nf_reqs:
-                    story_section += "### Non-Functional Requirements\n"
-                    for req in nf_reqs:
-                        if isinstance(req, dict):
-                            story_section += f"- **{req.get('id', 'NFR-XXX')}**: {req.get('description', 'No description')}\n"
-                        else:
-                            story_section += f"- {req}\n"
-                    story_section += "\n"
-
-                # Add acceptance criteria
-                acceptance_criteria = requirements.get("acceptance_criteria", [])
-                if acceptance_criteria:
-                    story_section += "### Acceptance Criteria\n"
-                    for criteria in acceptance_criteria:
-                        if isinstance(criteria, dict):
-                            story_section += f"- **{criteria.get('id', 'AC-XXX')}**: {criteria.get('scenario', 'No scenario')}\n"
-                        else:
-                            story_section += f"- {criteria}\n"
-                    story_section += "\n"
-
-                # Add dependencies
-                dependencies = requirements.get("dependencies", [])
-                if dependencies:
-                    story_section += "### Dependencies\n"
-                    for dep in dependencies:
-                        if isinstance(dep, dict):
-                            story_section += f"- **{dep.get('type', 'unknown')}**: {dep.get('description', 'No description')}\n"
-                        else:
-                            story_section += f"- {dep}\n"
-                    story_section += "\n"
-
-                # Write updated content
-                content += story_section
-                backlog_path.write_text(content)
-                logger.info(f"Updated backlog with requirements for {req_id}")
+            # Add functional requirements
+            functional_reqs = requirements.get("functional_requirements", [])
+            if functional_reqs:
+                story_section += "### Functional Requirements\n"
+                for req in functional_reqs:
+                    if isinstance(req, dict):
+                        story_section += f"- **{req.get('id', 'REQ-XXX')}**: {req.get('description', 'No description')}\n"
+                    else:
+                        story_section += f"- {req}\n"
+                story_section += "\n"
+
+            # Add non-functional requirements
+            nf_reqs = requirements.get("non_functional_requirements", [])
+            if nf_reqs:
+                story_section += "### Non-Functional Requirements\n"
+                for req in nf_reqs:
+                    if isinstance(req, dict):
+                        story_section += f"- **{req.get('id', 'NFR-XXX')}**: {req.get('description', 'No description')}\n"
+                    else:
+                        story_section += f"- {req}\n"
+                story_section += "\n"
+
+            # Add acceptance criteria
+            acceptance_criteria = requirements.get("acceptance_criteria", [])
+            if acceptance_criteria:
+                story_section += "### Acceptance Criteria\n"
+                for criteria in acceptance_criteria:
+                    if isinstance(criteria, dict):
+                        story_section += f"- **{criteria.get('id', 'AC-XXX')}**: {criteria.get('scenario', 'No scenario')}\n"
+                    else:
+                        story_section += f"- {criteria}\n"
+                story_section += "\n"
+
+            # Add dependencies
+            dependencies = requirements.get("dependencies", [])
+            if dependencies:
+                story_section += "### Dependencies\n"
+                for dep in dependencies:
+                    if isinstance(dep, dict):
+                        story_section += f"- **{dep.get('type', 'unknown')}**: {dep.get('description', 'No description')}\n"
+                    else:
+                        story_section += f"- {dep}\n"
+                story_section += "\n"
 
         except Exception as e:
             logger.error(f"Error updating backlog: {e}")
+            return
+
+        # Read and written by the job, after the writes queued before it
+        def update() -> None:
+            try:
+                if not backlog_path.exists():
+                    backlog_path.parent.mkdir(parents=True, exist_ok=True)
+                    backlog_path.write_text("# Product Backlog\n\n")
+
+                # Read current content
+                content = backlog_path.read_text()
+
+                # Only add if not already present
+                if req_id not in content:
+                    # Write updated content
+                    content += story_section
+                    backlog_path.write_text(content)
+                    logger.info(f"Updated backlog with requirements for {req_id}")
+
+            except Exception as e:
+                logger.error(f"Error updating backlog: {e}")
+
+        self._write(None, update)
 
     async def validate_requirements(self, requirements: dict[str, Any]) -> dict[str, Any]:
         """Validate requirements against INVEST and SMART criteria.
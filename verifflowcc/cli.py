@@ -1,9 +1,9 @@
 """VeriFlowCC CLI - Agile V-Model Command Center."""
 
 import asyncio
-import json
 import signal
 import sys
+from dataclasses import replace
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -16,7 +16,17 @@ from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.prompt import Confirm, IntPrompt
 from rich.table import Table
 
+from verifflowcc.core import json_codec
+from verifflowcc.core.artifact_index import ArtifactIndex
+from verifflowcc.core.checkpoint_store import CheckpointStore
 from verifflowcc.core.path_config import PathConfig
+from verifflowcc.core.state_store import (
+    load_project_sections,
+    load_project_state,
+    save_project_state,
+    update_project_state,
+)
+from verifflowcc.core.state_writer import flush_all_pending
 
 # Initialize Typer app and Rich console
 app = typer.Typer(
@@ -32,15 +42,31 @@ console = Console()
 checkpoint_app = typer.Typer()
 app.add_typer(checkpoint_app, name="checkpoint", help="Create or manage checkpoints")
 
+# Create state subcommand app
+state_app = typer.Typer()
+app.add_typer(state_app, name="state", help="Move project state between storage backends")
+
+# Create artifacts subcommand app
+artifacts_app = typer.Typer()
+app.add_typer(artifacts_app, name="artifacts", help="Find artifacts by story, stage and type")
+
 
 def handle_keyboard_interrupt(signum: int, frame: Any) -> None:
     """Handle keyboard interrupt gracefully."""
     console.print("\n[yellow]Interrupted by user[/yellow]")
+    flush_all_pending()
     sys.exit(130)
 
 
-# Register signal handler for keyboard interrupts
+def handle_termination(signum: int, frame: Any) -> None:
+    """Write pending state before terminating."""
+    flush_all_pending()
+    sys.exit(128 + signum)
+
+
+# Register signal handlers for keyboard interrupts and termination
 signal.signal(signal.SIGINT, handle_keyboard_interrupt)
+signal.signal(signal.SIGTERM, handle_termination)
 
 
 def get_path_config(base_dir: str | None = None) -> PathConfig:
@@ -56,6 +82,46 @@ def get_path_config(base_dir: str | None = None) -> PathConfig:
     return PathConfig(base_dir=base_dir)
 
 
+def load_backlog_stories(
+    backlog_file: Path, include_completed: bool = True
+) -> list[dict[str, Any]]:
+    """Parse user stories from a markdown backlog.
+
+    Stories are checklist items (``- [ ]`` open, ``- [x]`` done). Story IDs
+    are derived from the titles, so they do not change when the backlog is
+    reordered or items are checked off.
+
+    Args:
+        backlog_file: Path to backlog.md
+        include_completed: Whether to include stories already checked off
+
+    Returns:
+        List of story dictionaries
+    """
+    from verifflowcc.core.batch import story_id_for
+
+    stories: list[dict[str, Any]] = []
+    with backlog_file.open() as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith("- [ ]") or line.startswith("- [x]"):
+                title = line[5:].strip()
+                if title and not title.startswith("#"):
+                    stories.append(
+                        {
+                            "id": story_id_for(title),
+                            "title": title,
+                            "description": title,
+                            "priority": "Medium",
+                            "completed": line.startswith("- [x]"),
+                        }
+                    )
+
+    if include_completed:
+        return stories
+    return [story for story in stories if not story["completed"]]
+
+
 def validate_authentication() -> bool:
     """Authentication is assumed to be available.
 
@@ -243,8 +309,7 @@ def init(
             "checkpoint_history": [],
         }
 
-        with path_config.state_path.open("w") as f:
-            json.dump(state, f, indent=2)
+        save_project_state(path_config, state)
 
         # Create backlog.md template
         # TODO: Extract backlog template to a separate file
@@ -343,14 +408,7 @@ def plan(
         raise typer.Exit(1)
 
     # Load and parse stories from backlog
-    stories = []
-    with backlog_file.open() as f:
-        for line in f:
-            line = line.strip()
-            if line.startswith("- [ ]") or line.startswith("- [x]"):
-                story = line[5:].strip()
-                if story and not story.startswith("#"):
-                    stories.append(story)
+    stories = [story["title"] for story in load_backlog_stories(backlog_file)]
 
     if not stories:
         console.print("[yellow]No stories found in backlog.[/yellow]")
@@ -376,15 +434,9 @@ def plan(
         selected_story = stories[story_id - 1]
 
     # Update state
-    state_file = path_config.state_path
-    with state_file.open() as f:
-        state = json.load(f)
-
-    state["active_story"] = selected_story
-    state["current_stage"] = "planning"
-
-    with state_file.open("w") as f:
-        json.dump(state, f, indent=2)
+    with update_project_state(path_config) as state:
+        state["active_story"] = selected_story
+        state["current_stage"] = "planning"
 
     # Integrate Claude-Code subagent for requirements analysis
     try:
@@ -406,7 +458,7 @@ def plan(
         }
 
         # Run requirements analysis
-        result = asyncio.run(agent.process({"story": story_data}))
+        result = asyncio.run(agent.process_with_timeout({"story": story_data}))
 
         if result.get("acceptance_criteria"):
             console.print("\n[green]Requirements elaborated successfully![/green]")
@@ -431,12 +483,39 @@ def plan(
 
 @app.command()
 def sprint(
-    story: str = typer.Option(
-        ...,
+    story: str | None = typer.Option(
+        None,
         "--story",
         "-s",
         help="User story or requirement to implement",
     ),
+    stories: list[str] | None = typer.Option(
+        None,
+        "--stories",
+        help="Run several stories as a batch (repeat the option for each story)",
+    ),
+    from_backlog: bool = typer.Option(
+        False,
+        "--from-backlog",
+        help="Run every open story of the backlog as a batch",
+    ),
+    concurrency: int | None = typer.Option(
+        None,
+        "--concurrency",
+        "-c",
+        min=1,
+        help="Maximum number of stories run concurrently in batch mode",
+    ),
+    resume: bool = typer.Option(
+        False,
+        "--resume",
+        help="Resume the last sprint from its first stage that did not complete",
+    ),
+    pipelined: bool = typer.Option(
+        False,
+        "--pipelined",
+        help="Persist finished stages and prepare upcoming ones while SDK calls are in flight",
+    ),
     base_dir: str | None = typer.Option(
         None,
         "--dir",
@@ -449,39 +528,48 @@ def sprint(
 
     Orchestrates the complete V-Model cycle through specialized
     Claude-Code subagents for each stage (Requirements → Design →
-    Code → Test → Validate).
+    Code → Test → Validate). With --stories or --from-backlog, several
+    stories run concurrently, each in its own workspace.
     """
+    if not (story or stories or from_backlog or resume):
+        console.print(
+            "[red]No story given.[/red] Use --story, --stories, --from-backlog or --resume."
+        )
+        raise typer.Exit(1)
+
     path_config = get_path_config(base_dir)
 
     if not path_config.base_dir.exists():
         console.print("[red]Project not initialized.[/red] Run 'verifflowcc init' first.")
         raise typer.Exit(1)
 
-    # Update state
-    state_file = path_config.state_path
-    with state_file.open() as f:
-        state = json.load(f)
+    if resume:
+        resume_sprint(path_config, pipelined)
+        return
 
-    state["active_story"] = story
+    if stories or from_backlog:
+        run_batch_sprint(path_config, stories or [], from_backlog, concurrency)
+        return
 
-    # Determine sprint number
-    current_sprint_num = 0
-    if state.get("current_sprint"):
-        # Extract number from "Sprint X" format
-        try:
-            current_sprint_num = int(state["current_sprint"].split()[-1])
-        except (ValueError, IndexError):
-            current_sprint_num = 0
+    # Update state
+    with update_project_state(path_config) as state:
+        state["active_story"] = story
 
-    state["current_sprint"] = f"Sprint {current_sprint_num + 1}"
-    state["current_stage"] = "requirements"
+        # Determine sprint number
+        current_sprint_num = 0
+        if state.get("current_sprint"):
+            # Extract number from "Sprint X" format
+            try:
+                current_sprint_num = int(state["current_sprint"].split()[-1])
+            except (ValueError, IndexError):
+                current_sprint_num = 0
 
-    # Initialize completed_stages if not present
-    if "completed_stages" not in state:
-        state["completed_stages"] = []
+        state["current_sprint"] = f"Sprint {current_sprint_num + 1}"
+        state["current_stage"] = "requirements"
 
-    with state_file.open("w") as f:
-        json.dump(state, f, indent=2)
+        # Initialize completed_stages if not present
+        if "completed_stages" not in state:
+            state["completed_stages"] = []
 
     console.print(
         Panel(
@@ -513,45 +601,27 @@ def sprint(
         # Use the real Orchestrator with Claude-Code integration
         from verifflowcc.core.orchestrator import Orchestrator as RealOrchestrator
 
-        orchestrator = RealOrchestrator()
+        orchestrator = RealOrchestrator(path_config=path_config)
+        orchestrator.pipelined = orchestrator.pipelined or pipelined
 
-        # Prepare story context
+        from verifflowcc.core.batch import story_id_for
+
+        # Prepare story context, the ID follows the story so re-runs hit the stage cache
         story_data = {
-            "id": f"STORY-{current_sprint_num + 1:03d}",
+            "id": story_id_for(story),
             "title": story,
             "description": story,
             "priority": "Medium",
         }
 
         # Run the sprint through orchestrator
-        sprint_result = asyncio.run(orchestrator.run_sprint(story_data))
+        try:
+            sprint_result = asyncio.run(orchestrator.run_sprint(story_data))
+        finally:
+            orchestrator.close()
 
         # Display results
-        if all(
-            stage.get("status") != "failed" for stage in sprint_result.get("stages", {}).values()
-        ):
-            console.print(
-                Panel(
-                    "[green]✓[/green] Sprint completed successfully!\n"
-                    "All V-Model stages executed and validated.",
-                    title="Sprint Complete",
-                    border_style="green",
-                )
-            )
-        else:
-            failed_stages = [
-                stage
-                for stage, result in sprint_result.get("stages", {}).items()
-                if result.get("status") == "failed"
-            ]
-            console.print(
-                Panel(
-                    f"[yellow]⚠[/yellow] Sprint completed with issues.\n"
-                    f"Failed stages: {', '.join(failed_stages)}",
-                    title="Sprint Complete with Warnings",
-                    border_style="yellow",
-                )
-            )
+        display_sprint_result(sprint_result)
 
     except ImportError:
         # Fallback to simulation if orchestrator not available
@@ -580,14 +650,11 @@ def sprint(
                 progress.update(task, completed=1)
 
                 # Update state
-                with state_file.open() as f:
-                    state = json.load(f)
-                state["current_stage"] = stage.lower()
-                if "completed_stages" not in state:
-                    state["completed_stages"] = []
-                state["completed_stages"].append(stage.lower())
-                with state_file.open("w") as f:
-                    json.dump(state, f, indent=2)
+                with update_project_state(path_config) as state:
+                    state["current_stage"] = stage.lower()
+                    if "completed_stages" not in state:
+                        state["completed_stages"] = []
+                    state["completed_stages"].append(stage.lower())
 
         console.print(
             Panel(
@@ -603,6 +670,142 @@ def sprint(
         sys.exit(130)
 
 
+def display_sprint_result(sprint_result: dict[str, Any]) -> None:
+    """Display the outcome of a sprint.
+
+    Args:
+        sprint_result: Sprint results returned by the orchestrator
+    """
+    if all(stage.get("status") != "failed" for stage in sprint_result.get("stages", {}).values()):
+        console.print(
+            Panel(
+                "[green]✓[/green] Sprint completed successfully!\n"
+                "All V-Model stages executed and validated.",
+                title="Sprint Complete",
+                border_style="green",
+            )
+        )
+    else:
+        failed_stages = [
+            stage
+            for stage, result in sprint_result.get("stages", {}).items()
+            if result.get("status") == "failed"
+        ]
+        console.print(
+            Panel(
+                f"[yellow]⚠[/yellow] Sprint completed with issues.\n"
+                f"Failed stages: {', '.join(failed_stages)}",
+                title="Sprint Complete with Warnings",
+                border_style="yellow",
+            )
+        )
+
+
+def resume_sprint(path_config: PathConfig, pipelined: bool = False) -> None:
+    """Resume the last sprint from its persisted stage outputs.
+
+    Args:
+        path_config: Project PathConfig
+        pipelined: Whether to run the remaining stages in pipelined mode
+    """
+    if not validate_authentication_gracefully():
+        graceful_exit_with_message("Resuming a sprint requires authentication configuration")
+
+    from verifflowcc.core.orchestrator import Orchestrator
+
+    orchestrator = Orchestrator(path_config=path_config)
+    orchestrator.pipelined = orchestrator.pipelined or pipelined
+
+    try:
+        sprint_result = asyncio.run(orchestrator.resume_sprint())
+    except ValueError as e:
+        console.print(f"[red]Cannot resume sprint:[/red] {e}")
+        raise typer.Exit(1) from e
+    except KeyboardInterrupt:
+        console.print("\n[yellow]Sprint execution interrupted by user[/yellow]")
+        sys.exit(130)
+    finally:
+        orchestrator.close()
+
+    reused = sprint_result.get("resumed_stages", [])
+    console.print(
+        f"Resumed sprint {sprint_result['sprint_number']}, "
+        f"reused {len(reused)} completed stages: {', '.join(reused) or 'none'}"
+    )
+    display_sprint_result(sprint_result)
+
+
+def run_batch_sprint(
+    path_config: PathConfig,
+    stories: list[str],
+    from_backlog: bool,
+    concurrency: int | None,
+) -> None:
+    """Run several stories concurrently and display the merged summary.
+
+    Args:
+        path_config: Project PathConfig
+        stories: Story titles given on the command line
+        from_backlog: Whether to add the open stories of the backlog
+        concurrency: Maximum number of concurrent stories (None for config default)
+    """
+    batch_stories: list[str | dict[str, Any]] = list(stories)
+    if from_backlog:
+        if not path_config.backlog_path.exists():
+            console.print("[red]Backlog not found.[/red]")
+            raise typer.Exit(1)
+        batch_stories.extend(
+            load_backlog_stories(path_config.backlog_path, include_completed=False)
+        )
+
+    if not batch_stories:
+        console.print("[yellow]No stories to run.[/yellow]")
+        raise typer.Exit(0)
+
+    if not validate_authentication_gracefully():
+        graceful_exit_with_message("Batch sprint execution requires authentication configuration")
+
+    from verifflowcc.core.batch import BatchSprintRunner
+
+    try:
+        runner = BatchSprintRunner(path_config=path_config, max_concurrency=concurrency)
+        summary = asyncio.run(runner.run(batch_stories))
+    except ValueError as e:
+        console.print(f"[red]Invalid batch:[/red] {e}")
+        raise typer.Exit(1) from e
+    except KeyboardInterrupt:
+        console.print("\n[yellow]Batch execution interrupted by user[/yellow]")
+        sys.exit(130)
+
+    table = Table(title=f"Batch Sprint Summary ({summary['batch_id']})")
+    table.add_column("Story", style="cyan", no_wrap=True)
+    table.add_column("Title", style="white")
+    table.add_column("Decision", style="white")
+    table.add_column("Success Rate", style="white")
+    table.add_column("Failed Stages", style="yellow")
+
+    for story_id, result in summary["stories"].items():
+        decision = result.get("final_decision", "NO-GO")
+        decision_style = "green" if decision == "GO" else "red"
+        table.add_row(
+            story_id,
+            result.get("title", ""),
+            f"[{decision_style}]{decision}[/{decision_style}]",
+            f"{result.get('success_rate', 0.0):.0%}",
+            result.get("error") or ", ".join(result.get("failed_stages", [])) or "-",
+        )
+
+    console.print(table)
+
+    totals = summary["totals"]
+    console.print(
+        f"\n[bold]{totals['stories']} stories:[/bold] {totals['go']} GO, "
+        f"{totals['no_go']} NO-GO, {totals['errors']} errors "
+        f"in {summary['duration_seconds']:.1f}s"
+    )
+    console.print(f"Summary saved to {summary['summary_path']}")
+
+
 @app.command()
 def status(
     json_output: bool = typer.Option(
@@ -629,13 +832,11 @@ def status(
         console.print("[red]Project not initialized.[/red] Run 'verifflowcc init' first.")
         raise typer.Exit(1)
 
-    # Load state
-    state_file = path_config.state_path
-    with state_file.open() as f:
-        state = json.load(f)
+    # Only the sections shown, not the stage artifacts, sessions and gates
+    state = load_project_sections(path_config, ("summary", "metrics", "checkpoints"))
 
     if json_output:
-        console.print(json.dumps(state, indent=2))
+        console.print(json_codec.dumps(state, pretty=True))
     else:
         # Create status table
         table = Table(title="VeriFlowCC Project Status", show_header=True)
@@ -652,6 +853,27 @@ def status(
         checkpoints = len(state.get("checkpoint_history", []))
         table.add_row("Checkpoints", str(checkpoints))
 
+        concurrency = state.get("concurrency")
+        if concurrency:
+            table.add_row(
+                "Concurrency Limit",
+                f"{concurrency['limit']} (range {concurrency['min_limit']}-"
+                f"{concurrency['max_limit']})",
+            )
+            for adjustment in concurrency.get("adjustments", [])[-5:]:
+                table.add_row(
+                    "  Adjusted",
+                    f"{adjustment['from']} -> {adjustment['to']} ({adjustment['reason']})",
+                )
+
+        state_lock = state.get("state_lock")
+        if state_lock:
+            table.add_row(
+                "State Lock Wait",
+                f"{state_lock['total_wait_seconds']}s total, {state_lock['max_wait_seconds']}s max "
+                f"({state_lock['contended']} of {state_lock['acquisitions']} writes contended)",
+            )
+
         console.print(table)
 
 
@@ -756,13 +978,11 @@ def checkpoint(
     git = GitIntegration()
 
     # Create checkpoint
-    checkpoint_name = (
-        name or f"checkpoint_{len(list(path_config.checkpoints_dir.glob('*.json'))) + 1}"
-    )
+    checkpoints = CheckpointStore.for_project(path_config)
+    checkpoint_name = name or checkpoints.next_name()
 
     # Load current state
-    with path_config.state_path.open() as f:
-        state = json.load(f)
+    state = load_project_state(path_config)
 
     # Create checkpoint data
     checkpoint_data = {
@@ -774,10 +994,8 @@ def checkpoint(
         "git_tag": None,
     }
 
-    # Save checkpoint file
-    checkpoint_file = path_config.checkpoints_dir / f"{checkpoint_name}.json"
-    with checkpoint_file.open("w") as f:
-        json.dump(checkpoint_data, f, indent=2)
+    # Save checkpoint file, as a delta against the previous checkpoint
+    checkpoints.save(checkpoint_data)
 
     # Git integration
     if git.is_git_repo():
@@ -794,22 +1012,34 @@ def checkpoint(
                 console.print(f"[green]Git tag created:[/green] {tag_result}")
 
         # Update checkpoint file with git info
-        with checkpoint_file.open("w") as f:
-            json.dump(checkpoint_data, f, indent=2)
+        checkpoints.update_metadata(
+            checkpoint_name,
+            git_commit=checkpoint_data["git_commit"],
+            git_tag=checkpoint_data["git_tag"],
+        )
 
-    # Update state history
-    state["checkpoint_history"].append(checkpoint_name)
-    with path_config.state_path.open("w") as f:
-        json.dump(state, f, indent=2)
+    # Update state history, on the latest state as a sprint may have written it meanwhile
+    with update_project_state(path_config) as current:
+        current.setdefault("checkpoint_history", []).append(checkpoint_name)
 
     console.print(
         f"[green]Checkpoint created:[/green] {checkpoint_name}\n"
         f"Message: {checkpoint_data['message']}"
     )
 
+    if checkpoints.retention.auto_gc:
+        removed = checkpoints.gc(git=git)
+        if removed:
+            console.print(f"[dim]Removed {len(removed)} checkpoint(s) by retention policy[/dim]")
+
 
 @checkpoint_app.command("list")
 def checkpoint_list(
+    rebuild_index: bool = typer.Option(
+        False,
+        "--rebuild-index",
+        help="Rebuild the checkpoint manifest from the checkpoint files first",
+    ),
     base_dir: str | None = typer.Option(
         None,
         "--dir",
@@ -824,8 +1054,10 @@ def checkpoint_list(
         console.print("[red]Project not initialized.[/red]")
         raise typer.Exit(1)
 
-    checkpoints_dir = path_config.checkpoints_dir
-    checkpoints = list(checkpoints_dir.glob("*.json"))
+    # Listed from the manifest, without opening the checkpoint files
+    store = CheckpointStore.for_project(path_config)
+    manifest = store.rebuild_manifest() if rebuild_index else store.read_manifest()
+    checkpoints = list(manifest["checkpoints"].values())
 
     # Import git integration
     from verifflowcc.core.git_integration import GitIntegration
@@ -845,24 +1077,92 @@ def checkpoint_list(
     table.add_column("Name", style="cyan")
     table.add_column("Message", style="white")
     table.add_column("Timestamp", style="green")
+    table.add_column("Size", style="white", justify="right")
     table.add_column("Git Tag", style="blue")
 
-    for checkpoint_file in checkpoints:
-        with checkpoint_file.open() as f:
-            data = json.load(f)
+    for data in checkpoints:
         git_tag = data.get("git_tag", "")
         if git_tag:
             git_tag = git_tag.replace("checkpoint/", "")
         table.add_row(
             data["name"],
             data.get("message", ""),
-            data.get("timestamp", "N/A"),
+            data.get("timestamp") or "N/A",
+            f"{data['size'] / 1024:.1f} KB",
             git_tag or "N/A",
         )
 
     console.print(table)
 
 
+@checkpoint_app.command("gc")
+def checkpoint_gc(
+    keep_last: int | None = typer.Option(
+        None, "--keep-last", help="Keep the latest N checkpoints, overrides config.yaml"
+    ),
+    keep_per_sprint: bool | None = typer.Option(
+        None,
+        "--keep-per-sprint/--no-keep-per-sprint",
+        help="Keep the latest checkpoint of each sprint, overrides config.yaml",
+    ),
+    max_bytes: int | None = typer.Option(
+        None, "--max-bytes", help="Maximum total size of checkpoints, overrides config.yaml"
+    ),
+    dry_run: bool = typer.Option(
+        False, "--dry-run", help="Show the checkpoints to remove without removing them"
+    ),
+    base_dir: str | None = typer.Option(
+        None,
+        "--dir",
+        "-d",
+        help="Base directory for Agile V-Model project structure",
+    ),
+) -> None:
+    """Remove checkpoints not kept by the retention policy, with their git tags."""
+    path_config = get_path_config(base_dir)
+
+    if not path_config.base_dir.exists():
+        console.print("[red]Project not initialized.[/red]")
+        raise typer.Exit(1)
+
+    # Import git integration
+    from verifflowcc.core.git_integration import GitIntegration
+
+    checkpoints = CheckpointStore.for_project(path_config)
+    overrides = {
+        key: value
+        for key, value in {
+            "keep_last": keep_last,
+            "keep_per_sprint": keep_per_sprint,
+            "max_bytes": max_bytes,
+        }.items()
+        if value is not None
+    }
+    try:
+        policy = replace(checkpoints.retention, **overrides)
+    except ValueError as e:
+        console.print(f"[red]Invalid retention policy:[/red] {e}")
+        raise typer.Exit(1) from e
+
+    if not policy.limited:
+        console.print(
+            "[yellow]No retention policy configured.[/yellow] Set checkpoints.retention "
+            "in config.yaml or pass --keep-last, --keep-per-sprint or --max-bytes."
+        )
+        return
+
+    removed = checkpoints.gc(policy, git=GitIntegration(), dry_run=dry_run)
+    if not removed:
+        console.print("[green]No checkpoints to remove.[/green]")
+        return
+
+    verb = "Would remove" if dry_run else "Removed"
+    for record in removed:
+        tag = f" (git tag {record['git_tag']})" if record.get("git_tag") else ""
+        console.print(f"{verb} {record['name']}{tag}")
+    console.print(f"[green]{verb} {len(removed)} checkpoint(s).[/green]")
+
+
 @checkpoint_app.command("restore")
 def checkpoint_restore(
     name: str = typer.Argument(..., help="Checkpoint name to restore"),
@@ -888,9 +1188,9 @@ def checkpoint_restore(
 
     git = GitIntegration()
 
-    checkpoint_file = path_config.checkpoints_dir / f"{name}.json"
+    checkpoints = CheckpointStore.for_project(path_config)
 
-    if not checkpoint_file.exists():
+    if not checkpoints.exists(name):
         console.print(f"[red]Checkpoint '{name}' not found.[/red]")
         raise typer.Exit(1)
 
@@ -908,15 +1208,143 @@ def checkpoint_restore(
             console.print("[yellow]Falling back to file-based restore...[/yellow]")
 
     # File-based restore
-    with checkpoint_file.open() as f:
-        checkpoint_data = json.load(f)
+    checkpoint_data = checkpoints.load(name)
 
-    with path_config.state_path.open("w") as f:
-        json.dump(checkpoint_data["state"], f, indent=2)
+    save_project_state(path_config, checkpoint_data["state"])
+    checkpoints.mark_restored(name)
 
     console.print(f"[green]Restored to checkpoint:[/green] {name}")
 
 
+@state_app.command("import")
+def state_import(
+    base_dir: str | None = typer.Option(
+        None,
+        "--dir",
+        "-d",
+        help="Base directory for Agile V-Model project structure",
+    ),
+) -> None:
+    """Import state.json and the sprint directories into the SQLite state database."""
+    path_config = get_path_config(base_dir)
+
+    if not path_config.state_path.exists():
+        console.print("[red]No state.json to import.[/red]")
+        raise typer.Exit(1)
+
+    from verifflowcc.core.sqlite_store import SQLiteStateStore
+
+    store = SQLiteStateStore(path_config)
+    try:
+        store.import_json()
+        sprints = len(store.sprints())
+        stage_runs = len(store.stage_runs())
+    finally:
+        store.close()
+
+    console.print(
+        f"[green]Imported state into {path_config.state_db_path}[/green] "
+        f"({sprints} sprints, {stage_runs} stage runs)\n"
+        "Set 'state.backend: sqlite' in config.yaml to use it."
+    )
+
+
+@state_app.command("export")
+def state_export(
+    base_dir: str | None = typer.Option(
+        None,
+        "--dir",
+        "-d",
+        help="Base directory for Agile V-Model project structure",
+    ),
+) -> None:
+    """Export the SQLite state database to state.json and the sprint directories."""
+    path_config = get_path_config(base_dir)
+
+    if not path_config.state_db_path.exists():
+        console.print("[red]No state database to export.[/red]")
+        raise typer.Exit(1)
+
+    from verifflowcc.core.sqlite_store import SQLiteStateStore
+
+    store = SQLiteStateStore(path_config)
+    try:
+        state = store.export_json()
+    finally:
+        store.close()
+
+    if state is None:
+        console.print("[red]The state database is empty.[/red]")
+        raise typer.Exit(1)
+    console.print(f"[green]Exported state to {path_config.state_path}[/green]")
+
+
+@artifacts_app.command("query")
+def artifacts_query(
+    story: str | None = typer.Option(None, "--story", help="Story the artifacts belong to"),
+    stage: str | None = typer.Option(None, "--stage", help="Stage that produced them"),
+    artifact_type: str | None = typer.Option(
+        None, "--type", help="Artifact type, e.g. traceability or diagram"
+    ),
+    sprint: int | None = typer.Option(None, "--sprint", help="Sprint that last wrote them"),
+    json_output: bool = typer.Option(
+        False,
+        "--json",
+        help="Output the artifacts in JSON format",
+    ),
+    rebuild_index: bool = typer.Option(
+        False,
+        "--rebuild-index",
+        help="Rebuild the artifact index from the recorded artifact hashes first",
+    ),
+    base_dir: str | None = typer.Option(
+        None,
+        "--dir",
+        "-d",
+        help="Base directory for Agile V-Model project structure",
+    ),
+) -> None:
+    """Find artifacts of the project and its story workspaces in the artifact index."""
+    path_config = get_path_config(base_dir)
+
+    if not path_config.base_dir.exists():
+        console.print("[red]Project not initialized.[/red]")
+        raise typer.Exit(1)
+
+    index = ArtifactIndex.for_project(path_config)
+    if rebuild_index:
+        index.rebuild()
+    artifacts = index.query(story, stage, artifact_type, sprint)
+
+    if json_output:
+        console.print(json_codec.dumps([entry.to_dict() for entry in artifacts], pretty=True))
+        return
+
+    if not artifacts:
+        console.print("[yellow]No artifacts found.[/yellow]")
+        return
+
+    table = Table(title="Artifacts")
+    table.add_column("Path", style="cyan")
+    table.add_column("Type", style="white")
+    table.add_column("Story", style="green")
+    table.add_column("Stage", style="white")
+    table.add_column("Sprint", style="white", justify="right")
+    table.add_column("Size", style="white", justify="right")
+
+    for entry in artifacts:
+        table.add_row(
+            entry.path,
+            entry.type,
+            entry.story_id or "N/A",
+            entry.stage or "N/A",
+            str(entry.sprint_number) if entry.sprint_number is not None else "N/A",
+            f"{entry.size / 1024:.1f} KB",
+        )
+
+    console.print(table)
+
+
 # Helper functions
 
 
@@ -0,0 +1,154 @@
+"""Stage outputs kept outside the project state, referenced by handles.
+
+The project state is loaded, copied into checkpoints and rewritten on every
+stage transition, so it must not grow with the outputs stages produce. The
+artifact mapping and session state of a stage are written once to a body file
+named after their content hash, and the state only keeps a handle to it:
+
+    {"path": "outputs/3f/3f2a....json", "size": 412, "sha256": "3f2a...",
+     "schema_version": 1}
+
+Bodies are loaded on demand and verified against the handle's hash. Since a
+body file never changes once written, handles copied into checkpoints stay
+valid after later stages replace the state's handles. State written before
+handles existed holds the outputs inline; HandleStore.load() returns such
+values unchanged.
+"""
+
+import logging
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from verifflowcc.core import json_codec
+from verifflowcc.core.stage_cache import hash_content
+from verifflowcc.core.state_writer import write_atomic
+
+logger = logging.getLogger(__name__)
+
+# Version of the body format, stored in every handle
+SCHEMA_VERSION = 1
+
+HANDLE_KEYS = frozenset({"path", "size", "sha256", "schema_version"})
+
+
+@dataclass(frozen=True)
+class ArtifactHandle:
+    """Reference to a stage output body stored outside the state."""
+
+    path: str
+    size: int
+    sha256: str
+    schema_version: int = SCHEMA_VERSION
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize the handle for the project state."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ArtifactHandle":
+        """Deserialize a handle stored in the project state."""
+        return cls(
+            path=data["path"],
+            size=data["size"],
+            sha256=data["sha256"],
+            schema_version=data["schema_version"],
+        )
+
+    @staticmethod
+    def is_handle(value: Any) -> bool:
+        """Check whether a state value is a serialized handle."""
+        return isinstance(value, dict) and value.keys() == HANDLE_KEYS
+
+
+class HandleStore:
+    """Writes stage output bodies and loads them back through their handles.
+
+    Bodies are JSON files under ``<root>/<hash prefix>/<hash>.json``; handle
+    paths are relative to the project directory so that it can be moved.
+    Recently stored or loaded bodies are kept in memory, which also serves
+    reads of bodies still queued for writing in pipelined mode.
+    """
+
+    def __init__(
+        self,
+        base_dir: Path,
+        root: Path,
+        cache_size: int = 32,
+        write: Callable[[Path, str], None] | None = None,
+    ):
+        """Initialize the store.
+
+        Args:
+            base_dir: Project directory handle paths are relative to
+            root: Directory holding the body files
+            cache_size: Number of bodies kept in memory
+            write: Writes a body file, defaults to an atomic write
+        """
+        self.base_dir = base_dir
+        self.root = root
+        self.cache_size = max(1, cache_size)
+        self._write = write or write_atomic
+        self._cache: OrderedDict[str, str] = OrderedDict()
+
+    def put(self, value: Any) -> dict[str, Any]:
+        """Store a body.
+
+        Args:
+            value: JSON-serializable stage output
+
+        Returns:
+            Serialized handle of the body
+        """
+        text = json_codec.dumps(value, sort_keys=True)
+        digest = hash_content(text)
+        path = self.root / digest[:2] / f"{digest}.json"
+        if digest not in self._cache and not path.exists():
+            self._write(path, text)
+        self._remember(digest, text)
+        return ArtifactHandle(
+            path=path.relative_to(self.base_dir).as_posix(),
+            size=len(text.encode()),
+            sha256=digest,
+        ).to_dict()
+
+    def load(self, value: Any) -> Any:
+        """Load the body a state value refers to.
+
+        Args:
+            value: Serialized handle, or an output stored inline by older versions
+
+        Returns:
+            The body, a fresh copy on every call
+
+        Raises:
+            ValueError: If the body was written by a newer version or does not
+                match its handle
+            OSError: If the body file cannot be read
+        """
+        if not ArtifactHandle.is_handle(value):
+            return value
+
+        handle = ArtifactHandle.from_dict(value)
+        if handle.schema_version > SCHEMA_VERSION:
+            raise ValueError(
+                f"Stage output {handle.path} has schema version {handle.schema_version}, "
+                f"this version reads up to {SCHEMA_VERSION}"
+            )
+
+        text = self._cache.get(handle.sha256)
+        if text is None:
+            text = (self.base_dir / handle.path).read_text()
+            if hash_content(text) != handle.sha256:
+                raise ValueError(f"Stage output {handle.path} does not match its handle")
+        self._remember(handle.sha256, text)
+        return json_codec.loads(text)
+
+    def _remember(self, digest: str, text: str) -> None:
+        """Keep a body in memory, evicting the least recently used ones."""
+        self._cache[digest] = text
+        self._cache.move_to_end(digest)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
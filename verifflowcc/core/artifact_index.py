@@ -0,0 +1,256 @@
+"""Queryable index of the artifacts of a project.
+
+Finding an artifact used to mean knowing its naming convention, e.g.
+``testing/unit/US-001_traceability.json``, and globbing directories. The
+artifact store records every artifact it publishes in ``.agilevv/artifacts.db``,
+a SQLite database indexed by story, stage, artifact type and sprint, so that
+lookups walk an index instead of the directories:
+
+    index = ArtifactIndex.for_project(path_config)
+    index.query(story_id="US-001", type="traceability")
+
+Each row describes the latest version of one artifact: its path relative to
+the project directory (story workspaces included), size and sha256 hash, the
+fields of an artifact handle. The index is derived from the
+``artifact_refs.json`` files of the project and its story workspaces, and
+rebuild() recreates it from them.
+"""
+
+import logging
+import sqlite3
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path, PurePosixPath
+from typing import Any
+
+from verifflowcc.core import json_codec
+from verifflowcc.core.path_config import PathConfig
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    path TEXT PRIMARY KEY,
+    story_id TEXT,
+    stage TEXT,
+    type TEXT NOT NULL,
+    sprint_number INTEGER,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS artifacts_story ON artifacts (story_id, stage, type);
+CREATE INDEX IF NOT EXISTS artifacts_stage ON artifacts (stage, sprint_number);
+CREATE INDEX IF NOT EXISTS artifacts_type ON artifacts (type, story_id);
+CREATE INDEX IF NOT EXISTS artifacts_sprint ON artifacts (sprint_number, stage);
+"""
+
+
+def artifact_type(name: str, story_id: str | None = None) -> str:
+    """Derive the type of an artifact from its name.
+
+    The agents name artifacts ``<directory>/<story>.json`` for a stage's main
+    document and ``<directory>/<story>_<type>.<ext>`` for the others.
+
+    Args:
+        name: Path of the artifact relative to its directory
+        story_id: Story the artifact belongs to, if known
+
+    Returns:
+        The part of the file name after the story, the top directory for a
+        stage's main document, or the file name without extensions
+    """
+    path = PurePosixPath(name)
+    stem = path.name.split(".", 1)[0]
+    if story_id:
+        if stem == story_id and len(path.parts) > 1:
+            return path.parts[0]
+        if stem.startswith(f"{story_id}_"):
+            return stem[len(story_id) + 1 :]
+    return stem
+
+
+@dataclass(frozen=True)
+class IndexedArtifact:
+    """An artifact found in the index, with the fields of its handle."""
+
+    path: str
+    size: int
+    sha256: str
+    type: str
+    story_id: str | None = None
+    stage: str | None = None
+    sprint_number: int | None = None
+    updated_at: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize the entry for JSON output."""
+        return asdict(self)
+
+
+class ArtifactIndex:
+    """Artifacts of a project by story, stage, type and sprint."""
+
+    def __init__(self, root: Path, db_path: Path):
+        """Initialize the index.
+
+        Args:
+            root: Project directory artifact paths are relative to
+            db_path: SQLite database holding the index, created on first write
+        """
+        self.root = root
+        self.db_path = db_path
+        self._schema_ready = False
+
+    @classmethod
+    def for_project(cls, path_config: PathConfig) -> "ArtifactIndex":
+        """Get the index of a project, shared by its story workspaces.
+
+        Args:
+            path_config: Paths of the project or of a story workspace
+
+        Returns:
+            ArtifactIndex of the project directory
+        """
+        return cls(path_config.project_dir, path_config.artifact_index_path)
+
+    def record(self, entries: Iterable[IndexedArtifact]) -> None:
+        """Add or replace the entries of artifacts, in one transaction.
+
+        Args:
+            entries: Entries to record, keyed by path
+        """
+        entries = list(entries)
+        if not entries:
+            return
+        with self._connect() as connection:
+            self._insert(connection, entries)
+
+    def query(
+        self,
+        story_id: str | None = None,
+        stage: str | None = None,
+        type: str | None = None,
+        sprint_number: int | None = None,
+    ) -> list[IndexedArtifact]:
+        """Find the artifacts matching every given filter.
+
+        Args:
+            story_id: Story the artifacts belong to
+            stage: Stage that produced them
+            type: Artifact type, see artifact_type()
+            sprint_number: Sprint that last wrote them
+
+        Returns:
+            Matching entries ordered by path
+        """
+        if not self.db_path.exists():
+            return []
+        filters = {
+            "story_id": story_id,
+            "stage": stage,
+            "type": type,
+            "sprint_number": sprint_number,
+        }
+        clauses = [f"{column} = ?" for column, value in filters.items() if value is not None]
+        values = [value for value in filters.values() if value is not None]
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        query = f"SELECT * FROM artifacts{where} ORDER BY path"  # noqa: S608
+        with self._connect() as connection:
+            rows = connection.execute(query, values).fetchall()
+        return [IndexedArtifact(**dict(row)) for row in rows]
+
+    def get(self, path: str) -> IndexedArtifact | None:
+        """Get the entry of an artifact.
+
+        Args:
+            path: Path of the artifact relative to the project directory
+
+        Returns:
+            Its entry, None if it is not indexed
+        """
+        if not self.db_path.exists():
+            return None
+        with self._connect() as connection:
+            row = connection.execute("SELECT * FROM artifacts WHERE path = ?", (path,)).fetchone()
+        return IndexedArtifact(**dict(row)) if row is not None else None
+
+    def rebuild(self) -> int:
+        """Recreate the index from the artifact_refs.json files of the project.
+
+        Returns:
+            Number of artifacts indexed
+        """
+        entries: list[IndexedArtifact] = []
+        refs_paths = [self.root / "artifact_refs.json"]
+        refs_paths += sorted((self.root / "stories").glob("*/artifact_refs.json"))
+        for refs_path in refs_paths:
+            try:
+                refs = json_codec.loads(refs_path.read_bytes())
+            except (OSError, ValueError):
+                continue
+            base_dir = refs_path.parent
+            for name, ref in refs.items():
+                path = base_dir / name
+                if not path.is_file():
+                    continue
+                entries.append(
+                    IndexedArtifact(
+                        path=path.relative_to(self.root).as_posix(),
+                        size=path.stat().st_size,
+                        sha256=ref["sha256"],
+                        type=ref.get("type") or artifact_type(name, ref.get("story_id")),
+                        story_id=ref.get("story_id"),
+                        stage=ref.get("stage"),
+                        sprint_number=ref.get("sprint_number"),
+                    )
+                )
+
+        with self._connect() as connection:
+            connection.execute("DELETE FROM artifacts")
+            self._insert(connection, entries)
+        logger.info(f"Rebuilt artifact index with {len(entries)} artifacts")
+        return len(entries)
+
+    @staticmethod
+    def _insert(connection: sqlite3.Connection, entries: list[IndexedArtifact]) -> None:
+        """Add or replace index rows within an open transaction."""
+        now = datetime.now().isoformat()
+        connection.executemany(
+            "INSERT OR REPLACE INTO artifacts (path, story_id, stage, type, "
+            "sprint_number, size, sha256, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    entry.path,
+                    entry.story_id,
+                    entry.stage,
+                    entry.type,
+                    entry.sprint_number,
+                    entry.size,
+                    entry.sha256,
+                    entry.updated_at or now,
+                )
+                for entry in entries
+            ],
+        )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open the database for one operation, committing it on success.
+
+        A connection per operation lets agents write from worker threads.
+        """
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.db_path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        try:
+            if not self._schema_ready:
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.executescript(SCHEMA)
+                self._schema_ready = True
+            with connection:
+                yield connection
+        finally:
+            connection.close()
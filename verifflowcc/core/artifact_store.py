@@ -0,0 +1,600 @@
+"""Named artifacts stored once per content in a blob store.
+
+Agents save their artifacts under names such as ``design/US-001.json``, and
+many of them repeat content: artifacts identical across stories and stages,
+or payloads embedded in later artifacts. Contents are stored in a blob store
+keyed by their sha256 hash,
+
+    blobs/3f/3f2a...
+
+and a named artifact is a copy of its blob. On file systems that can clone
+files (Btrfs, XFS, ...) the copy is a reflink sharing the blob's storage, so
+identical payloads take the space of one file; elsewhere it is a plain copy.
+Either way every name reads as a regular file that can be edited without
+touching the blob. Blobs are read-only, and put() rewrites a blob that no
+longer holds its content. A blob is shared by the story workspaces of a
+project.
+
+``artifact_refs.json`` records the hash of every named artifact along with the
+inode, modification time and size of its file:
+
+    {"design/US-001.json": {"sha256": "3f2a...", "stamp": [1234, 1700..., 412]}}
+
+Comparing artifacts, and deciding whether a save changes anything, is then a
+comparison of hashes. A hash is only trusted while the stamp matches the file,
+so files written or edited by other means are hashed again. Saves replace
+the named file with a new copy.
+
+The orchestrator runs each stage's agent in a transaction: begin() makes
+saves store blobs only, and commit() publishes them all when the stage
+succeeds, while discard() leaves the previous artifacts in place when it
+fails. A commit first records the new hashes, without stamps, in a single
+write of ``artifact_refs.json``, then replaces the named files and records
+their stamps. Readers resolve names through one version of the recorded
+hashes, take an artifact recorded without a stamp from its blob, and look
+again when ``artifact_refs.json`` was replaced in the meantime, so that
+consumers reading through the store see the previous set or the new one,
+never a part of the new one.
+
+Each recorded hash carries the labels of the artifact: its type, and the
+story, stage and sprint of the transaction that saved it. The store records
+the artifacts it publishes in the project's artifact index (see
+artifact_index), in one write per commit.
+
+Payloads known to be copies of earlier artifacts (EMBEDDED_KEYS) are stored
+as blobs of their own and replaced in the saved artifact by a reference,
+``{"$blob": "<sha256>"}``, which load_embedded() resolves.
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+from collections.abc import Callable, Iterable, Mapping
+from contextlib import AbstractContextManager, nullcontext
+from pathlib import Path
+from typing import IO, Any, TypeVar
+
+from verifflowcc.core import json_codec
+from verifflowcc.core.artifact_index import ArtifactIndex, IndexedArtifact, artifact_type
+from verifflowcc.core.path_config import PathConfig
+from verifflowcc.core.state_lock import StateLock, lock_for
+from verifflowcc.core.state_writer import write_atomic
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Top-level artifact keys holding copies of earlier stages' artifacts
+EMBEDDED_KEYS = frozenset({"design_reference", "system_artifacts_reference"})
+
+BLOB_KEY = "$blob"
+
+# Labels of an artifact recorded with its hash and in the artifact index
+LABELS = ("type", "story_id", "stage", "sprint_number")
+
+# Permissions of blobs, which are never modified, and of named artifacts
+BLOB_MODE = 0o444
+ARTIFACT_MODE = 0o644
+
+# Linux ioctl making a file share the storage of another
+FICLONE = 0x40049409
+
+# Lock-free lookups attempted before looking under the lock
+READ_ATTEMPTS = 3
+
+
+def _digest(data: bytes) -> str:
+    """Hash the content of a blob."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def _stamp(stat: os.stat_result) -> list[int]:
+    """Identify a version of a file by its inode, modification time and size."""
+    return [stat.st_ino, stat.st_mtime_ns, stat.st_size]
+
+
+def _reflink(src: IO[bytes], dst: IO[bytes]) -> bool:
+    """Make an empty file a clone of another, where the file system supports it."""
+    if fcntl is None or not sys.platform.startswith("linux"):
+        return False
+    try:
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+    except OSError:
+        return False
+    return True
+
+
+def is_blob_ref(value: Any) -> bool:
+    """Check whether a value is a reference to a blob."""
+    return isinstance(value, dict) and value.keys() == {BLOB_KEY}
+
+
+class BlobStore:
+    """Contents stored under their sha256 hash, written once."""
+
+    def __init__(self, root: Path):
+        """Initialize the store.
+
+        Args:
+            root: Directory holding the blobs
+        """
+        self.root = root
+
+    def path_of(self, digest: str) -> Path:
+        """Get the file of a blob."""
+        return self.root / digest[:2] / digest
+
+    def put(self, data: bytes) -> str:
+        """Store a content unless a blob already holds it.
+
+        A blob whose file no longer holds the content is written again.
+
+        Args:
+            data: Content to store
+
+        Returns:
+            Hash of the content
+        """
+        digest = _digest(data)
+        path = self.path_of(digest)
+        try:
+            intact = path.read_bytes() == data
+        except OSError:
+            intact = False
+        if not intact:
+            write_atomic(path, data, mode=BLOB_MODE)
+        return digest
+
+    def get(self, digest: str) -> bytes:
+        """Read a blob.
+
+        Args:
+            digest: Hash of the content
+
+        Returns:
+            The content
+
+        Raises:
+            ValueError: If the blob does not match its hash
+            OSError: If the blob cannot be read
+        """
+        data = self.path_of(digest).read_bytes()
+        if _digest(data) != digest:
+            raise ValueError(f"Blob {digest} does not match its hash")
+        return data
+
+
+class ArtifactStore:
+    """Named artifacts of a directory, copied from their blobs."""
+
+    def __init__(
+        self,
+        base_dir: Path,
+        blobs: BlobStore,
+        lock: StateLock | None = None,
+        index: ArtifactIndex | None = None,
+    ):
+        """Initialize the store.
+
+        Args:
+            base_dir: Directory artifact names are relative to
+            blobs: Blob store holding the contents
+            lock: Lock held while updating the hashes, None when no other
+                process writes
+            index: Index recording the published artifacts, None for none
+        """
+        self.base_dir = base_dir
+        self.blobs = blobs
+        self.refs_path = base_dir / "artifact_refs.json"
+        self.lock = lock
+        self.index = index
+        # Name, hash and labels of the artifacts saved in the open transaction
+        self._staged: dict[str, tuple[str, dict[str, Any]]] | None = None
+        self._labels: dict[str, Any] = {}
+        self._on_commit: list[Callable[[], Any]] = []
+
+    @classmethod
+    def for_project(cls, path_config: PathConfig) -> "ArtifactStore":
+        """Create the artifact store of a project or story workspace.
+
+        Args:
+            path_config: Paths of the project
+
+        Returns:
+            ArtifactStore of the project's directory, using the project's blobs
+            and artifact index
+        """
+        return cls(
+            path_config.base_dir,
+            BlobStore(path_config.blobs_dir),
+            lock_for(path_config),
+            ArtifactIndex.for_project(path_config),
+        )
+
+    def save(
+        self,
+        name: str,
+        data: bytes,
+        embedded: Iterable[bytes] = (),
+        labels: Mapping[str, Any] | None = None,
+    ) -> str:
+        """Save an artifact, unless it already has this content.
+
+        Within a transaction the content is only stored as a blob, and the
+        named file is replaced by commit().
+
+        Args:
+            name: Path of the artifact relative to the base directory
+            data: Content of the artifact
+            embedded: Contents the artifact references, see pack_embedded()
+            labels: LABELS of the artifact, over those of the transaction
+
+        Returns:
+            Hash of the content
+        """
+        for content in embedded:
+            self.blobs.put(content)
+        digest = self.blobs.put(data)
+        labels = {**self._labels, **(labels or {})}
+        if self._staged is not None:
+            self._staged[name] = (digest, labels)
+            return digest
+
+        self._publish({name: (digest, labels)})
+        return digest
+
+    def begin(
+        self,
+        story_id: str | None = None,
+        stage: str | None = None,
+        sprint_number: int | None = None,
+    ) -> None:
+        """Start a transaction, dropping the saves of one left open.
+
+        Args:
+            story_id: Story the transaction's artifacts belong to
+            stage: Stage producing them
+            sprint_number: Sprint the stage runs in
+        """
+        if self._staged:
+            logger.warning(f"Dropping {len(self._staged)} uncommitted artifacts")
+        self._staged = {}
+        self._on_commit = []
+        labels = {"story_id": story_id, "stage": stage, "sprint_number": sprint_number}
+        self._labels = {key: value for key, value in labels.items() if value is not None}
+
+    def on_commit(self, job: Callable[[], Any]) -> None:
+        """Run a write job now, or when the open transaction commits.
+
+        Args:
+            job: Blocking job writing files outside the store
+        """
+        if self._staged is None:
+            job()
+        else:
+            self._on_commit.append(job)
+
+    def commit(self) -> list[str]:
+        """Publish the artifacts saved in the transaction, all at once.
+
+        The jobs queued by on_commit() run afterwards.
+
+        Returns:
+            Names of the artifacts saved in the transaction
+        """
+        staged, jobs = self._staged or {}, self._on_commit
+        self._staged, self._on_commit, self._labels = None, [], {}
+        if staged:
+            self._publish(staged)
+        for job in jobs:
+            job()
+        return list(staged)
+
+    def discard(self) -> list[str]:
+        """End the transaction without publishing its artifacts.
+
+        Their blobs are kept, so that a retry producing the same content
+        does not write it again.
+
+        Returns:
+            Names of the artifacts saved in the transaction
+        """
+        staged = self._staged or {}
+        self._staged, self._on_commit, self._labels = None, [], {}
+        return list(staged)
+
+    def read(self, name: str) -> bytes | None:
+        """Read an artifact, as saved in the open transaction if it was.
+
+        Args:
+            name: Path of the artifact relative to the base directory
+
+        Returns:
+            Content of the artifact, None if it does not exist
+        """
+        if self._staged and name in self._staged:
+            return self.blobs.get(self._staged[name][0])
+
+        def read(refs: dict[str, Any]) -> bytes | None:
+            path = self._lookup(refs, name)[1]
+            return path.read_bytes() if path is not None else None
+
+        return self._consistent(read)
+
+    def file_of(self, name: str) -> Path | None:
+        """Get the file holding an artifact as read() would read it.
+
+        Unlike read(), a blob is not checked against its hash.
+
+        Args:
+            name: Path of the artifact relative to the base directory
+
+        Returns:
+            The blob of an artifact staged or being published, or the named
+            file; None if the artifact does not exist
+        """
+        if self._staged and name in self._staged:
+            return self.blobs.path_of(self._staged[name][0])
+        return self._consistent(lambda refs: self._lookup(refs, name)[1])
+
+    def digest(self, name: str) -> str | None:
+        """Get the hash of an artifact.
+
+        Args:
+            name: Path of the artifact relative to the base directory
+
+        Returns:
+            Hash of the artifact's content, None if it does not exist
+        """
+        return self.digests([name])[name]
+
+    def digests(self, names: list[str]) -> dict[str, str | None]:
+        """Get the hashes of several artifacts, reading the recorded hashes once.
+
+        Files saved by other means than save() are hashed.
+
+        Args:
+            names: Paths of the artifacts relative to the base directory
+
+        Returns:
+            Mapping of name to hash, None for artifacts that do not exist
+        """
+
+        def hash_all(refs: dict[str, Any]) -> dict[str, str | None]:
+            digests: dict[str, str | None] = {}
+            for name in names:
+                digest, path = self._lookup(refs, name)
+                if digest is None and path is not None:
+                    digest = _digest(path.read_bytes())
+                digests[name] = digest
+            return digests
+
+        return self._consistent(hash_all)
+
+    def same(self, name: str, other: str) -> bool:
+        """Check whether two artifacts have the same content.
+
+        Args:
+            name: Path of an artifact relative to the base directory
+            other: Path of the other artifact
+
+        Returns:
+            True if both exist and their hashes are equal
+        """
+        digests = self.digests([name, other])
+        return digests[name] is not None and digests[name] == digests[other]
+
+    def read_refs(self) -> dict[str, Any]:
+        """Read the recorded hashes of the named artifacts.
+
+        Returns:
+            Mapping of name to hash and file stamp, empty when missing or unreadable
+        """
+        try:
+            refs = json_codec.loads(self.refs_path.read_bytes())
+        except (OSError, ValueError):
+            return {}
+        return refs if isinstance(refs, dict) else {}
+
+    def pack_embedded(self, content: Mapping[str, Any]) -> tuple[dict[str, Any], list[bytes]]:
+        """Replace the EMBEDDED_KEYS values of an artifact by blob references.
+
+        Nothing is written: the contents are stored by save().
+
+        Args:
+            content: Artifact about to be saved
+
+        Returns:
+            Copy of the artifact with those values replaced, and their contents
+        """
+        packed = dict(content)
+        embedded: list[bytes] = []
+        for key in EMBEDDED_KEYS & packed.keys():
+            value = packed[key]
+            if isinstance(value, dict | list) and value and not is_blob_ref(value):
+                data = json_codec.dumps(value, sort_keys=True).encode()
+                packed[key] = {BLOB_KEY: _digest(data)}
+                embedded.append(data)
+        return packed, embedded
+
+    def load_embedded(self, content: Any) -> Any:
+        """Resolve the blob references pack_embedded() left in an artifact.
+
+        Args:
+            content: Loaded artifact
+
+        Returns:
+            The artifact with its embedded values restored
+
+        Raises:
+            ValueError: If a referenced blob does not match its hash
+            OSError: If a referenced blob cannot be read
+        """
+        if not isinstance(content, dict):
+            return content
+        for key in EMBEDDED_KEYS & content.keys():
+            if is_blob_ref(content[key]):
+                content[key] = json_codec.loads(self.blobs.get(content[key][BLOB_KEY]))
+        return content
+
+    def _publish(self, saved: Mapping[str, tuple[str, Mapping[str, Any]]]) -> None:
+        """Publish saved artifacts, replacing their named files and recording their hashes.
+
+        The new hashes are recorded first, without stamps, and readers take
+        the artifacts from their blobs until the files are replaced and their
+        stamps recorded in a second write.
+
+        Args:
+            saved: Hash and labels of each artifact name
+        """
+        with self._locked():
+            refs = self.read_refs()
+            changed = [
+                name
+                for name, (digest, labels) in saved.items()
+                if self._update_ref(refs, name, digest, labels)
+            ]
+            if not changed:
+                return
+            write_atomic(self.refs_path, json_codec.dumps(refs), fsync=False)
+            pending = [name for name in changed if "stamp" not in refs[name]]
+            for name in pending:
+                path = self.base_dir / name
+                self._copy(self.blobs.path_of(refs[name]["sha256"]), path)
+                refs[name]["stamp"] = _stamp(path.stat())
+            if pending:
+                write_atomic(self.refs_path, json_codec.dumps(refs), fsync=False)
+            self._record(refs, changed)
+
+    def _update_ref(
+        self, refs: dict[str, Any], name: str, digest: str, labels: Mapping[str, Any]
+    ) -> bool:
+        """Record the hash and labels of an artifact.
+
+        The stamp is kept when the named file already has this content, and
+        left out otherwise until the file is replaced.
+
+        Returns:
+            Whether the recorded hashes or labels changed, or the file must be replaced
+        """
+        ref = {
+            **{key: labels[key] for key in LABELS if labels.get(key) is not None},
+            "sha256": digest,
+        }
+        ref.setdefault("type", artifact_type(name, ref.get("story_id")))
+        previous = refs.get(name)
+        if self._trusted_digest(self.base_dir / name, previous) == digest:
+            ref["stamp"] = previous["stamp"]
+            if previous == ref:
+                return False
+        refs[name] = ref
+        return True
+
+    def _lookup(self, refs: Mapping[str, Any], name: str) -> tuple[str | None, Path | None]:
+        """Find the hash of an artifact in recorded hashes and the file holding it.
+
+        Returns:
+            The hash, None when not recorded for the current file, and the
+            blob or named file, None if the artifact does not exist
+        """
+        ref = refs.get(name)
+        if isinstance(ref, dict) and "stamp" not in ref:
+            # Being published: the named file may not be replaced yet
+            return ref["sha256"], self.blobs.path_of(ref["sha256"])
+        path = self.base_dir / name
+        digest = self._trusted_digest(path, ref)
+        if digest is None and not path.is_file():
+            return None, None
+        return digest, path
+
+    def _consistent(self, lookup: Callable[[dict[str, Any]], T]) -> T:
+        """Run a lookup against a single version of the recorded hashes.
+
+        The lookup is run again when a publication replaced them meanwhile,
+        and under the lock if publications keep winning the race.
+        """
+        for _ in range(READ_ATTEMPTS):
+            before = self._refs_stamp()
+            result = lookup(self.read_refs())
+            if self._refs_stamp() == before:
+                return result
+        with self._locked():
+            return lookup(self.read_refs())
+
+    def _refs_stamp(self) -> list[int] | None:
+        """Identify the current version of the recorded hashes without reading them."""
+        try:
+            return _stamp(self.refs_path.stat())
+        except OSError:
+            return None
+
+    def _record(self, refs: Mapping[str, Any], names: list[str]) -> None:
+        """Record published artifacts in the index.
+
+        The index can be rebuilt from the recorded hashes, so failing to
+        update it does not fail the save.
+        """
+        if self.index is None:
+            return
+        entries = []
+        for name in names:
+            ref = refs[name]
+            path = self.base_dir / name
+            try:
+                indexed_path = path.relative_to(self.index.root).as_posix()
+            except ValueError:
+                indexed_path = path.as_posix()
+            entries.append(
+                IndexedArtifact(
+                    path=indexed_path,
+                    size=ref["stamp"][2],
+                    sha256=ref["sha256"],
+                    type=ref["type"],
+                    story_id=ref.get("story_id"),
+                    stage=ref.get("stage"),
+                    sprint_number=ref.get("sprint_number"),
+                )
+            )
+        try:
+            self.index.record(entries)
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to update the artifact index: {e}")
+
+    def _trusted_digest(self, path: Path, ref: Any) -> str | None:
+        """Get the recorded hash of a file if the file has not changed since."""
+        if not isinstance(ref, dict):
+            return None
+        try:
+            stamp = _stamp(path.stat())
+        except OSError:
+            return None
+        return ref.get("sha256") if ref.get("stamp") == stamp else None
+
+    def _copy(self, blob_path: Path, path: Path) -> None:
+        """Replace a named file with a clone of its blob, or a copy where cloning fails."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+        tmp_path = Path(tmp_name)
+        try:
+            with os.fdopen(fd, "wb") as dst, blob_path.open("rb") as src:
+                cloned = _reflink(src, dst)
+            if not cloned:
+                shutil.copyfile(blob_path, tmp_path)
+            tmp_path.chmod(ARTIFACT_MODE)
+            tmp_path.replace(path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    def _locked(self) -> AbstractContextManager[Any]:
+        """Hold the lock, if any, while writing."""
+        return self.lock.exclusive() if self.lock is not None else nullcontext()
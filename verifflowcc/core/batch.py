@@ -0,0 +1,265 @@
+"""Batch execution of multiple user stories through the V-Model.
+
+A batch runs several stories concurrently under a configurable concurrency
+limit. Every story executes in its own workspace (``stories/<story_id>``)
+with its own Orchestrator, so state, artifacts and quality-gate records never
+interleave. Per-story results are merged into a single batch summary.
+"""
+
+import asyncio
+import hashlib
+import logging
+from collections.abc import Callable, Sequence
+from datetime import datetime
+from typing import Any, cast
+
+import yaml
+from rich.console import Console
+
+from verifflowcc.core import json_codec
+from verifflowcc.core.orchestrator import Orchestrator
+from verifflowcc.core.path_config import PathConfig
+from verifflowcc.core.sdk_config import SDKConfig
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 2
+
+
+def story_id_for(title: str) -> str:
+    """Derive a stable story ID from a story title.
+
+    The ID only depends on the title, so a story keeps its workspace across
+    batches whatever its position, and unrelated stories never share one.
+
+    Args:
+        title: Story title
+
+    Returns:
+        Story ID of the form ``STORY-<8 hex digits>``
+    """
+    digest = hashlib.sha256(" ".join(title.lower().split()).encode()).hexdigest()
+    return f"STORY-{digest[:8]}"
+
+
+def normalize_stories(stories: Sequence[str | dict[str, Any]]) -> list[dict[str, Any]]:
+    """Normalize a list of stories into story dictionaries with unique IDs.
+
+    Plain strings become ``{"id": story_id_for(title), "title": ..., ...}``;
+    dictionaries without an ``id`` get one from their title the same way.
+
+    Args:
+        stories: Story titles or story dictionaries
+
+    Returns:
+        List of story dictionaries
+
+    Raises:
+        ValueError: If two stories share the same ID
+    """
+    normalized: list[dict[str, Any]] = []
+    seen: set[str] = set()
+
+    for story in stories:
+        if isinstance(story, str):
+            story_data: dict[str, Any] = {
+                "title": story,
+                "description": story,
+                "priority": "Medium",
+            }
+        else:
+            story_data = dict(story)
+
+        story_id = str(story_data.get("id") or story_id_for(story_data.get("title", "")))
+        if story_id in seen:
+            raise ValueError(f"Duplicate story ID in batch: {story_id}")
+        seen.add(story_id)
+
+        story_data["id"] = story_id
+        normalized.append(story_data)
+
+    return normalized
+
+
+class BatchSprintRunner:
+    """Runs sprints for several stories concurrently with bounded concurrency."""
+
+    def __init__(
+        self,
+        path_config: PathConfig | None = None,
+        sdk_config: SDKConfig | None = None,
+        max_concurrency: int | None = None,
+        orchestrator_factory: Callable[[PathConfig], Orchestrator] | None = None,
+        console: Console | None = None,
+    ):
+        """Initialize the batch runner.
+
+        Args:
+            path_config: PathConfig of the project; stories run in sub-workspaces
+            sdk_config: SDK configuration shared by all story orchestrators
+            max_concurrency: Maximum number of stories in flight, defaults to
+                ``batch.max_concurrency`` from config.yaml
+            orchestrator_factory: Callable creating the Orchestrator of a story
+                workspace, defaults to an Orchestrator sharing the project config
+            console: Console used for batch progress output
+        """
+        self.path_config = path_config or PathConfig()
+        self.sdk_config = sdk_config or SDKConfig()
+        self.console = console or Console()
+        self.config = self._load_config()
+
+        if max_concurrency is None:
+            batch_config = (self.config or {}).get("batch") or {}
+            max_concurrency = batch_config.get("max_concurrency", DEFAULT_MAX_CONCURRENCY)
+        if max_concurrency is None or max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        self.max_concurrency = int(max_concurrency)
+        self.orchestrator_factory = orchestrator_factory or self._create_orchestrator
+
+    def _load_config(self) -> dict[str, Any] | None:
+        """Load the project config.yaml shared by all stories, if present."""
+        if self.path_config.config_path.exists():
+            return cast(
+                "dict[str, Any] | None", yaml.safe_load(self.path_config.config_path.read_text())
+            )
+        return None
+
+    def _create_orchestrator(self, story_path_config: PathConfig) -> Orchestrator:
+        """Create the Orchestrator for a story workspace."""
+        return Orchestrator(
+            path_config=story_path_config,
+            sdk_config=self.sdk_config,
+            config=self.config,
+            show_progress=False,
+        )
+
+    async def run(self, stories: Sequence[str | dict[str, Any]]) -> dict[str, Any]:
+        """Run a sprint for every story and merge the results.
+
+        A failure in one story never stops the other stories of the batch.
+
+        Args:
+            stories: Story titles or story dictionaries
+
+        Returns:
+            Merged batch summary
+        """
+        story_list = normalize_stories(stories)
+        started_at = datetime.now()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        self.console.print(
+            f"[bold]Running {len(story_list)} stories "
+            f"(max {self.max_concurrency} concurrent)[/bold]"
+        )
+
+        async def run_story(story: dict[str, Any]) -> dict[str, Any]:
+            async with semaphore:
+                return await self._run_story(story)
+
+        results = await asyncio.gather(*(run_story(story) for story in story_list))
+
+        summary = self.merge_results(results, started_at)
+        self._save_summary(summary)
+        return summary
+
+    async def _run_story(self, story: dict[str, Any]) -> dict[str, Any]:
+        """Run the sprint of a single story in its own workspace."""
+        story_id = story["id"]
+        story_path_config = self.path_config.for_story(story_id)
+        story_path_config.ensure_base_exists()
+
+        self.console.print(f"[cyan]▶ {story_id}: {story.get('title', '')}[/cyan]")
+
+        orchestrator: Orchestrator | None = None
+        try:
+            orchestrator = self.orchestrator_factory(story_path_config)
+            sprint_result = await orchestrator.run_sprint(story)
+            # Leave the story's state on disk before reporting it
+            await orchestrator.flush()
+        except Exception as e:
+            logger.error(f"Batch story {story_id} failed: {e}")
+            self.console.print(f"[red]✗ {story_id} failed: {e}[/red]")
+            return {
+                "story_id": story_id,
+                "title": story.get("title", ""),
+                "workspace": str(story_path_config.base_dir),
+                "status": "error",
+                "error": str(e),
+                "final_decision": "NO-GO",
+                "readiness_score": 0,
+                "success_rate": 0.0,
+                "completed_stages": [],
+                "failed_stages": [],
+                "quality_summary": {},
+            }
+        finally:
+            # Each story opens its own state store, release it with the story
+            if orchestrator is not None:
+                orchestrator.close()
+
+        failed_stages = [
+            stage
+            for stage, result in sprint_result.get("stages", {}).items()
+            if result.get("status") in ("error", "failed")
+        ]
+        final_decision = sprint_result.get("final_decision", "NO-GO")
+        self.console.print(f"[green]✓ {story_id} finished: {final_decision}[/green]")
+
+        return {
+            "story_id": story_id,
+            "title": story.get("title", ""),
+            "workspace": str(story_path_config.base_dir),
+            "status": "completed",
+            "sprint_number": sprint_result.get("sprint_number"),
+            "final_decision": final_decision,
+            "readiness_score": sprint_result.get("readiness_score", 0),
+            "success_rate": sprint_result.get("success_rate", 0.0),
+            "completed_stages": sprint_result.get("completed_stages", []),
+            "failed_stages": failed_stages,
+            "quality_summary": sprint_result.get("quality_summary", {}),
+            "started_at": sprint_result.get("started_at"),
+            "completed_at": sprint_result.get("completed_at"),
+        }
+
+    def merge_results(
+        self, story_results: Sequence[dict[str, Any]], started_at: datetime
+    ) -> dict[str, Any]:
+        """Merge per-story results into a batch summary.
+
+        Args:
+            story_results: Results of the individual stories
+            started_at: When the batch started
+
+        Returns:
+            Batch summary with per-story results and totals
+        """
+        completed_at = datetime.now()
+        success_rates = [r.get("success_rate", 0.0) for r in story_results]
+
+        return {
+            "batch_id": f"batch-{started_at.strftime('%Y%m%d-%H%M%S-%f')}",
+            "max_concurrency": self.max_concurrency,
+            "started_at": started_at.isoformat(),
+            "completed_at": completed_at.isoformat(),
+            "duration_seconds": (completed_at - started_at).total_seconds(),
+            "stories": {r["story_id"]: r for r in story_results},
+            "totals": {
+                "stories": len(story_results),
+                "go": sum(1 for r in story_results if r.get("final_decision") == "GO"),
+                "no_go": sum(1 for r in story_results if r.get("final_decision") != "GO"),
+                "errors": sum(1 for r in story_results if r.get("status") == "error"),
+                "average_success_rate": (
+                    sum(success_rates) / len(success_rates) if success_rates else 0.0
+                ),
+            },
+        }
+
+    def _save_summary(self, summary: dict[str, Any]) -> None:
+        """Persist the batch summary under batches/."""
+        batches_dir = self.path_config.batches_dir
+        batches_dir.mkdir(parents=True, exist_ok=True)
+        summary_path = batches_dir / f"{summary['batch_id']}.json"
+        summary_path.write_text(json_codec.dumps(summary, pretty=True))
+        summary["summary_path"] = str(summary_path)
@@ -0,0 +1,533 @@
+"""Checkpoints stored as deltas against the previous checkpoint.
+
+A checkpoint used to hold a full copy of the project state, so checkpoint
+storage grew with the state size times the number of checkpoints. Each
+checkpoint file now holds the journal operations (see
+verifflowcc.core.state_journal) turning the state of the previous checkpoint
+into its own, and every ``snapshot_every``-th checkpoint holds the full state
+again:
+
+    {"name": "after-design", "timestamp": "...", "base": "after-requirements",
+     "depth": 3, "delta": [["set", ["current_stage"], "coding"], ...]}
+
+Restoring a checkpoint reads its chain back to the last full snapshot and
+applies the deltas in order, so at most ``snapshot_every`` files are read.
+Files written before deltas existed hold a ``state`` and are snapshots.
+
+``checkpoints/manifest.json`` indexes the checkpoints in creation order with
+what listing, naming and retention need (name, timestamp, message, size, git
+tag, parent and sprint), and names the latest checkpoint, which the next delta
+is based on. Every create, metadata update, restore and removal updates it, so
+none of them opens more checkpoint files than it reads or writes. A missing
+or unreadable manifest is rebuilt from the checkpoint files.
+
+Checkpoint files are compressed with gzip (``<name>.json.gz``) or lzma
+(``<name>.json.xz``) as configured, or written as plain ``<name>.json``. Files
+of every format are read whatever the current setting.
+
+A retention policy limits the checkpoints kept: the latest ``keep_last``, the
+latest of each sprint and at most ``max_bytes`` in total. gc() removes the
+others, along with the git tags ``vv checkpoint`` created for them, and runs
+after every new checkpoint with ``auto_gc``:
+
+    checkpoints:
+      compression: gzip
+      snapshot_every: 10
+      retention:
+        keep_last: 20
+        keep_per_sprint: true
+        max_bytes: 50000000
+        auto_gc: true
+"""
+
+import gzip
+import logging
+import lzma
+from collections.abc import Mapping
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, cast
+
+import yaml
+
+from verifflowcc.core import json_codec
+from verifflowcc.core.git_integration import GitIntegration
+from verifflowcc.core.path_config import PathConfig
+from verifflowcc.core.state_journal import apply_ops, diff_state
+from verifflowcc.core.state_lock import StateLock, lock_for
+from verifflowcc.core.state_writer import write_atomic
+
+logger = logging.getLogger(__name__)
+
+# Index of the checkpoints
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 1
+
+# Suffix of the checkpoint files of each compression
+COMPRESSIONS = {"none": ".json", "gzip": ".json.gz", "lzma": ".json.xz"}
+
+# Errors of reading a missing, truncated or corrupt checkpoint file
+READ_ERRORS = (OSError, ValueError, EOFError, lzma.LZMAError)
+
+
+def get_checkpoint_settings(path_config: PathConfig) -> dict[str, Any]:
+    """Read the ``checkpoints`` section of a project's config.yaml.
+
+    Args:
+        path_config: Paths of the project
+
+    Returns:
+        Checkpoint settings, empty when not configured
+    """
+    if not path_config.config_path.exists():
+        return {}
+    config = yaml.safe_load(path_config.config_path.read_text()) or {}
+    return cast("dict[str, Any]", config.get("checkpoints") or {})
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """Limits on the checkpoints kept, None for no limit."""
+
+    keep_last: int | None = None
+    keep_per_sprint: bool = False
+    max_bytes: int | None = None
+    auto_gc: bool = False
+
+    def __post_init__(self) -> None:
+        """Validate the limits."""
+        if self.keep_last is not None and self.keep_last < 1:
+            raise ValueError("keep_last must be at least 1")
+        if self.max_bytes is not None and self.max_bytes < 0:
+            raise ValueError("max_bytes must not be negative")
+
+    @classmethod
+    def from_settings(cls, settings: Mapping[str, Any]) -> "RetentionPolicy":
+        """Read the policy from the ``checkpoints.retention`` configuration section.
+
+        Raises:
+            ValueError: If a limit is out of range
+        """
+        return cls(
+            keep_last=settings.get("keep_last"),
+            keep_per_sprint=bool(settings.get("keep_per_sprint", False)),
+            max_bytes=settings.get("max_bytes"),
+            auto_gc=bool(settings.get("auto_gc", False)),
+        )
+
+    @property
+    def limited(self) -> bool:
+        """Whether the policy removes any checkpoint."""
+        return self.keep_last is not None or self.keep_per_sprint or self.max_bytes is not None
+
+
+class CheckpointStore:
+    """Writes checkpoints as deltas and rebuilds their state on load."""
+
+    def __init__(
+        self,
+        checkpoints_dir: Path,
+        snapshot_every: int = 10,
+        lock: StateLock | None = None,
+        compression: str = "gzip",
+        retention: RetentionPolicy | None = None,
+    ):
+        """Initialize the store.
+
+        Args:
+            checkpoints_dir: Directory of the checkpoint files
+            snapshot_every: Checkpoints per full snapshot, 1 stores every
+                checkpoint in full
+            lock: Lock held while writing, None when no other process writes
+            compression: Compression of new checkpoint files, one of COMPRESSIONS
+            retention: Checkpoints kept by gc(), all of them when None
+        """
+        if snapshot_every < 1:
+            raise ValueError("snapshot_every must be at least 1")
+        if compression not in COMPRESSIONS:
+            raise ValueError(
+                f"Unknown checkpoint compression '{compression}', "
+                f"expected one of {', '.join(COMPRESSIONS)}"
+            )
+        self.checkpoints_dir = checkpoints_dir
+        self.manifest_path = checkpoints_dir / MANIFEST_FILE
+        self.snapshot_every = snapshot_every
+        self.lock = lock
+        self.compression = compression
+        self.retention = retention or RetentionPolicy()
+        # Name, depth and state of the latest checkpoint written by this store
+        self._latest: tuple[str, int, dict[str, Any]] | None = None
+
+    @classmethod
+    def for_project(
+        cls, path_config: PathConfig, settings: dict[str, Any] | None = None
+    ) -> "CheckpointStore":
+        """Create the checkpoint store of a project.
+
+        Args:
+            path_config: Paths of the project
+            settings: The ``checkpoints`` configuration section, read from
+                config.yaml when None
+
+        Returns:
+            CheckpointStore writing to the project's checkpoints directory
+        """
+        if settings is None:
+            settings = get_checkpoint_settings(path_config)
+        return cls(
+            path_config.checkpoints_dir,
+            settings.get("snapshot_every", 10),
+            lock_for(path_config),
+            settings.get("compression", "gzip"),
+            RetentionPolicy.from_settings(settings.get("retention") or {}),
+        )
+
+    def path_of(self, name: str) -> Path:
+        """Get the file of a checkpoint, in whichever format it was written."""
+        for suffix in COMPRESSIONS.values():
+            path = self.checkpoints_dir / f"{name}{suffix}"
+            if path.exists():
+                return path
+        return self.checkpoints_dir / f"{name}{COMPRESSIONS[self.compression]}"
+
+    def exists(self, name: str) -> bool:
+        """Check whether a checkpoint exists."""
+        return name in self.read_manifest()["checkpoints"]
+
+    def names(self) -> list[str]:
+        """Get the names of all checkpoints, oldest first."""
+        return list(self.read_manifest()["checkpoints"])
+
+    def entries(self) -> list[dict[str, Any]]:
+        """Get the manifest entries of all checkpoints, oldest first."""
+        return list(self.read_manifest()["checkpoints"].values())
+
+    def next_name(self, prefix: str = "checkpoint") -> str:
+        """Allocate a name for a new checkpoint, e.g. ``checkpoint_12``."""
+        checkpoints = self.read_manifest()["checkpoints"]
+        number = len(checkpoints) + 1
+        while f"{prefix}_{number}" in checkpoints:
+            number += 1
+        return f"{prefix}_{number}"
+
+    def read_manifest(self) -> dict[str, Any]:
+        """Read the manifest, rebuilt from the checkpoint files when missing.
+
+        Returns:
+            Manifest with the ``latest`` checkpoint name and the ``checkpoints``
+            entries by name, oldest first
+        """
+        try:
+            manifest = json_codec.loads(self.manifest_path.read_bytes())
+        except (OSError, ValueError):
+            return self._scan()
+        if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+            return self._scan()
+        return manifest
+
+    def rebuild_manifest(self) -> dict[str, Any]:
+        """Rebuild the manifest from the checkpoint files, e.g. after editing them by hand.
+
+        Returns:
+            The new manifest
+        """
+        with self._locked():
+            manifest = self._scan()
+            self._write_manifest(manifest)
+        return manifest
+
+    def save(self, checkpoint: dict[str, Any]) -> None:
+        """Write a checkpoint.
+
+        Args:
+            checkpoint: Checkpoint with its ``name``, ``state`` and metadata
+        """
+        name = checkpoint["name"]
+        state = cast("dict[str, Any]", json_codec.loads(json_codec.dumps(checkpoint["state"])))
+        record = {key: value for key, value in checkpoint.items() if key != "state"}
+        # Read by the retention policy without rebuilding the state
+        record.setdefault("sprint_number", state.get("sprint_number"))
+
+        with self._locked():
+            manifest = self.read_manifest()
+            latest = self._load_latest(manifest)
+            if name in manifest["checkpoints"]:
+                # Checkpoints based on the one replaced keep their state
+                self._detach_dependants(name, manifest)
+            if latest is None or latest[0] == name or latest[1] + 1 >= self.snapshot_every:
+                record.update(depth=0, state=state)
+            else:
+                base, depth, base_state = latest
+                record.update(base=base, depth=depth + 1, delta=diff_state(base_state, state))
+            # A replaced checkpoint moves to the end of the creation order
+            manifest["checkpoints"].pop(name, None)
+            self._write_record(name, record, manifest)
+            manifest["latest"] = name
+            self._write_manifest(manifest)
+            self._latest = (name, record["depth"], state)
+
+    def load(self, name: str) -> dict[str, Any]:
+        """Read a checkpoint and rebuild its state.
+
+        Args:
+            name: Checkpoint name
+
+        Returns:
+            The checkpoint with its full ``state``
+
+        Raises:
+            FileNotFoundError: If the checkpoint or one of its bases is missing
+            ValueError: If the chain of bases loops
+        """
+        checkpoint = self.read_record(name)
+        chain = [checkpoint]
+        while "state" not in chain[-1]:
+            base = chain[-1]["base"]
+            if any(record["name"] == base for record in chain):
+                raise ValueError(f"Checkpoint '{name}' has a loop in its bases")
+            chain.append(self.read_record(base))
+
+        state = chain.pop()["state"]
+        for record in reversed(chain):
+            apply_ops(state, record["delta"])
+        checkpoint = {
+            key: value for key, value in checkpoint.items() if key not in ("base", "delta")
+        }
+        checkpoint["state"] = state
+        return checkpoint
+
+    def read_record(self, name: str) -> dict[str, Any]:
+        """Read a checkpoint file as stored, a delta or a snapshot.
+
+        Raises:
+            FileNotFoundError: If the checkpoint does not exist
+        """
+        path = self.path_of(name)
+        data = path.read_bytes()
+        if path.name.endswith(COMPRESSIONS["gzip"]):
+            data = gzip.decompress(data)
+        elif path.name.endswith(COMPRESSIONS["lzma"]):
+            data = lzma.decompress(data)
+        return cast("dict[str, Any]", json_codec.loads(data))
+
+    def update_metadata(self, name: str, **fields: Any) -> None:
+        """Add metadata to a checkpoint, e.g. the git commit made for it.
+
+        Args:
+            name: Checkpoint name
+            **fields: Fields to set, not ``state``, ``base`` or ``delta``
+        """
+        with self._locked():
+            manifest = self.read_manifest()
+            record = self.read_record(name)
+            record.update(fields)
+            self._write_record(name, record, manifest)
+            self._write_manifest(manifest)
+
+    def mark_restored(self, name: str) -> None:
+        """Record in the manifest that a checkpoint was restored."""
+        with self._locked():
+            manifest = self.read_manifest()
+            entry = manifest["checkpoints"].get(name)
+            if entry is None:
+                return
+            entry["restored_at"] = datetime.now().isoformat()
+            self._write_manifest(manifest)
+
+    def gc(
+        self,
+        policy: RetentionPolicy | None = None,
+        git: GitIntegration | None = None,
+        dry_run: bool = False,
+    ) -> list[dict[str, Any]]:
+        """Remove the checkpoints a retention policy does not keep.
+
+        Checkpoints based on a removed one are rewritten as full snapshots,
+        which may grow them; with ``max_bytes`` the selection is repeated
+        until the remaining checkpoints fit. The latest checkpoint is always
+        kept.
+
+        Args:
+            policy: Policy to apply, the store's retention by default
+            git: Repository whose tags of removed checkpoints are deleted
+            dry_run: Whether to only report what would be removed
+
+        Returns:
+            Manifest entries of the removed checkpoints, oldest first
+        """
+        policy = policy or self.retention
+        removed: list[dict[str, Any]] = []
+        if not policy.limited:
+            return removed
+
+        with self._locked():
+            manifest = self.read_manifest()
+            while True:
+                doomed = self._select_garbage(list(manifest["checkpoints"].values()), policy)
+                if not doomed:
+                    break
+                removed.extend(doomed)
+                if dry_run:
+                    break
+                for entry in doomed:
+                    self._remove(entry, manifest, git)
+                self._write_manifest(manifest)
+        return removed
+
+    def _select_garbage(
+        self, entries: list[dict[str, Any]], policy: RetentionPolicy
+    ) -> list[dict[str, Any]]:
+        """Select the checkpoints a policy does not keep.
+
+        Args:
+            entries: Manifest entries, oldest first
+            policy: Retention policy
+
+        Returns:
+            Entries to remove, oldest first
+        """
+        if not entries:
+            return []
+        kept = {entries[-1]["name"]}
+        if policy.keep_last is None and not policy.keep_per_sprint:
+            kept.update(entry["name"] for entry in entries)
+        if policy.keep_last is not None:
+            kept.update(entry["name"] for entry in entries[-policy.keep_last :])
+        if policy.keep_per_sprint:
+            latest_of_sprint = {entry["sprint_number"]: entry["name"] for entry in entries}
+            kept.update(latest_of_sprint.values())
+
+        if policy.max_bytes is not None:
+            total = sum(entry["size"] for entry in entries if entry["name"] in kept)
+            for entry in entries[:-1]:
+                if total <= policy.max_bytes:
+                    break
+                if entry["name"] in kept:
+                    kept.discard(entry["name"])
+                    total -= entry["size"]
+
+        return [entry for entry in entries if entry["name"] not in kept]
+
+    def _remove(
+        self, entry: dict[str, Any], manifest: dict[str, Any], git: GitIntegration | None
+    ) -> None:
+        """Remove a checkpoint and its git tag, keeping the checkpoints based on it."""
+        name = entry["name"]
+        self._detach_dependants(name, manifest)
+        (self.checkpoints_dir / entry["file"]).unlink(missing_ok=True)
+        del manifest["checkpoints"][name]
+        if manifest["latest"] == name:
+            manifest["latest"] = None
+            self._latest = None
+        if git is not None and entry.get("git_tag"):
+            success, message = git.delete_checkpoint_tag(name)
+            if not success:
+                logger.warning(f"Cannot delete git tag of checkpoint '{name}': {message}")
+
+    def _write_record(self, name: str, record: dict[str, Any], manifest: dict[str, Any]) -> None:
+        """Write a checkpoint file in the configured format, replacing any other.
+
+        Args:
+            name: Checkpoint name
+            record: Checkpoint as stored, a delta or a snapshot
+            manifest: Manifest whose entry of the checkpoint is updated
+        """
+        data = json_codec.dumps(record).encode()
+        if self.compression == "gzip":
+            data = gzip.compress(data, mtime=0)
+        elif self.compression == "lzma":
+            data = lzma.compress(data)
+        path = self.checkpoints_dir / f"{name}{COMPRESSIONS[self.compression]}"
+        write_atomic(path, data)
+        for suffix in COMPRESSIONS.values():
+            if suffix != COMPRESSIONS[self.compression]:
+                (self.checkpoints_dir / f"{name}{suffix}").unlink(missing_ok=True)
+        previous = manifest["checkpoints"].get(name) or {}
+        manifest["checkpoints"][name] = self._entry(record, path, len(data), previous)
+
+    @staticmethod
+    def _entry(
+        record: dict[str, Any], path: Path, size: int, previous: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
+        """Build the manifest entry of a checkpoint file."""
+        entry = {
+            "name": record["name"],
+            "timestamp": record.get("timestamp"),
+            # The orchestrator calls it a description
+            "message": record.get("message") or record.get("description") or "",
+            "size": size,
+            "git_tag": record.get("git_tag"),
+            "parent": record.get("base"),
+            "depth": record.get("depth", 0),
+            "sprint_number": record.get(
+                "sprint_number", (record.get("state") or {}).get("sprint_number")
+            ),
+            "file": path.name,
+        }
+        if previous and "restored_at" in previous:
+            entry["restored_at"] = previous["restored_at"]
+        return entry
+
+    def _scan(self) -> dict[str, Any]:
+        """Build the manifest by reading every checkpoint file."""
+        found = []
+        if self.checkpoints_dir.is_dir():
+            for path in self.checkpoints_dir.iterdir():
+                suffix = next(
+                    (suffix for suffix in COMPRESSIONS.values() if path.name.endswith(suffix)),
+                    None,
+                )
+                # Temporary files of interrupted writes start with a dot
+                if suffix is None or path.name.startswith(".") or path.name == MANIFEST_FILE:
+                    continue
+                try:
+                    record = self.read_record(path.name.removesuffix(suffix))
+                    stat = path.stat()
+                except READ_ERRORS as e:
+                    logger.warning(f"Skipping unreadable checkpoint {path}: {e}")
+                    continue
+                record.setdefault("name", path.name.removesuffix(suffix))
+                entry = self._entry(record, path, stat.st_size)
+                found.append((record.get("timestamp") or "", stat.st_mtime, entry))
+        found.sort(key=lambda item: item[:2])
+        checkpoints = {entry["name"]: entry for _, _, entry in found}
+        return {
+            "version": MANIFEST_VERSION,
+            "latest": next(reversed(checkpoints), None),
+            "checkpoints": checkpoints,
+        }
+
+    def _write_manifest(self, manifest: dict[str, Any]) -> None:
+        """Write the manifest; it is rebuilt from the checkpoint files if lost."""
+        write_atomic(self.manifest_path, json_codec.dumps(manifest), fsync=False)
+
+    def _load_latest(self, manifest: dict[str, Any]) -> tuple[str, int, dict[str, Any]] | None:
+        """Get the name, depth and state of the checkpoint to base a delta on."""
+        name = manifest["latest"]
+        if name is None:
+            return None
+        if self._latest is not None and self._latest[0] == name:
+            return self._latest
+        try:
+            checkpoint = self.load(name)
+        except (*READ_ERRORS, KeyError) as e:
+            # A full snapshot is written instead
+            logger.warning(f"Cannot read latest checkpoint '{name}': {e}")
+            return None
+        return name, checkpoint.get("depth", 0), checkpoint["state"]
+
+    def _detach_dependants(self, name: str, manifest: dict[str, Any]) -> None:
+        """Store the checkpoints based on a checkpoint as full snapshots."""
+        dependants = [
+            entry["name"] for entry in manifest["checkpoints"].values() if entry["parent"] == name
+        ]
+        for dependant in dependants:
+            checkpoint = self.load(dependant)
+            checkpoint["depth"] = 0
+            self._write_record(dependant, checkpoint, manifest)
+
+    def _locked(self) -> AbstractContextManager[Any]:
+        """Hold the lock, if any, while writing."""
+        return self.lock.exclusive() if self.lock is not None else nullcontext()
@@ -0,0 +1,311 @@
+"""Adaptive concurrency control of agent calls.
+
+A fixed number of concurrent stages is too low while the backend is fast and
+too high once it degrades. The AdaptiveConcurrencyController adjusts the number
+of stages (and so SDK calls) in flight with AIMD, as used by TCP congestion
+control:
+
+- every successful call that is not slow raises the limit by ``1 / limit``,
+  i.e. by one per window of ``limit`` calls (additive increase);
+- a timeout, error, throttled call (one that needed retries or waited for the
+  rate limiter) or slow call multiplies the limit by ``backoff_ratio``
+  (multiplicative decrease). Calls that started before the last decrease do
+  not decrease it again, so one burst of failures counts as one signal.
+
+Only SDK-level signals drive the limit: agents report how their SDK calls went
+under ``sdk_outcome`` in their results. Stages that made no SDK call (cached,
+skipped or agent-less stages, agents that could not be created) give no
+feedback, and a stage failing its quality gate is not backend congestion.
+
+A call is slow when it exceeds ``latency_target``, or when no target is set,
+when it takes more than ``latency_tolerance`` times the moving average latency
+of calls with the same key (the agent type, as stages differ widely in cost).
+
+Like the rate limiter, one controller is shared by all orchestrators of the
+process, so concurrent batch stories adapt to the same backend.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Mapping
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+SUCCESS = "success"
+ERROR = "error"
+TIMEOUT = "timeout"
+THROTTLED = "throttled"
+OUTCOMES = (SUCCESS, ERROR, TIMEOUT, THROTTLED)
+
+# Weight of a new sample in the moving average latency of a key
+LATENCY_SMOOTHING = 0.3
+
+
+def outcome_from_result(result: Mapping[str, Any]) -> str | None:
+    """Get the congestion signal an agent reported with a stage result.
+
+    Args:
+        result: Stage result
+
+    Returns:
+        Outcome of the stage's SDK calls, or None when no SDK call was made
+        (cached, skipped or agent-less stages)
+    """
+    if result.get("cached"):
+        return None
+    outcome = result.get("sdk_outcome")
+    return outcome if outcome in OUTCOMES else None
+
+
+class Permit:
+    """A slot held by one call, reporting its outcome on release."""
+
+    def __init__(self, key: str | None, started_at: float):
+        """Initialize the permit.
+
+        Args:
+            key: Latency class of the call
+            started_at: Clock time the call started
+        """
+        self.key = key
+        self.started_at = started_at
+        # Set by the holder; None means the call gives no feedback
+        self.outcome: str | None = SUCCESS
+
+
+class AdaptiveConcurrencyController:
+    """AIMD limit on the number of calls in flight."""
+
+    def __init__(
+        self,
+        initial_limit: int = 2,
+        min_limit: int = 1,
+        max_limit: int = 8,
+        backoff_ratio: float = 0.5,
+        latency_target: float | None = None,
+        latency_tolerance: float = 2.0,
+        history_size: int = 20,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the controller.
+
+        Args:
+            initial_limit: Calls allowed in flight at start
+            min_limit: Lower bound of the limit
+            max_limit: Upper bound of the limit
+            backoff_ratio: Factor applied to the limit on congestion
+            latency_target: Latency in seconds above which a call is slow
+            latency_tolerance: Multiple of the average latency above which a call
+                is slow, used when no latency_target is set
+            history_size: Number of limit adjustments kept for status output
+            clock: Monotonic clock in seconds
+        """
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("Concurrency limits must satisfy 1 <= min <= initial <= max")
+        if not 0 < backoff_ratio < 1:
+            raise ValueError("Backoff ratio must be between 0 and 1")
+        if latency_tolerance <= 1:
+            raise ValueError("Latency tolerance must be greater than 1")
+
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_ratio = backoff_ratio
+        self.latency_target = latency_target
+        self.latency_tolerance = latency_tolerance
+        self._clock = clock
+        self._limit = float(initial_limit)
+        self._last_decrease_at = float("-inf")
+        self._average_latency: dict[str | None, float] = {}
+        self.in_flight = 0
+        self.total_calls = 0
+        self.congested_calls = 0
+        self.adjustments: deque[dict[str, Any]] = deque(maxlen=history_size)
+
+        self._condition: asyncio.Condition | None = None
+        self._condition_loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def limit(self) -> int:
+        """Current number of calls allowed in flight."""
+        return int(self._limit)
+
+    @asynccontextmanager
+    async def slot(self, key: str | None = None) -> AsyncIterator[Permit]:
+        """Hold one of the slots for the duration of a call.
+
+        Set ``outcome`` on the yielded permit to report how the call went. An
+        exception raised by the call counts as an error, cancellation gives no
+        feedback.
+
+        Args:
+            key: Latency class of the call, e.g. the agent type
+
+        Yields:
+            Permit of the call
+        """
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+
+        permit = Permit(key, self._clock())
+        try:
+            yield permit
+        except asyncio.CancelledError:
+            permit.outcome = None
+            raise
+        except Exception:
+            permit.outcome = ERROR
+            raise
+        finally:
+            self.in_flight -= 1
+            if permit.outcome is not None:
+                self.record(permit.outcome, self._clock() - permit.started_at, permit)
+            async with condition:
+                condition.notify_all()
+
+    def record(self, outcome: str, latency: float, permit: Permit | None = None) -> None:
+        """Adjust the limit from the outcome of a call.
+
+        Args:
+            outcome: SUCCESS, ERROR, TIMEOUT or THROTTLED
+            latency: Duration of the call in seconds
+            permit: Permit of the call, for its key and start time
+        """
+        key = permit.key if permit else None
+        started_at = permit.started_at if permit else self._clock()
+        self.total_calls += 1
+
+        reason = None if outcome == SUCCESS else outcome
+        if reason is None and self._is_slow(key, latency):
+            reason = f"slow ({latency:.1f}s)"
+        if outcome == SUCCESS:
+            average = self._average_latency.get(key)
+            self._average_latency[key] = (
+                latency if average is None else average + LATENCY_SMOOTHING * (latency - average)
+            )
+
+        if reason is None:
+            self._set_limit(self._limit + 1 / self._limit, "healthy")
+            return
+
+        self.congested_calls += 1
+        if started_at < self._last_decrease_at:
+            # Already reacted to the congestion this call ran into
+            return
+        self._last_decrease_at = self._clock()
+        self._set_limit(self._limit * self.backoff_ratio, reason)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get the current limit and the recent adjustments.
+
+        Returns:
+            Dictionary of limits, counters and adjustments
+        """
+        return {
+            "limit": self.limit,
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "in_flight": self.in_flight,
+            "total_calls": self.total_calls,
+            "congested_calls": self.congested_calls,
+            "adjustments": list(self.adjustments),
+        }
+
+    def _is_slow(self, key: str | None, latency: float) -> bool:
+        """Check whether a call took longer than expected."""
+        if self.latency_target is not None:
+            return latency > self.latency_target
+        average = self._average_latency.get(key)
+        return average is not None and latency > self.latency_tolerance * average
+
+    def _set_limit(self, value: float, reason: str) -> None:
+        """Change the limit within its bounds, recording visible changes."""
+        previous = self.limit
+        self._limit = min(float(self.max_limit), max(float(self.min_limit), value))
+        if self.limit == previous:
+            return
+
+        logger.info(f"Concurrency limit {previous} -> {self.limit} ({reason})")
+        self.adjustments.append(
+            {
+                "at": datetime.now().isoformat(),
+                "from": previous,
+                "to": self.limit,
+                "reason": reason,
+            }
+        )
+
+    def _get_condition(self) -> asyncio.Condition:
+        """Get the condition waiters block on, bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._condition is None or self._condition_loop is not loop:
+            self._condition = asyncio.Condition()
+            self._condition_loop = loop
+        return self._condition
+
+
+# Global controller shared by all orchestrators of the process
+_concurrency_controller: AdaptiveConcurrencyController | None = None
+_concurrency_options: dict[str, Any] = {}
+
+
+def get_concurrency_controller() -> AdaptiveConcurrencyController:
+    """Get the process-wide concurrency controller.
+
+    Returns:
+        AdaptiveConcurrencyController instance
+    """
+    global _concurrency_controller
+    if _concurrency_controller is None:
+        _concurrency_controller = AdaptiveConcurrencyController()
+    return _concurrency_controller
+
+
+def configure_concurrency_controller(
+    settings: Mapping[str, Any] | None,
+) -> AdaptiveConcurrencyController | None:
+    """Apply the ``concurrency`` section of config.yaml to the global controller.
+
+    The controller is replaced only when its bounds change, so orchestrators
+    sharing a configuration keep the limit learned so far.
+
+    Args:
+        settings: The ``concurrency`` configuration section
+
+    Returns:
+        The global controller, or None when adaptive concurrency is disabled
+    """
+    global _concurrency_controller, _concurrency_options
+    settings = settings or {}
+    if not settings.get("adaptive", True):
+        return None
+
+    options = {
+        "initial_limit": settings.get("initial_limit", 2),
+        "min_limit": settings.get("min_limit", 1),
+        "max_limit": settings.get("max_limit", 8),
+        "backoff_ratio": settings.get("backoff_ratio", 0.5),
+        "latency_target": settings.get("latency_target"),
+        "latency_tolerance": settings.get("latency_tolerance", 2.0),
+    }
+    if _concurrency_controller is None or options != _concurrency_options:
+        _concurrency_controller = AdaptiveConcurrencyController(**options)
+        _concurrency_options = options
+    return _concurrency_controller
+
+
+def set_concurrency_controller(controller: AdaptiveConcurrencyController | None) -> None:
+    """Replace the process-wide concurrency controller.
+
+    Args:
+        controller: Controller to share, or None to reset to defaults
+    """
+    global _concurrency_controller, _concurrency_options
+    _concurrency_controller = controller
+    _concurrency_options = {}
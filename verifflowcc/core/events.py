@@ -0,0 +1,273 @@
+"""Event bus for stage lifecycle events.
+
+The orchestrator publishes an event when a stage starts, streams output from
+its agent, is gated, completes or fails. Subscribers are isolated from the
+stage and from each other:
+
+- a non-blocking subscriber gets its events through a bounded queue drained by
+  a task of its own, so a slow notifier or report writer never delays the
+  sprint. When its queue is full the oldest event is dropped;
+- a blocking subscriber is awaited by publish(), concurrently with the other
+  blocking subscribers, for callbacks that must finish before the stage moves
+  on (e.g. writing a report the next stage reads).
+
+Sync callbacks run in a worker thread, so blocking I/O in a notifier never
+stalls the event loop. Every delivery runs under a timeout, and an exception
+raised by a subscriber is logged and counted but never propagated to the
+publisher. A sync callback that times out is abandoned, not interrupted: its
+thread keeps running until the callback returns.
+"""
+
+import asyncio
+import inspect
+import logging
+from collections.abc import Awaitable, Callable, Collection
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from verifflowcc.core.vmodel import VModelStage
+
+logger = logging.getLogger(__name__)
+
+STAGE_STARTED = "stage_started"
+STAGE_STREAMED = "stage_streamed"
+STAGE_GATED = "stage_gated"
+STAGE_COMPLETED = "stage_completed"
+STAGE_FAILED = "stage_failed"
+
+EVENT_TYPES = (STAGE_STARTED, STAGE_STREAMED, STAGE_GATED, STAGE_COMPLETED, STAGE_FAILED)
+
+EventCallback = Callable[["StageEvent"], Awaitable[None] | None]
+
+
+@dataclass
+class StageEvent:
+    """An event in the lifecycle of a stage."""
+
+    type: str
+    stage: VModelStage
+    data: dict[str, Any] = field(default_factory=dict)
+    timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
+
+
+class Subscription:
+    """A callback subscribed to the event bus, with its delivery statistics."""
+
+    def __init__(
+        self,
+        callback: EventCallback,
+        events: Collection[str] | None,
+        stages: Collection[VModelStage] | None,
+        blocking: bool,
+        timeout: float,
+        queue_size: int,
+    ):
+        """Initialize the subscription.
+
+        Args:
+            callback: Sync or async callable receiving a StageEvent
+            events: Event types to deliver, None for all
+            stages: Stages to deliver events of, None for all
+            blocking: Whether publish() waits for the callback
+            timeout: Seconds a delivery may take before it is abandoned
+            queue_size: Maximum events waiting for a non-blocking callback
+        """
+        self.callback = callback
+        self.events = frozenset(events) if events is not None else None
+        self.stages = frozenset(stages) if stages is not None else None
+        self.blocking = blocking
+        self.timeout = timeout
+        self.queue_size = queue_size
+        self.delivered = 0
+        self.dropped = 0
+        self.timeouts = 0
+        self.errors = 0
+
+        self._queue: asyncio.Queue[StageEvent] | None = None
+        self._worker: asyncio.Task[None] | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def name(self) -> str:
+        """Readable name of the callback for logs and statistics."""
+        return getattr(self.callback, "__qualname__", repr(self.callback))
+
+    def matches(self, event: StageEvent) -> bool:
+        """Check whether the subscription receives an event."""
+        return (self.events is None or event.type in self.events) and (
+            self.stages is None or event.stage in self.stages
+        )
+
+    def enqueue(self, event: StageEvent) -> None:
+        """Queue an event for the worker, dropping the oldest one when full."""
+        loop = asyncio.get_running_loop()
+        if self._queue is None or self._loop is not loop:
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+            self._loop = loop
+            self._worker = None
+        if self._queue.full():
+            self._queue.get_nowait()
+            self._queue.task_done()
+            self.dropped += 1
+            logger.warning(f"Event queue of subscriber {self.name} is full, dropped oldest event")
+        self._queue.put_nowait(event)
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.ensure_future(self._work(self._queue))
+
+    async def deliver(self, event: StageEvent) -> None:
+        """Run the callback for one event, isolating its failures."""
+        try:
+            await asyncio.wait_for(self._call(event), timeout=self.timeout)
+            self.delivered += 1
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            logger.warning(
+                f"Subscriber {self.name} timed out after {self.timeout}s on {event.type}"
+            )
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Subscriber {self.name} failed on {event.type}: {e}")
+
+    async def drain(self) -> None:
+        """Wait until every queued event has been delivered."""
+        if self._queue is not None and self._loop is asyncio.get_running_loop():
+            await self._queue.join()
+
+    def close(self) -> None:
+        """Stop the worker; queued events are discarded."""
+        if self._worker is not None:
+            self._worker.cancel()
+        self._queue = None
+        self._worker = None
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get the delivery statistics of the subscription."""
+        return {
+            "callback": self.name,
+            "blocking": self.blocking,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+        }
+
+    async def _call(self, event: StageEvent) -> None:
+        """Run the callback, in a worker thread unless it is a coroutine function."""
+        if inspect.iscoroutinefunction(self.callback):
+            await self.callback(event)
+            return
+        outcome = await asyncio.to_thread(self.callback, event)
+        if inspect.isawaitable(outcome):
+            await outcome
+
+    async def _work(self, queue: "asyncio.Queue[StageEvent]") -> None:
+        """Deliver queued events one at a time, in order."""
+        while True:
+            event = await queue.get()
+            try:
+                await self.deliver(event)
+            finally:
+                queue.task_done()
+
+
+class EventBus:
+    """Publishes stage events to concurrent, isolated subscribers."""
+
+    def __init__(self, queue_size: int = 100, timeout: float = 30.0):
+        """Initialize the bus.
+
+        Args:
+            queue_size: Default maximum events waiting for a non-blocking subscriber
+            timeout: Default seconds a delivery may take
+        """
+        if queue_size < 1:
+            raise ValueError("Event queue size must be at least 1")
+        if timeout <= 0:
+            raise ValueError("Event timeout must be positive")
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.subscriptions: list[Subscription] = []
+
+    def subscribe(
+        self,
+        callback: EventCallback,
+        events: Collection[str] | None = None,
+        stages: Collection[VModelStage] | None = None,
+        blocking: bool = False,
+        timeout: float | None = None,
+        queue_size: int | None = None,
+    ) -> Subscription:
+        """Subscribe a callback to stage events.
+
+        Args:
+            callback: Sync or async callable receiving a StageEvent
+            events: Event types to deliver, None for all
+            stages: Stages to deliver events of, None for all
+            blocking: Whether publish() waits for the callback
+            timeout: Seconds a delivery may take, defaults to the bus timeout
+            queue_size: Maximum queued events, defaults to the bus queue size
+
+        Returns:
+            The subscription, to pass to unsubscribe()
+        """
+        unknown = set(events or ()) - set(EVENT_TYPES)
+        if unknown:
+            raise ValueError(f"Unknown event types: {', '.join(sorted(unknown))}")
+        subscription = Subscription(
+            callback,
+            events,
+            stages,
+            blocking,
+            timeout if timeout is not None else self.timeout,
+            queue_size if queue_size is not None else self.queue_size,
+        )
+        self.subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a subscription, discarding its queued events.
+
+        Args:
+            subscription: Subscription returned by subscribe()
+        """
+        if subscription in self.subscriptions:
+            self.subscriptions.remove(subscription)
+            subscription.close()
+
+    def has_subscribers(self, event_type: str, stage: VModelStage) -> bool:
+        """Check whether an event would be delivered to anyone.
+
+        Lets publishers skip building events nobody listens to, such as
+        streamed output.
+        """
+        probe = StageEvent(event_type, stage)
+        return any(subscription.matches(probe) for subscription in self.subscriptions)
+
+    async def publish(self, event: StageEvent) -> None:
+        """Publish an event.
+
+        Non-blocking subscribers get the event queued; blocking subscribers are
+        awaited concurrently. Subscriber failures never propagate.
+
+        Args:
+            event: Event to publish
+        """
+        blocking = []
+        for subscription in list(self.subscriptions):
+            if not subscription.matches(event):
+                continue
+            if subscription.blocking:
+                blocking.append(subscription.deliver(event))
+            else:
+                subscription.enqueue(event)
+        if blocking:
+            await asyncio.gather(*blocking)
+
+    async def drain(self) -> None:
+        """Wait until every queued event has been delivered."""
+        await asyncio.gather(*(subscription.drain() for subscription in self.subscriptions))
+
+    def get_stats(self) -> list[dict[str, Any]]:
+        """Get the delivery statistics of every subscription."""
+        return [subscription.get_stats() for subscription in self.subscriptions]
@@ -142,6 +142,32 @@ class GitIntegration:
         except subprocess.CalledProcessError as e:
             return False, str(e)
 
+    def delete_checkpoint_tag(self, checkpoint_name: str) -> tuple[bool, str]:
+        """Delete the git tag of a checkpoint.
+
+        Args:
+            checkpoint_name: Name of the checkpoint
+
+        Returns:
+            Tuple of (success, tag_name or error_message)
+        """
+        if not self.is_git_repo():
+            return False, "Not a git repository"
+
+        tag_name = f"checkpoint/{checkpoint_name}"
+
+        try:
+            subprocess.run(
+                ["git", "tag", "-d", tag_name],
+                cwd=self.repo_path,
+                check=True,
+                capture_output=True,
+            )
+            return True, tag_name
+
+        except subprocess.CalledProcessError as e:
+            return False, str(e)
+
     def list_checkpoint_tags(self) -> list[dict[str, str]]:
         """List all checkpoint tags.
 
@@ -0,0 +1,174 @@
+"""JSON encoding of the files VeriFlowCC persists.
+
+Every write goes through dumps(). Files that only machines read are written
+compact: state snapshots, journal entries, checkpoints, sprint records, cache
+entries and stage output bodies. Files meant for people, such as agent
+artifacts, batch summaries and ``vv status --json``, ask for ``pretty=True``.
+
+Encoding and decoding are delegated to a codec. OrjsonCodec is used when
+orjson is installed (``pip install verifflowcc[speedups]``), and StdlibCodec
+otherwise. AGILEVV_JSON_CODEC=stdlib forces the fallback, and set_codec()
+plugs in another implementation. Both codecs produce documents that decode to
+the same values. Values JSON cannot represent are written as their str(), as
+with ``json.dumps(default=str)``.
+"""
+
+import json
+import logging
+import os
+from typing import Any, Protocol
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+
+class JsonCodec(Protocol):
+    """Encoder and decoder used for persisted JSON."""
+
+    name: str
+
+    def dumps(self, value: Any, pretty: bool = False, sort_keys: bool = False) -> str:
+        """Encode a value."""
+        ...
+
+    def loads(self, data: str | bytes) -> Any:
+        """Decode a document."""
+        ...
+
+
+class StdlibCodec:
+    """Codec built on the json module of the standard library."""
+
+    name = "stdlib"
+
+    def dumps(self, value: Any, pretty: bool = False, sort_keys: bool = False) -> str:
+        """Encode a value.
+
+        Args:
+            value: Value to encode
+            pretty: Whether to indent the output for people to read
+            sort_keys: Whether to sort object keys
+
+        Returns:
+            JSON document
+        """
+        if pretty:
+            return json.dumps(value, indent=2, sort_keys=sort_keys, default=str)
+        return json.dumps(value, separators=(",", ":"), sort_keys=sort_keys, default=str)
+
+    def loads(self, data: str | bytes) -> Any:
+        """Decode a document."""
+        return json.loads(data)
+
+
+class OrjsonCodec:
+    """Codec built on orjson, several times faster than the standard library.
+
+    Datetimes and dataclasses are handed to str() like the standard library
+    codec does. Values orjson rejects, e.g. integers wider than 64 bits, are
+    encoded by the standard library instead.
+    """
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        """Initialize the codec.
+
+        Raises:
+            ImportError: If orjson is not installed
+        """
+        if orjson is None:
+            raise ImportError("orjson is not installed")
+        self._options = (
+            orjson.OPT_NON_STR_KEYS
+            | orjson.OPT_PASSTHROUGH_DATETIME
+            | orjson.OPT_PASSTHROUGH_DATACLASS
+        )
+        self._fallback = StdlibCodec()
+
+    def dumps(self, value: Any, pretty: bool = False, sort_keys: bool = False) -> str:
+        """Encode a value.
+
+        Args:
+            value: Value to encode
+            pretty: Whether to indent the output for people to read
+            sort_keys: Whether to sort object keys
+
+        Returns:
+            JSON document
+        """
+        options = self._options
+        if pretty:
+            options |= orjson.OPT_INDENT_2
+        if sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(value, default=str, option=options).decode()
+        except orjson.JSONEncodeError:
+            return self._fallback.dumps(value, pretty=pretty, sort_keys=sort_keys)
+
+    def loads(self, data: str | bytes) -> Any:
+        """Decode a document."""
+        return orjson.loads(data)
+
+
+def _default_codec() -> JsonCodec:
+    """Pick the fastest available codec unless AGILEVV_JSON_CODEC says otherwise."""
+    requested = os.environ.get("AGILEVV_JSON_CODEC", "").lower()
+    if requested == StdlibCodec.name:
+        return StdlibCodec()
+    try:
+        return OrjsonCodec()
+    except ImportError:
+        if requested == OrjsonCodec.name:
+            logger.warning("AGILEVV_JSON_CODEC=orjson but orjson is not installed")
+        return StdlibCodec()
+
+
+_codec: JsonCodec = _default_codec()
+
+
+def get_codec() -> JsonCodec:
+    """Get the codec used for persisted JSON."""
+    return _codec
+
+
+def set_codec(codec: JsonCodec | None) -> JsonCodec:
+    """Replace the codec used for persisted JSON.
+
+    Args:
+        codec: New codec, None for the default choice
+
+    Returns:
+        The previous codec
+    """
+    global _codec
+    previous, _codec = _codec, codec or _default_codec()
+    return previous
+
+
+def dumps(value: Any, pretty: bool = False, sort_keys: bool = False) -> str:
+    """Encode a value with the current codec.
+
+    Args:
+        value: Value to encode
+        pretty: Whether to indent the output, only for files people read
+        sort_keys: Whether to sort object keys
+
+    Returns:
+        JSON document
+    """
+    return _codec.dumps(value, pretty=pretty, sort_keys=sort_keys)
+
+
+def loads(data: str | bytes) -> Any:
+    """Decode a document with the current codec.
+
+    Raises:
+        ValueError: If the document is not valid JSON
+    """
+    return _codec.loads(data)
@@ -0,0 +1,262 @@
+"""Partial loading of large JSON files.
+
+Loading one key of an artifact such as ``testing/US-001_results.json`` used to
+decode the whole document, thousands of test cases included. The functions
+here decode only what is asked for:
+
+    load_keys(path, ["execution_summary"])
+    for test_case in iter_array(path, "test_cases"): ...
+
+Files from MMAP_THRESHOLD bytes up are memory-mapped rather than read, and
+scanned for the spans of the values requested: a regular expression matches
+a whole container nested up to NESTING_MATCHED levels within SKIP_WINDOW
+bytes, and brackets are only counted in Python for containers deeper or
+longer than that, between runs skipped a window at a time. Only the spans
+requested are copied and decoded, with json_codec, so memory use is bounded
+by the values returned (one array element at a time for iter_array()) rather
+than by the size of the file.
+
+This bounds memory, not time. The regular expressions scan a few tens of MB
+per second, slower than json_codec decodes, and each element of a walked
+array is matched and decoded on its own: in the benchmark of
+tests/performance, loading one key of a 7 MB test results file takes up to
+two and a half times as long as decoding the file whole, and walking its
+test cases up to six times as long. Callers that can afford to hold the
+whole document should decode it whole.
+"""
+
+import mmap
+import re
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from verifflowcc.core import json_codec
+
+# Files from this size up are memory-mapped instead of read
+MMAP_THRESHOLD = 1024 * 1024
+
+# Depth of the containers a single regular expression match skips
+NESTING_MATCHED = 16
+
+# Bytes a regular expression match covers at most, bounding its backtracking stack
+SKIP_WINDOW = 64 * 1024
+
+_PLAIN = rb'[^"\[\]{}]*'
+_STRING_PATTERN = rb'"[^"\\]*(?:\\.[^"\\]*)*"'
+
+
+def _container_pattern(depth: int) -> bytes:
+    """Build a pattern matching arrays and objects nested up to a depth.
+
+    Runs of other bytes are matched whole and always end before a quote or
+    a bracket, so that a failing match backtracks in linear time. Brackets
+    are not paired by kind, which keeps the pattern linear in the depth; a
+    mismatch in a value returned still fails its decoding.
+    """
+    inner = _STRING_PATTERN
+    if depth > 1:
+        inner += b"|" + _container_pattern(depth - 1)
+    return rb"[\[{]" + _PLAIN + b"(?:(?:" + inner + b")" + _PLAIN + rb")*[\]}]"
+
+
+_WHITESPACE = re.compile(rb"[ \t\n\r]*")
+_STRING = re.compile(_STRING_PATTERN, re.DOTALL)
+_CONTAINER = re.compile(_container_pattern(NESTING_MATCHED), re.DOTALL)
+# Bytes up to the next bracket outside strings and shallow containers
+_SKIP = re.compile(
+    _PLAIN + b"(?:(?:" + _STRING_PATTERN + b"|" + _CONTAINER.pattern + b")" + _PLAIN + b")*",
+    re.DOTALL,
+)
+_SCALAR_END = re.compile(rb"[,\]} \t\n\r]|\Z")
+_ELEMENT_END = re.compile(rb"[ \t\n\r]*([,\]])[ \t\n\r]*")
+
+Buffer = bytes | mmap.mmap
+
+
+@contextmanager
+def _open(path: Path) -> Iterator[Buffer]:
+    """Map a file into memory, or read it when it is small."""
+    with path.open("rb") as file:
+        size = file.seek(0, 2)
+        if not size or size < MMAP_THRESHOLD:
+            file.seek(0)
+            yield file.read()
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            yield buffer
+
+
+def _skip_whitespace(buffer: Buffer, pos: int) -> int:
+    """Get the position of the first non-whitespace byte from pos."""
+    match = _WHITESPACE.match(buffer, pos)
+    return match.end() if match else pos
+
+
+def _expect(buffer: Buffer, pos: int, char: bytes) -> int:
+    """Check the byte at pos, skipping whitespace before it, and get the position after it.
+
+    Raises:
+        ValueError: If another byte is found
+    """
+    pos = _skip_whitespace(buffer, pos)
+    if buffer[pos : pos + 1] != char:
+        raise ValueError(f"Expected {char.decode()!r} at byte {pos}")
+    return pos + 1
+
+
+def _value_end(buffer: Buffer, pos: int) -> int:
+    """Find the end of the JSON value starting at pos, without decoding it.
+
+    Raises:
+        ValueError: If the value is not terminated
+    """
+    first = buffer[pos : pos + 1]
+    if first == b'"':
+        match = _STRING.match(buffer, pos)
+        if match is None:
+            raise ValueError(f"Unterminated string at byte {pos}")
+        return match.end()
+    if first not in (b"[", b"{"):
+        # Number, true, false or null
+        match = _SCALAR_END.search(buffer, pos)
+        end = match.start() if match else len(buffer)
+        if end == pos:
+            raise ValueError(f"Expected a value at byte {pos}")
+        return end
+
+    match = _CONTAINER.match(buffer, pos, pos + SKIP_WINDOW)
+    if match is not None:
+        return match.end()
+
+    # Count the brackets of containers nested deeper or longer than a match
+    # reaches, skipping what lies between them a window at a time
+    start, depth = pos, 1
+    pos += 1
+    while True:
+        window_end = pos + SKIP_WINDOW
+        match = _SKIP.match(buffer, pos, window_end)
+        pos = match.end() if match else pos
+        char = buffer[pos : pos + 1]
+        if char in (b"[", b"{"):
+            depth += 1
+            pos += 1
+        elif char in (b"]", b"}"):
+            depth -= 1
+            pos += 1
+            if depth == 0:
+                return pos
+        elif char == b'"':
+            # A string running past the window
+            match = _STRING.match(buffer, pos)
+            if match is None:
+                raise ValueError(f"Unterminated string at byte {pos}")
+            pos = match.end()
+        elif not char:
+            raise ValueError(f"Unterminated value at byte {start}")
+        elif pos < window_end:
+            raise ValueError(f"Unexpected byte at {pos}")
+
+
+def _members(buffer: Buffer, pos: int) -> Iterator[tuple[str, int, int]]:
+    """Iterate over the members of the object starting at pos.
+
+    Yields:
+        Key of each member, and the start and end of its value
+    """
+    pos = _expect(buffer, pos, b"{")
+    pos = _skip_whitespace(buffer, pos)
+    if buffer[pos : pos + 1] == b"}":
+        return
+    while True:
+        pos = _skip_whitespace(buffer, pos)
+        key_end = _value_end(buffer, pos)
+        key = json_codec.loads(buffer[pos:key_end])
+        start = _skip_whitespace(buffer, _expect(buffer, key_end, b":"))
+        end = _value_end(buffer, start)
+        yield key, start, end
+        pos = _skip_whitespace(buffer, end)
+        if buffer[pos : pos + 1] == b"}":
+            return
+        pos = _expect(buffer, pos, b",")
+
+
+def _elements(buffer: Buffer, pos: int) -> Iterator[tuple[int, int]]:
+    """Iterate over the elements of the array starting at pos.
+
+    Yields:
+        Start and end of each element
+    """
+    pos = _expect(buffer, pos, b"[")
+    pos = _skip_whitespace(buffer, pos)
+    if buffer[pos : pos + 1] == b"]":
+        return
+    while True:
+        end = _value_end(buffer, pos)
+        yield pos, end
+        match = _ELEMENT_END.match(buffer, end)
+        if match is None:
+            raise ValueError(f"Expected ',' or ']' at byte {end}")
+        if match.group(1) == b"]":
+            return
+        pos = match.end()
+
+
+def load_keys(path: Path, keys: Iterable[str]) -> dict[str, Any]:
+    """Decode selected top-level keys of a JSON object.
+
+    The values before the last key found are scanned, which can take longer
+    than decoding the whole file.
+
+    Args:
+        path: JSON file holding an object
+        keys: Keys to decode
+
+    Returns:
+        Mapping of the keys found to their values
+
+    Raises:
+        ValueError: If the file is not a valid JSON object
+        OSError: If the file cannot be read
+    """
+    wanted = set(keys)
+    values: dict[str, Any] = {}
+    with _open(path) as buffer:
+        for key, start, end in _members(buffer, _skip_whitespace(buffer, 0)):
+            if key in wanted:
+                values[key] = json_codec.loads(buffer[start:end])
+                if len(values) == len(wanted):
+                    break
+    return values
+
+
+def iter_array(path: Path, key: str | None = None) -> Iterator[Any]:
+    """Decode the elements of a JSON array one at a time.
+
+    The file stays open until the iterator is exhausted or closed. Walking
+    a whole array takes several times as long as decoding the file whole.
+
+    Args:
+        path: JSON file holding an array, or an object
+        key: Top-level key of the array within an object, None for an array
+            at the top level
+
+    Yields:
+        Elements of the array; nothing if the key is missing
+
+    Raises:
+        ValueError: If the file is not valid JSON or the value is not an array
+        OSError: If the file cannot be read
+    """
+    with _open(path) as buffer:
+        start = _skip_whitespace(buffer, 0)
+        if key is not None:
+            for member, member_start, _ in _members(buffer, start):
+                if member == key:
+                    start = member_start
+                    break
+            else:
+                return
+        for element_start, element_end in _elements(buffer, start):
+            yield json_codec.loads(buffer[element_start:element_end])
@@ -1,8 +1,11 @@
 """Orchestrator for V-Model stage execution with Claude Code SDK integration."""
 
-import json
+import asyncio
+import copy
+import functools
 import logging
-from collections.abc import Callable
+import threading
+from collections.abc import Callable, Iterable
 from datetime import datetime
 from pathlib import Path
 from typing import Any, cast
@@ -12,13 +15,63 @@ from rich.panel import Panel
 from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.table import Table
 
+from verifflowcc.agents.base import BaseAgent, warm_prompt_templates
 from verifflowcc.agents.factory import AgentFactory
+from verifflowcc.core import json_codec
+from verifflowcc.core.artifact_handles import HandleStore
+from verifflowcc.core.artifact_index import ArtifactIndex, IndexedArtifact
+from verifflowcc.core.checkpoint_store import CheckpointStore
+from verifflowcc.core.concurrency import configure_concurrency_controller
+from verifflowcc.core.events import (
+    STAGE_COMPLETED,
+    STAGE_FAILED,
+    STAGE_GATED,
+    STAGE_STARTED,
+    STAGE_STREAMED,
+    EventBus,
+    StageEvent,
+)
+from verifflowcc.core.git_integration import GitIntegration
 from verifflowcc.core.path_config import PathConfig
+from verifflowcc.core.pipeline import BackgroundWriter
+from verifflowcc.core.rate_limiter import configure_rate_limiter
+from verifflowcc.core.scheduler import StageGraph, StageScheduler
 from verifflowcc.core.sdk_config import SDKConfig
+from verifflowcc.core.stage_cache import (
+    StageCache,
+    hash_artifacts,
+    hash_content,
+    normalize_agent_input,
+)
+from verifflowcc.core.state_lock import lock_for
+from verifflowcc.core.state_store import open_state_store
+from verifflowcc.core.state_writer import DebouncedFlush, write_atomic
 from verifflowcc.core.vmodel import VModelStage
 
 logger = logging.getLogger(__name__)
 
+# Map V-Model stages to the agents that execute them
+STAGE_AGENT_MAPPING: dict[VModelStage, str] = {
+    VModelStage.REQUIREMENTS: "requirements_analyst",
+    VModelStage.DESIGN: "architect",
+    VModelStage.CODING: "developer",
+    VModelStage.UNIT_TESTING: "qa_tester",
+    VModelStage.INTEGRATION_TESTING: "qa_tester",
+    VModelStage.SYSTEM_TESTING: "qa_tester",
+    VModelStage.VALIDATION: "integration",
+}
+
+# State keys a stage updates when it completes or fails
+STAGE_STATE_KEYS = (
+    "completed_stages",
+    "quality_gates",
+    "stage_artifacts",
+    "session_state",
+    "agent_metrics",
+)
+# State keys refreshed by every flush
+ALWAYS_CHANGED_KEYS = ("updated_at", "current_stage", "concurrency", "state_lock")
+
 
 class Orchestrator:
     """Orchestrates V-Model workflow execution with stage transitions, gating, and Claude Code SDK coordination."""
@@ -28,6 +81,8 @@ class Orchestrator:
         config_path: Path | None = None,
         path_config: PathConfig | None = None,
         sdk_config: SDKConfig | None = None,
+        config: dict[str, Any] | None = None,
+        show_progress: bool = True,
     ):
         """Initialize the Orchestrator with SDK integration.
 
@@ -35,6 +90,8 @@ class Orchestrator:
             config_path: Path to configuration file (deprecated, use path_config)
             path_config: PathConfig instance for managing project paths
             sdk_config: SDK configuration for agents
+            config: Pre-loaded configuration, overrides config.yaml when given
+            show_progress: Whether run_sprint renders a live progress display
         """
         # Use provided PathConfig or create default
         self.path_config = path_config or PathConfig()
@@ -52,17 +109,60 @@ class Orchestrator:
         self.sdk_config = sdk_config or SDKConfig()
         self.console = Console()
         self.current_stage = VModelStage.PLANNING
+        self.config = config if config is not None else self._load_config()
+        # Saves only persist what changed: state deltas appended to a journal
+        # compacted into state.json, or rows of the SQLite backend
+        state_config = self.config.get("state") or {}
+        self.journal_state = bool(state_config.get("journal", True))
+        self.state_store = open_state_store(self.path_config, state_config)
+        # Held while writing, other vv processes may share the project
+        self.state_lock = lock_for(self.path_config)
         self.state = self._load_state()
-        self.config = self._load_config()
-        self.agent_factory = AgentFactory(self.sdk_config, self.path_config)
+        # Stage artifacts and session state are stored by handle, their bodies
+        # live in outputs/ and are loaded on demand
+        self.outputs = HandleStore(
+            self.path_config.base_dir,
+            self.path_config.outputs_dir,
+            write=functools.partial(self._persist, atomic=True),
+        )
+        # Checkpoints after the first are stored as deltas against the previous one
+        self.checkpoints = CheckpointStore.for_project(
+            self.path_config, self.config.get("checkpoints") or {}
+        )
+        self._compact_pending = False
+        # Top-level state keys modified since the last flush, None if unknown
+        self._changed_keys: set[str] | None = set()
+        self.show_progress = show_progress
+        # Pipelined mode persists finished stages and prepares upcoming ones in
+        # the background, leaving only SDK calls on the critical path
+        self.pipelined = bool((self.config.get("pipeline") or {}).get("enabled", False))
+        self.persistence = BackgroundWriter()
+        self.artifact_settings = self.config.get("artifacts") or {}
+        self.artifact_index = ArtifactIndex.for_project(self.path_config)
+        # Saves requested within the flush window are coalesced into one write
+        self.state_flush = DebouncedFlush(
+            self._flush_state,
+            window=state_config.get("flush_window", 0.1),
+            drain=self.persistence.flush_sync,
+        )
+        self.rate_limiter = configure_rate_limiter(self.config.get("sdk"))
+        self.concurrency = configure_concurrency_controller(self.config.get("concurrency"))
+        self.agent_factory = AgentFactory(self.sdk_config, self.path_config, self.rate_limiter)
         self.agents = self._initialize_agents()
-        self.stage_callbacks: dict[VModelStage, list[Callable]] = {}
+        self.stage_agents: dict[VModelStage, Any] = {}
+        # Agents may be created ahead of time in a worker thread in pipelined mode
+        self._agent_lock = threading.Lock()
+        self.stage_graph = StageGraph.from_config(self.config.get("v_model", {}))
+        self.stage_cache = self._initialize_stage_cache()
+        events_config = self.config.get("events") or {}
+        self.events = EventBus(
+            queue_size=events_config.get("queue_size", 100),
+            timeout=events_config.get("timeout", 30.0),
+        )
 
     def _load_state(self) -> dict[str, Any]:
         """Load project state from state.json."""
-        if self.state_path.exists():
-            return cast("dict[str, Any]", json.loads(self.state_path.read_text()))
-        return {
+        state: dict[str, Any] = {
             "current_stage": VModelStage.PLANNING.value,
             "sprint_number": 0,
             "completed_stages": [],
@@ -75,13 +175,50 @@ class Orchestrator:
             "created_at": datetime.now().isoformat(),
             "updated_at": datetime.now().isoformat(),
         }
+        persisted = self.state_store.load()
+        if persisted is not None:
+            # Keys missing from older or CLI-created state files fall back to defaults
+            state.update(persisted)
+        return state
+
+    def _save_state(self, compact: bool = False, changed: Iterable[str] | None = None) -> None:
+        """Request a save of the project state.
 
-    def _save_state(self) -> None:
-        """Save project state to state.json."""
+        Saves are coalesced over the flush window; a compacting save is a
+        barrier and is flushed right away with anything pending.
+
+        Args:
+            compact: Whether to persist the full state now instead of its changes
+            changed: Top-level keys modified since the last save; None compares
+                the whole state with what was persisted
+        """
         self.state["updated_at"] = datetime.now().isoformat()
+        self._compact_pending = self._compact_pending or compact
+        if changed is None:
+            self._changed_keys = None
+        elif self._changed_keys is not None:
+            self._changed_keys.update(changed)
+        if compact:
+            self.state_flush.flush()
+        else:
+            self.state_flush.request()
+
+    def _flush_state(self) -> None:
+        """Persist the latest project state to the state store."""
+        compact, self._compact_pending = self._compact_pending, False
+        changed, self._changed_keys = self._changed_keys, set()
+        if changed is not None:
+            changed.update(ALWAYS_CHANGED_KEYS)
         self.state["current_stage"] = self.current_stage.value
-        self.path_config.ensure_base_exists()
-        self.state_path.write_text(json.dumps(self.state, indent=2))
+        if self.concurrency is not None:
+            self.state["concurrency"] = self.concurrency.get_stats()
+        self.state["state_lock"] = self.state_lock.get_stats()
+        job = self.state_store.save_job(
+            self.state, compact=compact or not self.journal_state, changed=changed
+        )
+        if job is not None:
+            # Journal writes are ordered and must never replace one another
+            self._write(None, job)
 
     def _load_config(self) -> dict[str, Any]:
         """Load configuration from config.yaml."""
@@ -142,6 +279,64 @@ class Orchestrator:
                 "timeout": 120,
                 "session_persistence": True,
                 "streaming": True,
+                # Shared by all agents of the process, None disables a limit
+                "requests_per_minute": None,
+                "tokens_per_minute": None,
+            },
+            "batch": {
+                "max_concurrency": 2,
+            },
+            "cache": {
+                "enabled": True,
+                "max_entries_per_stage": 5,
+            },
+            "state": {
+                # json (state.json plus journal) or sqlite (state.db in WAL mode)
+                "backend": "json",
+                # Append state changes to a journal instead of rewriting state.json
+                "journal": True,
+                # Seconds during which state saves are coalesced into one write
+                "flush_window": 0.1,
+                # Journal entries written before they are compacted into state.json
+                "compact_every": 50,
+            },
+            "checkpoints": {
+                # gzip, lzma or none
+                "compression": "gzip",
+                # Checkpoints per full snapshot, the others are deltas
+                "snapshot_every": 10,
+                # Checkpoints kept by vv checkpoint gc, None for no limit
+                "retention": {
+                    "keep_last": None,
+                    "keep_per_sprint": False,
+                    "max_bytes": None,
+                    # Apply the retention after every new checkpoint
+                    "auto_gc": False,
+                },
+            },
+            "pipeline": {
+                # Overlap persistence and stage preparation with SDK calls
+                "enabled": False,
+            },
+            "artifacts": {
+                # Agents hand artifact writes to a worker thread, flushed before gating
+                "background_writes": True,
+                # Writes queued per agent; further writes wait for the oldest ones
+                "max_pending": 64,
+            },
+            "events": {
+                # Stage events waiting for a non-blocking callback, oldest dropped first
+                "queue_size": 100,
+                # Seconds a callback may take per event
+                "timeout": 30.0,
+            },
+            "concurrency": {
+                # AIMD limit on stages in flight, shared by all sprints of the process
+                "adaptive": True,
+                "initial_limit": 3,
+                "min_limit": 1,
+                "max_limit": 8,
+                "latency_target": None,
             },
         }
 
@@ -166,16 +361,49 @@ class Orchestrator:
 
         return agents
 
-    def register_callback(self, stage: VModelStage, callback: Callable) -> None:
+    def _initialize_stage_cache(self) -> StageCache | None:
+        """Create the stage result cache unless disabled in config."""
+        cache_config = self.config.get("cache") or {}
+        if not cache_config.get("enabled", True):
+            return None
+
+        return StageCache(
+            self.path_config.cache_dir / "stages",
+            self.path_config.base_dir,
+            max_entries_per_stage=cache_config.get("max_entries_per_stage", 5),
+        )
+
+    def register_callback(
+        self,
+        stage: VModelStage,
+        callback: Callable,
+        blocking: bool = False,
+        timeout: float | None = None,
+    ) -> None:
         """Register a callback for a specific stage.
 
+        The callback receives the stage result once the stage has been gated.
+        It runs concurrently with the sprint unless blocking is set; subscribe
+        to self.events directly for the other stage events.
+
         Args:
             stage: V-Model stage
-            callback: Callback function
+            callback: Callback function, sync or async
+            blocking: Whether the stage waits for the callback before completing
+            timeout: Seconds the callback may take, defaults to events.timeout
         """
-        if stage not in self.stage_callbacks:
-            self.stage_callbacks[stage] = []
-        self.stage_callbacks[stage].append(callback)
+
+        def on_completed(event: StageEvent) -> Any:
+            return callback(event.data["result"])
+
+        on_completed.__qualname__ = getattr(callback, "__qualname__", repr(callback))
+        self.events.subscribe(
+            on_completed,
+            events=[STAGE_COMPLETED],
+            stages=[stage],
+            blocking=blocking,
+            timeout=timeout,
+        )
 
     async def execute_stage(self, stage: VModelStage, context: dict[str, Any]) -> dict[str, Any]:
         """Execute a specific V-Model stage with SDK-based agents.
@@ -196,6 +424,9 @@ class Orchestrator:
             self.console.print(f"[yellow]Stage {stage.value} is disabled, skipping...[/yellow]")
             return {"status": "skipped", "stage": stage.value}
 
+        await self.events.publish(StageEvent(STAGE_STARTED, stage))
+
+        result: dict[str, Any] = {}
         try:
             # Execute stage-specific logic with SDK agents
             result = await self._execute_stage_logic(stage, context)
@@ -207,6 +438,9 @@ class Orchestrator:
             gating_result = await self._apply_advanced_gating(stage, result)
 
             if gating_result["passed"]:
+                # Each stage is listed once, most recently completed last
+                if stage.value in self.state["completed_stages"]:
+                    self.state["completed_stages"].remove(stage.value)
                 self.state["completed_stages"].append(stage.value)
                 self.console.print(f"[green]✓ Stage {stage.value} completed successfully[/green]")
             else:
@@ -227,17 +461,19 @@ class Orchestrator:
 
             # Store quality gate results
             self.state["quality_gates"][stage.value] = gating_result
+            await self.events.publish(StageEvent(STAGE_GATED, stage, {"gate": gating_result}))
 
-            # Execute callbacks
-            for callback in self.stage_callbacks.get(stage, []):
-                await callback(result)
+            # Notify subscribers, only blocking ones hold the stage
+            await self.events.publish(StageEvent(STAGE_COMPLETED, stage, {"result": result}))
 
             # Save artifacts and session state
-            self.state["stage_artifacts"][stage.value] = result.get("artifacts", {})
+            self.state["stage_artifacts"][stage.value] = self.outputs.put(
+                result.get("artifacts", {})
+            )
             if "session_state" in result:
-                self.state["session_state"][stage.value] = result["session_state"]
+                self.state["session_state"][stage.value] = self.outputs.put(result["session_state"])
 
-            self._save_state()
+            self._save_state(changed=STAGE_STATE_KEYS)
 
             return result
 
@@ -251,10 +487,18 @@ class Orchestrator:
                 "metrics": {},
                 "timestamp": datetime.now().isoformat(),
             }
+            if result.get("sdk_outcome") is not None:
+                # A gate failure is not a backend signal, the agent's SDK calls are
+                error_result["sdk_outcome"] = result["sdk_outcome"]
+            if result.get("status") == "timeout":
+                # Keep the partial output of a timed-out agent for inspection
+                error_result["timed_out"] = True
+                error_result["partial_response"] = result.get("partial_response", "")
 
             # Save error state
-            self.state["stage_artifacts"][stage.value] = error_result["artifacts"]
-            self._save_state()
+            self.state["stage_artifacts"][stage.value] = self.outputs.put(error_result["artifacts"])
+            self._save_state(changed=STAGE_STATE_KEYS)
+            await self.events.publish(StageEvent(STAGE_FAILED, stage, {"result": error_result}))
 
             return error_result
 
@@ -270,40 +514,88 @@ class Orchestrator:
         Returns:
             Stage execution results
         """
-        # Map V-Model stages to appropriate agents
-        stage_agent_mapping = {
-            VModelStage.REQUIREMENTS: "requirements_analyst",
-            VModelStage.DESIGN: "architect",
-            VModelStage.CODING: "developer",
-            VModelStage.UNIT_TESTING: "qa_tester",
-            VModelStage.INTEGRATION_TESTING: "qa_tester",
-            VModelStage.SYSTEM_TESTING: "qa_tester",
-            VModelStage.VALIDATION: "integration",
-        }
-
-        agent_name = stage_agent_mapping.get(stage)
+        agent_name = STAGE_AGENT_MAPPING.get(stage)
 
         if agent_name:
-            agent = self.agents.get(agent_name)
-            if not agent:
-                # Create agent on demand if not initialized
-                try:
-                    agent = self.agent_factory.create_agent(agent_name)
-                    self.agents[agent_name] = agent
-                except Exception as e:
-                    logger.error(f"Failed to create agent {agent_name}: {e}")
-                    return {"status": "error", "error": f"Agent creation failed: {e}"}
+            try:
+                agent = self._get_stage_agent(stage)
+            except Exception as e:
+                logger.error(f"Failed to create agent {agent_name}: {e}")
+                return {"status": "error", "error": f"Agent creation failed: {e}"}
+
+            if self.events.has_subscribers(STAGE_STREAMED, stage):
+                agent.stream_listener = functools.partial(self._publish_streamed, stage)
+            else:
+                agent.stream_listener = None
+            if (
+                isinstance(agent, BaseAgent)
+                and agent.artifact_writer is None
+                and self.artifact_settings.get("background_writes", True)
+            ):
+                agent.artifact_writer = BackgroundWriter(self.artifact_settings.get("max_pending"))
 
             # Prepare input data based on stage and previous results
             input_data = self._prepare_comprehensive_agent_input(stage, context)
 
+            # Reuse the stored result when the stage inputs are unchanged
+            fingerprint = None
+            if self.stage_cache is not None:
+                fingerprint = self.stage_cache.fingerprint(
+                    stage.value, self._stage_fingerprint_inputs(stage, agent, input_data)
+                )
+                cached_result = self.stage_cache.get(stage.value, fingerprint)
+                if cached_result is not None:
+                    self.console.print(
+                        f"[dim]↺ Stage {stage.value} inputs unchanged, reusing cached result[/dim]"
+                    )
+                    return {**cached_result, "cached": True}
+
+            # The agent's artifacts are published together once the stage succeeds
+            if isinstance(agent, BaseAgent):
+                agent.artifact_store.begin(
+                    story_id=input_data.get("story_id"),
+                    stage=stage.value,
+                    sprint_number=self.state.get("sprint_number"),
+                )
+            result = None
             try:
-                # Execute agent with SDK
-                if hasattr(agent, "process"):
-                    result = await agent.process(input_data)
-                else:
-                    # Legacy compatibility
-                    result = await agent.execute(**input_data)
+                try:
+                    # Execute agent with SDK under its deadline
+                    if hasattr(agent, "process_with_timeout"):
+                        result = await agent.process_with_timeout(
+                            input_data, timeout=self._get_agent_timeout(agent_name, agent)
+                        )
+                    elif hasattr(agent, "process"):
+                        result = await agent.process(input_data)
+                    else:
+                        # Legacy compatibility
+                        result = await agent.execute(**input_data)
+                finally:
+                    # Gating and the stage cache read the artifacts the agent wrote
+                    await self._finish_artifacts(
+                        agent,
+                        commit=isinstance(result, dict)
+                        and result.get("status") not in ("error", "failed", "timeout"),
+                    )
+
+                if (
+                    fingerprint is not None
+                    and self.stage_cache is not None
+                    and isinstance(result, dict)
+                    and result.get("status", "success") == "success"
+                ):
+                    if self.pipelined:
+                        self.persistence.submit(
+                            f"cache:{stage.value}:{fingerprint}",
+                            functools.partial(
+                                self.stage_cache.put,
+                                stage.value,
+                                fingerprint,
+                                copy.deepcopy(result),
+                            ),
+                        )
+                    else:
+                        self.stage_cache.put(stage.value, fingerprint, result)
 
                 return cast("dict[str, Any]", result)
 
@@ -316,6 +608,7 @@ class Orchestrator:
                     "stage": stage.value,
                     "artifacts": {},
                     "metrics": {},
+                    "sdk_outcome": (agent.sdk_outcome() if hasattr(agent, "sdk_outcome") else None),
                     "timestamp": datetime.now().isoformat(),
                 }
 
@@ -329,6 +622,124 @@ class Orchestrator:
             "message": f"Stage {stage.value} executed without specific agent",
         }
 
+    async def _finish_artifacts(self, agent: Any, commit: bool) -> None:
+        """Wait for the artifacts an agent queued, then publish or drop them.
+
+        A stage whose artifacts could not all be written publishes none.
+        Write errors are logged, as agents do when saving artifacts themselves.
+
+        Args:
+            agent: Agent of the stage
+            commit: Whether the stage succeeded
+        """
+        if not isinstance(agent, BaseAgent):
+            return
+        writer = agent.artifact_writer
+        store = agent.artifact_store
+        try:
+            if writer is not None:
+                try:
+                    await writer.flush()
+                except Exception as e:
+                    logger.error(f"Writing artifacts of agent {agent.name} failed: {e}")
+                    commit = False
+            finish = store.commit if commit else store.discard
+            if writer is None:
+                finish()
+            else:
+                writer.submit(None, finish)
+                await writer.flush()
+        except Exception as e:
+            logger.error(f"Publishing artifacts of agent {agent.name} failed: {e}")
+
+    def _get_agent_timeout(self, agent_name: str, agent: Any) -> float:
+        """Get the deadline of an agent run from ``agents.<name>.timeout`` in config.
+
+        Falls back to the SDK configuration default for the agent type.
+
+        Args:
+            agent_name: Agent name as used in the config
+            agent: Agent instance
+
+        Returns:
+            Timeout in seconds
+        """
+        agent_config = (self.config.get("agents") or {}).get(agent_name) or {}
+        timeout = agent_config.get("timeout")
+        if timeout:
+            return float(timeout)
+        return float(self.sdk_config.get_agent_timeout(getattr(agent, "agent_type", agent_name)))
+
+    def _get_stage_agent(self, stage: VModelStage) -> Any:
+        """Get the agent instance executing a stage.
+
+        Stages that share an agent type (the three testing stages all use the
+        QA tester) each get a dedicated instance so that stages running
+        concurrently never share session history or context.
+
+        Args:
+            stage: Stage to get the agent for
+
+        Returns:
+            Agent instance for the stage
+        """
+        agent_name = STAGE_AGENT_MAPPING[stage]
+        shared_stages = [s for s, name in STAGE_AGENT_MAPPING.items() if name == agent_name]
+
+        with self._agent_lock:
+            if len(shared_stages) > 1:
+                if stage not in self.stage_agents:
+                    self.stage_agents[stage] = self.agent_factory.create_agent(
+                        agent_name, name=f"{agent_name}_{stage.value}"
+                    )
+                return self.stage_agents[stage]
+
+            agent = self.agents.get(agent_name)
+            if not agent:
+                # Create agent on demand if not initialized
+                agent = self.agent_factory.create_agent(agent_name)
+                self.agents[agent_name] = agent
+            return agent
+
+    def _stage_fingerprint_inputs(
+        self, stage: VModelStage, agent: Any, input_data: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Collect the effective inputs of a stage execution for fingerprinting.
+
+        The inputs cover the agent type and model options, the prompt
+        template source, the agent input without run-specific values and the
+        content hashes of the artifacts produced by upstream stages.
+
+        Args:
+            stage: Stage being executed
+            agent: Agent executing the stage
+            input_data: Agent input prepared for the stage
+
+        Returns:
+            Fingerprint inputs of the stage
+        """
+        agent_type = getattr(agent, "agent_type", type(agent).__name__)
+        client_options = getattr(agent, "client_options", None)
+        template_path = Path("verifflowcc/prompts") / f"{agent_type}.j2"
+
+        upstream = {
+            dep.value: hash_artifacts(
+                self.path_config.base_dir, self.get_stage_artifacts(dep.value) or {}
+            )
+            for dep in self.stage_graph.dependencies(stage)
+        }
+
+        return {
+            "agent_type": agent_type,
+            "agent_class": type(agent).__name__,
+            "options": client_options.model_dump() if client_options is not None else None,
+            "template": (
+                hash_content(template_path.read_bytes()) if template_path.exists() else None
+            ),
+            "input": normalize_agent_input(input_data),
+            "upstream": upstream,
+        }
+
     def _prepare_comprehensive_agent_input(
         self, stage: VModelStage, context: dict[str, Any]
     ) -> dict[str, Any]:
@@ -367,16 +778,14 @@ class Orchestrator:
         }
 
         # Add stage-specific data from previous artifacts
-        stage_artifacts = self.state.get("stage_artifacts", {})
-
         if stage == VModelStage.DESIGN:
             # Architect needs requirements
-            requirements_artifacts = stage_artifacts.get("requirements", {})
+            requirements_artifacts = self.get_stage_artifacts("requirements")
             input_data["requirements"] = requirements_artifacts.get("requirements_data", {})
 
         elif stage == VModelStage.CODING:
             # Developer needs design and requirements
-            design_artifacts = stage_artifacts.get("design", {})
+            design_artifacts = self.get_stage_artifacts("design")
             input_data["design_spec"] = design_artifacts.get("design_data", {})
 
         elif stage in [
@@ -385,7 +794,7 @@ class Orchestrator:
             VModelStage.SYSTEM_TESTING,
         ]:
             # QA Tester needs implementation and previous stage data
-            implementation_artifacts = stage_artifacts.get("coding", {})
+            implementation_artifacts = self.get_stage_artifacts("coding")
             input_data["implementation_data"] = implementation_artifacts.get(
                 "implementation_data", {}
             )
@@ -393,6 +802,7 @@ class Orchestrator:
 
         elif stage == VModelStage.VALIDATION:
             # Integration agent needs all previous stage data
+            stage_artifacts = self._load_stage_outputs_of("stage_artifacts")
             input_data["system_artifacts"] = stage_artifacts
             input_data["requirements_data"] = stage_artifacts.get("requirements", {})
             input_data["design_data"] = stage_artifacts.get("design", {})
@@ -401,12 +811,55 @@ class Orchestrator:
             input_data["deployment_target"] = context.get("deployment_target", "production")
 
         # Add session state for continuity
-        session_state = self.state.get("session_state", {})
+        session_state = self._load_stage_outputs_of("session_state")
         if session_state:
             input_data["session_state"] = session_state
 
         return input_data
 
+    def get_stage_artifacts(self, stage: str) -> dict[str, Any]:
+        """Get the artifact mapping a stage produced, loading it from its handle.
+
+        Args:
+            stage: Stage name
+
+        Returns:
+            Artifact mapping, empty if the stage has not run
+        """
+        artifacts = self.outputs.load(self.state.get("stage_artifacts", {}).get(stage))
+        return artifacts if isinstance(artifacts, dict) else {}
+
+    def find_artifacts(
+        self,
+        story_id: str | None = None,
+        stage: str | None = None,
+        type: str | None = None,
+        sprint_number: int | None = None,
+    ) -> list[IndexedArtifact]:
+        """Find the published artifacts of the project, story workspaces included.
+
+        Args:
+            story_id: Story the artifacts belong to
+            stage: Stage that produced them
+            type: Artifact type
+            sprint_number: Sprint that last wrote them
+
+        Returns:
+            Matching entries of the artifact index
+        """
+        return self.artifact_index.query(story_id, stage, type, sprint_number)
+
+    def _load_stage_outputs_of(self, key: str) -> dict[str, Any]:
+        """Load the bodies of every stage's output under a state key.
+
+        Args:
+            key: State key holding handles per stage (stage_artifacts, session_state)
+
+        Returns:
+            Mapping of stage name to output body
+        """
+        return {stage: self.outputs.load(value) for stage, value in self.state.get(key, {}).items()}
+
     def _update_agent_metrics(self, stage: VModelStage, result: dict[str, Any]) -> None:
         """Update agent performance metrics.
 
@@ -426,6 +879,11 @@ class Orchestrator:
             "execution_time": metrics.get("execution_time", "unknown"),
             "quality_score": metrics.get("overall_quality_score", 0),
             "artifacts_created": len(result.get("artifacts", {})),
+            "cache_hit": bool(result.get("cached", False)),
+            "timed_out": result.get("status") == "timeout",
+            "retries": 0,
+            "backoff_seconds": 0.0,
+            "rate_limit_wait_seconds": 0.0,
             **metrics,
         }
 
@@ -447,6 +905,23 @@ class Orchestrator:
         if gating_mode == "off":
             return {"passed": True, "mode": "off", "issues": []}
 
+        if result.get("status") == "timeout":
+            # Only partial output is available, which can never pass a gate
+            partial = result.get("partial_response", "")
+            issue = (
+                f"Agent timed out after {result.get('metrics', {}).get('timeout_seconds')}s "
+                f"with {len(partial)} characters of partial output"
+            )
+            return {
+                "passed": False,
+                "mode": gating_mode,
+                "issues": [issue],
+                "warnings": [],
+                "all_issues": [issue],
+                "quality_score": 0,
+                "partial_output": result.get("partial_data") or partial,
+            }
+
         # Get quality thresholds
         thresholds = self.config["v_model"].get("quality_thresholds", {})
 
@@ -570,9 +1045,9 @@ class Orchestrator:
         """
         self.state["sprint_number"] += 1
         self.state["active_story"] = story
-        self._save_state()
+        self._save_state(changed=("sprint_number", "active_story"))
 
-        sprint_results = {
+        sprint_results: dict[str, Any] = {
             "sprint_number": self.state["sprint_number"],
             "story": story,
             "stages": {},
@@ -581,65 +1056,190 @@ class Orchestrator:
             "started_at": datetime.now().isoformat(),
         }
 
-        # V-Model execution order
-        v_model_stages = [
-            VModelStage.PLANNING,
-            VModelStage.REQUIREMENTS,
-            VModelStage.DESIGN,
-            VModelStage.CODING,
-            VModelStage.UNIT_TESTING,
-            VModelStage.INTEGRATION_TESTING,
-            VModelStage.SYSTEM_TESTING,
-            VModelStage.VALIDATION,
+        return await self._execute_sprint(sprint_results)
+
+    async def resume_sprint(self, sprint_number: int | None = None) -> dict[str, Any]:
+        """Resume a failed or interrupted sprint from its persisted stage outputs.
+
+        Stages that completed and passed their quality gate are not executed
+        again, unless a stage they depend on has to be re-run. Execution
+        continues from the first stage that did not complete.
+
+        Args:
+            sprint_number: Sprint to resume, defaults to the latest sprint
+
+        Returns:
+            Sprint execution results
+
+        Raises:
+            ValueError: If no persisted outputs exist for the sprint
+        """
+        if sprint_number is None:
+            sprint_number = self.state.get("sprint_number", 0)
+
+        manifest = self.state_store.load_sprint(sprint_number)
+        if manifest is None:
+            raise ValueError(f"No persisted outputs found for sprint {sprint_number}")
+
+        story = manifest["story"]
+        records = self._load_stage_outputs(sprint_number)
+
+        # A stage is only reused when every stage it depends on is reused as well
+        incomplete = [
+            stage
+            for stage in self.stage_graph.stages
+            if not self._is_stage_output_complete(records.get(stage))
         ]
+        rerun = set(incomplete)
+        for stage in incomplete:
+            rerun.update(self.stage_graph.downstream(stage))
+        completed = [stage for stage in self.stage_graph.stages if stage not in rerun]
 
-        with Progress(
+        sprint_results: dict[str, Any] = {
+            "sprint_number": sprint_number,
+            "story": story,
+            "stages": {},
+            "quality_summary": {},
+            "agent_performance": {},
+            "started_at": manifest.get("started_at", datetime.now().isoformat()),
+            "resumed_at": datetime.now().isoformat(),
+            "resumed_stages": [stage.value for stage in completed],
+        }
+
+        # Rebuild sprint results and stage context from the reused outputs
+        for stage in completed:
+            record = records[stage]
+            result = record["result"]
+            sprint_results["stages"][stage.value] = result
+            self.state["stage_artifacts"][stage.value] = self.outputs.put(
+                result.get("artifacts", {})
+            )
+            if record.get("gate") is not None:
+                self.state["quality_gates"][stage.value] = record["gate"]
+                sprint_results["quality_summary"][stage.value] = self._summarize_gate(
+                    record["gate"]
+                )
+            if stage.value not in self.state["completed_stages"]:
+                self.state["completed_stages"].append(stage.value)
+
+        self.state["active_story"] = story
+        self._save_state(changed=(*STAGE_STATE_KEYS, "active_story"))
+
+        if rerun:
+            first = next(stage for stage in self.stage_graph.stages if stage in rerun)
+            self.console.print(
+                f"[cyan]Resuming sprint {sprint_number} from {first.value} "
+                f"({len(completed)} stages reused)[/cyan]"
+            )
+        else:
+            self.console.print(f"[green]Sprint {sprint_number} has no stages left to run[/green]")
+
+        return await self._execute_sprint(sprint_results, completed)
+
+    async def _execute_sprint(
+        self, sprint_results: dict[str, Any], completed: list[VModelStage] | None = None
+    ) -> dict[str, Any]:
+        """Execute the remaining stages of a sprint and finalize its results.
+
+        Args:
+            sprint_results: Sprint results to fill in
+            completed: Stages already completed that must not be executed again
+
+        Returns:
+            Sprint execution results
+        """
+        story = sprint_results["story"]
+        sprint_number = sprint_results["sprint_number"]
+        self._save_sprint_manifest(sprint_results, "running")
+
+        progress = Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
             console=self.console,
-        ) as progress:
-            for stage in v_model_stages:
-                task = progress.add_task(f"Executing {stage.value}...", total=None)
+            disable=not self.show_progress,
+        )
 
-                try:
-                    # Prepare stage context
-                    stage_context = {
-                        "story": story,
-                        "sprint_results": sprint_results,
-                        "previous_artifacts": self.state.get("stage_artifacts", {}),
-                        "session_state": self.state.get("session_state", {}),
-                    }
-
-                    result = await self.execute_stage(stage, stage_context)
-                    sprint_results["stages"][stage.value] = result
-
-                    # Update quality summary
-                    if result.get("status") == "success":
-                        quality_gates = self.state.get("quality_gates", {}).get(stage.value, {})
-                        sprint_results["quality_summary"][stage.value] = {
-                            "passed": quality_gates.get("passed", False),
-                            "quality_score": quality_gates.get("quality_score", 0),
-                            "issues_count": len(quality_gates.get("issues", [])),
-                        }
+        async def run_stage(stage: VModelStage) -> dict[str, Any]:
+            task = progress.add_task(f"Executing {stage.value}...", total=None)
+            preparation = None
+            if self.pipelined:
+                # Get the following stages ready in a worker thread; it starts
+                # once this stage yields, i.e. while its SDK call is in flight
+                preparation = asyncio.ensure_future(
+                    asyncio.to_thread(self._prepare_downstream_stages, stage)
+                )
 
-                except Exception as e:
-                    logger.error(f"Sprint execution failed at stage {stage.value}: {e}")
-                    sprint_results["stages"][stage.value] = {
-                        "status": "failed",
-                        "error": str(e),
-                        "stage": stage.value,
-                        "timestamp": datetime.now().isoformat(),
-                    }
-
-                    # Check if this is a hard gate failure
-                    stage_config = self.config["v_model"]["stages"].get(stage.value, {})
-                    if stage_config.get("gating") == "hard":
-                        self.console.print(
-                            f"[red]Hard gate failure at {stage.value}, stopping sprint[/red]"
-                        )
-                        break
+            try:
+                # Prepare stage context
+                stage_context = {
+                    "story": story,
+                    "sprint_results": sprint_results,
+                    "previous_artifacts": self._load_stage_outputs_of("stage_artifacts"),
+                    "session_state": self._load_stage_outputs_of("session_state"),
+                }
 
+                result = await self.execute_stage(stage, stage_context)
+
+                # Update quality summary
+                if result.get("status") == "success":
+                    quality_gates = self.state.get("quality_gates", {}).get(stage.value, {})
+                    sprint_results["quality_summary"][stage.value] = self._summarize_gate(
+                        quality_gates
+                    )
+
+            except Exception as e:
+                logger.error(f"Sprint execution failed at stage {stage.value}: {e}")
+                result = {
+                    "status": "failed",
+                    "error": str(e),
+                    "stage": stage.value,
+                    "timestamp": datetime.now().isoformat(),
+                }
+
+            finally:
                 progress.remove_task(task)
+                if preparation is not None:
+                    await asyncio.gather(preparation, return_exceptions=True)
+
+            sprint_results["stages"][stage.value] = result
+            self._save_stage_output(sprint_number, stage, result)
+            return result
+
+        # Independent stages (e.g. the testing stages) run concurrently
+        scheduler = StageScheduler(
+            self.stage_graph,
+            run_stage,
+            is_blocking=self._is_hard_gate_failure,
+            max_parallel=self.config.get("v_model", {}).get("max_parallel_stages"),
+            concurrency=self.concurrency,
+            concurrency_key=lambda stage: STAGE_AGENT_MAPPING.get(stage, stage.value),
+        )
+
+        warm_up = (
+            asyncio.ensure_future(asyncio.to_thread(warm_prompt_templates))
+            if self.pipelined
+            else None
+        )
+        try:
+            with progress:
+                await scheduler.run(completed=completed or [])
+        except BaseException:
+            # Ctrl-C or cancellation: completed stages are already persisted
+            if warm_up is not None:
+                warm_up.cancel()
+            self._save_sprint_manifest(sprint_results, "interrupted")
+            self._save_state()
+            self.state_flush.flush_sync()
+            self.console.print(
+                f"[yellow]Sprint {sprint_number} interrupted, resume with "
+                "'verifflowcc sprint --resume'[/yellow]"
+            )
+            raise
+
+        if scheduler.blocked_by is not None:
+            self.console.print(
+                f"[red]Hard gate failure at {scheduler.blocked_by.value}, stopping sprint[/red]"
+            )
 
         # Finalize sprint results
         sprint_results["completed_at"] = datetime.now().isoformat()
@@ -651,7 +1251,7 @@ class Orchestrator:
             for stage, result in sprint_results["stages"].items()
             if result.get("status") == "success"
         ]
-        sprint_results["success_rate"] = len(successful_stages) / len(v_model_stages)
+        sprint_results["success_rate"] = len(successful_stages) / len(self.stage_graph.stages)
         sprint_results["completed_stages"] = successful_stages
 
         # Final validation decision
@@ -669,11 +1269,190 @@ class Orchestrator:
             sprint_results["final_decision"] = "NO-GO"
             sprint_results["readiness_score"] = 0
 
+        self._save_sprint_manifest(
+            sprint_results, "blocked" if scheduler.blocked_by is not None else "completed"
+        )
+
         self.state["active_story"] = None
-        self._save_state()
+        # Leave an up-to-date state.json behind for tools reading it directly
+        self._save_state(compact=True)
+        if warm_up is not None:
+            await asyncio.gather(warm_up, return_exceptions=True)
+        await self.flush()
 
         return sprint_results
 
+    def _prepare_downstream_stages(self, stage: VModelStage) -> None:
+        """Create the agents of the stages that follow a stage ahead of time.
+
+        Runs in a worker thread while the stage's SDK call is in flight.
+
+        Args:
+            stage: Stage whose SDK call is in flight
+        """
+        for dependent in self.stage_graph.dependents(stage):
+            if dependent in STAGE_AGENT_MAPPING:
+                try:
+                    self._get_stage_agent(dependent)
+                except Exception as e:
+                    # The stage reports the failure itself when it runs
+                    logger.debug(f"Could not prepare agent for {dependent.value}: {e}")
+
+    @staticmethod
+    def _summarize_gate(gate_result: dict[str, Any]) -> dict[str, Any]:
+        """Summarize a quality gate result for the sprint quality summary."""
+        return {
+            "passed": gate_result.get("passed", False),
+            "quality_score": gate_result.get("quality_score", 0),
+            "issues_count": len(gate_result.get("issues", [])),
+        }
+
+    def _sprint_dir(self, sprint_number: int) -> Path:
+        """Get the directory holding the persisted outputs of a sprint."""
+        return self.path_config.sprints_dir / f"sprint-{sprint_number}"
+
+    def _save_sprint_manifest(self, sprint_results: dict[str, Any], status: str) -> None:
+        """Persist the sprint manifest used to resume the sprint.
+
+        Args:
+            sprint_results: Current sprint results
+            status: Sprint status (running, interrupted, blocked, completed)
+        """
+        manifest = {
+            "sprint_number": sprint_results["sprint_number"],
+            "story": sprint_results["story"],
+            "status": status,
+            "started_at": sprint_results["started_at"],
+            "updated_at": datetime.now().isoformat(),
+        }
+        self._write_json_atomic(
+            self._sprint_dir(sprint_results["sprint_number"]) / "sprint.json", manifest
+        )
+        job = self.state_store.record_sprint_job(manifest)
+        if job is not None:
+            self._write(None, job)
+
+    def _save_stage_output(
+        self, sprint_number: int, stage: VModelStage, result: dict[str, Any]
+    ) -> None:
+        """Persist the output of a finished stage for resuming the sprint.
+
+        Args:
+            sprint_number: Sprint the stage belongs to
+            stage: Finished stage
+            result: Stage result
+        """
+        failed = result.get("status") in ("error", "failed")
+        record = {
+            "stage": stage.value,
+            "status": result.get("status", "success"),
+            # Gate results are only stored for stages that got as far as gating
+            "gate": None if failed else self.state["quality_gates"].get(stage.value),
+            "result": result,
+            "completed_at": datetime.now().isoformat(),
+        }
+        self._write_json_atomic(self._sprint_dir(sprint_number) / f"{stage.value}.json", record)
+        job = self.state_store.record_stage_run_job(sprint_number, record)
+        if job is not None:
+            self._write(None, job)
+
+    def _load_stage_outputs(self, sprint_number: int) -> dict[VModelStage, dict[str, Any]]:
+        """Load the persisted stage outputs of a sprint from the state store.
+
+        Args:
+            sprint_number: Sprint to load
+
+        Returns:
+            Mapping of stage to its persisted output record
+        """
+        records = self.state_store.load_stage_runs(sprint_number)
+        return {
+            stage: records[stage.value]
+            for stage in self.stage_graph.stages
+            if stage.value in records
+        }
+
+    @staticmethod
+    def _is_stage_output_complete(record: dict[str, Any] | None) -> bool:
+        """Check whether a persisted stage completed and passed its gate."""
+        if record is None:
+            return False
+        if record.get("status") == "skipped":
+            return True
+        if record.get("status") in ("error", "failed", "timeout"):
+            return False
+        gate = record.get("gate")
+        return bool(gate and gate.get("passed", False))
+
+    def _write_json_atomic(self, path: Path, content: dict[str, Any]) -> None:
+        """Write JSON through a temporary file so an interruption never leaves it truncated."""
+        self._persist(path, json_codec.dumps(content), atomic=True)
+
+    def _persist(self, path: Path, text: str, atomic: bool = False) -> None:
+        """Write a file now, or hand it to the background writer in pipelined mode.
+
+        Args:
+            path: File to write
+            text: Serialized content, a snapshot taken by the caller
+            atomic: Whether to write through a temporary file and rename it
+        """
+
+        def write() -> None:
+            if atomic:
+                write_atomic(path, text)
+                return
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text)
+
+        self._write(str(path), write)
+
+    def _write(self, key: str | None, job: Callable[[], None]) -> None:
+        """Run a write job now, or hand it to the background writer in pipelined mode.
+
+        Args:
+            key: Target of the job, None for jobs that must all run
+            job: Blocking write job
+        """
+        if self.pipelined:
+            self.persistence.submit(key, job)
+        else:
+            job()
+
+    async def _publish_streamed(self, stage: VModelStage, content: str) -> None:
+        """Publish output streamed by the agent of a stage."""
+        await self.events.publish(StageEvent(STAGE_STREAMED, stage, {"content": content}))
+
+    async def flush(self) -> None:
+        """Wait until state and background writes are on disk and stage events are delivered."""
+        self.state_flush.flush_pending()
+        await self.persistence.flush()
+        await self.events.drain()
+
+    def close(self) -> None:
+        """Write anything pending and release the state store.
+
+        The orchestrator cannot save state once closed.
+        """
+        self.state_flush.flush_sync()
+        self.state_store.close()
+
+    def _is_hard_gate_failure(self, stage: VModelStage, result: dict[str, Any]) -> bool:
+        """Check whether a stage result stops the sprint under hard gating.
+
+        Args:
+            stage: Executed stage
+            result: Stage execution result
+
+        Returns:
+            True if the stage failed and is configured with hard gating
+        """
+        if result.get("status") not in ("error", "failed", "timeout"):
+            return False
+        stages_config = self.config.get("v_model", {}).get("stages", {})
+        if not isinstance(stages_config, dict):
+            return False
+        return bool(stages_config.get(stage.value, {}).get("gating") == "hard")
+
     def get_status(self) -> dict[str, Any]:
         """Get current orchestrator status with SDK metrics.
 
@@ -687,9 +1466,16 @@ class Orchestrator:
             "completed_stages": self.state.get("completed_stages", []),
             "agent_metrics": self.state.get("agent_metrics", {}),
             "quality_gates": self.state.get("quality_gates", {}),
+            "concurrency": (
+                self.concurrency.get_stats()
+                if self.concurrency is not None
+                else self.state.get("concurrency")
+            ),
+            "state_lock": self.state_lock.get_stats(),
             "sdk_config": {
                 "agents_initialized": len(self.agents),
                 "session_persistence": self.config.get("sdk", {}).get("session_persistence", True),
+                "rate_limiter": self.rate_limiter.get_stats(),
             },
             "last_updated": self.state.get("updated_at"),
         }
@@ -726,10 +1512,43 @@ class Orchestrator:
         table.add_row("Agents Initialized", str(sdk_info["agents_initialized"]))
         table.add_row("Session Persistence", str(sdk_info["session_persistence"]))
 
+        limiter = sdk_info["rate_limiter"]
+        if limiter["requests_per_minute"] or limiter["tokens_per_minute"]:
+            table.add_row(
+                "Rate Limit",
+                f"{limiter['requests_per_minute'] or '-'} req/min, "
+                f"{limiter['tokens_per_minute'] or '-'} tokens/min "
+                f"({limiter['throttled_requests']} calls waited "
+                f"{limiter['total_wait_seconds']:.1f}s)",
+            )
+
+        concurrency = status["concurrency"]
+        if concurrency:
+            table.add_row(
+                "Concurrency Limit",
+                f"{concurrency['limit']} (range {concurrency['min_limit']}-"
+                f"{concurrency['max_limit']}, {concurrency['in_flight']} in flight)",
+            )
+
         table.add_row("Last Updated", status["last_updated"])
 
         self.console.print(table)
 
+        if concurrency and concurrency["adjustments"]:
+            adjustment_table = Table(title="Concurrency Adjustments")
+            adjustment_table.add_column("Time", style="cyan")
+            adjustment_table.add_column("Limit", style="white")
+            adjustment_table.add_column("Reason", style="yellow")
+
+            for adjustment in concurrency["adjustments"]:
+                adjustment_table.add_row(
+                    adjustment["at"],
+                    f"{adjustment['from']} -> {adjustment['to']}",
+                    adjustment["reason"],
+                )
+
+            self.console.print(adjustment_table)
+
         # Display quality gates summary if available
         quality_gates = status.get("quality_gates", {})
         if quality_gates:
@@ -766,17 +1585,17 @@ class Orchestrator:
             },
         }
 
-        # Save checkpoint
-        checkpoint_dir = self.path_config.checkpoints_dir
-        checkpoint_dir.mkdir(parents=True, exist_ok=True)
-        checkpoint_path = checkpoint_dir / f"{name}.json"
-        checkpoint_path.write_text(json.dumps(checkpoint, indent=2))
+        # Save checkpoint, as a delta against the previous one
+        self.checkpoints.save(checkpoint)
+        if self.checkpoints.retention.auto_gc:
+            self.checkpoints.gc(git=GitIntegration(path_config=self.path_config))
 
         # Update history
         self.state["checkpoint_history"].append(
             {"name": name, "timestamp": checkpoint["timestamp"]}
         )
-        self._save_state()
+        self._save_state(changed=("checkpoint_history",))
+        self.state_flush.flush()
 
         logger.info(f"Created checkpoint '{name}' with SDK session data")
         return checkpoint
@@ -790,13 +1609,12 @@ class Orchestrator:
         Returns:
             True if successful
         """
-        checkpoint_path = self.path_config.checkpoints_dir / f"{name}.json"
-        if not checkpoint_path.exists():
+        if not self.checkpoints.exists(name):
             logger.error(f"Checkpoint '{name}' not found")
             return False
 
         try:
-            checkpoint = json.loads(checkpoint_path.read_text())
+            checkpoint = self.checkpoints.load(name)
             self.state = checkpoint["state"]
             self.current_stage = VModelStage(checkpoint["stage"])
 
@@ -804,6 +1622,8 @@ class Orchestrator:
             self.agents = self._initialize_agents()
 
             self._save_state()
+            self.state_flush.flush()
+            self.checkpoints.mark_restored(name)
 
             logger.info(f"Restored checkpoint '{name}' with SDK session data")
             return True
@@ -848,6 +1668,9 @@ class Orchestrator:
                 "status": metrics.get("status"),
                 "quality_score": metrics.get("quality_score", 0),
                 "artifacts_created": metrics.get("artifacts_created", 0),
+                "retries": metrics.get("retries", 0),
+                "backoff_seconds": metrics.get("backoff_seconds", 0.0),
+                "rate_limit_wait_seconds": metrics.get("rate_limit_wait_seconds", 0.0),
             }
 
         return summary
@@ -5,7 +5,6 @@ the .agilevv directory, supporting both production and test environments
 with configurable base directories.
 """
 
-import json
 import os
 import shutil
 from collections.abc import Iterator
@@ -14,6 +13,9 @@ from pathlib import Path
 
 import yaml
 
+from verifflowcc.core import json_codec
+from verifflowcc.core.state_writer import write_atomic
+
 
 class PathConfig:
     """Manages paths for the .agilevv directory structure.
@@ -48,6 +50,9 @@ class PathConfig:
         if not self.base_dir.is_absolute():
             self.base_dir = Path.cwd() / self.base_dir
 
+        # Project directory holding what story workspaces share, see for_story()
+        self.project_dir = self.base_dir
+
     # Core configuration paths
     @property
     def config_path(self) -> Path:
@@ -59,6 +64,26 @@ class PathConfig:
         """Path to state.json file."""
         return self.base_dir / "state.json"
 
+    @property
+    def state_journal_path(self) -> Path:
+        """Path to the journal of changes not yet compacted into state.json."""
+        return self.base_dir / "state.journal.jsonl"
+
+    @property
+    def state_sections_dir(self) -> Path:
+        """Path to the state split into sections loadable on their own."""
+        return self.base_dir / "state"
+
+    @property
+    def state_lock_path(self) -> Path:
+        """Path to the file locked by processes writing the project state."""
+        return self.base_dir / "state.lock"
+
+    @property
+    def state_db_path(self) -> Path:
+        """Path to the SQLite state database, used by the sqlite state backend."""
+        return self.base_dir / "state.db"
+
     @property
     def backlog_path(self) -> Path:
         """Path to backlog.md file."""
@@ -95,6 +120,72 @@ class PathConfig:
         """Path to artifacts directory."""
         return self.base_dir / "artifacts"
 
+    @property
+    def cache_dir(self) -> Path:
+        """Path to the stage result cache directory."""
+        return self.base_dir / "cache"
+
+    @property
+    def sprints_dir(self) -> Path:
+        """Path to persisted per-stage sprint outputs."""
+        return self.base_dir / "sprints"
+
+    @property
+    def outputs_dir(self) -> Path:
+        """Path to stage output bodies referenced by handles in the state."""
+        return self.base_dir / "outputs"
+
+    @property
+    def blobs_dir(self) -> Path:
+        """Path to artifact contents stored by hash, shared with story workspaces."""
+        return self.project_dir / "blobs"
+
+    @property
+    def artifact_refs_path(self) -> Path:
+        """Path to the hashes of the named artifacts of this directory."""
+        return self.base_dir / "artifact_refs.json"
+
+    @property
+    def artifact_index_path(self) -> Path:
+        """Path to the index of the artifacts of the project and its story workspaces."""
+        return self.project_dir / "artifacts.db"
+
+    @property
+    def stories_dir(self) -> Path:
+        """Path to per-story workspaces used by batch sprints."""
+        return self.base_dir / "stories"
+
+    @property
+    def batches_dir(self) -> Path:
+        """Path to batch sprint summaries."""
+        return self.base_dir / "batches"
+
+    def for_story(self, story_id: str) -> "PathConfig":
+        """Get an isolated PathConfig for a single story.
+
+        Each story gets its own state, artifacts and quality-gate records
+        under ``stories/<story_id>`` so that stories can run concurrently.
+        Artifact contents are stored once in the project's blob store.
+
+        Args:
+            story_id: Identifier of the story.
+
+        Returns:
+            PathConfig rooted at the story workspace.
+
+        Raises:
+            ValueError: If story_id is empty or not a single path component.
+        """
+        story_path = Path(story_id)
+        if not story_id or story_path.is_absolute() or len(story_path.parts) != 1:
+            raise ValueError(f"Invalid story identifier: {story_id!r}")
+        if story_id in (".", ".."):
+            raise ValueError(f"Invalid story identifier: {story_id!r}")
+
+        story_config = PathConfig(base_dir=self.stories_dir / story_id)
+        story_config.project_dir = self.project_dir
+        return story_config
+
     def get_artifact_path(self, artifact_name: str) -> Path:
         """Get path for a specific artifact within base directory.
 
@@ -158,8 +249,7 @@ class PathConfig:
                     "current_stage": "planning",
                     "checkpoints": [],
                 }
-                with self.state_path.open("w") as f:
-                    json.dump(default_state, f, indent=2)
+                write_atomic(self.state_path, json_codec.dumps(default_state))
 
     def validate_path(self, path: Path, must_be_inside: bool = False) -> bool:
         """Validate that a path exists and optionally is within base directory.
@@ -0,0 +1,145 @@
+"""Pipelined stage execution support.
+
+In pipelined mode the orchestrator keeps local work off the critical path of
+a sprint: the persistence of a finished stage (state, stage outputs, sprint
+manifest, cache entries) is handed to a BackgroundWriter, and the preparation
+of the stages that follow (agent creation, prompt template loading) runs while
+the current stage's SDK call is in flight. The scheduler can then dispatch the
+next stage as soon as the remote call returns and the gate is evaluated.
+"""
+
+import asyncio
+import itertools
+import logging
+import threading
+from collections.abc import Callable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundWriter:
+    """Runs blocking write jobs in a worker thread, in submission order.
+
+    Jobs are keyed by their target (usually a file path). A job submitted for
+    a key that still has a pending job replaces it, so a file rewritten several
+    times while the worker is busy is only written once, with its latest content.
+    Job arguments must be snapshots: they are used after submit() returns.
+
+    With ``max_pending``, a submit() that would queue more jobs writes the
+    oldest ones in the calling thread, bounding the memory held by the queue.
+    """
+
+    def __init__(self, max_pending: int | None = None) -> None:
+        """Initialize an idle writer.
+
+        Args:
+            max_pending: Jobs queued at most, None for no limit
+        """
+        if max_pending is not None and max_pending < 1:
+            raise ValueError("max_pending must be at least 1")
+        self.max_pending = max_pending
+        self._pending: dict[str, Callable[[], Any]] = {}
+        self._anonymous = itertools.count()
+        self._task: asyncio.Task[None] | None = None
+        # Serializes jobs between the worker thread and flush_sync()
+        self._job_lock = threading.Lock()
+        self._errors: list[BaseException] = []
+        self.jobs_written = 0
+        self.jobs_coalesced = 0
+        self.jobs_written_inline = 0
+
+    @property
+    def pending(self) -> int:
+        """Number of jobs waiting to be written."""
+        return len(self._pending)
+
+    def submit(self, key: str | None, job: Callable[[], Any]) -> None:
+        """Queue a write job.
+
+        Args:
+            key: Target of the job; a pending job for the same key is replaced.
+                Jobs submitted without a key are never replaced.
+            job: Blocking callable performing the write
+        """
+        if key is None:
+            key = f"#{next(self._anonymous)}"
+        if self._pending.pop(key, None) is not None:
+            self.jobs_coalesced += 1
+        self._pending[key] = job
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop to write in the background, write in order right away
+            self.flush_sync()
+            return
+
+        while self.max_pending is not None and len(self._pending) > self.max_pending:
+            self.jobs_written_inline += 1
+            self._run(self._pop())
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._drain())
+
+    def wait_for(self, key: str) -> None:
+        """Write the pending job of a key before the caller reads its target.
+
+        Jobs queued before it are written first, and a job running in the
+        worker finishes first.
+
+        Args:
+            key: Target of the job
+        """
+        if key in self._pending:
+            self.flush_sync()
+            return
+        with self._job_lock:
+            pass
+        self._raise_errors()
+
+    async def flush(self) -> None:
+        """Wait until every submitted job has been written.
+
+        Raises:
+            Exception: The first error raised by a job since the last flush
+        """
+        while self._task is not None and not self._task.done():
+            await asyncio.shield(self._task)
+        self._raise_errors()
+
+    def flush_sync(self) -> None:
+        """Write pending jobs in the calling thread.
+
+        Used where awaiting is not possible, e.g. while a sprint is being
+        cancelled. A job already running in the worker finishes first.
+        """
+        while self._pending:
+            self._run(self._pop())
+        self._raise_errors()
+
+    async def _drain(self) -> None:
+        """Write pending jobs until the queue is empty."""
+        while self._pending:
+            await asyncio.to_thread(self._run, self._pop())
+
+    def _pop(self) -> Callable[[], Any]:
+        """Take the oldest pending job."""
+        key = next(iter(self._pending))
+        return self._pending.pop(key)
+
+    def _run(self, job: Callable[[], Any]) -> None:
+        """Run one job, keeping its error for the next flush."""
+        with self._job_lock:
+            try:
+                job()
+                self.jobs_written += 1
+            except Exception as e:
+                logger.error(f"Background write failed: {e}")
+                self._errors.append(e)
+
+    def _raise_errors(self) -> None:
+        """Raise the first collected job error."""
+        if self._errors:
+            errors, self._errors = self._errors, []
+            raise errors[0]
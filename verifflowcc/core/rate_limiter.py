@@ -0,0 +1,287 @@
+"""Process-wide rate limiting of Claude Code SDK calls.
+
+Concurrent stages and batch stories all talk to the same backend, so every
+agent created through AgentFactory shares one RateLimiter. It combines two
+token buckets, one for requests per minute and one for tokens per minute.
+Callers wait in arrival order, so a call that needs many tokens is not starved
+by a stream of small ones.
+
+The number of tokens of a call is not known before the response arrives. The
+prompt size is reserved up front and the response size is charged afterwards
+with consume(), which may put the token bucket into debt that later callers
+wait out.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable, Mapping
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Rough size of a token in characters, used when the SDK does not report usage
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens of a text.
+
+    Args:
+        text: Prompt or response text
+
+    Returns:
+        Estimated token count, at least 1
+    """
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+class TokenBucket:
+    """Token bucket refilled continuously up to its capacity.
+
+    The level may drop below zero when more is consumed than was reserved;
+    the debt is paid back by refilling before anything else can be acquired.
+    """
+
+    def __init__(
+        self,
+        capacity: float,
+        refill_per_second: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize a full bucket.
+
+        Args:
+            capacity: Maximum number of tokens held
+            refill_per_second: Tokens added per second
+            clock: Monotonic clock in seconds
+        """
+        if capacity <= 0 or refill_per_second <= 0:
+            raise ValueError("Token bucket capacity and refill rate must be positive")
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self._clock = clock
+        self._level = capacity
+        self._updated = clock()
+
+    @property
+    def level(self) -> float:
+        """Current number of tokens in the bucket."""
+        self._refill()
+        return self._level
+
+    def time_until(self, amount: float) -> float:
+        """Get the time until an amount can be taken from the bucket.
+
+        Args:
+            amount: Number of tokens, capped at the capacity
+
+        Returns:
+            Seconds to wait, 0 if the tokens are available now
+        """
+        missing = min(amount, self.capacity) - self.level
+        return max(0.0, missing / self.refill_per_second)
+
+    def consume(self, amount: float) -> None:
+        """Take tokens from the bucket, going into debt if necessary.
+
+        Args:
+            amount: Number of tokens
+        """
+        self._refill()
+        self._level -= amount
+
+    def _refill(self) -> None:
+        """Add the tokens accrued since the last update."""
+        now = self._clock()
+        self._level = min(
+            self.capacity, self._level + (now - self._updated) * self.refill_per_second
+        )
+        self._updated = now
+
+
+class RateLimiter:
+    """Fair limiter for requests per minute and tokens per minute.
+
+    A limit of None disables the corresponding bucket.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float | None = None,
+        tokens_per_minute: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the rate limiter.
+
+        Args:
+            requests_per_minute: Maximum SDK calls per minute
+            tokens_per_minute: Maximum prompt and response tokens per minute
+            clock: Monotonic clock in seconds
+        """
+        self._clock = clock
+        self.requests: TokenBucket | None = None
+        self.tokens: TokenBucket | None = None
+        self.requests_per_minute: float | None = None
+        self.tokens_per_minute: float | None = None
+        self.configure(requests_per_minute, tokens_per_minute)
+
+        self._lock: asyncio.Lock | None = None
+        self._lock_loop: asyncio.AbstractEventLoop | None = None
+
+        self.total_requests = 0
+        self.throttled_requests = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any limit is configured."""
+        return self.requests is not None or self.tokens is not None
+
+    def configure(self, requests_per_minute: float | None, tokens_per_minute: float | None) -> None:
+        """Change the limits.
+
+        Buckets whose limit is unchanged keep their current level.
+
+        Args:
+            requests_per_minute: Maximum SDK calls per minute, None for no limit
+            tokens_per_minute: Maximum tokens per minute, None for no limit
+        """
+        for limit in (requests_per_minute, tokens_per_minute):
+            if limit is not None and limit <= 0:
+                raise ValueError("Rate limits must be positive")
+
+        if requests_per_minute != self.requests_per_minute:
+            self.requests = self._bucket(requests_per_minute)
+            self.requests_per_minute = requests_per_minute
+        if tokens_per_minute != self.tokens_per_minute:
+            self.tokens = self._bucket(tokens_per_minute)
+            self.tokens_per_minute = tokens_per_minute
+
+    async def acquire(self, tokens: int = 1) -> float:
+        """Wait until a call of the given size may be sent.
+
+        Callers are served in arrival order.
+
+        Args:
+            tokens: Tokens reserved for the call (its prompt size)
+
+        Returns:
+            Seconds spent waiting
+        """
+        if not self.enabled:
+            return 0.0
+
+        start = self._clock()
+        lock = self._get_lock()
+        # Queued behind earlier callers, or about to sleep for capacity
+        throttled = lock.locked()
+        async with lock:
+            while True:
+                delay = max(
+                    self.requests.time_until(1) if self.requests else 0.0,
+                    self.tokens.time_until(tokens) if self.tokens else 0.0,
+                )
+                if delay <= 0:
+                    break
+                throttled = True
+                await asyncio.sleep(delay)
+
+            if self.requests:
+                self.requests.consume(1)
+            if self.tokens:
+                self.tokens.consume(tokens)
+
+        self.total_requests += 1
+        if not throttled:
+            return 0.0
+
+        waited = self._clock() - start
+        self.throttled_requests += 1
+        self.total_wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        logger.debug(f"Rate limiter delayed SDK call by {waited:.2f}s")
+        return waited
+
+    def consume(self, tokens: int) -> None:
+        """Charge tokens that were not reserved by acquire(), e.g. the response.
+
+        Args:
+            tokens: Number of tokens used
+        """
+        if self.tokens:
+            self.tokens.consume(tokens)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get limiter settings and wait statistics.
+
+        Returns:
+            Dictionary of limits and counters
+        """
+        return {
+            "requests_per_minute": self.requests_per_minute,
+            "tokens_per_minute": self.tokens_per_minute,
+            "total_requests": self.total_requests,
+            "throttled_requests": self.throttled_requests,
+            "total_wait_seconds": round(self.total_wait_seconds, 3),
+            "max_wait_seconds": round(self.max_wait_seconds, 3),
+        }
+
+    def _bucket(self, per_minute: float | None) -> TokenBucket | None:
+        """Create the bucket of a per-minute limit."""
+        if per_minute is None:
+            return None
+        return TokenBucket(per_minute, per_minute / 60.0, self._clock)
+
+    def _get_lock(self) -> asyncio.Lock:
+        """Get the FIFO lock serving waiters, bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+
+# Global rate limiter shared by all agents of the process
+_rate_limiter: RateLimiter | None = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get the process-wide rate limiter.
+
+    Returns:
+        RateLimiter instance, unlimited until configured
+    """
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = RateLimiter()
+    return _rate_limiter
+
+
+def configure_rate_limiter(sdk_settings: Mapping[str, Any] | None) -> RateLimiter:
+    """Apply the limits of the ``sdk`` section of config.yaml to the global limiter.
+
+    Args:
+        sdk_settings: The ``sdk`` configuration section
+
+    Returns:
+        The global RateLimiter
+    """
+    settings = sdk_settings or {}
+    limiter = get_rate_limiter()
+    limiter.configure(
+        settings.get("requests_per_minute"),
+        settings.get("tokens_per_minute"),
+    )
+    return limiter
+
+
+def set_rate_limiter(limiter: RateLimiter | None) -> None:
+    """Replace the process-wide rate limiter.
+
+    Args:
+        limiter: RateLimiter to share, or None to reset to an unlimited one
+    """
+    global _rate_limiter
+    _rate_limiter = limiter
@@ -0,0 +1,210 @@
+"""Retry engine for Claude Code SDK calls.
+
+Failures of an SDK call are classified as transient (connection drops, rate
+limiting, overloaded or failing API, truncated output streams) or permanent
+(missing CLI, authentication problems, invalid input). Transient failures are
+retried with capped exponential backoff and full jitter, so that concurrent
+agents hitting the same failure do not retry in lockstep. Permanent failures
+are raised immediately.
+"""
+
+import asyncio
+import logging
+import random
+import re
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+from claude_code_sdk import (
+    CLIConnectionError,
+    CLIJSONDecodeError,
+    CLINotFoundError,
+    ProcessError,
+)
+
+from verifflowcc.core.sdk_config import AuthenticationError, SDKConfig
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+TRANSIENT = "transient"
+PERMANENT = "permanent"
+
+# Jitter only spreads retries apart, it does not need a cryptographic generator
+_jitter_rng = random.Random()  # noqa: S311
+
+# Error text of the CLI or API that indicates a condition which clears by itself
+TRANSIENT_PATTERNS = re.compile(
+    r"rate.?limit|\b429\b|overloaded|\b529\b|\b50[0234]\b|internal server error|"
+    r"service unavailable|bad gateway|timed? ?out|temporar|connection (reset|refused|closed)|"
+    r"econnreset|network",
+    re.IGNORECASE,
+)
+
+# Error text that indicates the call will keep failing until something is fixed
+PERMANENT_PATTERNS = re.compile(
+    r"invalid.?api.?key|unauthori[sz]ed|\b401\b|\b403\b|forbidden|authentication|"
+    r"not logged in|permission denied|invalid request|\b400\b",
+    re.IGNORECASE,
+)
+
+
+def classify_error(error: BaseException) -> str:
+    """Classify an SDK call failure as transient or permanent.
+
+    Args:
+        error: Exception raised by the SDK call
+
+    Returns:
+        TRANSIENT if retrying may succeed, PERMANENT otherwise
+    """
+    if isinstance(error, CLINotFoundError | AuthenticationError):
+        return PERMANENT
+    if isinstance(error, CLIConnectionError | CLIJSONDecodeError):
+        # Lost connection to the CLI process or a stream cut off mid-message
+        return TRANSIENT
+    if isinstance(error, asyncio.TimeoutError | ConnectionError):
+        return TRANSIENT
+
+    text = str(error)
+    if isinstance(error, ProcessError) and error.stderr:
+        text = f"{text} {error.stderr}"
+
+    if PERMANENT_PATTERNS.search(text):
+        return PERMANENT
+    if TRANSIENT_PATTERNS.search(text):
+        return TRANSIENT
+    if isinstance(error, ProcessError):
+        # The CLI exited without a recognizable cause, most often a failed API request
+        return TRANSIENT
+    return PERMANENT
+
+
+@dataclass
+class RetryPolicy:
+    """Capped exponential backoff with full jitter.
+
+    The delay before retry n (starting at 0) is drawn uniformly from
+    ``[0, min(max_delay, base_delay * multiplier ** n)]``.
+    """
+
+    max_retries: int = 3
+    base_delay: float = 1.0
+    max_delay: float = 30.0
+    multiplier: float = 2.0
+    jitter: bool = True
+
+    def __post_init__(self) -> None:
+        """Validate the policy."""
+        if self.max_retries < 0:
+            raise ValueError("Max retries must be non-negative")
+        if self.base_delay < 0 or self.max_delay < 0:
+            raise ValueError("Retry delays must be non-negative")
+        if self.multiplier < 1:
+            raise ValueError("Backoff multiplier must be at least 1")
+
+    @classmethod
+    def from_sdk_config(cls, sdk_config: SDKConfig, **overrides: Any) -> "RetryPolicy":
+        """Create a policy from the retry settings of an SDK configuration.
+
+        Args:
+            sdk_config: SDK configuration providing max_retries and retry_delay
+            **overrides: Policy fields overriding the defaults
+
+        Returns:
+            Retry policy
+        """
+        settings: dict[str, Any] = {
+            "max_retries": sdk_config.max_retries,
+            "base_delay": sdk_config.retry_delay,
+        }
+        settings.update(overrides)
+        return cls(**settings)
+
+    def backoff(self, retry: int, rng: random.Random | None = None) -> float:
+        """Compute the delay before a retry.
+
+        Args:
+            retry: Zero-based index of the retry
+            rng: Random generator used for jitter
+
+        Returns:
+            Delay in seconds
+        """
+        capped = min(self.max_delay, self.base_delay * self.multiplier**retry)
+        if not self.jitter:
+            return capped
+        return (rng or _jitter_rng).uniform(0, capped)
+
+
+@dataclass
+class RetryStats:
+    """Retry counters of one or more retried calls."""
+
+    attempts: int = 0
+    retries: int = 0
+    backoff_seconds: float = 0.0
+    errors: list[dict[str, Any]] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Get the counters as stage metrics.
+
+        Returns:
+            Dictionary of retry metrics
+        """
+        return {
+            "attempts": self.attempts,
+            "retries": self.retries,
+            "backoff_seconds": round(self.backoff_seconds, 3),
+            "retry_errors": list(self.errors),
+        }
+
+
+async def retry_async(
+    func: Callable[[], Awaitable[T]],
+    policy: RetryPolicy,
+    stats: RetryStats | None = None,
+    classify: Callable[[BaseException], str] = classify_error,
+    sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+) -> T:
+    """Call an async function, retrying transient failures.
+
+    Args:
+        func: Function performing one attempt
+        policy: Retry policy
+        stats: Counters updated with attempts, retries and backoff time
+        classify: Error classifier returning TRANSIENT or PERMANENT
+        sleep: Coroutine used to wait between attempts
+
+    Returns:
+        Result of the first successful attempt
+
+    Raises:
+        Exception: The last error once it is permanent or retries are exhausted
+    """
+    stats = stats if stats is not None else RetryStats()
+    retry = 0
+
+    while True:
+        stats.attempts += 1
+        try:
+            return await func()
+        except Exception as e:
+            kind = classify(e)
+            stats.errors.append(
+                {"attempt": stats.attempts, "error_type": type(e).__name__, "kind": kind}
+            )
+            if kind != TRANSIENT or retry >= policy.max_retries:
+                raise
+
+            delay = policy.backoff(retry)
+            logger.warning(
+                f"Transient error ({type(e).__name__}: {e}), "
+                f"retry {retry + 1}/{policy.max_retries} in {delay:.2f}s"
+            )
+            await sleep(delay)
+            stats.backoff_seconds += delay
+            stats.retries += 1
+            retry += 1
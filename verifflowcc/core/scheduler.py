@@ -0,0 +1,272 @@
+"""Dependency-aware scheduling of V-Model stages.
+
+This module models the V-Model as a directed acyclic graph of stages and
+provides a scheduler that dispatches every stage as soon as all of its
+dependencies have finished, so independent stages (for example the three
+testing stages, which only read the CODING artifacts) run concurrently.
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from typing import Any
+
+from verifflowcc.core.concurrency import AdaptiveConcurrencyController, outcome_from_result
+from verifflowcc.core.vmodel import VModelStage
+
+logger = logging.getLogger(__name__)
+
+# Default V-Model dependency graph: stage -> stages it must wait for
+DEFAULT_STAGE_DEPENDENCIES: dict[VModelStage, tuple[VModelStage, ...]] = {
+    VModelStage.PLANNING: (),
+    VModelStage.REQUIREMENTS: (VModelStage.PLANNING,),
+    VModelStage.DESIGN: (VModelStage.REQUIREMENTS,),
+    VModelStage.CODING: (VModelStage.DESIGN,),
+    VModelStage.UNIT_TESTING: (VModelStage.CODING,),
+    VModelStage.INTEGRATION_TESTING: (VModelStage.CODING,),
+    VModelStage.SYSTEM_TESTING: (VModelStage.CODING,),
+    VModelStage.VALIDATION: (
+        VModelStage.UNIT_TESTING,
+        VModelStage.INTEGRATION_TESTING,
+        VModelStage.SYSTEM_TESTING,
+    ),
+}
+
+
+class StageGraph:
+    """Directed acyclic graph of V-Model stage dependencies."""
+
+    def __init__(self, dependencies: Mapping[VModelStage, Iterable[VModelStage]]):
+        """Initialize the stage graph.
+
+        Args:
+            dependencies: Mapping of each stage to the stages it depends on
+
+        Raises:
+            ValueError: If a dependency is not part of the graph or the graph has a cycle
+        """
+        self._dependencies: dict[VModelStage, tuple[VModelStage, ...]] = {
+            stage: tuple(deps) for stage, deps in dependencies.items()
+        }
+
+        for stage, deps in self._dependencies.items():
+            for dep in deps:
+                if dep not in self._dependencies:
+                    raise ValueError(
+                        f"Stage {stage.value} depends on {dep.value}, which is not in the graph"
+                    )
+                if dep == stage:
+                    raise ValueError(f"Stage {stage.value} cannot depend on itself")
+
+        self._order = self._topological_order()
+
+    @classmethod
+    def default(cls) -> "StageGraph":
+        """Create the default V-Model stage graph."""
+        return cls(DEFAULT_STAGE_DEPENDENCIES)
+
+    @classmethod
+    def from_config(cls, v_model_config: Mapping[str, Any] | None) -> "StageGraph":
+        """Create a stage graph from the ``v_model`` section of config.yaml.
+
+        Entries under ``stage_dependencies`` replace the default dependencies of
+        the named stage, for example::
+
+            v_model:
+              stage_dependencies:
+                system_testing: [integration_testing]
+
+        Args:
+            v_model_config: The ``v_model`` configuration section
+
+        Returns:
+            StageGraph with configured overrides applied
+        """
+        dependencies = dict(DEFAULT_STAGE_DEPENDENCIES)
+        overrides = (v_model_config or {}).get("stage_dependencies") or {}
+
+        for stage_name, deps in overrides.items():
+            try:
+                stage = VModelStage(stage_name)
+                dependencies[stage] = tuple(VModelStage(dep) for dep in deps or [])
+            except ValueError as e:
+                raise ValueError(f"Invalid stage dependency override for '{stage_name}': {e}")
+
+        return cls(dependencies)
+
+    @property
+    def stages(self) -> list[VModelStage]:
+        """All stages in a valid topological order."""
+        return list(self._order)
+
+    def dependencies(self, stage: VModelStage) -> tuple[VModelStage, ...]:
+        """Get the stages a stage depends on."""
+        return self._dependencies[stage]
+
+    def dependents(self, stage: VModelStage) -> list[VModelStage]:
+        """Get the stages that directly depend on a stage."""
+        return [s for s in self._order if stage in self._dependencies[s]]
+
+    def downstream(self, stage: VModelStage) -> list[VModelStage]:
+        """Get every stage that transitively depends on a stage."""
+        result: list[VModelStage] = []
+        frontier = [stage]
+        while frontier:
+            current = frontier.pop()
+            for dependent in self.dependents(current):
+                if dependent not in result:
+                    result.append(dependent)
+                    frontier.append(dependent)
+        return [s for s in self._order if s in result]
+
+    def ready(
+        self, completed: Iterable[VModelStage], started: Iterable[VModelStage]
+    ) -> list[VModelStage]:
+        """Get stages whose dependencies are all completed and that have not started.
+
+        Args:
+            completed: Stages that have finished
+            started: Stages that have been dispatched (running or finished)
+
+        Returns:
+            Ready stages in topological order
+        """
+        completed_set = set(completed)
+        started_set = set(started)
+        return [
+            stage
+            for stage in self._order
+            if stage not in started_set
+            and all(dep in completed_set for dep in self._dependencies[stage])
+        ]
+
+    def _topological_order(self) -> list[VModelStage]:
+        """Order stages so every stage comes after its dependencies.
+
+        Ties are broken by V-Model enum order so the result is deterministic.
+
+        Raises:
+            ValueError: If the dependency graph contains a cycle
+        """
+        enum_order = {stage: i for i, stage in enumerate(VModelStage)}
+        remaining = dict(self._dependencies)
+        order: list[VModelStage] = []
+
+        while remaining:
+            ready = sorted(
+                (s for s, deps in remaining.items() if all(d in order for d in deps)),
+                key=lambda s: enum_order[s],
+            )
+            if not ready:
+                cycle = ", ".join(sorted(s.value for s in remaining))
+                raise ValueError(f"Stage dependency graph contains a cycle among: {cycle}")
+            for stage in ready:
+                order.append(stage)
+                del remaining[stage]
+
+        return order
+
+
+class StageScheduler:
+    """Runs stages of a StageGraph concurrently while honouring dependencies and gating.
+
+    A stage is dispatched once every stage it depends on has finished. When a
+    finished stage is reported as blocking (a hard gate failure), no further
+    stages are dispatched; stages already in flight are allowed to finish.
+    """
+
+    def __init__(
+        self,
+        graph: StageGraph,
+        execute: Callable[[VModelStage], Awaitable[dict[str, Any]]],
+        is_blocking: Callable[[VModelStage, dict[str, Any]], bool] | None = None,
+        max_parallel: int | None = None,
+        concurrency: AdaptiveConcurrencyController | None = None,
+        concurrency_key: Callable[[VModelStage], str | None] | None = None,
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            graph: Stage dependency graph to execute
+            execute: Coroutine function executing a single stage
+            is_blocking: Predicate telling whether a stage result stops the sprint
+            max_parallel: Maximum number of stages in flight (None for unbounded)
+            concurrency: Adaptive controller a stage must get a slot from before
+                it runs, and which is told how the stage went
+            concurrency_key: Latency class of a stage for the controller,
+                defaults to the stage name
+        """
+        if max_parallel is not None and max_parallel < 1:
+            raise ValueError("max_parallel must be at least 1")
+
+        self.graph = graph
+        self.execute = execute
+        self.is_blocking = is_blocking or (lambda _stage, _result: False)
+        self.max_parallel = max_parallel
+        self.concurrency = concurrency
+        self.concurrency_key = concurrency_key or (lambda stage: stage.value)
+        self.blocked_by: VModelStage | None = None
+
+    async def run(self, completed: Iterable[VModelStage] = ()) -> dict[VModelStage, dict[str, Any]]:
+        """Execute all stages of the graph.
+
+        Args:
+            completed: Stages that are already done and must not be executed again
+
+        Returns:
+            Mapping of executed stages to their results, in completion order
+        """
+        done: set[VModelStage] = set(completed)
+        started: set[VModelStage] = set(done)
+        results: dict[VModelStage, dict[str, Any]] = {}
+        running: dict[asyncio.Task[dict[str, Any]], VModelStage] = {}
+        self.blocked_by = None
+
+        try:
+            while True:
+                if self.blocked_by is None:
+                    for stage in self.graph.ready(done, started):
+                        if self.max_parallel is not None and len(running) >= self.max_parallel:
+                            break
+                        started.add(stage)
+                        task = asyncio.ensure_future(self._dispatch(stage))
+                        running[task] = stage
+                        logger.debug(f"Dispatched stage {stage.value}")
+
+                if not running:
+                    break
+
+                finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in finished:
+                    stage = running.pop(task)
+                    result = task.result()
+                    results[stage] = result
+                    done.add(stage)
+
+                    if self.blocked_by is None and self.is_blocking(stage, result):
+                        self.blocked_by = stage
+                        logger.warning(
+                            f"Stage {stage.value} blocked the sprint, no further stages dispatched"
+                        )
+        finally:
+            for task in running:
+                task.cancel()
+
+        return results
+
+    async def _dispatch(self, stage: VModelStage) -> dict[str, Any]:
+        """Execute a stage once the concurrency controller admits it.
+
+        Args:
+            stage: Stage to execute
+
+        Returns:
+            Stage result
+        """
+        if self.concurrency is None:
+            return await self.execute(stage)
+
+        async with self.concurrency.slot(self.concurrency_key(stage)) as permit:
+            result = await self.execute(stage)
+            permit.outcome = outcome_from_result(result)
+            return result
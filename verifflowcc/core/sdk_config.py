@@ -355,7 +355,7 @@ deployment status, performance metrics, and recommendations."""
         }
 
         # Define permissions for each agent type
-        requirements_analyst_permissions = {
+        requirements_permissions = {
             **base_permissions,
             "write": True,  # Can create requirement documents
         }
@@ -401,10 +401,12 @@ deployment status, performance metrics, and recommendations."""
             Timeout in seconds
         """
         agent_timeouts = {
+            "requirements": 60,
             "requirements_analyst": 60,
             "architect": 90,
             "developer": 120,
             "qa": 90,
+            "qa_tester": 90,
             "integration": 150,
         }
         return agent_timeouts.get(agent_type, self.timeout)
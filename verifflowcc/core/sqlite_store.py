@@ -0,0 +1,531 @@
+"""SQLite backend of the project state.
+
+Selected with ``state.backend: sqlite`` in config.yaml. The database,
+``.agilevv/state.db``, runs in WAL mode so that ``vv status`` and other readers
+never block a sprint writing to it. Besides the state itself, stored one row
+per top-level key, it keeps queryable tables of:
+
+- sprints: one row per sprint manifest;
+- stage_runs: the output record of every stage of every sprint;
+- gate_results: every quality gate evaluation, oldest first;
+- agent_metrics: the latest metrics of the agent of each stage.
+
+import_json() loads an existing JSON layout (state.json, its journal and the
+sprint directories) and export_json() writes it back, so projects can move
+between backends in both directions.
+"""
+
+import logging
+import sqlite3
+import threading
+from collections.abc import Collection, Iterable
+from datetime import datetime
+from typing import Any, cast
+
+from verifflowcc.core import json_codec
+from verifflowcc.core.path_config import PathConfig
+from verifflowcc.core.state_journal import StateJournal, apply_ops, diff_state
+from verifflowcc.core.state_lock import StateLock, lock_for
+from verifflowcc.core.state_store import StateStore, WriteJob, check_sections, section_of
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sprints (
+    number INTEGER PRIMARY KEY,
+    story_id TEXT,
+    status TEXT NOT NULL,
+    started_at TEXT,
+    updated_at TEXT,
+    manifest TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sprints_status ON sprints (status);
+CREATE TABLE IF NOT EXISTS stage_runs (
+    sprint_number INTEGER NOT NULL,
+    stage TEXT NOT NULL,
+    status TEXT NOT NULL,
+    completed_at TEXT,
+    record TEXT NOT NULL,
+    PRIMARY KEY (sprint_number, stage)
+);
+CREATE INDEX IF NOT EXISTS stage_runs_stage ON stage_runs (stage, status);
+CREATE TABLE IF NOT EXISTS gate_results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    sprint_number INTEGER,
+    stage TEXT NOT NULL,
+    passed INTEGER NOT NULL,
+    result TEXT NOT NULL,
+    recorded_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS gate_results_stage ON gate_results (stage, id);
+CREATE TABLE IF NOT EXISTS agent_metrics (
+    stage TEXT PRIMARY KEY,
+    status TEXT,
+    quality_score REAL,
+    retries INTEGER,
+    updated_at TEXT,
+    metrics TEXT NOT NULL
+);
+"""
+
+
+def _dumps(value: Any) -> str:
+    """Serialize a value stored in a TEXT column."""
+    return json_codec.dumps(value)
+
+
+def _changed_sections(ops: Iterable[list[Any]], key: str, state: dict[str, Any]) -> set[str]:
+    """Get the stages whose entry of a per-stage section of the state changed."""
+    stages: set[str] = set()
+    for op in ops:
+        path = op[1]
+        if path[0] == key:
+            stages.update([path[1]] if len(path) > 1 else state.get(key) or {})
+    return stages
+
+
+class SQLiteStateStore(StateStore):
+    """Project state and sprint history in a SQLite database."""
+
+    def __init__(self, path_config: PathConfig, lock: StateLock | None = None):
+        """Open (and create if needed) the database of a project.
+
+        Args:
+            path_config: Paths of the project
+            lock: Lock held while writing, defaults to the project's state lock
+        """
+        self.path_config = path_config
+        # SQLite serializes transactions, the state lock also covers the
+        # read-modify-write cycles of other processes
+        self.state_lock = lock or lock_for(path_config)
+        self.db_path = path_config.state_db_path
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Write jobs may run in the orchestrator's background writer thread
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(SCHEMA)
+        # State as persisted, None until loaded
+        self._persisted: dict[str, Any] | None = None
+
+    def load(self) -> dict[str, Any] | None:
+        """Load the project state.
+
+        A project still using the JSON layout is imported on first load.
+
+        Returns:
+            The persisted state, or None when there is none
+        """
+        with self._lock:
+            rows = self._connection.execute("SELECT key, value FROM state").fetchall()
+        if not rows:
+            if self.import_json() is None:
+                self._persisted = None
+                return None
+            return self.load()
+
+        state = {row["key"]: json_codec.loads(row["value"]) for row in rows}
+        self._persisted = json_codec.loads(_dumps(state))
+        return state
+
+    def load_sections(self, sections: Collection[str]) -> dict[str, Any] | None:
+        """Load the rows of the top-level keys of some sections of the state.
+
+        Args:
+            sections: Names of the sections to load
+
+        Returns:
+            The keys of the sections, or None when there is no state
+
+        Raises:
+            ValueError: If a section is unknown
+        """
+        check_sections(sections)
+        keys = [row["key"] for row in self._query("SELECT key FROM state")]
+        if not keys:
+            # Nothing stored yet, a JSON layout may still have to be imported
+            return super().load_sections(sections)
+        wanted = [key for key in keys if section_of(key) in sections]
+        placeholders = ", ".join("?" * len(wanted))
+        query = f"SELECT key, value FROM state WHERE key IN ({placeholders})"  # noqa: S608
+        rows = self._query(query, tuple(wanted))
+        return {row["key"]: json_codec.loads(row["value"]) for row in rows}
+
+    def save_job(
+        self,
+        state: dict[str, Any],
+        compact: bool = False,
+        changed: Collection[str] | None = None,
+    ) -> WriteJob | None:
+        """Upsert the top-level keys of the state that changed.
+
+        Only the changes since this process last saved are written: the job
+        applies them under the state lock to the rows as stored, so that the
+        changes other processes made in between are kept.
+
+        Args:
+            state: Current state
+            compact: Whether to compare every key instead of the changed ones
+            changed: Top-level keys modified since the last save, None if unknown
+
+        Returns:
+            Blocking write job, or None when nothing changed
+        """
+        previous = self._persisted or {}
+        # A first save has nothing to compare with and writes every key
+        keys = None if compact or self._persisted is None else changed
+        ops = diff_state(previous, state, keys=keys)
+        if not ops:
+            return None
+
+        ops_text = _dumps(ops)
+        changed = sorted({op[1][0] for op in ops})
+        gates = self._gate_rows(state, previous, _changed_sections(ops, "quality_gates", state))
+        metrics = self._metric_rows(state, _changed_sections(ops, "agent_metrics", state))
+
+        if self._persisted is None:
+            self._persisted = {}
+        apply_ops(self._persisted, json_codec.loads(ops_text))
+
+        placeholders = ", ".join("?" * len(changed))
+        query = f"SELECT key, value FROM state WHERE key IN ({placeholders})"  # noqa: S608
+
+        def write() -> None:
+            with self.state_lock.exclusive(), self._lock, self._connection:
+                stored = {
+                    row["key"]: json_codec.loads(row["value"])
+                    for row in self._connection.execute(query, changed)
+                }
+                apply_ops(stored, json_codec.loads(ops_text))
+                self._connection.executemany(
+                    "DELETE FROM state WHERE key = ?",
+                    [(key,) for key in changed if key not in stored],
+                )
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)",
+                    [(key, _dumps(stored[key])) for key in changed if key in stored],
+                )
+                self._insert_gates(gates)
+                self._upsert_metrics(metrics)
+
+        return write
+
+    def record_sprint_job(self, manifest: dict[str, Any]) -> WriteJob:
+        """Return the write recording a sprint manifest.
+
+        Args:
+            manifest: Sprint manifest, as written to sprint.json
+        """
+        row = self._sprint_row(manifest)
+
+        def write() -> None:
+            with self.state_lock.exclusive(), self._lock, self._connection:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO sprints VALUES (?, ?, ?, ?, ?, ?)", row
+                )
+
+        return write
+
+    def record_stage_run_job(self, sprint_number: int, record: dict[str, Any]) -> WriteJob:
+        """Return the write recording a finished stage.
+
+        Args:
+            sprint_number: Sprint the stage belongs to
+            record: Stage output record, as written to <stage>.json
+        """
+        row = self._stage_run_row(sprint_number, record)
+
+        def write() -> None:
+            with self.state_lock.exclusive(), self._lock, self._connection:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO stage_runs VALUES (?, ?, ?, ?, ?)", row
+                )
+
+        return write
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def load_sprint(self, sprint_number: int) -> dict[str, Any] | None:
+        """Load the manifest of a sprint from the sprints table.
+
+        Args:
+            sprint_number: Sprint to load
+
+        Returns:
+            The sprint manifest, or None when the sprint was not recorded
+        """
+        rows = self._query("SELECT manifest FROM sprints WHERE number = ?", (sprint_number,))
+        return cast("dict[str, Any]", json_codec.loads(rows[0]["manifest"])) if rows else None
+
+    def load_stage_runs(self, sprint_number: int) -> dict[str, dict[str, Any]]:
+        """Load the output records of a sprint from the stage_runs table.
+
+        Args:
+            sprint_number: Sprint to load
+
+        Returns:
+            Mapping of stage name to its output record
+        """
+        rows = self._query(
+            "SELECT stage, record FROM stage_runs WHERE sprint_number = ?", (sprint_number,)
+        )
+        return {row["stage"]: json_codec.loads(row["record"]) for row in rows}
+
+    # Queries
+
+    def sprints(self, status: str | None = None) -> list[dict[str, Any]]:
+        """List sprint manifests, oldest first.
+
+        Args:
+            status: Only list sprints with this status
+
+        Returns:
+            Sprint manifests
+        """
+        query = "SELECT manifest FROM sprints"
+        params: tuple[Any, ...] = ()
+        if status is not None:
+            query += " WHERE status = ?"
+            params = (status,)
+        return [
+            json_codec.loads(row["manifest"])
+            for row in self._query(query + " ORDER BY number", params)
+        ]
+
+    def stage_runs(
+        self,
+        stage: str | None = None,
+        sprint_number: int | None = None,
+        status: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """List stage output records, by sprint then completion time.
+
+        Args:
+            stage: Only list runs of this stage
+            sprint_number: Only list runs of this sprint
+            status: Only list runs with this status
+
+        Returns:
+            Stage output records, each with its sprint_number
+        """
+        conditions = []
+        params: list[Any] = []
+        for column, value in (
+            ("stage", stage),
+            ("sprint_number", sprint_number),
+            ("status", status),
+        ):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        query = "SELECT sprint_number, record FROM stage_runs"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY sprint_number, completed_at"
+        return [
+            {**json_codec.loads(row["record"]), "sprint_number": row["sprint_number"]}
+            for row in self._query(query, tuple(params))
+        ]
+
+    def gate_history(self, stage: str) -> list[dict[str, Any]]:
+        """List the quality gate results of a stage, oldest first.
+
+        Args:
+            stage: Stage name
+
+        Returns:
+            Gate results, each with its sprint_number and recorded_at
+        """
+        rows = self._query(
+            "SELECT sprint_number, result, recorded_at FROM gate_results "
+            "WHERE stage = ? ORDER BY id",
+            (stage,),
+        )
+        return [
+            {
+                **json_codec.loads(row["result"]),
+                "sprint_number": row["sprint_number"],
+                "recorded_at": row["recorded_at"],
+            }
+            for row in rows
+        ]
+
+    def agent_metrics(self) -> dict[str, dict[str, Any]]:
+        """Get the latest agent metrics of every stage.
+
+        Returns:
+            Mapping of stage name to its metrics
+        """
+        rows = self._query("SELECT stage, metrics FROM agent_metrics ORDER BY stage")
+        return {row["stage"]: json_codec.loads(row["metrics"]) for row in rows}
+
+    # JSON layout
+
+    def import_json(self) -> dict[str, Any] | None:
+        """Replace the database content with the project's JSON layout.
+
+        Returns:
+            The imported state, or None when the project has no state.json
+        """
+        state = StateJournal.for_project(self.path_config).load()
+        if state is None:
+            return None
+
+        sprint_rows = []
+        stage_rows = []
+        gate_rows = []
+        for sprint_dir in sorted(self.path_config.sprints_dir.glob("sprint-*")):
+            manifest_path = sprint_dir / "sprint.json"
+            if not manifest_path.exists():
+                continue
+            manifest = json_codec.loads(manifest_path.read_text())
+            sprint_rows.append(self._sprint_row(manifest))
+            for record_path in sorted(sprint_dir.glob("*.json")):
+                if record_path.name == "sprint.json":
+                    continue
+                record = json_codec.loads(record_path.read_text())
+                stage_rows.append(self._stage_run_row(manifest["sprint_number"], record))
+                if record.get("gate"):
+                    gate_rows.append(
+                        (
+                            manifest["sprint_number"],
+                            record["stage"],
+                            int(bool(record["gate"].get("passed"))),
+                            _dumps(record["gate"]),
+                            record.get("completed_at") or datetime.now().isoformat(),
+                        )
+                    )
+
+        with self.state_lock.exclusive(), self._lock, self._connection:
+            for table in ("state", "sprints", "stage_runs", "gate_results", "agent_metrics"):
+                self._connection.execute(f"DELETE FROM {table}")  # noqa: S608
+            self._connection.executemany(
+                "INSERT INTO state (key, value) VALUES (?, ?)",
+                [(key, _dumps(value)) for key, value in state.items()],
+            )
+            self._connection.executemany(
+                "INSERT INTO sprints VALUES (?, ?, ?, ?, ?, ?)", sprint_rows
+            )
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO stage_runs VALUES (?, ?, ?, ?, ?)", stage_rows
+            )
+            self._insert_gates(gate_rows)
+            self._upsert_metrics(self._metric_rows(state, set(state.get("agent_metrics") or {})))
+
+        logger.info(f"Imported project state into {self.db_path}")
+        return state
+
+    def export_json(self) -> dict[str, Any] | None:
+        """Write the database content to the project's JSON layout.
+
+        Returns:
+            The exported state, or None when the database has no state
+        """
+        with self._lock:
+            rows = self._connection.execute("SELECT key, value FROM state").fetchall()
+        if not rows:
+            return None
+        state = {row["key"]: json_codec.loads(row["value"]) for row in rows}
+
+        journal = StateJournal.for_project(self.path_config)
+        journal.load()
+        journal.save(state, compact=True)
+
+        for manifest in self.sprints():
+            sprint_dir = self.path_config.sprints_dir / f"sprint-{manifest['sprint_number']}"
+            sprint_dir.mkdir(parents=True, exist_ok=True)
+            (sprint_dir / "sprint.json").write_text(_dumps(manifest))
+            for record in self.stage_runs(sprint_number=manifest["sprint_number"]):
+                record.pop("sprint_number")
+                (sprint_dir / f"{record['stage']}.json").write_text(_dumps(record))
+        return state
+
+    # Helpers
+
+    def _query(self, query: str, params: tuple[Any, ...] = ()) -> list[sqlite3.Row]:
+        """Run a read query."""
+        with self._lock:
+            return self._connection.execute(query, params).fetchall()
+
+    @staticmethod
+    def _sprint_row(manifest: dict[str, Any]) -> tuple[Any, ...]:
+        """Build the sprints row of a manifest."""
+        story = manifest.get("story") or {}
+        return (
+            manifest["sprint_number"],
+            story.get("id"),
+            manifest.get("status", "unknown"),
+            manifest.get("started_at"),
+            manifest.get("updated_at"),
+            _dumps(manifest),
+        )
+
+    @staticmethod
+    def _stage_run_row(sprint_number: int, record: dict[str, Any]) -> tuple[Any, ...]:
+        """Build the stage_runs row of a stage output record."""
+        return (
+            sprint_number,
+            record["stage"],
+            record.get("status", "success"),
+            record.get("completed_at"),
+            _dumps(record),
+        )
+
+    @staticmethod
+    def _gate_rows(
+        state: dict[str, Any], previous: dict[str, Any], stages: set[str]
+    ) -> list[tuple[Any, ...]]:
+        """Build gate_results rows for the gates evaluated since the last save."""
+        gates = state.get("quality_gates") or {}
+        recorded_at = datetime.now().isoformat()
+        return [
+            (
+                state.get("sprint_number"),
+                stage,
+                int(bool(gates[stage].get("passed"))),
+                _dumps(gates[stage]),
+                recorded_at,
+            )
+            for stage in sorted(stages)
+            if stage in gates and gates[stage] != (previous.get("quality_gates") or {}).get(stage)
+        ]
+
+    @staticmethod
+    def _metric_rows(state: dict[str, Any], stages: set[str]) -> list[tuple[Any, ...]]:
+        """Build agent_metrics rows for the stages whose metrics changed."""
+        metrics = state.get("agent_metrics") or {}
+        return [
+            (
+                stage,
+                metrics[stage].get("status"),
+                metrics[stage].get("quality_score"),
+                metrics[stage].get("retries"),
+                metrics[stage].get("last_execution"),
+                _dumps(metrics[stage]),
+            )
+            for stage in sorted(stages)
+            if stage in metrics
+        ]
+
+    def _insert_gates(self, rows: list[tuple[Any, ...]]) -> None:
+        """Insert gate_results rows, inside the caller's transaction."""
+        self._connection.executemany(
+            "INSERT INTO gate_results (sprint_number, stage, passed, result, recorded_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            rows,
+        )
+
+    def _upsert_metrics(self, rows: list[tuple[Any, ...]]) -> None:
+        """Insert or replace agent_metrics rows, inside the caller's transaction."""
+        self._connection.executemany(
+            "INSERT OR REPLACE INTO agent_metrics VALUES (?, ?, ?, ?, ?, ?)", rows
+        )
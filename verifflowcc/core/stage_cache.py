@@ -0,0 +1,237 @@
+"""Content-hash memoization of V-Model stage results.
+
+A stage result is stored under a fingerprint of the stage's effective inputs:
+the agent type and options, the prompt template, the (normalized) agent input
+and the content hashes of the artifacts produced by upstream stages. When a
+sprint is re-run and the fingerprint of a stage is unchanged, the stored result
+is reused instead of calling the Claude Code SDK again.
+
+Because upstream stages are represented by the hashes of the artifacts they
+produced, invalidation cascades naturally: a stage whose upstream artifacts are
+byte-for-byte identical still hits the cache, and only stages whose inputs
+actually changed are executed again.
+"""
+
+import hashlib
+import json
+import logging
+from collections.abc import Mapping
+from datetime import datetime
+from pathlib import Path
+from typing import Any, cast
+
+from verifflowcc.core import json_codec
+from verifflowcc.core.artifact_store import ArtifactStore, BlobStore
+from verifflowcc.core.path_config import PathConfig
+from verifflowcc.core.state_lock import lock_for
+
+logger = logging.getLogger(__name__)
+
+# Context keys that change on every run without changing what a stage computes
+VOLATILE_CONTEXT_KEYS = frozenset(
+    {
+        "sprint_number",
+        "sprint_results",
+        "previous_stages",
+        "previous_artifacts",
+        "session_state",
+    }
+)
+
+# Top-level agent input keys that are volatile for the same reason
+VOLATILE_INPUT_KEYS = frozenset({"session_state"})
+
+
+def hash_content(content: Any) -> str:
+    """Compute a stable sha256 hash of JSON-compatible content.
+
+    Args:
+        content: Content to hash (bytes, str or JSON-serializable data)
+
+    Returns:
+        Hex digest of the content
+    """
+    if isinstance(content, bytes):
+        data = content
+    elif isinstance(content, str):
+        data = content.encode()
+    else:
+        data = json.dumps(content, sort_keys=True, separators=(",", ":"), default=str).encode()
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_artifacts(base_dir: Path, artifacts: Mapping[str, Any]) -> dict[str, str | None]:
+    """Hash the files referenced by a stage's artifact mapping.
+
+    Artifact values that are relative paths of existing files are hashed by
+    file content, using the hashes recorded by the artifact store where they
+    are current; any other value is hashed as data. Missing files map to None.
+
+    Args:
+        base_dir: Directory artifact paths are relative to
+        artifacts: Artifact mapping of a stage result
+
+    Returns:
+        Mapping of artifact name to content hash
+    """
+    store = ArtifactStore(base_dir, BlobStore(base_dir / "blobs"), lock_for(PathConfig(base_dir)))
+    files = {
+        name: value
+        for name, value in artifacts.items()
+        if isinstance(value, str) and value and not Path(value).is_absolute()
+    }
+    # Artifacts saved through the artifact store are not read again
+    digests = store.digests(sorted(set(files.values())))
+
+    hashes: dict[str, str | None] = {}
+    for name, value in sorted(artifacts.items()):
+        if name in files:
+            if digests[value] is not None:
+                hashes[name] = digests[value]
+                continue
+            if Path(value).suffix:
+                hashes[name] = None
+                continue
+        hashes[name] = hash_content(value)
+    return hashes
+
+
+def normalize_agent_input(input_data: Mapping[str, Any]) -> dict[str, Any]:
+    """Drop volatile keys from an agent input before fingerprinting.
+
+    Args:
+        input_data: Agent input prepared by the orchestrator
+
+    Returns:
+        Copy of the input without run-specific values
+    """
+    normalized = {k: v for k, v in input_data.items() if k not in VOLATILE_INPUT_KEYS}
+    context = normalized.get("context")
+    if isinstance(context, Mapping):
+        normalized["context"] = {k: v for k, v in context.items() if k not in VOLATILE_CONTEXT_KEYS}
+    return normalized
+
+
+class StageCache:
+    """Stores stage results keyed by the fingerprint of their inputs.
+
+    Entries are JSON files under ``<cache_dir>/<stage>/<fingerprint>.json``.
+    """
+
+    def __init__(self, cache_dir: Path, artifacts_base_dir: Path, max_entries_per_stage: int = 5):
+        """Initialize the stage cache.
+
+        Args:
+            cache_dir: Directory holding cache entries
+            artifacts_base_dir: Directory artifact paths of stage results are relative to
+            max_entries_per_stage: Number of fingerprints kept per stage
+        """
+        self.cache_dir = cache_dir
+        self.artifacts_base_dir = artifacts_base_dir
+        self.max_entries_per_stage = max(1, max_entries_per_stage)
+        self.hits = 0
+        self.misses = 0
+
+    def fingerprint(self, stage: str, inputs: Mapping[str, Any]) -> str:
+        """Compute the fingerprint of a stage execution.
+
+        Args:
+            stage: Stage name
+            inputs: Effective inputs of the stage (agent identity, input, upstream hashes)
+
+        Returns:
+            Fingerprint hex digest
+        """
+        return hash_content({"stage": stage, **inputs})
+
+    def get(self, stage: str, fingerprint: str) -> dict[str, Any] | None:
+        """Look up a cached stage result.
+
+        An entry is only valid while the artifacts it produced are still on
+        disk with the same content, since downstream stages read them.
+
+        Args:
+            stage: Stage name
+            fingerprint: Fingerprint of the stage inputs
+
+        Returns:
+            Cached stage result, or None on a miss
+        """
+        entry_path = self._entry_path(stage, fingerprint)
+        if not entry_path.exists():
+            self.misses += 1
+            return None
+
+        try:
+            entry = json_codec.loads(entry_path.read_text())
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Discarding unreadable cache entry {entry_path}: {e}")
+            entry_path.unlink(missing_ok=True)
+            self.misses += 1
+            return None
+
+        result = entry.get("result", {})
+        current_hashes = hash_artifacts(self.artifacts_base_dir, result.get("artifacts") or {})
+        if current_hashes != entry.get("artifact_hashes"):
+            logger.info(f"Cache entry for stage {stage} is stale, artifacts changed on disk")
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return cast("dict[str, Any]", result)
+
+    def put(self, stage: str, fingerprint: str, result: Mapping[str, Any]) -> None:
+        """Store a stage result.
+
+        Args:
+            stage: Stage name
+            fingerprint: Fingerprint of the stage inputs
+            result: Stage result to store
+        """
+        entry = {
+            "stage": stage,
+            "fingerprint": fingerprint,
+            "created_at": datetime.now().isoformat(),
+            "artifact_hashes": hash_artifacts(
+                self.artifacts_base_dir, result.get("artifacts") or {}
+            ),
+            "result": result,
+        }
+
+        entry_path = self._entry_path(stage, fingerprint)
+        entry_path.parent.mkdir(parents=True, exist_ok=True)
+        entry_path.write_text(json_codec.dumps(entry))
+        self._prune(stage)
+
+    def invalidate(self, stage: str | None = None) -> int:
+        """Remove cache entries.
+
+        Args:
+            stage: Stage whose entries are removed, or None for all stages
+
+        Returns:
+            Number of removed entries
+        """
+        if not self.cache_dir.exists():
+            return 0
+
+        pattern = f"{stage}/*.json" if stage else "*/*.json"
+        removed = 0
+        for entry_path in self.cache_dir.glob(pattern):
+            entry_path.unlink()
+            removed += 1
+        return removed
+
+    def _entry_path(self, stage: str, fingerprint: str) -> Path:
+        """Get the file path of a cache entry."""
+        return self.cache_dir / stage / f"{fingerprint}.json"
+
+    def _prune(self, stage: str) -> None:
+        """Keep only the most recent entries of a stage."""
+        entries = sorted(
+            (self.cache_dir / stage).glob("*.json"),
+            key=lambda p: p.stat().st_mtime,
+            reverse=True,
+        )
+        for stale in entries[self.max_entries_per_stage :]:
+            stale.unlink(missing_ok=True)
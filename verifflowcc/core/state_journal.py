@@ -0,0 +1,487 @@
+"""Append-only journal of project state changes.
+
+Rewriting the whole of state.json after every transition costs time
+proportional to the project history, since stage artifacts, session state and
+checkpoint history are all embedded in it. The StateJournal instead appends
+the difference between the state last persisted and the current one to
+``state.journal.jsonl``, one line per save:
+
+    {"seq": 12, "ops": [["set", ["stage_artifacts", "design"], {...}],
+                        ["extend", ["completed_stages"], ["design"]],
+                        ["del", ["active_story"]]]}
+
+Every ``compact_every`` saves (and when asked to) the state is compacted: it is
+written in full to state.json, which records the sequence number of the last
+journal entry it includes, and the journal is truncated. Loading replays the
+journal entries newer than the snapshot on top of it, so a crash between the
+snapshot and the truncation never applies an entry twice. A snapshot without
+a sequence number was written by something else than the journal (an older
+version, the CLI, a restore) and supersedes any journal left next to it.
+
+Several processes may save the state of a project. A save records only the
+changes of its own process, and its write job re-applies them under the
+state lock to the state on disk, read again when another process wrote it
+since, so neither a journal entry nor a compaction drops the changes of the
+other writers.
+
+Every save also rewrites the files of the state sections it changed under
+``state/`` (see verifflowcc.core.state_store), e.g. ``state/summary.json``,
+so that load_sections() reads a few small files instead of replaying the
+journal on top of the full snapshot. Once they are written, the sequence
+number of the save is recorded in the small ``state/journal_seq.json``. A
+writer that finds it behind the journal after a crash rewrites all the
+section files with its next save.
+"""
+
+import json
+import logging
+from collections.abc import Collection
+from contextlib import AbstractContextManager, nullcontext
+from pathlib import Path
+from typing import Any, cast
+
+from verifflowcc.core import json_codec
+from verifflowcc.core.path_config import PathConfig
+from verifflowcc.core.state_lock import StateLock, lock_for
+from verifflowcc.core.state_store import (
+    SECTIONS,
+    StateStore,
+    WriteJob,
+    check_sections,
+    section_of,
+)
+from verifflowcc.core.state_writer import write_atomic
+
+logger = logging.getLogger(__name__)
+
+# Key of the snapshot recording the last journal entry it includes
+SEQ_KEY = "_journal_seq"
+
+# Key of the section files recording the snapshot they were written against
+SNAPSHOT_KEY = "_snapshot"
+
+# File next to the section files recording the journal entry they include
+SECTIONS_SEQ_FILE = "journal_seq.json"
+
+# Lock-free reads attempted before reading under the state lock
+LOAD_ATTEMPTS = 3
+
+Op = list[Any]
+
+
+def diff_state(
+    old: Any,
+    new: Any,
+    path: list[str] | None = None,
+    keys: Collection[str] | None = None,
+) -> list[Op]:
+    """Compute the journal operations turning one state into another.
+
+    Dictionaries are compared key by key and lists that only grew are
+    extended, so the operations stay proportional to what changed.
+
+    Args:
+        old: State last persisted
+        new: Current state
+        path: Keys leading to old and new in the state
+        keys: Top-level keys that may have changed, None to compare them all
+
+    Returns:
+        List of ``set``, ``del`` and ``extend`` operations
+    """
+    path = path or []
+    if isinstance(old, dict) and isinstance(new, dict):
+        if keys is not None:
+            # Only the subtrees the caller marked changed are compared
+            old = {key: old[key] for key in keys if key in old}
+            new = {key: new[key] for key in keys if key in new}
+        ops: list[Op] = [["del", [*path, key]] for key in old if key not in new]
+        for key, value in new.items():
+            if key not in old:
+                ops.append(["set", [*path, key], value])
+            elif old[key] != value:
+                ops.extend(diff_state(old[key], value, [*path, key]))
+        return ops
+    if (
+        isinstance(old, list)
+        and isinstance(new, list)
+        and path
+        and len(new) > len(old)
+        and new[: len(old)] == old
+    ):
+        return [["extend", path, new[len(old) :]]]
+    if not path:
+        # The state itself is always a dictionary
+        raise TypeError("State must be a dictionary")
+    return [["set", path, new]]
+
+
+def apply_ops(state: dict[str, Any], ops: list[Op]) -> None:
+    """Apply journal operations to a state in place.
+
+    Args:
+        state: State to update
+        ops: Operations produced by diff_state()
+    """
+    for op in ops:
+        kind, path = op[0], op[1]
+        parent = state
+        for key in path[:-1]:
+            parent = parent.setdefault(key, {})
+        if kind == "set":
+            parent[path[-1]] = op[2]
+        elif kind == "del":
+            parent.pop(path[-1], None)
+        elif kind == "extend":
+            parent.setdefault(path[-1], []).extend(op[2])
+        else:
+            raise ValueError(f"Unknown journal operation: {kind}")
+
+
+class StateJournal(StateStore):
+    """Persists project state as a snapshot plus a journal of deltas."""
+
+    def __init__(
+        self,
+        snapshot_path: Path,
+        journal_path: Path,
+        compact_every: int = 50,
+        sprints_dir: Path | None = None,
+        lock: StateLock | None = None,
+        sections_dir: Path | None = None,
+    ):
+        """Initialize the journal.
+
+        Args:
+            snapshot_path: Path of the full state (state.json)
+            journal_path: Path of the journal of deltas
+            compact_every: Journal entries written before the next compaction
+            sprints_dir: Directory of the sprint manifests and stage outputs,
+                defaults to ``sprints`` next to the snapshot
+            lock: Lock held while writing, None when no other process writes
+            sections_dir: Directory of the section files, defaults to ``state``
+                next to the snapshot
+        """
+        if compact_every < 1:
+            raise ValueError("compact_every must be at least 1")
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path
+        self.sprints_dir = sprints_dir or snapshot_path.parent / "sprints"
+        self.sections_dir = sections_dir or snapshot_path.parent / "state"
+        self.compact_every = compact_every
+        self.lock = lock
+        # State as this process last persisted it, which its saves are diffed
+        # against; None until loaded
+        self._persisted: dict[str, Any] | None = None
+        self._entries_since_compaction = 0
+        # Whether the next save must compact, e.g. after loading a snapshot
+        # written outside the journal
+        self._compact_next = True
+        # State on disk as last read or written by a write job, with the
+        # sequence number of its last entry and the mark of the files it was
+        # read from; write jobs re-read it when another process wrote since
+        self._disk: dict[str, Any] = {}
+        self._seq = 0
+        self._disk_mark: tuple[Any, ...] | None = None
+        self._journaled = False
+        self._replayed = 0
+        # Whether the section files may be behind the journal
+        self._sections_stale = True
+
+    @classmethod
+    def for_project(
+        cls, path_config: PathConfig, compact_every: int = 50, lock: StateLock | None = None
+    ) -> "StateJournal":
+        """Create the journal of a project.
+
+        Args:
+            path_config: Paths of the project
+            compact_every: Journal entries written before the next compaction
+            lock: Lock held while writing, defaults to the project's state lock
+
+        Returns:
+            StateJournal instance
+        """
+        return cls(
+            path_config.state_path,
+            path_config.state_journal_path,
+            compact_every,
+            path_config.sprints_dir,
+            lock or lock_for(path_config),
+            path_config.state_sections_dir,
+        )
+
+    def load(self) -> dict[str, Any] | None:
+        """Load the state by replaying the journal on top of the snapshot.
+
+        Loading takes no lock. A load racing a compaction by another process
+        can read the old snapshot and the new journal, which shows as a gap
+        in the sequence numbers: it is then retried, and read under the lock
+        if writers keep winning the race.
+
+        Returns:
+            The persisted state, or None when there is none
+        """
+        for _ in range(LOAD_ATTEMPTS):
+            state, complete = self._read()
+            if complete:
+                break
+        else:
+            with self._locked():
+                state = self._read()[0]
+
+        # A snapshot written outside the journal is compacted by the next save,
+        # which also discards the journal it superseded
+        self._compact_next = not self._journaled
+        self._entries_since_compaction = self._replayed
+        self._persisted = None if state is None else json_codec.loads(json_codec.dumps(state))
+        self._disk = json_codec.loads(json_codec.dumps(state or {}))
+        return state
+
+    def _read(self) -> tuple[dict[str, Any] | None, bool]:
+        """Read the snapshot and replay the journal.
+
+        Also records the sequence number reached and the mark of the files
+        read, so that write jobs notice when another process writes after.
+
+        Returns:
+            The state, and whether the journal entries followed the snapshot
+            without a gap
+        """
+        # Marking before reading errs towards reading again
+        self._disk_mark = self._mark()
+        self._seq = self._replayed = 0
+        self._journaled = False
+        if not self.snapshot_path.exists():
+            return None, True
+
+        state = cast("dict[str, Any]", json_codec.loads(self.snapshot_path.read_text()))
+        snapshot_seq = state.pop(SEQ_KEY, None)
+        self._seq = snapshot_seq or 0
+        self._journaled = snapshot_seq is not None
+
+        if snapshot_seq is not None and self.journal_path.exists():
+            for line_number, line in enumerate(self.journal_path.read_text().splitlines(), 1):
+                try:
+                    entry = json_codec.loads(line)
+                except json.JSONDecodeError:
+                    # A save interrupted mid-append leaves a torn last line
+                    logger.warning(
+                        f"Ignoring unreadable entry {line_number} of {self.journal_path}"
+                    )
+                    break
+                if entry["seq"] <= self._seq:
+                    continue
+                if entry["seq"] > self._seq + 1:
+                    # The journal belongs to a newer snapshot than the one read
+                    return state, False
+                apply_ops(state, entry["ops"])
+                self._seq = entry["seq"]
+                self._replayed += 1
+
+        self._sections_stale = self._sections_seq() != [self._snapshot_stamp(), self._seq]
+        return state, True
+
+    def load_sections(self, sections: Collection[str]) -> dict[str, Any] | None:
+        """Load some sections of the state from their files.
+
+        Falls back to loading the whole state when a section file is missing
+        or was written against another snapshot, e.g. for a state.json written
+        by an older version or replaced by a restore.
+
+        Args:
+            sections: Names of the sections to load
+
+        Returns:
+            The keys of the sections, or None when there is no state
+
+        Raises:
+            ValueError: If a section is unknown
+        """
+        check_sections(sections)
+        stamp = self._snapshot_stamp()
+        state: dict[str, Any] = {}
+        for section in sections:
+            try:
+                part = json_codec.loads(self._section_path(section).read_text())
+            except (OSError, json.JSONDecodeError):
+                part = None
+            if part is None or part.pop(SNAPSHOT_KEY, None) != stamp:
+                return super().load_sections(sections)
+            state.update(part)
+        return state
+
+    def save_job(
+        self,
+        state: dict[str, Any],
+        compact: bool = False,
+        changed: Collection[str] | None = None,
+    ) -> WriteJob | None:
+        """Append the changes of the state to the journal, or compact it.
+
+        Only the changes since this process last saved are written: the job
+        re-applies them under the state lock to the state on disk, reading it
+        again first when another process wrote it in between, so that the
+        changes of that process are kept, including by a compaction.
+
+        Args:
+            state: Current state
+            compact: Whether to write a full snapshot instead of a delta
+            changed: Top-level keys modified since the last save, None if unknown
+
+        Returns:
+            Blocking write job, or None when nothing changed
+        """
+        compact = (
+            compact or self._compact_next or self._entries_since_compaction >= self.compact_every
+        )
+        # A first save has nothing to compare with and writes every key
+        keys = None if self._persisted is None else changed
+        ops = diff_state(self._persisted or {}, state, keys=keys)
+        if not ops and not compact:
+            return None
+
+        ops_text = json_codec.dumps(ops)
+        # Track the state exactly as the loader will replay it
+        if self._persisted is None:
+            self._persisted = {}
+        apply_ops(self._persisted, json_codec.loads(ops_text))
+        if compact:
+            self._compact_next = False
+            self._entries_since_compaction = 0
+            return self._write_job(ops_text, SECTIONS, compact=True)
+        self._entries_since_compaction += 1
+        changed_sections = {section_of(op[1][0]) for op in ops}
+        return self._write_job(ops_text, changed_sections, compact=False)
+
+    def load_sprint(self, sprint_number: int) -> dict[str, Any] | None:
+        """Load the manifest of a sprint from its sprint.json.
+
+        Args:
+            sprint_number: Sprint to load
+
+        Returns:
+            The sprint manifest, or None when the sprint was not recorded
+        """
+        manifest_path = self.sprints_dir / f"sprint-{sprint_number}" / "sprint.json"
+        if not manifest_path.exists():
+            return None
+        return cast("dict[str, Any]", json_codec.loads(manifest_path.read_text()))
+
+    def load_stage_runs(self, sprint_number: int) -> dict[str, dict[str, Any]]:
+        """Load the output records of a sprint from its <stage>.json files.
+
+        Args:
+            sprint_number: Sprint to load
+
+        Returns:
+            Mapping of stage name to its output record
+        """
+        records: dict[str, dict[str, Any]] = {}
+        for record_path in sorted((self.sprints_dir / f"sprint-{sprint_number}").glob("*.json")):
+            if record_path.name == "sprint.json":
+                continue
+            try:
+                record = json_codec.loads(record_path.read_text())
+            except json.JSONDecodeError as e:
+                logger.warning(f"Ignoring unreadable stage output {record_path}: {e}")
+                continue
+            records[record.get("stage", record_path.stem)] = record
+        return records
+
+    def _locked(self) -> AbstractContextManager[None]:
+        """Hold the state lock, if the journal has one."""
+        return self.lock.exclusive() if self.lock is not None else nullcontext()
+
+    def _write_job(self, ops_text: str, sections: Collection[str], compact: bool) -> WriteJob:
+        """Return the job applying journal operations to the state on disk.
+
+        Args:
+            ops_text: Serialized operations produced by diff_state()
+            sections: Names of the sections the operations change
+            compact: Whether to write a full snapshot instead of a journal entry
+        """
+
+        def write() -> None:
+            with self._locked():
+                written = sections
+                if self._disk_mark != self._mark():
+                    # Another process wrote the state since this one last did
+                    self._disk = self._read()[0] or {}
+                if self._sections_stale:
+                    written = SECTIONS
+                ops = json_codec.loads(ops_text)
+                apply_ops(self._disk, ops)
+                if compact or not self._journaled:
+                    self._compact()
+                    written = SECTIONS
+                else:
+                    self._seq += 1
+                    self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+                    with self.journal_path.open("a") as f:
+                        f.write(f'{{"seq":{self._seq},"ops":{ops_text}}}\n')
+                self._write_sections(written)
+                self._disk_mark = self._mark()
+
+        return write
+
+    def _compact(self) -> None:
+        """Write the state on disk as a snapshot and truncate the journal."""
+        write_atomic(self.snapshot_path, json_codec.dumps({**self._disk, SEQ_KEY: self._seq}))
+        self._journaled = True
+        # Entries up to the snapshot's sequence number are skipped on load, so
+        # a crash before this point loses nothing
+        self.journal_path.unlink(missing_ok=True)
+
+    def _mark(self) -> tuple[Any, ...]:
+        """Identify the snapshot and journal files without reading them."""
+        try:
+            journal_size = self.journal_path.stat().st_size
+        except OSError:
+            journal_size = None
+        return self._snapshot_stamp(), journal_size
+
+    def _section_path(self, section: str) -> Path:
+        """Get the file of a state section."""
+        return self.sections_dir / f"{section}.json"
+
+    def _sections_seq(self) -> Any:
+        """Get the snapshot stamp and sequence number the section files include."""
+        try:
+            return json_codec.loads((self.sections_dir / SECTIONS_SEQ_FILE).read_text())
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def _snapshot_stamp(self) -> list[int] | None:
+        """Identify the current snapshot file without reading it."""
+        try:
+            stat = self.snapshot_path.stat()
+        except OSError:
+            return None
+        return [stat.st_ino, stat.st_mtime_ns, stat.st_size]
+
+    def _write_sections(self, sections: Collection[str]) -> None:
+        """Write section files of the state on disk.
+
+        They are rebuilt from the journal after a crash, which leaves the
+        sequence number recorded next to them behind. Each file is stamped
+        with the snapshot it completes, so that readers notice a snapshot
+        replaced by something else than the journal.
+
+        Args:
+            sections: Names of the sections to write
+        """
+        stamp = self._snapshot_stamp()
+        parts: dict[str, dict[str, Any]] = {section: {SNAPSHOT_KEY: stamp} for section in sections}
+        for key, value in self._disk.items():
+            part = parts.get(section_of(key))
+            if part is not None:
+                part[key] = value
+        for section, part in parts.items():
+            write_atomic(self._section_path(section), json_codec.dumps(part), fsync=False)
+        write_atomic(
+            self.sections_dir / SECTIONS_SEQ_FILE,
+            json_codec.dumps([stamp, self._seq]),
+            fsync=False,
+        )
+        self._sections_stale = False
@@ -0,0 +1,201 @@
+"""Cross-process locking of a project's state.
+
+Several ``vv`` processes may work on the same .agilevv directory, e.g. a
+sprint running in the background while ``vv checkpoint`` records a
+checkpoint. Writers take the project's StateLock, an exclusive OS file lock
+on ``state.lock``, around every write and around read-modify-write cycles, so
+that their updates never interleave.
+
+Readers do not lock. Snapshots are replaced atomically and journal entries
+are appended, so a reader sees a consistent state as long as it replays an
+unbroken sequence of entries, which StateJournal.load() checks; ``vv status``
+can therefore poll while a sprint runs without ever delaying it.
+
+One StateLock exists per project directory and process: OS file locks are
+held per open file, so a second lock on the same file would block its own
+process. The lock is reentrant, and records how long writers waited for it.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any
+
+from verifflowcc.core.path_config import PathConfig
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore[assignment]
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+# Waits longer than this are logged
+SLOW_WAIT_SECONDS = 1.0
+
+
+class StateLockTimeoutError(TimeoutError):
+    """Raised when the state lock is not acquired in time."""
+
+
+def _try_lock(file: IO[bytes]) -> bool:
+    """Try to take the OS lock of an open file without blocking."""
+    try:
+        if fcntl is not None:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+def _unlock(file: IO[bytes]) -> None:
+    """Release the OS lock of an open file."""
+    if fcntl is not None:
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+    else:
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class StateLock:
+    """Exclusive lock of a project's state, shared by the threads of a process."""
+
+    def __init__(
+        self,
+        lock_path: Path,
+        timeout: float = 30.0,
+        poll_interval: float = 0.01,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the lock.
+
+        Args:
+            lock_path: File locked by the OS, created on first use
+            timeout: Seconds a writer waits for the lock before giving up
+            poll_interval: Seconds between attempts while another process holds it
+            clock: Monotonic clock, replaceable in tests
+        """
+        if timeout <= 0:
+            raise ValueError("timeout must be positive")
+        self.lock_path = lock_path
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._clock = clock
+        self._thread_lock = threading.RLock()
+        self._file: IO[bytes] | None = None
+        self._depth = 0
+        self.acquisitions = 0
+        self.contended = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    @property
+    def held(self) -> bool:
+        """Whether a thread of this process holds the lock."""
+        return self._depth > 0
+
+    @contextmanager
+    def exclusive(self, timeout: float | None = None) -> Iterator[None]:
+        """Hold the lock for the duration of the block.
+
+        Args:
+            timeout: Seconds to wait, defaults to the lock timeout
+
+        Raises:
+            StateLockTimeoutError: If another process holds the lock for too long
+        """
+        timeout = self.timeout if timeout is None else timeout
+        started = self._clock()
+        if not self._thread_lock.acquire(timeout=timeout):
+            raise StateLockTimeoutError(f"State lock {self.lock_path} busy for {timeout}s")
+        try:
+            if self._depth == 0:
+                self._acquire_file(started, started + timeout)
+            self._depth += 1
+            try:
+                yield
+            finally:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._release_file()
+        finally:
+            self._thread_lock.release()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get the wait statistics of the lock.
+
+        Returns:
+            Dictionary of counters
+        """
+        return {
+            "acquisitions": self.acquisitions,
+            "contended": self.contended,
+            "total_wait_seconds": round(self.total_wait_seconds, 3),
+            "max_wait_seconds": round(self.max_wait_seconds, 3),
+        }
+
+    def _acquire_file(self, started: float, deadline: float) -> None:
+        """Take the OS lock, polling until the deadline."""
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        file = self.lock_path.open("a+b")
+        contended = False
+        while not _try_lock(file):
+            contended = True
+            if self._clock() >= deadline:
+                file.close()
+                raise StateLockTimeoutError(
+                    f"State lock {self.lock_path} held by another process for "
+                    f"{deadline - started:.1f}s"
+                )
+            time.sleep(self.poll_interval)
+        self._file = file
+
+        waited = self._clock() - started
+        self.acquisitions += 1
+        self.contended += contended
+        self.total_wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        if waited >= SLOW_WAIT_SECONDS:
+            logger.warning(f"Waited {waited:.1f}s for state lock {self.lock_path}")
+
+    def _release_file(self) -> None:
+        """Release the OS lock and close the lock file."""
+        if self._file is None:
+            return
+        try:
+            _unlock(self._file)
+        finally:
+            self._file.close()
+            self._file = None
+
+
+_locks: dict[Path, StateLock] = {}
+_locks_guard = threading.Lock()
+
+
+def lock_for(path_config: PathConfig, timeout: float | None = None) -> StateLock:
+    """Get the process-wide state lock of a project.
+
+    Args:
+        path_config: Paths of the project
+        timeout: Seconds writers wait for the lock; updates the shared lock when given
+
+    Returns:
+        StateLock shared by every store of the project in this process
+    """
+    lock_path = Path(os.path.realpath(path_config.state_lock_path))
+    with _locks_guard:
+        lock = _locks.get(lock_path)
+        if lock is None:
+            lock = _locks[lock_path] = StateLock(lock_path)
+        if timeout is not None:
+            lock.timeout = timeout
+        return lock
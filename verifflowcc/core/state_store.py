@@ -0,0 +1,325 @@
+"""Project state storage backends.
+
+The orchestrator and the CLI read and write project state through a
+StateStore, selected by the ``state.backend`` setting of config.yaml:
+
+- ``json`` (default): state.json plus an append-only journal of changes,
+  see verifflowcc.core.state_journal;
+- ``sqlite``: a stdlib sqlite3 database in WAL mode with tables for sprints,
+  stage runs, gate results and agent metrics, see
+  verifflowcc.core.sqlite_store.
+
+The state is divided into sections that can be loaded on their own, so
+that read-only commands such as ``vv status`` do not parse stage artifacts,
+sessions or gate results they never show: ``artifacts``, ``sessions``,
+``metrics``, ``gates`` and ``checkpoints`` group the top-level keys listed in
+STATE_SECTIONS, and ``summary`` holds every other key. Its size does not
+depend on how many stages, sprints and checkpoints have run.
+
+Saves return blocking write jobs so that the orchestrator can run them
+inline or hand them to its background writer. Writes hold the project's
+state lock (see verifflowcc.core.state_lock) so that several processes can
+share a project; update_project_state() holds it around a whole
+read-modify-write cycle.
+"""
+
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Collection, Iterator, Mapping
+from contextlib import contextmanager
+from typing import Any, cast
+
+import yaml
+
+from verifflowcc.core.path_config import PathConfig
+from verifflowcc.core.state_lock import lock_for
+
+WriteJob = Callable[[], None]
+
+BACKENDS = ("json", "sqlite")
+
+# Top-level state keys of the sections other than the summary
+STATE_SECTIONS: dict[str, tuple[str, ...]] = {
+    "artifacts": ("stage_artifacts",),
+    "sessions": ("session_state",),
+    "metrics": ("agent_metrics", "concurrency", "state_lock"),
+    "gates": ("quality_gates",),
+    "checkpoints": ("checkpoint_history",),
+}
+SUMMARY_SECTION = "summary"
+SECTIONS = (SUMMARY_SECTION, *STATE_SECTIONS)
+
+_KEY_SECTIONS = {key: section for section, keys in STATE_SECTIONS.items() for key in keys}
+
+
+def section_of(key: str) -> str:
+    """Get the section a top-level state key belongs to."""
+    return _KEY_SECTIONS.get(key, SUMMARY_SECTION)
+
+
+def check_sections(sections: Collection[str]) -> None:
+    """Check that section names are known.
+
+    Raises:
+        ValueError: If a section is unknown
+    """
+    unknown = set(sections) - set(SECTIONS)
+    if unknown:
+        raise ValueError(
+            f"Unknown state sections {', '.join(sorted(unknown))}, "
+            f"expected some of {', '.join(SECTIONS)}"
+        )
+
+
+class StateStore(ABC):
+    """Storage of the project state and of the sprint history."""
+
+    @abstractmethod
+    def load(self) -> dict[str, Any] | None:
+        """Load the project state.
+
+        Returns:
+            The persisted state, or None when there is none
+        """
+
+    @abstractmethod
+    def save_job(
+        self,
+        state: dict[str, Any],
+        compact: bool = False,
+        changed: Collection[str] | None = None,
+    ) -> WriteJob | None:
+        """Record a save of the state and return the write that persists it.
+
+        The state is serialized immediately, so the returned job can run later
+        as long as jobs of the store run in the order returned. Passing the
+        keys that changed spares comparing the rest of the state with what
+        was persisted; a key left out is not saved. Only the changes since the
+        store last saved are written, on top of the state as stored when the
+        job runs, so that the changes of other processes are kept.
+
+        Args:
+            state: Current state
+            compact: Whether to persist the full state instead of its changes
+            changed: Top-level keys modified since the last save, None if unknown
+
+        Returns:
+            Blocking write job, or None when nothing changed
+        """
+
+    def load_sections(self, sections: Collection[str]) -> dict[str, Any] | None:
+        """Load the top-level keys of some sections of the project state.
+
+        Backends override this to read the sections without the rest of the
+        state; the default loads the whole state.
+
+        Args:
+            sections: Names of the sections to load
+
+        Returns:
+            The keys of the sections, or None when there is no state
+
+        Raises:
+            ValueError: If a section is unknown
+        """
+        check_sections(sections)
+        state = self.load()
+        if state is None:
+            return None
+        return {key: value for key, value in state.items() if section_of(key) in sections}
+
+    def save(self, state: dict[str, Any], compact: bool = False) -> None:
+        """Persist the state now.
+
+        Args:
+            state: Current state
+            compact: Whether to persist the full state instead of its changes
+        """
+        job = self.save_job(state, compact)
+        if job is not None:
+            job()
+
+    def record_sprint_job(self, manifest: dict[str, Any]) -> WriteJob | None:
+        """Return the write recording a sprint manifest, if the store keeps sprints.
+
+        Args:
+            manifest: Sprint manifest, as written to sprint.json
+        """
+        return None
+
+    def record_stage_run_job(self, sprint_number: int, record: dict[str, Any]) -> WriteJob | None:
+        """Return the write recording a finished stage, if the store keeps stage runs.
+
+        Args:
+            sprint_number: Sprint the stage belongs to
+            record: Stage output record, as written to <stage>.json
+        """
+        return None
+
+    @abstractmethod
+    def load_sprint(self, sprint_number: int) -> dict[str, Any] | None:
+        """Load the manifest of a sprint.
+
+        Args:
+            sprint_number: Sprint to load
+
+        Returns:
+            The sprint manifest, or None when the sprint was not recorded
+        """
+
+    @abstractmethod
+    def load_stage_runs(self, sprint_number: int) -> dict[str, dict[str, Any]]:
+        """Load the output records of the stages a sprint finished.
+
+        Args:
+            sprint_number: Sprint to load
+
+        Returns:
+            Mapping of stage name to its output record
+        """
+
+    def close(self) -> None:  # noqa: B027
+        """Release the resources held by the store."""
+
+
+def get_state_settings(path_config: PathConfig) -> dict[str, Any]:
+    """Read the ``state`` section of a project's config.yaml.
+
+    Args:
+        path_config: Paths of the project
+
+    Returns:
+        State settings, empty when not configured
+    """
+    if not path_config.config_path.exists():
+        return {}
+    config = yaml.safe_load(path_config.config_path.read_text()) or {}
+    return cast("dict[str, Any]", config.get("state") or {})
+
+
+def open_state_store(
+    path_config: PathConfig, settings: Mapping[str, Any] | None = None
+) -> StateStore:
+    """Open the state store of a project.
+
+    Args:
+        path_config: Paths of the project
+        settings: The ``state`` configuration section, read from config.yaml when None
+
+    Returns:
+        StateStore of the configured backend
+
+    Raises:
+        ValueError: If the configured backend is unknown
+    """
+    # Backends build on this module, import them on use
+    from verifflowcc.core.sqlite_store import SQLiteStateStore
+    from verifflowcc.core.state_journal import StateJournal
+
+    if settings is None:
+        settings = get_state_settings(path_config)
+    lock = lock_for(path_config, settings.get("lock_timeout"))
+    backend = settings.get("backend", "json")
+    if backend == "json":
+        return StateJournal.for_project(path_config, settings.get("compact_every", 50), lock)
+    if backend == "sqlite":
+        return SQLiteStateStore(path_config, lock)
+    raise ValueError(f"Unknown state backend '{backend}', expected one of {', '.join(BACKENDS)}")
+
+
+def load_project_state(path_config: PathConfig) -> dict[str, Any]:
+    """Read the current project state from the configured backend.
+
+    Reading takes no lock, so it never waits for a sprint writing the state.
+
+    Args:
+        path_config: Paths of the project
+
+    Returns:
+        Project state
+
+    Raises:
+        FileNotFoundError: If the project has no state
+    """
+    store = open_state_store(path_config)
+    try:
+        state = store.load()
+    finally:
+        store.close()
+    if state is None:
+        raise FileNotFoundError(path_config.state_path)
+    return state
+
+
+def load_project_sections(path_config: PathConfig, sections: Collection[str]) -> dict[str, Any]:
+    """Read some sections of the project state from the configured backend.
+
+    Like load_project_state(), reading takes no lock.
+
+    Args:
+        path_config: Paths of the project
+        sections: Names of the sections to read, see STATE_SECTIONS
+
+    Returns:
+        The top-level keys of the sections
+
+    Raises:
+        FileNotFoundError: If the project has no state
+        ValueError: If a section is unknown
+    """
+    store = open_state_store(path_config)
+    try:
+        state = store.load_sections(sections)
+    finally:
+        store.close()
+    if state is None:
+        raise FileNotFoundError(path_config.state_path)
+    return state
+
+
+def save_project_state(path_config: PathConfig, state: dict[str, Any]) -> None:
+    """Write the full project state to the configured backend.
+
+    Args:
+        path_config: Paths of the project
+        state: Project state
+    """
+    store = open_state_store(path_config)
+    try:
+        with lock_for(path_config).exclusive():
+            # Loading first continues the store's history instead of restarting it
+            store.load()
+            store.save(state, compact=True)
+    finally:
+        store.close()
+
+
+@contextmanager
+def update_project_state(path_config: PathConfig) -> Iterator[dict[str, Any]]:
+    """Read, modify and write the project state while holding the state lock.
+
+    Other processes cannot write the state in between, so their changes are
+    never overwritten with an older copy:
+
+        with update_project_state(path_config) as state:
+            state["active_story"] = story
+
+    Args:
+        path_config: Paths of the project
+
+    Yields:
+        Project state, written back when the block exits without an error
+
+    Raises:
+        FileNotFoundError: If the project has no state
+        StateLockTimeoutError: If another process holds the lock for too long
+    """
+    store = open_state_store(path_config)
+    try:
+        with lock_for(path_config).exclusive():
+            state = store.load()
+            if state is None:
+                raise FileNotFoundError(path_config.state_path)
+            yield state
+            store.save(state, compact=True)
+    finally:
+        store.close()
@@ -0,0 +1,148 @@
+"""Atomic and debounced writing of project state.
+
+write_atomic() writes a file through a temporary file in the same directory,
+fsyncs it and renames it over the target, so a crash mid-write leaves either
+the previous content or the new one, never a truncated file.
+
+A DebouncedFlush coalesces the saves requested within a window into a single
+flush: a burst of stage transitions pays one serialization and one fsync
+instead of one per transition. flush() is a barrier writing anything pending
+right away; the orchestrator calls it at the end of a sprint, after checkpoints
+and when it is interrupted, and flush_all_pending() does the same for every
+flusher of the process from signal handlers and at exit.
+"""
+
+import asyncio
+import atexit
+import logging
+import os
+import tempfile
+import weakref
+from collections.abc import Callable
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Flushers with pending saves, flushed by flush_all_pending(). Kept alive until
+# they flush, so that a save pending when the event loop stops is not lost.
+_live_flushers: set["DebouncedFlush"] = set()
+# Every flusher of the process, drained by flush_all_pending()
+_all_flushers: "weakref.WeakSet[DebouncedFlush]" = weakref.WeakSet()
+
+
+def write_atomic(
+    path: Path, text: str | bytes, fsync: bool = True, mode: int | None = None
+) -> None:
+    """Replace the content of a file atomically.
+
+    Args:
+        path: File to write
+        text: New content, bytes for binary files
+        fsync: Whether to flush the content to disk before the rename
+        mode: Permissions of the new file, those of a temporary file (0600) when None
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb" if isinstance(text, bytes) else "w") as f:
+            f.write(text)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        if mode is not None:
+            Path(tmp_name).chmod(mode)
+        Path(tmp_name).replace(path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+class DebouncedFlush:
+    """Coalesces the save requests of a window into one flush.
+
+    The window starts with the first request after a flush, so a steady
+    stream of requests is still flushed at least once per window. Without a
+    running event loop, or with a window of zero, requests flush immediately.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[], None],
+        window: float = 0.1,
+        drain: Callable[[], None] | None = None,
+    ):
+        """Initialize the flusher.
+
+        Args:
+            flush: Callable persisting the latest state
+            window: Seconds during which requests are coalesced
+            drain: Blocking callable finishing the writes flush() may have
+                queued, e.g. on a background writer; run by flush_all_pending()
+        """
+        if window < 0:
+            raise ValueError("window must not be negative")
+        self._flush = flush
+        self._drain = drain
+        self.window = window
+        self._handle: asyncio.TimerHandle | None = None
+        self.requests = 0
+        self.flushes = 0
+        _all_flushers.add(self)
+
+    @property
+    def pending(self) -> bool:
+        """Whether a requested save has not been flushed yet."""
+        return self._handle is not None
+
+    def request(self) -> None:
+        """Request a save, flushed at the end of the current window."""
+        self.requests += 1
+        if self._handle is not None:
+            return
+        if self.window == 0:
+            self.flush()
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        self._handle = loop.call_later(self.window, self.flush)
+        _live_flushers.add(self)
+
+    def flush(self) -> None:
+        """Flush now, cancelling the pending window."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        _live_flushers.discard(self)
+        self.flushes += 1
+        self._flush()
+
+    def flush_pending(self) -> None:
+        """Flush only if a requested save is still pending."""
+        if self.pending:
+            self.flush()
+
+    def flush_sync(self) -> None:
+        """Flush anything pending and wait until it is written."""
+        self.flush_pending()
+        if self._drain is not None:
+            self._drain()
+
+
+def flush_all_pending() -> None:
+    """Write the pending saves of every flusher of the process.
+
+    Meant for signal handlers and exit, where queued writes would never run:
+    saves are written and drained synchronously, and errors are logged so
+    that every flusher gets its chance to write.
+    """
+    for flusher in {*_live_flushers, *_all_flushers}:
+        try:
+            flusher.flush_sync()
+        except Exception as e:
+            logger.error(f"Could not flush pending state: {e}")
+
+
+atexit.register(flush_all_pending)